@@ -24,6 +24,8 @@ import ctypes
 from tkinter import messagebox
 from pathlib import Path
 import hashlib
+import socket
+from concurrent.futures import ThreadPoolExecutor
 
 # ============================================================================
 # INFORMACIÓN DE COPYRIGHT Y LICENCIA
@@ -66,6 +68,14 @@ FONT_CONSOLE = ("Consolas", 14)
 FONT_BUTTON = ("Segoe UI", 14, "bold")
 FONT_INFO = ("Segoe UI", 14)
 
+# Destinos que necesita la inscripción (conexión TCP, sin ICMP)
+INTERNET_ENDPOINTS = [
+    ("spradling.group", 443),
+    ("www.powershellgallery.com", 443),
+    ("enrollment.manage.microsoft.com", 443),
+]
+INTERNET_TIMEOUT = 3
+
 
 # ============================================================================
 # FUNCIONES DE ELEVACIÓN DE PRIVILEGIOS
@@ -139,15 +149,29 @@ def get_serial_number():
         return "N/A"
 
 
-def check_internet():
-    """Verifica conexión a internet."""
+def measure_connect(host, port, timeout=INTERNET_TIMEOUT):
+    """Latencia de conexión TCP en ms, o None si no se pudo conectar."""
+    start = time.perf_counter()
     try:
-        result = subprocess.run(
-            ["ping", "-n", "3", "spradling.group"], capture_output=True, timeout=5
-        )
-        return result.returncode == 0
-    except:
-        return False
+        with socket.create_connection((host, port), timeout=timeout):
+            return round((time.perf_counter() - start) * 1000, 1)
+    except OSError:
+        return None
+
+
+def check_internet(endpoints=INTERNET_ENDPOINTS, timeout=INTERNET_TIMEOUT):
+    """
+    Verifica la conexión abriendo conexiones TCP en paralelo.
+
+    Muchas redes bloquean ICMP, por eso no se usa ping. El tiempo total es
+    el del destino más lento (como máximo `timeout`).
+
+    Returns:
+        dict: (host, puerto) → latencia en ms o None si no responde
+    """
+    with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+        latencies = pool.map(lambda e: measure_connect(*e, timeout), endpoints)
+        return dict(zip(endpoints, latencies))
 
 
 # ============================================================================
@@ -333,14 +357,27 @@ class AutoPilotApp(ctk.CTk):
         self.status_label.configure(text=f"Estado: {text}", text_color=color)
 
     def initial_check(self):
-        """Verificación inicial del sistema."""
+        """Verificación inicial del sistema (la red se mide en segundo plano)."""
         self.log("Verificando prerequisitos del sistema...", "PROCESS")
 
-        # Verificar conexión
-        if check_internet():
-            self.log("✓ Conexión a internet activa", "SUCCESS")
-        else:
+        def worker():
+            results = check_internet()
+            self.after(0, self.show_internet_check, results)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def show_internet_check(self, results):
+        """Muestra el resultado de la verificación de red (hilo de Tk)."""
+        for (host, port), latency in results.items():
+            if latency is None:
+                self.log(f"⚠ Sin conexión a {host}:{port}", "WARNING")
+            else:
+                self.log(f"✓ {host}:{port} responde en {latency} ms", "SUCCESS")
+
+        if all(latency is None for latency in results.values()):
             self.log("⚠ Sin conexión a internet", "WARNING")
+        else:
+            self.log("✓ Conexión a internet activa", "SUCCESS")
 
         self.log("━" * 70, "INFO")
         self.log(
@@ -17,9 +17,12 @@ import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime
 import socket
+import socketserver
+import argparse
 import platform
 import subprocess
 import psutil
+import numpy as np
 import os
 import sys
 from reportlab.pdfgen import canvas
@@ -29,8 +32,19 @@ from reportlab.lib.utils import ImageReader
 import getpass
 from pathlib import Path
 import re
+import json
 import hashlib
 import ctypes
+import codecs
+import itertools
+from xml.etree import ElementTree
+import mmap
+import errno
+import tempfile
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
 
 
 # ============================================================================
@@ -90,6 +104,169 @@ LOGO_PROQUINAL = Path(resource_path("static/logos/proquinal.png"))
 LOGO_MAYTE = Path(resource_path("static/logos/mayte.png"))
 LOGO_STEFANINI = Path(resource_path("static/logos/stefanini.png"))
 
+# Historial que deja el Optimizador de Sistema en cada ejecución
+OPTIMIZER_RUNS_DIR = Path("C:/ProgramData/PQN_Optimizer/runs")
+
+# Recolección de hardware: todas las consultas corren en paralelo y el
+# conjunto tiene un único plazo; lo que no responda a tiempo queda marcado
+UNAVAILABLE = "No disponible"
+HARDWARE_DEADLINE = 12.0
+
+# Unidades: plazo por volumen y tipos que solo se consultan bajo demanda
+VOLUME_TIMEOUT = 2.0
+SLOW_VOLUME_TIMEOUT = 10.0
+DRIVE_TYPES = {2: "removable", 3: "fixed", 4: "network", 5: "optical", 6: "ramdisk"}
+DRIVE_TYPE_LABELS = {
+    "fixed": "fija",
+    "removable": "extraíble",
+    "network": "red",
+    "optical": "óptica",
+    "ramdisk": "RAM",
+}
+SLOW_DRIVE_TYPES = {"network", "optical"}
+
+_volume_cache = {}
+_volume_cache_lock = threading.Lock()
+
+# Muestreo de recursos mientras el técnico diligencia el formulario. Los
+# búferes son circulares: la memoria es fija sin importar cuánto dure.
+SAMPLE_INTERVAL = 1.0
+SAMPLE_WINDOW = 60
+SPARKLINE_POINTS = 120
+
+# Canal → (etiqueta, unidad)
+SAMPLER_CHANNELS = {
+    "cpu": ("CPU (promedio núcleos)", "%"),
+    "cpu_max_core": ("CPU (núcleo más cargado)", "%"),
+    "freq": ("Frecuencia CPU", "MHz"),
+    "memory": ("Memoria en uso", "%"),
+    "disk_read": ("Lectura de disco", "MB/s"),
+    "disk_write": ("Escritura de disco", "MB/s"),
+    "net_recv": ("Red recibido", "Mbps"),
+    "net_sent": ("Red enviado", "Mbps"),
+    "temperature": ("Temperatura CPU", "°C"),
+}
+
+# Benchmark de CPU y memoria (~20 s en total). El historial se guarda por
+# placa (fixed asset) para comparar antes/después del mantenimiento.
+BENCHMARK_DIR = Path("C:/ProgramData/PQN_Diagnostic/benchmarks")
+BENCHMARK_HISTORY = 20
+BENCH_CPU_SECONDS = 2.0
+BENCH_ARRAY_MB = 64
+BENCH_BANDWIDTH_REPEATS = 5
+BENCH_CHASE_MB = 64
+BENCH_CHASE_STEPS = 1_000_000
+# Espera máxima a que todos los procesos de carga estén listos para empezar
+BENCH_START_TIMEOUT = 30.0
+
+# Métrica → (etiqueta, unidad, valor de referencia = 1000 puntos, mayor es mejor)
+BENCHMARK_METRICS = {
+    "cpu_int_single": ("CPU enteros (1 núcleo)", "Mops/s", 5.0, True),
+    "cpu_float_single": ("CPU flotante (1 núcleo)", "Mops/s", 8.0, True),
+    "cpu_int_multi": ("CPU enteros (todos los núcleos)", "Mops/s", 20.0, True),
+    "cpu_float_multi": ("CPU flotante (todos los núcleos)", "Mops/s", 32.0, True),
+    "mem_copy": ("Memoria copy", "GB/s", 10.0, True),
+    "mem_scale": ("Memoria scale", "GB/s", 8.0, True),
+    "mem_triad": ("Memoria triad", "GB/s", 13.3, True),
+    "mem_latency": ("Latencia de memoria", "ns", 100.0, False),
+}
+
+# Benchmark de almacenamiento: archivo temporal por volumen fijo con tamaño
+# acotado; se elimina siempre al terminar, aunque la prueba falle
+STORAGE_BENCH_MAX_MB = 256
+STORAGE_BENCH_MIN_MB = 32
+STORAGE_BENCH_PREFIX = "pqn_storage_bench_"
+STORAGE_SEQ_BLOCK = 4 * 1024**2
+STORAGE_RANDOM_BLOCK = 4096
+STORAGE_RANDOM_SECONDS = 2.0
+STORAGE_QUEUE_DEPTH = 8
+
+# Diagnóstico de red: destinos configurables en NETWORK_CONFIG_FILE
+# {"endpoints": [["Nombre", "host:puerto"], ...], "throughput_server": "host:puerto"}
+NETWORK_CONFIG_FILE = Path("C:/ProgramData/PQN_Diagnostic/network.json")
+DEFAULT_NETWORK_CONFIG = {
+    "endpoints": [
+        ["Spradling", "spradling.group:443"],
+        ["PowerShell Gallery", "www.powershellgallery.com:443"],
+        ["Microsoft Intune", "enrollment.manage.microsoft.com:443"],
+    ],
+    "throughput_server": None,
+}
+NETWORK_SAMPLES = 5
+NETWORK_TIMEOUT = 2.0
+THROUGHPUT_PORT = 5201
+THROUGHPUT_MAGIC = b"PQNT"
+THROUGHPUT_CHUNK = 64 * 1024
+THROUGHPUT_BYTES = 64 * 1024**2
+THROUGHPUT_MAX_BYTES = 1024**3
+THROUGHPUT_SECONDS = 5.0
+
+# Throttling térmico: carga en todos los núcleos con umbrales por modelo.
+# Se pueden ajustar en THROTTLE_CONFIG_FILE {"models": {"<modelo>": {...}}}
+THROTTLE_CONFIG_FILE = Path("C:/ProgramData/PQN_Diagnostic/throttling.json")
+THROTTLE_LOAD_SECONDS = 30
+THROTTLE_SAMPLE_INTERVAL = 0.5
+THROTTLE_REFERENCE_SECONDS = 3
+# Segundos iniciales que se descartan: turbo y contadores aún estabilizándose
+THROTTLE_RAMP_SECONDS = 1
+DEFAULT_THROTTLE_THRESHOLDS = {
+    "freq_drop_percent": 15,
+    "sustained_seconds": 5,
+    "temp_limit": 95,
+}
+THROTTLE_MODEL_THRESHOLDS = {
+    # Equipos delgados: el fabricante limita la potencia más agresivamente
+    "Latitude 7": {"freq_drop_percent": 25},
+    "EliteBook 8": {"freq_drop_percent": 25},
+    "ThinkPad X1": {"freq_drop_percent": 25, "temp_limit": 100},
+    "OptiPlex": {"freq_drop_percent": 10, "temp_limit": 90},
+}
+
+# Registro de eventos: filtro XPath en el servicio de eventos y lectura
+# incremental del XML (memoria acotada aunque el registro sea enorme)
+EVENT_LOGS = ["System", "Application"]
+EVENT_DAYS = 30
+EVENT_MAX_EVENTS = 20000
+EVENT_QUERY_TIMEOUT = 60
+EVENT_TOP_OFFENDERS = 10
+EVENT_NS = "{http://schemas.microsoft.com/win/2004/08/events/event}"
+EVENT_WATCHED_PROVIDERS = [
+    "disk",
+    "Ntfs",
+    "storahci",
+    "stornvme",
+    "Microsoft-Windows-WHEA-Logger",
+    "Microsoft-Windows-Kernel-Power",
+    "EventLog",
+]
+EVENT_LEVEL_NAMES = {1: "critical", 2: "error", 3: "warning"}
+EVENT_LEVEL_LABELS = {1: "Crítico", 2: "Error", 3: "Advertencia"}
+
+# Rendimiento de arranque: eventos 100-110 (arranque) y 200-203 (apagado)
+BOOT_LOG = "Microsoft-Windows-Diagnostics-Performance/Operational"
+BOOT_EVENT_XPATH = (
+    "*[System[(EventID>=100 and EventID<=110) or (EventID>=200 and EventID<=203)]]"
+)
+BOOT_HISTORY = 20
+BOOT_MAX_EVENTS = 3000
+BOOT_TOP_OFFENDERS = 8
+BOOT_TREND_TOLERANCE = 0.02  # Pendiente menor al 2 % del promedio = estable
+BOOT_DELAY_KINDS = {
+    101: "aplicación",
+    102: "controlador",
+    103: "servicio",
+    104: "desfragmentación",
+    105: "aplicación en primer plano",
+    106: "optimización en segundo plano",
+    107: "directiva de equipo",
+    108: "directiva de usuario",
+    109: "dispositivo",
+    110: "inicialización de sesión",
+    201: "aplicación (apagado)",
+    202: "dispositivo (apagado)",
+    203: "servicio (apagado)",
+}
+
 
 # ============================================================================
 # FUNCIONES DE ELEVACIÓN DE PRIVILEGIOS
@@ -107,13 +284,16 @@ def is_admin():
 def run_as_admin():
     """Reinicia el script con privilegios de administrador."""
     try:
+        # En el ejecutable congelado sys.executable ya es el programa: solo se
+        # pasan los argumentos, sin sys.argv[0]
+        arguments = subprocess.list2cmdline(sys.argv[1:])
         if sys.argv[0].endswith(".py"):
             ctypes.windll.shell32.ShellExecuteW(
-                None, "runas", sys.executable, f'"{sys.argv[0]}"', None, 1
+                None, "runas", sys.executable, f'"{sys.argv[0]}" {arguments}'.strip(), None, 1
             )
         else:
             ctypes.windll.shell32.ShellExecuteW(
-                None, "runas", sys.executable, " ".join(sys.argv), None, 1
+                None, "runas", sys.executable, arguments, None, 1
             )
         sys.exit(0)
     except Exception as e:
@@ -222,16 +402,13 @@ def get_bios_serial():
 
 
 def get_ram_info():
-    """Obtiene información detallada de RAM."""
+    """Obtiene información detallada de RAM a partir de una sola lectura."""
     try:
-        total_gb = round(psutil.virtual_memory().total / (1024**3), 2)
-        available_gb = round(psutil.virtual_memory().available / (1024**3), 2)
-        used_gb = round(
-            (psutil.virtual_memory().total - psutil.virtual_memory().available)
-            / (1024**3),
-            2,
-        )
-        percent = psutil.virtual_memory().percent
+        memory = psutil.virtual_memory()
+        total_gb = round(memory.total / (1024**3), 2)
+        available_gb = round(memory.available / (1024**3), 2)
+        used_gb = round((memory.total - memory.available) / (1024**3), 2)
+        percent = memory.percent
 
         return {
             "total": total_gb,
@@ -243,29 +420,218 @@ def get_ram_info():
         return {"total": 0, "available": 0, "used": 0, "percent": 0}
 
 
-def get_disk_info():
-    """Obtiene información de todos los discos."""
-    disks = []
+def get_drive_type(partition):
+    """
+    Clasifica una unidad como fixed, removable, network, optical o ramdisk.
+
+    En Windows usa GetDriveTypeW, que no accede al dispositivo (no despierta
+    discos dormidos ni espera unidades de red desconectadas).
+    """
     try:
-        for partition in psutil.disk_partitions():
-            if "cdrom" in partition.opts or partition.fstype == "":
-                continue
+        code = ctypes.windll.kernel32.GetDriveTypeW(partition.mountpoint)
+        return DRIVE_TYPES.get(code, "unknown")
+    except (AttributeError, OSError):
+        pass
+    opts = partition.opts.split(",")
+    for option, kind in (("cdrom", "optical"), ("remote", "network"), ("removable", "removable")):
+        if option in opts:
+            return kind
+    return "fixed"
+
+
+def list_partitions():
+    """
+    Particiones que se informan.
+
+    En Windows se piden todas (all=True incluye las unidades de red mapeadas
+    y las que no tienen medio) y se conservan las que GetDriveTypeW reconoce;
+    en otros sistemas se omiten los pseudo sistemas de archivos.
+    """
+    if sys.platform == "win32":
+        get_type = ctypes.windll.kernel32.GetDriveTypeW
+        return [
+            p for p in psutil.disk_partitions(all=True) if get_type(p.mountpoint) in DRIVE_TYPES
+        ]
+    return [
+        p for p in psutil.disk_partitions(all=False) if p.fstype or "cdrom" in p.opts
+    ]
+
+
+def probe_volume_usage(partition, kind):
+    """Lee el uso de una unidad (puede bloquearse en unidades lentas)."""
+    usage = psutil.disk_usage(partition.mountpoint)
+    return {
+        "drive": partition.device,
+        "type": kind,
+        "status": "ok",
+        "total": round(usage.total / (1024**3), 2),
+        "used": round(usage.used / (1024**3), 2),
+        "free": round(usage.free / (1024**3), 2),
+        "percent": usage.percent,
+    }
+
+
+def get_disk_info(include_slow=False, timeout=VOLUME_TIMEOUT, refresh=False):
+    """
+    Obtiene información de todos los discos sin bloquearse en unidades lentas.
+
+    Cada unidad se consulta en su propio hilo con un plazo corto; las que no
+    responden quedan marcadas con status "timeout". Las unidades de red y
+    ópticas solo se consultan con include_slow=True. Solo las lecturas
+    correctas se guardan en caché durante la sesión: una unidad que no
+    respondió o falló se vuelve a consultar en el siguiente informe.
+    """
+    try:
+        partitions = list_partitions()
+    except Exception:
+        return []
+
+    disks, pending = {}, {}
+    for partition in partitions:
+        key = partition.mountpoint
+        with _volume_cache_lock:
+            cached = None if refresh else _volume_cache.get(key)
+        if cached:
+            disks[key] = cached
+            continue
+
+        kind = get_drive_type(partition)
+        if kind in SLOW_DRIVE_TYPES and not include_slow:
+            disks[key] = {"drive": partition.device, "type": kind, "status": "skipped"}
+            continue
+
+        result = {"drive": partition.device, "type": kind, "status": "timeout", "timeout": timeout}
+
+        def worker(partition=partition, kind=kind, result=result):
             try:
-                usage = psutil.disk_usage(partition.mountpoint)
-                disks.append(
-                    {
-                        "drive": partition.device,
-                        "total": round(usage.total / (1024**3), 2),
-                        "used": round(usage.used / (1024**3), 2),
-                        "free": round(usage.free / (1024**3), 2),
-                        "percent": usage.percent,
-                    }
+                result.update(probe_volume_usage(partition, kind))
+            except Exception:
+                result["status"] = "error"
+
+        # Hilos daemon: una unidad colgada no impide cerrar la aplicación
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        pending[key] = (thread, result)
+
+    deadline = time.monotonic() + timeout
+    for key, (thread, result) in pending.items():
+        thread.join(max(0, deadline - time.monotonic()))
+        # Copia: si el hilo termina tarde no modifica lo ya reportado
+        disks[key] = dict(result)
+
+    with _volume_cache_lock:
+        _volume_cache.update((key, disk) for key, disk in disks.items() if disk["status"] == "ok")
+    return [disks[p.mountpoint] for p in partitions if p.mountpoint in disks]
+
+
+def describe_disk(disk):
+    """Línea del informe para una unidad según el resultado de su consulta."""
+    label = DRIVE_TYPE_LABELS.get(disk.get("type"), "unidad")
+    if disk["status"] == "ok":
+        return (
+            f"{disk['drive']} ({label}) - Total: {disk['total']} GB | Usado: {disk['used']} GB"
+            f" | Libre: {disk['free']} GB ({disk['percent']}%)"
+        )
+    if disk["status"] == "timeout":
+        return f"{disk['drive']} ({label}) - Sin respuesta en {disk['timeout']:g} s, no se pudo leer"
+    if disk["status"] == "skipped":
+        return f"{disk['drive']} ({label}) - No consultada"
+    return f"{disk['drive']} ({label}) - Error al leer la unidad"
+
+
+def format_bytes(size):
+    """Formatea un tamaño en bytes a una unidad legible."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.2f} TB"
+
+
+def load_last_optimizer_run():
+    """Carga el resumen de la última ejecución del Optimizador, si existe."""
+    try:
+        runs = sorted(OPTIMIZER_RUNS_DIR.glob("run_*.json"))
+        if not runs:
+            return None
+        with open(runs[-1], "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+# Consultas de hardware: campo → (función, valor si no responde a tiempo)
+HARDWARE_PROBES = {
+    "processor": (get_processor_info, UNAVAILABLE),
+    "manufacturer": (get_manufacturer, UNAVAILABLE),
+    "model": (get_model, UNAVAILABLE),
+    "serial": (get_bios_serial, UNAVAILABLE),
+    "ram": (get_ram_info, {"total": 0, "available": 0, "used": 0, "percent": 0}),
+    "disks": (get_disk_info, []),
+    "os": (
+        lambda: f"{platform.system()} {platform.release()} {platform.version()}",
+        UNAVAILABLE,
+    ),
+    "hostname": (socket.gethostname, UNAVAILABLE),
+    "user": (getpass.getuser, UNAVAILABLE),
+    "optimizer_run": (load_last_optimizer_run, None),
+}
+
+
+def collect_system_info(probes=None, deadline=HARDWARE_DEADLINE):
+    """
+    Ejecuta todas las consultas de hardware en paralelo con un plazo común.
+
+    El tiempo total es el de la consulta más lenta (o el plazo), no la suma.
+    Las consultas que fallan o no terminan a tiempo se reemplazan por su
+    valor "No disponible" sin invalidar el resto.
+
+    Returns:
+        tuple: (información del sistema, lista de campos no disponibles)
+    """
+    probes = probes or HARDWARE_PROBES
+    pool = ThreadPoolExecutor(max_workers=len(probes))
+    futures = {pool.submit(func): field for field, (func, _) in probes.items()}
+    wait(futures, timeout=deadline)
+    # No esperar a las consultas colgadas: sus hilos terminan por su cuenta
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    info, missing = {}, []
+    for future, field in futures.items():
+        if future.done() and not future.cancelled() and future.exception() is None:
+            info[field] = future.result()
+        else:
+            info[field] = probes[field][1]
+        if not future.done() or future.cancelled() or info[field] == UNAVAILABLE:
+            missing.append(field)
+    return info, missing
+
+
+def describe_optimizer_run(run):
+    """Genera las líneas del informe que resumen una ejecución del Optimizador."""
+    if not run:
+        return []
+
+    tasks = run.get("tasks", [])
+    ok = sum(1 for t in tasks if t.get("success"))
+    lines = [
+        f"Fecha de ejecución: {run.get('started', 'N/A').replace('T', ' ')}",
+        f"Tareas ejecutadas: {len(tasks)} ({ok} correctas, {len(tasks) - ok} con advertencias)",
+    ]
+
+    cleanup = run.get("cleanup")
+    if cleanup:
+        verb = "a liberar (simulación)" if cleanup.get("dry_run") else "liberados"
+        lines.append(
+            f"Archivos temporales: {cleanup.get('files', 0)} archivos, "
+            f"{format_bytes(cleanup.get('bytes', 0))} {verb}"
+        )
+        for location in cleanup.get("locations", []):
+            if location.get("bytes"):
+                lines.append(
+                    f"   - {location['name']}: {format_bytes(location['bytes'])}"
                 )
-            except:
-                continue
-    except:
-        pass
-    return disks
+    return lines
 
 
 def validate_ticket_number(ticket):
@@ -310,6 +676,1593 @@ def validate_technician_name(name):
     return True, ""
 
 
+# ============================================================================
+# MUESTREO DE RECURSOS
+# ============================================================================
+
+
+def read_cpu_temperature():
+    """Temperatura actual de la CPU en °C, o NaN si el equipo no la expone."""
+    try:
+        sensors = psutil.sensors_temperatures()
+    except (AttributeError, OSError):
+        return float("nan")
+    for name in ("coretemp", "k10temp", "cpu_thermal", "acpitz"):
+        readings = [t.current for t in sensors.get(name, []) if t.current]
+        if readings:
+            return max(readings)
+    return float("nan")
+
+
+class ResourceSampler:
+    """
+    Registra el uso de recursos a intervalo fijo en búferes NumPy circulares.
+
+    Cada muestra son unas pocas lecturas de contadores de psutil (sin
+    procesos externos), por lo que el costo es despreciable. Los búferes se
+    reservan al inicio para la ventana configurada; al llenarse, las
+    muestras nuevas reemplazan a las más antiguas.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, window=SAMPLE_WINDOW):
+        self.interval = interval
+        self.capacity = max(2, int(window / interval))
+        self.cores = psutil.cpu_count() or 1
+        self.per_core = np.full((self.capacity, self.cores), np.nan, dtype=np.float32)
+        self.buffers = {
+            name: np.full(self.capacity, np.nan, dtype=np.float32)
+            for name in SAMPLER_CHANNELS
+        }
+        self.index = 0
+        self.count = 0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self._last = None
+
+    def start(self):
+        """Inicia el muestreo en un hilo de fondo."""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        psutil.cpu_percent(percpu=True)  # Primera lectura: fija la referencia
+        self._last = self._read_counters()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Detiene el muestreo conservando las muestras tomadas."""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(self.interval * 2)
+
+    def _run(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:
+                continue
+
+    def _read_counters(self):
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+        return (
+            time.monotonic(),
+            (disk.read_bytes, disk.write_bytes) if disk else (0, 0),
+            (net.bytes_recv, net.bytes_sent) if net else (0, 0),
+        )
+
+    def sample(self):
+        """Toma una muestra y la guarda en la posición actual del búfer."""
+        cores = psutil.cpu_percent(percpu=True)
+        freq = psutil.cpu_freq()
+        now, disk, net = self._read_counters()
+        elapsed = max(now - self._last[0], 1e-3)
+        disk_rates = [(cur - prev) / elapsed / 1024**2 for cur, prev in zip(disk, self._last[1])]
+        net_rates = [(cur - prev) * 8 / elapsed / 1e6 for cur, prev in zip(net, self._last[2])]
+        self._last = (now, disk, net)
+
+        values = {
+            "cpu": sum(cores) / len(cores),
+            "cpu_max_core": max(cores),
+            "freq": freq.current if freq else np.nan,
+            "memory": psutil.virtual_memory().percent,
+            "disk_read": max(disk_rates[0], 0),
+            "disk_write": max(disk_rates[1], 0),
+            "net_recv": max(net_rates[0], 0),
+            "net_sent": max(net_rates[1], 0),
+            "temperature": read_cpu_temperature(),
+        }
+        with self.lock:
+            self.per_core[self.index, : len(cores)] = cores[: self.cores]
+            for name, value in values.items():
+                self.buffers[name][self.index] = value
+            self.index = (self.index + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+
+    def series(self, name):
+        """Muestras de un canal en orden cronológico (copia)."""
+        with self.lock:
+            buffer = self.buffers[name]
+            if self.count < self.capacity:
+                return buffer[: self.count].copy()
+            return np.concatenate((buffer[self.index :], buffer[: self.index]))
+
+    def summary(self):
+        """
+        Estadísticas por canal con datos válidos.
+
+        Returns:
+            dict: canal → {"mean", "p95", "max", "samples"}
+        """
+        stats = {}
+        for name in SAMPLER_CHANNELS:
+            values = self.series(name)
+            values = values[~np.isnan(values)]
+            if values.size == 0:
+                continue
+            stats[name] = {
+                "mean": float(values.mean()),
+                "p95": float(np.percentile(values, 95)),
+                "max": float(values.max()),
+                "samples": int(values.size),
+            }
+        return stats
+
+
+def downsample(values, points=SPARKLINE_POINTS):
+    """Reduce una serie a un máximo de puntos promediando por bloques."""
+    values = values[~np.isnan(values)]
+    if values.size <= points:
+        return values
+    edges = np.linspace(0, values.size, points + 1).astype(int)
+    return np.add.reduceat(values, edges[:-1]) / np.diff(edges)
+
+
+def draw_sparkline(c, x, y, width, height, values, color):
+    """Dibuja una gráfica de línea compacta (sparkline) en el PDF."""
+    values = downsample(values)
+    if values.size < 2:
+        return
+    low, high = float(values.min()), float(values.max())
+    span = (high - low) or 1.0
+    step = width / (values.size - 1)
+    path = c.beginPath()
+    for i, value in enumerate(values):
+        py = y + (float(value) - low) / span * height
+        if i == 0:
+            path.moveTo(x, py)
+        else:
+            path.lineTo(x + i * step, py)
+    c.setStrokeColorRGB(*color)
+    c.setLineWidth(0.8)
+    c.drawPath(path, stroke=1, fill=0)
+
+
+def describe_temperature(stats):
+    """Observación sobre la temperatura de CPU medida durante el muestreo."""
+    temperature = stats.get("temperature")
+    if not temperature:
+        return "• Temperatura de CPU: el equipo no expone el sensor, no se midió."
+    return (
+        f"• Temperatura de CPU medida: media {temperature['mean']:.0f}°C, "
+        f"máxima {temperature['max']:.0f}°C ({temperature['samples']} muestras)."
+    )
+
+
+# ============================================================================
+# BENCHMARK DE CPU Y MEMORIA
+# ============================================================================
+
+
+def integer_kernel(iterations):
+    """Kernel fijo de aritmética entera (generador congruencial + xorshift)."""
+    x = 1
+    for _ in range(iterations):
+        x = (x * 1103515245 + 12345) & 0x7FFFFFFF
+        x ^= x >> 7
+    return x
+
+
+def float_kernel(iterations):
+    """Kernel fijo de punto flotante (multiplicación, suma y división)."""
+    x, acc = 0.5, 0.0
+    for _ in range(iterations):
+        x = x * 1.000001 + 0.000001
+        acc += x * x / (1.0 + x)
+    return acc
+
+
+def run_cpu_kernels(duration=BENCH_CPU_SECONDS, chunk=20_000):
+    """
+    Ejecuta cada kernel durante la mitad del tiempo indicado.
+
+    Returns:
+        tuple: (millones de operaciones enteras/s, millones flotantes/s)
+    """
+    rates = []
+    for kernel in (integer_kernel, float_kernel):
+        done, start = 0, time.perf_counter()
+        deadline = start + duration / 2
+        while time.perf_counter() < deadline:
+            kernel(chunk)
+            done += chunk
+        rates.append(done / (time.perf_counter() - start) / 1e6)
+    return tuple(rates)
+
+
+_start_barrier = None
+
+
+def set_start_barrier(barrier):
+    """Inicializador de los procesos de carga: guarda la barrera de inicio."""
+    global _start_barrier
+    _start_barrier = barrier
+
+
+def wait_start_barrier(barrier):
+    """Espera a los demás participantes; si alguno no llega se sigue igual."""
+    try:
+        barrier.wait(BENCH_START_TIMEOUT)
+    except threading.BrokenBarrierError:
+        pass
+
+
+def run_cpu_kernels_synced(duration=BENCH_CPU_SECONDS):
+    """run_cpu_kernels una vez que todos los procesos de carga arrancaron."""
+    if _start_barrier is not None:
+        wait_start_barrier(_start_barrier)
+    return run_cpu_kernels(duration)
+
+
+def start_load_pool(workers):
+    """
+    Procesos de carga que empiezan a la vez.
+
+    Arrancar los procesos toma tiempo (en Windows cada uno vuelve a importar
+    el módulo); sin sincronizar, los primeros miden con el equipo a medio
+    cargar. Cada tarea run_cpu_kernels_synced espera en una barrera común
+    a la que también se suma el proceso principal.
+
+    Returns:
+        tuple: (ProcessPoolExecutor, barrera para el proceso principal)
+    """
+    barrier = multiprocessing.Barrier(workers + 1)
+    pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=set_start_barrier, initargs=(barrier,)
+    )
+    return pool, barrier
+
+
+def measure_memory_bandwidth(size_mb=BENCH_ARRAY_MB, repeats=BENCH_BANDWIDTH_REPEATS):
+    """
+    Ancho de banda de memoria con operaciones vectorizadas tipo STREAM.
+
+    Los bytes de cada kernel cuentan los arreglos que NumPy recorre de
+    verdad: el triad (a = b + escalar·c) se hace en dos pasadas, c → a y
+    luego a + b → a, es decir cinco arreglos.
+
+    Returns:
+        dict: copy, scale y triad en GB/s (mejor de las repeticiones)
+    """
+    n = size_mb * 1024**2 // 8
+    a = np.full(n, 1.0)
+    b = np.full(n, 2.0)
+    c = np.zeros(n)
+    scalar = 3.0
+    kernels = {
+        "mem_copy": (lambda: np.copyto(c, a), 2),
+        "mem_scale": (lambda: np.multiply(c, scalar, out=b), 2),
+        "mem_triad": (lambda: np.add(b, np.multiply(c, scalar, out=a), out=a), 5),
+    }
+    results = {}
+    for name, (kernel, arrays) in kernels.items():
+        best = float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            kernel()
+            best = min(best, time.perf_counter() - start)
+        results[name] = arrays * n * 8 / best / 1e9
+    return results
+
+
+def build_pointer_chain(entries, seed=1234):
+    """Permutación cíclica aleatoria (algoritmo de Sattolo) para recorrer."""
+    order = np.random.default_rng(seed).permutation(entries)
+    chain = np.empty(entries, dtype=np.int64)
+    chain[order] = np.roll(order, -1)
+    return chain
+
+
+def chase(chain, steps):
+    """Recorre la cadena de punteros y retorna segundos transcurridos."""
+    index = 0
+    start = time.perf_counter()
+    for _ in range(steps):
+        index = chain[index]
+    return time.perf_counter() - start
+
+
+def measure_memory_latency(size_mb=BENCH_CHASE_MB, steps=BENCH_CHASE_STEPS):
+    """
+    Latencia de memoria por persecución de punteros.
+
+    El costo del intérprete se descuenta recorriendo una cadena que cabe en
+    caché L1 con el mismo número de pasos.
+
+    Returns:
+        float: nanosegundos por acceso
+    """
+    large = build_pointer_chain(size_mb * 1024**2 // 8)
+    small = build_pointer_chain(512)
+    overhead = chase(small, steps)
+    elapsed = chase(large, steps)
+    return max(elapsed - overhead, 0) / steps * 1e9
+
+
+def score_metric(name, value):
+    """Normaliza una métrica a puntos (1000 = equipo de referencia)."""
+    _, _, reference, higher_is_better = BENCHMARK_METRICS[name]
+    if not value:
+        return 0
+    ratio = value / reference if higher_is_better else reference / value
+    return round(1000 * ratio)
+
+
+def run_benchmark(progress=None):
+    """
+    Ejecuta el benchmark completo de CPU y memoria (~20 s).
+
+    Args:
+        progress: función opcional que recibe mensajes de avance
+
+    Returns:
+        dict: timestamp, métricas, puntajes y puntaje global
+    """
+    progress = progress or (lambda msg: None)
+    metrics = {}
+
+    progress("CPU de un núcleo...")
+    metrics["cpu_int_single"], metrics["cpu_float_single"] = run_cpu_kernels()
+
+    workers = psutil.cpu_count() or 1
+    progress(f"CPU en {workers} núcleos...")
+    pool, barrier = start_load_pool(workers)
+    with pool:
+        futures = [pool.submit(run_cpu_kernels_synced) for _ in range(workers)]
+        wait_start_barrier(barrier)
+        rates = [future.result() for future in futures]
+    metrics["cpu_int_multi"] = sum(r[0] for r in rates)
+    metrics["cpu_float_multi"] = sum(r[1] for r in rates)
+
+    progress("Ancho de banda de memoria...")
+    metrics.update(measure_memory_bandwidth())
+
+    progress("Latencia de memoria...")
+    metrics["mem_latency"] = measure_memory_latency()
+
+    scores = {name: score_metric(name, value) for name, value in metrics.items()}
+    positive = [score for score in scores.values() if score > 0]
+    overall = round(float(np.exp(np.mean(np.log(positive))))) if positive else 0
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "metrics": {name: round(value, 2) for name, value in metrics.items()},
+        "scores": scores,
+        "overall": overall,
+    }
+
+
+def benchmark_history_path(fixed_asset, kind=None):
+    """Archivo de historial de una placa (kind separa otras mediciones)."""
+    name = re.sub(r"[^A-Za-z0-9_-]", "_", fixed_asset)
+    return BENCHMARK_DIR / (f"{name}_{kind}.json" if kind else f"{name}.json")
+
+
+def load_benchmark_history(fixed_asset, kind=None):
+    """Carga las ejecuciones anteriores del benchmark para una placa."""
+    try:
+        with open(benchmark_history_path(fixed_asset, kind), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_benchmark_result(fixed_asset, result, kind=None):
+    """
+    Agrega un resultado al historial de la placa.
+
+    Returns:
+        dict | None: ejecución anterior para comparar, si existe
+    """
+    history = load_benchmark_history(fixed_asset, kind)
+    previous = history[-1] if history else None
+    history = (history + [result])[-BENCHMARK_HISTORY:]
+    try:
+        BENCHMARK_DIR.mkdir(parents=True, exist_ok=True)
+        with open(benchmark_history_path(fixed_asset, kind), "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+    except OSError:
+        pass
+    return previous
+
+
+def describe_benchmark(result, previous=None):
+    """Genera las líneas del informe con el benchmark y la comparación."""
+    if not result:
+        return []
+    lines = []
+    if previous:
+        change = (result["overall"] - previous["overall"]) / max(previous["overall"], 1) * 100
+        lines.append(
+            f"Puntaje global: {result['overall']} (anterior {previous['overall']} "
+            f"del {previous['timestamp'][:10]}, {change:+.0f}%)"
+        )
+    else:
+        lines.append(f"Puntaje global: {result['overall']} (primera medición de esta placa)")
+
+    for name, value in result["metrics"].items():
+        label, unit, _, _ = BENCHMARK_METRICS[name]
+        line = f"{label}: {value:.1f} {unit} ({result['scores'][name]} pts)"
+        if previous and name in previous.get("scores", {}):
+            line += f" | anterior {previous['scores'][name]} pts"
+        lines.append(line)
+    return lines
+
+
+# ============================================================================
+# BENCHMARK DE ALMACENAMIENTO
+# ============================================================================
+
+
+def open_unbuffered(path):
+    """
+    Abre un archivo para lectura/escritura evitando la caché del sistema.
+
+    En Windows usa FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH y en
+    Linux O_DIRECT. Si el sistema de archivos no lo admite se abre normal.
+    Las lecturas y escrituras deben usar búferes alineados (aligned_buffer)
+    y desplazamientos múltiplos de 4 KB.
+
+    Returns:
+        tuple: (archivo binario sin búfer, True si se evita la caché)
+    """
+    if sys.platform == "win32":
+        import msvcrt
+
+        kernel32 = ctypes.windll.kernel32
+        kernel32.CreateFileW.restype = ctypes.c_void_p
+        handle = kernel32.CreateFileW(
+            str(path),
+            0x80000000 | 0x40000000,  # GENERIC_READ | GENERIC_WRITE
+            0x1 | 0x2,  # FILE_SHARE_READ | FILE_SHARE_WRITE
+            None,
+            4,  # OPEN_ALWAYS
+            0x20000000 | 0x80000000,  # FILE_FLAG_NO_BUFFERING | WRITE_THROUGH
+            None,
+        )
+        if handle not in (None, ctypes.c_void_p(-1).value):
+            fd = msvcrt.open_osfhandle(handle, os.O_RDWR | os.O_BINARY)
+            return open(fd, "r+b", buffering=0), True
+    elif hasattr(os, "O_DIRECT"):
+        try:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_DIRECT, 0o600)
+            return open(fd, "r+b", buffering=0), True
+        except OSError as e:
+            if e.errno != errno.EINVAL:
+                raise
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o600)
+    return open(fd, "r+b", buffering=0), False
+
+
+def aligned_buffer(size):
+    """Búfer alineado a página (requisito de la E/S sin caché)."""
+    return mmap.mmap(-1, size)
+
+
+def latency_percentiles(latencies):
+    """Percentiles de latencia en milisegundos."""
+    if not latencies:
+        return {}
+    values = np.array(latencies) * 1000
+    return {f"p{p}": round(float(np.percentile(values, p)), 3) for p in (50, 95, 99)}
+
+
+def run_random_io(path, blocks, write, workers, duration):
+    """
+    E/S aleatoria de 4 KB con profundidad de cola = número de hilos.
+
+    Cada hilo usa su propio descriptor y búfer alineado; las llamadas de E/S
+    liberan el GIL, así que las solicitudes quedan realmente en paralelo.
+
+    Returns:
+        tuple: (IOPS, lista de latencias en segundos)
+    """
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(seed):
+        rng = np.random.default_rng(seed)
+        handle, _ = open_unbuffered(path)
+        buffer = aligned_buffer(STORAGE_RANDOM_BLOCK)
+        buffer.write(os.urandom(STORAGE_RANDOM_BLOCK))
+        view = memoryview(buffer)
+        local = []
+        try:
+            while time.perf_counter() < deadline:
+                for block in rng.integers(0, blocks, 256):
+                    start = time.perf_counter()
+                    handle.seek(int(block) * STORAGE_RANDOM_BLOCK)
+                    if write:
+                        handle.write(view)
+                    else:
+                        handle.readinto(view)
+                    local.append(time.perf_counter() - start)
+        finally:
+            view.release()
+            buffer.close()
+            handle.close()
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(latencies) / (time.perf_counter() - start), latencies
+
+
+def benchmark_storage_path(directory, max_mb=None):
+    """
+    Mide un volumen con un archivo temporal en el directorio indicado.
+
+    El archivo nunca supera max_mb ni el 10 % del espacio libre y se elimina
+    al terminar pase lo que pase (también los restos de ejecuciones previas).
+
+    Returns:
+        dict: MB/s secuenciales, IOPS 4K (QD1 y QDn) y percentiles de latencia
+    """
+    directory = Path(directory)
+    for stale in directory.glob(f"{STORAGE_BENCH_PREFIX}*.tmp"):
+        try:
+            stale.unlink()
+        except OSError:
+            pass
+
+    free_mb = psutil.disk_usage(str(directory)).free // 1024**2
+    size_mb = min(max_mb or STORAGE_BENCH_MAX_MB, free_mb // 10)
+    size_mb -= size_mb % (STORAGE_SEQ_BLOCK // 1024**2)
+    if size_mb < STORAGE_BENCH_MIN_MB:
+        raise OSError(f"espacio libre insuficiente ({free_mb} MB)")
+
+    path = directory / f"{STORAGE_BENCH_PREFIX}{os.getpid()}.tmp"
+    size = size_mb * 1024**2
+    result = {"directory": str(directory), "file_mb": size_mb}
+    try:
+        handle, bypass = open_unbuffered(path)
+        result["cache_bypass"] = bypass
+        buffer = aligned_buffer(STORAGE_SEQ_BLOCK)
+        buffer.write(os.urandom(STORAGE_SEQ_BLOCK))  # Datos no comprimibles
+        view = memoryview(buffer)
+        try:
+            start = time.perf_counter()
+            for _ in range(size // STORAGE_SEQ_BLOCK):
+                handle.write(view)
+            os.fsync(handle.fileno())
+            result["seq_write_mbs"] = round(size_mb / (time.perf_counter() - start), 1)
+
+            handle.seek(0)
+            start = time.perf_counter()
+            for _ in range(size // STORAGE_SEQ_BLOCK):
+                handle.readinto(view)
+            result["seq_read_mbs"] = round(size_mb / (time.perf_counter() - start), 1)
+        finally:
+            view.release()
+            buffer.close()
+            handle.close()
+
+        blocks = size // STORAGE_RANDOM_BLOCK
+        result["queue_depth"] = STORAGE_QUEUE_DEPTH
+        result["latency_ms"] = {}
+        for write in (False, True):
+            kind = "write" if write else "read"
+            for depth in (1, STORAGE_QUEUE_DEPTH):
+                iops, latencies = run_random_io(
+                    path, blocks, write, depth, STORAGE_RANDOM_SECONDS
+                )
+                suffix = "qd1" if depth == 1 else "qdn"
+                result[f"rand_{kind}_iops_{suffix}"] = round(iops)
+                result["latency_ms"][f"{kind}_{suffix}"] = latency_percentiles(latencies)
+    finally:
+        try:
+            path.unlink()
+        except OSError:
+            pass
+    return result
+
+
+def get_benchmark_directories():
+    """
+    Directorio de prueba por cada volumen fijo que respondió a tiempo.
+
+    En la unidad del sistema se usa la carpeta temporal; en las demás, la raíz.
+    """
+    system_drive = os.environ.get("SystemDrive", "C:").upper()
+    mountpoints = {p.device: p.mountpoint for p in psutil.disk_partitions(all=False)}
+    directories = []
+    for disk in get_disk_info():
+        if disk["type"] != "fixed" or disk["status"] != "ok":
+            continue
+        if disk["drive"].upper().startswith(system_drive):
+            directories.append((disk["drive"], tempfile.gettempdir()))
+        elif disk["drive"] in mountpoints:
+            directories.append((disk["drive"], mountpoints[disk["drive"]]))
+    return directories
+
+
+def run_storage_benchmark(directories=None, progress=None):
+    """
+    Ejecuta el benchmark de almacenamiento en cada volumen fijo.
+
+    Args:
+        directories: lista de (volumen, directorio); por defecto los fijos
+        progress: función opcional que recibe mensajes de avance
+
+    Returns:
+        list: resultado por volumen (o {"volume", "error"} si no se pudo medir)
+    """
+    progress = progress or (lambda msg: None)
+    results = []
+    for volume, directory in directories or get_benchmark_directories():
+        progress(f"Midiendo {volume}...")
+        try:
+            result = benchmark_storage_path(directory)
+            results.append({"volume": volume, **result})
+        except Exception as e:
+            results.append({"volume": volume, "error": str(e)})
+    return results
+
+
+def describe_storage_benchmark(results):
+    """Genera las líneas del informe con el benchmark de almacenamiento."""
+    lines = []
+    for result in results or []:
+        if "error" in result:
+            lines.append(f"{result['volume']}: no se pudo medir ({result['error']})")
+            continue
+        cache = "sin caché" if result["cache_bypass"] else "con caché del sistema"
+        lines.append(
+            f"{result['volume']}: secuencial lectura {result['seq_read_mbs']} MB/s | "
+            f"escritura {result['seq_write_mbs']} MB/s ({result['file_mb']} MB, {cache})"
+        )
+        lines.append(
+            f"   4K aleatorio QD1: lectura {result['rand_read_iops_qd1']} IOPS | "
+            f"escritura {result['rand_write_iops_qd1']} IOPS"
+        )
+        lines.append(
+            f"   4K aleatorio QD{result['queue_depth']}: "
+            f"lectura {result['rand_read_iops_qdn']} IOPS | "
+            f"escritura {result['rand_write_iops_qdn']} IOPS"
+        )
+        latency = result["latency_ms"].get("read_qd1")
+        if latency:
+            lines.append(
+                f"   Latencia lectura QD1: p50 {latency['p50']} ms | "
+                f"p95 {latency['p95']} ms | p99 {latency['p99']} ms"
+            )
+    return lines
+
+
+def export_report_json(path, data):
+    """Guarda los datos del informe en JSON junto al PDF."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+
+
+# ============================================================================
+# DIAGNÓSTICO DE RED
+# ============================================================================
+
+
+def load_network_config():
+    """Configuración de red (destinos y servidor de rendimiento) con valores por defecto."""
+    config = dict(DEFAULT_NETWORK_CONFIG)
+    try:
+        with open(NETWORK_CONFIG_FILE, "r", encoding="utf-8") as f:
+            config.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return config
+
+
+def get_default_endpoints(config=None):
+    """
+    Destinos a medir: los configurados más el controlador de dominio actual.
+
+    Returns:
+        list: (nombre, host, puerto)
+    """
+    config = config or load_network_config()
+    endpoints = []
+    logon_server = os.environ.get("LOGONSERVER", "").lstrip("\\")
+    if logon_server and logon_server.upper() != socket.gethostname().upper():
+        endpoints.append(("Controlador de dominio", logon_server, 389))
+    for name, address in config["endpoints"]:
+        host, port = parse_host_port(address)
+        endpoints.append((name, host, port))
+    return endpoints
+
+
+def parse_host_port(address, default_port=443):
+    """Separa "host:puerto" (el puerto es opcional)."""
+    host, _, port = address.rpartition(":")
+    if not host:
+        return address, default_port
+    return host, int(port)
+
+
+def percentiles_ms(values):
+    """Percentiles p50/p95 y máximo de una lista de tiempos en ms."""
+    if not values:
+        return {}
+    array = np.array(values)
+    return {
+        "p50": round(float(np.percentile(array, 50)), 1),
+        "p95": round(float(np.percentile(array, 95)), 1),
+        "max": round(float(array.max()), 1),
+    }
+
+
+def measure_dns(host, samples=NETWORK_SAMPLES):
+    """
+    Tiempo de resolución DNS. La primera consulta suele no estar en caché.
+
+    Returns:
+        dict: first_ms, percentiles y dirección resuelta (o error)
+    """
+    timings = []
+    address = None
+    for _ in range(samples):
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        except OSError as e:
+            return {"error": str(e)}
+        timings.append((time.perf_counter() - start) * 1000)
+        address = infos[0][4][0]
+    return {"address": address, "first_ms": round(timings[0], 1), **percentiles_ms(timings)}
+
+
+def measure_tcp_connect(address, port, samples=NETWORK_SAMPLES, timeout=NETWORK_TIMEOUT):
+    """
+    Latencia de conexión TCP (handshake) contra una dirección ya resuelta.
+
+    Returns:
+        dict: percentiles en ms y número de intentos fallidos
+    """
+    timings, failures = [], 0
+    for _ in range(samples):
+        start = time.perf_counter()
+        try:
+            with socket.create_connection((address, port), timeout=timeout):
+                timings.append((time.perf_counter() - start) * 1000)
+        except OSError:
+            failures += 1
+    return {"failures": failures, **percentiles_ms(timings)}
+
+
+def probe_endpoint(name, host, port):
+    """DNS + latencia TCP de un destino."""
+    result = {"name": name, "host": host, "port": port, "dns": measure_dns(host)}
+    if "error" in result["dns"]:
+        result["tcp"] = {"failures": NETWORK_SAMPLES}
+        return result
+    result["tcp"] = measure_tcp_connect(result["dns"]["address"], port)
+    return result
+
+
+def measure_throughput(host, port, direction, size=THROUGHPUT_BYTES, duration=THROUGHPUT_SECONDS):
+    """
+    Rendimiento TCP contra el servidor incluido (--serve-throughput).
+
+    Se transfiere como máximo `size` bytes o durante `duration` segundos,
+    lo que ocurra primero.
+
+    Args:
+        direction: "upload" o "download"
+
+    Returns:
+        dict: bytes transferidos, segundos y Mbps
+    """
+    mode = b"U" if direction == "upload" else b"D"
+    chunk = b"\0" * THROUGHPUT_CHUNK
+    transferred = 0
+    with socket.create_connection((host, port), timeout=NETWORK_TIMEOUT) as sock:
+        sock.sendall(THROUGHPUT_MAGIC + mode + size.to_bytes(8, "big"))
+        start = time.perf_counter()
+        deadline = start + duration
+        if mode == b"U":
+            while transferred < size and time.perf_counter() < deadline:
+                transferred += sock.send(chunk[: size - transferred])
+            sock.shutdown(socket.SHUT_WR)
+            # El servidor confirma cuántos bytes recibió
+            received = recv_exact(sock, 8)
+            transferred = int.from_bytes(received, "big") if received else transferred
+        else:
+            while transferred < size and time.perf_counter() < deadline:
+                data = sock.recv(THROUGHPUT_CHUNK)
+                if not data:
+                    break
+                transferred += len(data)
+        elapsed = time.perf_counter() - start
+    return {
+        "bytes": transferred,
+        "seconds": round(elapsed, 2),
+        "mbps": round(transferred * 8 / max(elapsed, 1e-6) / 1e6, 1),
+    }
+
+
+def recv_exact(sock, size):
+    """Lee exactamente `size` bytes (o menos si la conexión se cierra)."""
+    data = b""
+    while len(data) < size:
+        part = sock.recv(size - len(data))
+        if not part:
+            break
+        data += part
+    return data
+
+
+class ThroughputHandler(socketserver.BaseRequestHandler):
+    """Atiende una prueba: recibe (U) o envía (D) la cantidad pedida de bytes."""
+
+    def handle(self):
+        header = recv_exact(self.request, len(THROUGHPUT_MAGIC) + 9)
+        if not header.startswith(THROUGHPUT_MAGIC):
+            return
+        mode = header[len(THROUGHPUT_MAGIC) : len(THROUGHPUT_MAGIC) + 1]
+        size = min(int.from_bytes(header[-8:], "big"), THROUGHPUT_MAX_BYTES)
+        try:
+            if mode == b"U":
+                received = 0
+                while True:
+                    data = self.request.recv(THROUGHPUT_CHUNK)
+                    if not data:
+                        break
+                    received += len(data)
+                self.request.sendall(received.to_bytes(8, "big"))
+            elif mode == b"D":
+                chunk = b"\0" * THROUGHPUT_CHUNK
+                sent = 0
+                while sent < size:
+                    sent += self.request.send(chunk[: size - sent])
+        except OSError:
+            pass  # El cliente cerró al cumplirse su tiempo límite
+
+
+class ThroughputServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def run_network_diagnostics(endpoints=None, throughput_server=None):
+    """
+    Mide todos los destinos en paralelo y, si hay servidor, el rendimiento.
+
+    Returns:
+        dict: "endpoints" (lista por destino) y "throughput" (o None)
+    """
+    config = load_network_config()
+    endpoints = endpoints if endpoints is not None else get_default_endpoints(config)
+    throughput_server = throughput_server or config.get("throughput_server")
+
+    results = {"endpoints": [], "throughput": None}
+    if endpoints:
+        with ThreadPoolExecutor(max_workers=len(endpoints)) as pool:
+            results["endpoints"] = list(pool.map(lambda e: probe_endpoint(*e), endpoints))
+
+    if throughput_server:
+        host, port = parse_host_port(throughput_server, THROUGHPUT_PORT)
+        try:
+            results["throughput"] = {
+                "server": throughput_server,
+                "download": measure_throughput(host, port, "download"),
+                "upload": measure_throughput(host, port, "upload"),
+            }
+        except OSError as e:
+            results["throughput"] = {"server": throughput_server, "error": str(e)}
+    return results
+
+
+def describe_network(results):
+    """Genera las líneas del informe con el diagnóstico de red."""
+    if not results:
+        return []
+    lines = []
+    for endpoint in results["endpoints"]:
+        target = f"{endpoint['name']} ({endpoint['host']}:{endpoint['port']})"
+        dns, tcp = endpoint["dns"], endpoint["tcp"]
+        if "error" in dns:
+            lines.append(f"{target}: no resuelve DNS")
+        elif "p50" not in tcp:
+            lines.append(f"{target}: sin conexión TCP (DNS {dns['first_ms']} ms)")
+        else:
+            lost = f", {tcp['failures']} fallidos" if tcp["failures"] else ""
+            lines.append(
+                f"{target}: TCP p50 {tcp['p50']} ms / p95 {tcp['p95']} ms{lost} | "
+                f"DNS {dns['first_ms']} ms"
+            )
+    throughput = results.get("throughput")
+    if throughput:
+        if "error" in throughput:
+            lines.append(f"Rendimiento contra {throughput['server']}: {throughput['error']}")
+        else:
+            lines.append(
+                f"Rendimiento contra {throughput['server']}: "
+                f"descarga {throughput['download']['mbps']} Mbps | "
+                f"subida {throughput['upload']['mbps']} Mbps"
+            )
+    return lines
+
+
+def describe_connectivity(results):
+    """Observación del informe sobre la conectividad medida."""
+    if not results or not results["endpoints"]:
+        return "• Conectividad de red: no se midió."
+    reachable = [e for e in results["endpoints"] if "p50" in e["tcp"]]
+    if len(reachable) == len(results["endpoints"]):
+        return f"• Conectividad de red verificada: {len(reachable)} destinos responden."
+    return (
+        f"• Conectividad de red parcial: {len(reachable)} de "
+        f"{len(results['endpoints'])} destinos responden."
+    )
+
+
+# ============================================================================
+# DETECCIÓN DE THROTTLING TÉRMICO
+# ============================================================================
+
+
+def get_throttle_thresholds(model):
+    """
+    Umbrales de throttling para un modelo de equipo.
+
+    Se combinan los valores por defecto, los de THROTTLE_MODEL_THRESHOLDS y
+    los de THROTTLE_CONFIG_FILE ({"models": {"Latitude 5420": {...}}}); la
+    clave se busca como subcadena del modelo detectado.
+    """
+    thresholds = dict(DEFAULT_THROTTLE_THRESHOLDS)
+    overrides = dict(THROTTLE_MODEL_THRESHOLDS)
+    try:
+        with open(THROTTLE_CONFIG_FILE, "r", encoding="utf-8") as f:
+            overrides.update(json.load(f).get("models", {}))
+    except (OSError, ValueError):
+        pass
+    for key, values in overrides.items():
+        if key.lower() in (model or "").lower():
+            thresholds.update(values)
+    return thresholds
+
+
+def read_frequency_sample():
+    """
+    Frecuencia actual (promedio y núcleo más lento) y temperatura.
+
+    Returns:
+        tuple: (MHz promedio, MHz mínimo entre núcleos, °C o NaN)
+    """
+    cores = [f.current for f in psutil.cpu_freq(percpu=True) or [] if f.current]
+    if not cores:
+        return float("nan"), float("nan"), read_cpu_temperature()
+    return sum(cores) / len(cores), min(cores), read_cpu_temperature()
+
+
+def start_performance_counter(seconds):
+    """
+    En Windows psutil reporta la frecuencia nominal; el rendimiento real se
+    lee con typeperf (% Processor Performance) en un único proceso.
+    """
+    if sys.platform != "win32":
+        return None
+    try:
+        return subprocess.Popen(
+            [
+                "typeperf",
+                r"\Processor Information(_Total)\% Processor Performance",
+                "-si",
+                "1",
+                "-sc",
+                str(int(seconds)),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            creationflags=subprocess.CREATE_NO_WINDOW,
+        )
+    except OSError:
+        return None
+
+
+def parse_performance_counter(output, base_mhz):
+    """Convierte la salida CSV de typeperf en frecuencias efectivas (MHz)."""
+    values = []
+    for line in output.splitlines()[1:]:
+        parts = line.replace('"', "").split(",")
+        try:
+            values.append(float(parts[1]) * base_mhz / 100)
+        except (IndexError, ValueError):
+            continue
+    return values
+
+
+def analyze_throttling(samples, interval, thresholds):
+    """
+    Busca caídas sostenidas de frecuencia bajo carga.
+
+    Se descartan los primeros THROTTLE_RAMP_SECONDS (la carga y el turbo aún
+    están subiendo). La referencia es la frecuencia de los segundos
+    siguientes (equipo aún frío); hay throttling si la frecuencia cae por
+    debajo de ese valor más del umbral durante al menos
+    `sustained_seconds`, o si la temperatura alcanza el límite del modelo.
+
+    Args:
+        samples: lista de (MHz promedio, MHz mínimo, °C)
+
+    Returns:
+        dict: referencia, mínimo, caída máxima, segundos sostenidos y veredicto
+    """
+    ramp = int(THROTTLE_RAMP_SECONDS / interval)
+    freqs = np.array([s[0] for s in samples[ramp:]], dtype=float)
+    temps = np.array([s[2] for s in samples], dtype=float)
+    valid = freqs[~np.isnan(freqs)]
+    if valid.size < 4:
+        return {"error": "el equipo no reporta la frecuencia de la CPU"}
+
+    warmup = max(1, int(THROTTLE_REFERENCE_SECONDS / interval))
+    reference = float(np.median(valid[:warmup]))
+    drops = np.clip(1 - valid / reference, 0, None) * 100
+    below = drops >= thresholds["freq_drop_percent"]
+
+    longest = current = 0
+    for flag in below:
+        current = current + 1 if flag else 0
+        longest = max(longest, current)
+    sustained = longest * interval
+
+    valid_temps = temps[~np.isnan(temps)]
+    max_temp = float(valid_temps.max()) if valid_temps.size else None
+    throttled = sustained >= thresholds["sustained_seconds"] or (
+        max_temp is not None and max_temp >= thresholds["temp_limit"]
+    )
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "reference_mhz": round(reference),
+        "mean_mhz": round(float(valid.mean())),
+        "min_mhz": round(float(valid.min())),
+        "max_drop_percent": round(float(drops.max()), 1),
+        "sustained_seconds": round(sustained, 1),
+        "max_temp": round(max_temp, 1) if max_temp is not None else None,
+        "throttled": bool(throttled),
+        "thresholds": thresholds,
+    }
+
+
+def run_throttle_test(
+    model,
+    duration=THROTTLE_LOAD_SECONDS,
+    interval=THROTTLE_SAMPLE_INTERVAL,
+    sample=read_frequency_sample,
+    progress=None,
+):
+    """
+    Aplica carga en todos los núcleos y muestrea frecuencia y temperatura.
+
+    La carga son los mismos kernels del benchmark de CPU, uno por núcleo; el
+    muestreo empieza cuando todos los procesos de carga arrancaron.
+
+    Returns:
+        dict: resultado de analyze_throttling más el modelo evaluado
+    """
+    progress = progress or (lambda msg: None)
+    thresholds = get_throttle_thresholds(model)
+    workers = psutil.cpu_count() or 1
+    base = psutil.cpu_freq()
+
+    progress(f"Carga en {workers} núcleos durante {duration:.0f} s...")
+    samples = []
+    pool, barrier = start_load_pool(workers)
+    with pool:
+        futures = [pool.submit(run_cpu_kernels_synced, duration) for _ in range(workers)]
+        wait_start_barrier(barrier)
+        counter = start_performance_counter(duration)
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            samples.append(sample())
+            time.sleep(interval)
+        wait(futures)
+
+    if sys.platform == "win32":
+        # psutil solo conoce la frecuencia nominal en Windows: sin typeperf
+        # no hay medición real y el resultado sería siempre "sin throttling"
+        effective = []
+        if counter is not None and base and base.current:
+            try:
+                output, _ = counter.communicate(timeout=10)
+            except subprocess.TimeoutExpired:
+                counter.kill()
+                output = ""
+            effective = parse_performance_counter(output, base.current)
+        if not effective:
+            return {
+                "error": "typeperf no entregó el rendimiento real del procesador",
+                "model": model,
+            }
+        # Una lectura por segundo: se reemplaza la frecuencia nominal
+        temps = [s[2] for s in samples][:: max(1, int(1 / interval))]
+        temps += [float("nan")] * (len(effective) - len(temps))
+        samples = [(f, f, t) for f, t in zip(effective, temps)]
+        interval = 1.0
+
+    result = analyze_throttling(samples, interval, thresholds)
+    result["model"] = model
+    return result
+
+
+def describe_throttle_run(result):
+    """Resumen de una medición de throttling."""
+    temp = f", máx. {result['max_temp']}°C" if result.get("max_temp") is not None else ""
+    verdict = "CON throttling" if result["throttled"] else "sin throttling"
+    return (
+        f"{result['timestamp'][:10]}: {result['mean_mhz']} MHz promedio "
+        f"(inicio {result['reference_mhz']} MHz, caída máx. {result['max_drop_percent']}%, "
+        f"sostenida {result['sustained_seconds']} s{temp}) → {verdict}"
+    )
+
+
+def describe_throttling(result, previous=None):
+    """Líneas del informe con el throttling antes/después del mantenimiento."""
+    if not result:
+        return []
+    if "error" in result:
+        return [f"No se pudo evaluar: {result['error']}"]
+    lines = []
+    if previous and "error" not in previous:
+        lines.append(f"Antes: {describe_throttle_run(previous)}")
+        lines.append(f"Después: {describe_throttle_run(result)}")
+        if previous["throttled"] and not result["throttled"]:
+            lines.append("El throttling desapareció después del mantenimiento.")
+        elif result["throttled"]:
+            lines.append("El throttling persiste: revisar ventilación, pasta térmica y perfil de energía.")
+    else:
+        lines.append(describe_throttle_run(result))
+    thresholds = result["thresholds"]
+    lines.append(
+        f"Umbrales del modelo {result.get('model', '')}: caída ≥ {thresholds['freq_drop_percent']}% "
+        f"durante {thresholds['sustained_seconds']} s o ≥ {thresholds['temp_limit']}°C"
+    )
+    return lines
+
+
+# ============================================================================
+# REGISTRO DE EVENTOS DE WINDOWS
+# ============================================================================
+
+
+def build_event_xpath(days=EVENT_DAYS, providers=EVENT_WATCHED_PROVIDERS):
+    """
+    Filtro XPath evaluado por el propio servicio de eventos.
+
+    Selecciona los eventos críticos y de error de los últimos `days` días y,
+    de los proveedores vigilados (disco, WHEA, Kernel-Power...), también las
+    advertencias.
+    """
+    milliseconds = int(days * 86400 * 1000)
+    watched = " or ".join(f"@Name='{name}'" for name in providers)
+    return (
+        f"*[System[TimeCreated[timediff(@SystemTime) <= {milliseconds}]"
+        f" and ((Level=1 or Level=2) or (Provider[{watched}] and Level=3))]]"
+    )
+
+
+def parse_event_element(element, log=None):
+    """Convierte un elemento <Event> en un diccionario compacto."""
+    system = element.find(f"{EVENT_NS}System")
+    if system is None:
+        return None
+    provider = system.find(f"{EVENT_NS}Provider")
+    created = system.find(f"{EVENT_NS}TimeCreated")
+    data = {}
+    event_data = element.find(f"{EVENT_NS}EventData")
+    if event_data is not None:
+        for index, item in enumerate(event_data):
+            data[item.get("Name") or str(index)] = (item.text or "").strip()
+    message = element.find(f"{EVENT_NS}RenderingInfo/{EVENT_NS}Message")
+    return {
+        "log": log or (system.findtext(f"{EVENT_NS}Channel") or ""),
+        "provider": provider.get("Name", "") if provider is not None else "",
+        "event_id": int(system.findtext(f"{EVENT_NS}EventID") or 0),
+        "level": int(system.findtext(f"{EVENT_NS}Level") or 0),
+        "time": created.get("SystemTime", "") if created is not None else "",
+        "data": data,
+        "message": " ".join((message.text or "").split()) if message is not None else "",
+    }
+
+
+def parse_event_stream(chunks, log=None, state=None):
+    """
+    Analiza de forma incremental una secuencia de eventos XML.
+
+    Acepta la salida de wevtutil (eventos sin elemento raíz) o una
+    exportación con raíz <Events>. Cada evento se libera apenas se procesa,
+    así que la memoria no crece con el tamaño del registro. Si el XML queda
+    cortado (wevtutil terminado por plazo) se detiene sin error conservando
+    los eventos ya entregados y marca state["truncated"].
+
+    Args:
+        chunks: iterable de bloques de texto o bytes
+        state: diccionario opcional donde se informa el truncamiento
+
+    Yields:
+        dict: evento (ver parse_event_element)
+    """
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    parser.feed("<PQNEvents>")
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    containers = []
+    first = True
+    for chunk in itertools.chain(chunks, [None]):
+        if chunk is None:
+            text = decoder.decode(b"", final=True) + "</PQNEvents>"
+        else:
+            text = decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if first:
+                # Quitar la declaración XML de las exportaciones
+                text = re.sub(r"^\ufeff?\s*<\?xml[^>]*\?>", "", text)
+                first = False
+        try:
+            parser.feed(text)
+            for event, element in parser.read_events():
+                if event == "start":
+                    if element.tag in ("PQNEvents", "Events"):
+                        containers.append(element)
+                elif element.tag == f"{EVENT_NS}Event":
+                    parsed = parse_event_element(element, log)
+                    if parsed:
+                        yield parsed
+        except ElementTree.ParseError:
+            if state is not None:
+                state["truncated"] = True
+            return
+        # Soltar del árbol los eventos ya procesados
+        for container in containers:
+            del container[:]
+
+
+def query_events(log, xpath, max_events=EVENT_MAX_EVENTS, timeout=EVENT_QUERY_TIMEOUT, state=None):
+    """
+    Consulta un registro con wevtutil y entrega los eventos a medida que llegan.
+
+    Al terminar, state (si se indica) recibe "events" (cantidad leída),
+    "truncated" (la consulta se cortó por plazo o el XML quedó incompleto)
+    y "capped" (se alcanzó max_events: hay más eventos que los contados).
+
+    Yields:
+        dict: evento (los más recientes primero)
+    """
+    state = {} if state is None else state
+    state.update(events=0, truncated=False, capped=False)
+    process = subprocess.Popen(
+        [
+            "wevtutil",
+            "qe",
+            log,
+            f"/q:{xpath}",
+            "/f:RenderedXml",
+            "/rd:true",
+            f"/c:{max_events}",
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        creationflags=subprocess.CREATE_NO_WINDOW,
+    )
+    expired = threading.Event()
+
+    def expire():
+        expired.set()
+        process.kill()
+
+    timer = threading.Timer(timeout, expire)
+    timer.start()
+    try:
+        chunks = iter(lambda: process.stdout.read(64 * 1024), b"")
+        for event in parse_event_stream(chunks, log, state):
+            state["events"] += 1
+            yield event
+    finally:
+        timer.cancel()
+        state["truncated"] = state["truncated"] or expired.is_set()
+        state["capped"] = state["events"] >= max_events
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+
+def aggregate_events(events):
+    """
+    Agrupa eventos por registro, proveedor e ID.
+
+    Returns:
+        list: grupos ordenados por número de eventos (mayor primero)
+    """
+    groups = {}
+    for event in events:
+        key = (event["log"], event["provider"], event["event_id"])
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                "log": event["log"],
+                "provider": event["provider"],
+                "event_id": event["event_id"],
+                "level": event["level"],
+                "count": 0,
+                "first": event["time"],
+                "last": event["time"],
+                "message": event["message"][:160],
+            }
+        group["count"] += 1
+        group["level"] = min(group["level"], event["level"])
+        group["first"] = min(group["first"], event["time"])
+        group["last"] = max(group["last"], event["time"])
+    return sorted(groups.values(), key=lambda g: (-g["count"], g["level"]))
+
+
+def collect_event_summary(logs=EVENT_LOGS, days=EVENT_DAYS):
+    """
+    Resume los eventos críticos/de error de los registros indicados.
+
+    Los registros cuya lectura se cortó por plazo (truncated) o que llegaron
+    al límite de EVENT_MAX_EVENTS (capped) se informan: sus totales son un
+    mínimo, no el total real.
+
+    Returns:
+        dict: días, totales por nivel, grupos, registros que fallaron y
+        registros truncados o con el límite alcanzado
+    """
+    xpath = build_event_xpath(days)
+    groups, failed, truncated, capped = [], [], [], []
+    for log in logs:
+        state = {}
+        try:
+            groups.extend(aggregate_events(query_events(log, xpath, state=state)))
+        except Exception as e:
+            failed.append(f"{log}: {e}")
+            continue
+        if state["truncated"]:
+            truncated.append(log)
+        if state["capped"]:
+            capped.append(log)
+    groups.sort(key=lambda g: (-g["count"], g["level"]))
+    totals = {
+        name: sum(g["count"] for g in groups if g["level"] == level)
+        for level, name in EVENT_LEVEL_NAMES.items()
+    }
+    return {
+        "days": days,
+        "totals": totals,
+        "groups": groups,
+        "failed": failed,
+        "truncated": truncated,
+        "capped": capped,
+    }
+
+
+def describe_events(summary, top=EVENT_TOP_OFFENDERS):
+    """Líneas del informe con los eventos más frecuentes."""
+    if not summary:
+        return []
+    partial = summary.get("truncated", []) + summary.get("capped", [])
+    lines = [
+        f"Últimos {summary['days']} días: {'al menos ' if partial else ''}"
+        f"{summary['totals']['critical']} críticos, "
+        f"{summary['totals']['error']} errores, {summary['totals']['warning']} advertencias "
+        "de proveedores vigilados"
+    ]
+    for group in summary["groups"][:top]:
+        level = EVENT_LEVEL_LABELS.get(group["level"], "Evento")
+        line = (
+            f"{level} {group['provider']} ID {group['event_id']} ({group['log']}): "
+            f"{group['count']} veces, último {group['last'][:10]}"
+        )
+        if group["message"]:
+            line += f" - {group['message'][:60]}"
+        lines.append(line)
+    for failure in summary["failed"]:
+        lines.append(f"No se pudo leer {failure}")
+    for log in summary.get("truncated", []):
+        lines.append(f"{log}: lectura interrumpida por tiempo, totales parciales")
+    for log in summary.get("capped", []):
+        lines.append(f"{log}: se alcanzó el límite de {EVENT_MAX_EVENTS} eventos, hay más")
+    return lines
+
+
+def describe_event_health(summary):
+    """Observación del informe sobre el estado de los registros de eventos."""
+    if not summary or (summary["failed"] and not summary["groups"]):
+        return "• Registros de eventos: no se pudieron consultar."
+    critical = summary["totals"]["critical"]
+    errors = summary["totals"]["error"]
+    if not critical and not errors and summary.get("truncated"):
+        return "• Registros de eventos: la lectura no terminó a tiempo, resultado incompleto."
+    if not critical and not errors:
+        return (
+            f"• Sin errores críticos en los registros de eventos de los últimos "
+            f"{summary['days']} días."
+        )
+    at_least = "al menos " if summary.get("truncated") or summary.get("capped") else ""
+    return (
+        f"• Registros de eventos: {at_least}{critical} críticos y {errors} errores en los "
+        f"últimos {summary['days']} días (ver detalle)."
+    )
+
+
+# ============================================================================
+# RENDIMIENTO DE ARRANQUE Y APAGADO
+# ============================================================================
+
+
+def event_ms(event, field):
+    """Valor numérico (ms) de un campo del evento, 0 si no existe."""
+    try:
+        return int(event["data"].get(field) or 0)
+    except ValueError:
+        return 0
+
+
+def analyze_boot_events(events, last_boots=BOOT_HISTORY):
+    """
+    Resume arranques, apagados y causas de demora de los eventos 100-110 y 200-203.
+
+    Solo se consideran las demoras ocurridas desde el más antiguo de los
+    últimos `last_boots` arranques.
+
+    Returns:
+        dict: arranques, apagados, tendencia y responsables ordenados por
+        demora acumulada
+    """
+    boots, shutdowns, delays = [], [], []
+    for event in events:
+        if event["event_id"] == 100:
+            boots.append(
+                {
+                    "time": event["time"],
+                    "boot_ms": event_ms(event, "BootTime"),
+                    "main_path_ms": event_ms(event, "MainPathBootTime"),
+                    "post_boot_ms": event_ms(event, "BootPostBootTime"),
+                    "degraded": event["data"].get("BootIsDegradation", "").lower() == "true",
+                }
+            )
+        elif event["event_id"] == 200:
+            shutdowns.append({"time": event["time"], "shutdown_ms": event_ms(event, "ShutdownTime")})
+        elif event["event_id"] in BOOT_DELAY_KINDS:
+            delays.append(event)
+
+    boots = sorted(boots, key=lambda b: b["time"])[-last_boots:]
+    shutdowns = sorted(shutdowns, key=lambda s: s["time"])[-last_boots:]
+    since = boots[0]["time"] if boots else ""
+
+    offenders = {}
+    for event in delays:
+        if event["time"] < since:
+            continue
+        kind = BOOT_DELAY_KINDS[event["event_id"]]
+        name = event["data"].get("FriendlyName") or event["data"].get("Name") or "Desconocido"
+        key = (kind, name)
+        item = offenders.setdefault(
+            key,
+            {"kind": kind, "name": name, "file": event["data"].get("Name", ""), "count": 0, "total_ms": 0, "max_ms": 0},
+        )
+        degradation = event_ms(event, "DegradationTime") or event_ms(event, "TotalTime")
+        item["count"] += 1
+        item["total_ms"] += degradation
+        item["max_ms"] = max(item["max_ms"], degradation)
+
+    return {
+        "boots": boots,
+        "shutdowns": shutdowns,
+        "trend": boot_trend([b["boot_ms"] for b in boots]),
+        "offenders": sorted(offenders.values(), key=lambda o: -o["total_ms"]),
+    }
+
+
+def boot_trend(durations):
+    """
+    Tendencia de la duración de arranque (regresión lineal por arranque).
+
+    Returns:
+        dict: promedio, mediana, último, pendiente (ms por arranque) y dirección
+    """
+    if not durations:
+        return {}
+    values = np.array(durations, dtype=float)
+    slope = float(np.polyfit(np.arange(values.size), values, 1)[0]) if values.size >= 3 else 0.0
+    mean = float(values.mean())
+    if abs(slope) < mean * BOOT_TREND_TOLERANCE:
+        direction = "estable"
+    else:
+        direction = "empeorando" if slope > 0 else "mejorando"
+    return {
+        "mean_ms": round(mean),
+        "median_ms": round(float(np.median(values))),
+        "last_ms": int(values[-1]),
+        "slope_ms": round(slope),
+        "direction": direction,
+    }
+
+
+def collect_boot_performance(last_boots=BOOT_HISTORY):
+    """
+    Lee el registro Diagnostics-Performance y analiza los arranques.
+
+    Los eventos llegan del más reciente al más antiguo: si la lectura se
+    cortó por plazo (truncated) o llegó a BOOT_MAX_EVENTS (capped) el
+    análisis cubre solo los arranques más recientes y se indica en el
+    resultado.
+    """
+    state = {}
+    try:
+        events = query_events(BOOT_LOG, BOOT_EVENT_XPATH, max_events=BOOT_MAX_EVENTS, state=state)
+        result = analyze_boot_events(events, last_boots)
+    except Exception as e:
+        return {"error": str(e)}
+    result["truncated"] = state["truncated"]
+    result["capped"] = state["capped"]
+    return result
+
+
+def describe_boot_performance(result, top=BOOT_TOP_OFFENDERS):
+    """Líneas del informe con el rendimiento de arranque y apagado."""
+    if not result:
+        return []
+    if "error" in result:
+        return [f"No se pudo leer el registro de rendimiento: {result['error']}"]
+    if not result["boots"]:
+        if result.get("truncated"):
+            return ["La lectura del registro de rendimiento no terminó a tiempo."]
+        return ["Windows no registró mediciones de arranque en este equipo."]
+
+    boots, trend = result["boots"], result["trend"]
+    main_path = np.mean([b["main_path_ms"] for b in boots]) / 1000
+    post_boot = np.mean([b["post_boot_ms"] for b in boots]) / 1000
+    degraded = sum(1 for b in boots if b["degraded"])
+    lines = [
+        f"Últimos {len(boots)} arranques: promedio {trend['mean_ms'] / 1000:.1f} s "
+        f"(ruta principal {main_path:.1f} s, post-arranque {post_boot:.1f} s)",
+        f"Último arranque: {trend['last_ms'] / 1000:.1f} s | tendencia: {trend['direction']} "
+        f"({trend['slope_ms'] / 1000:+.1f} s por arranque) | degradados: {degraded} de {len(boots)}",
+    ]
+    if result["shutdowns"]:
+        shutdown = np.mean([s["shutdown_ms"] for s in result["shutdowns"]]) / 1000
+        lines.append(f"Apagado: promedio {shutdown:.1f} s en {len(result['shutdowns'])} apagados")
+    for offender in result["offenders"][:top]:
+        lines.append(
+            f"{offender['kind'].capitalize()} {offender['name'][:45]}: "
+            f"{offender['total_ms'] / 1000:.1f} s acumulados en {offender['count']} eventos "
+            f"(máx. {offender['max_ms'] / 1000:.1f} s)"
+        )
+    if result.get("truncated"):
+        lines.append("Lectura interrumpida por tiempo: solo se analizaron los eventos más recientes")
+    elif result.get("capped"):
+        lines.append(
+            f"Se alcanzó el límite de {BOOT_MAX_EVENTS} eventos: "
+            "solo se analizaron los más recientes"
+        )
+    return lines
+
+
 # ============================================================================
 # CLASE PRINCIPAL DE LA APLICACIÓN
 # ============================================================================
@@ -327,12 +2280,29 @@ class DiagnosticApp(ctk.CTk):
         # Variables de estado
         self.system_info = None
         self.is_generating = False
+        self.benchmark_result = None
+        self.benchmark_previous = None
+        self.benchmark_asset = None
+        self.storage_result = None
+        self.network_result = None
+        self.throttle_result = None
+        self.throttle_previous = None
+        self.throttle_asset = None
+        self.event_summary = None
+        self.boot_result = None
+
+        # Muestreo de recursos mientras se diligencia el formulario
+        self.sampler = ResourceSampler()
+        self.sampler.start()
 
         # Construir interfaz
         self.build_ui()
 
         # Obtener información del sistema
         self.after(500, self.load_system_info)
+        self.after(800, self.start_network_diagnostics)
+        self.after(1000, self.start_event_collection)
+        self.after(1200, self.start_boot_analysis)
 
     def build_ui(self):
         """Construye la interfaz de usuario con espaciado compacto y scroll."""
@@ -526,6 +2496,66 @@ class DiagnosticApp(ctk.CTk):
         )
         self.generate_button.pack(side="left", expand=True, fill="x", padx=(0, 5))
 
+        self.benchmark_button = ctk.CTkButton(
+            button_frame,
+            text="⏱ Benchmark",
+            command=self.start_benchmark,
+            font=FONT_BUTTON,
+            height=42,
+            corner_radius=8,
+            fg_color=COLOR_BG_LIGHT,
+            hover_color=COLOR_BG_MEDIUM,
+            border_width=1,
+            border_color=COLOR_SECONDARY,
+            text_color=COLOR_TEXT_WHITE,
+        )
+        self.benchmark_button.pack(side="left", fill="x", padx=5)
+
+        self.storage_button = ctk.CTkButton(
+            button_frame,
+            text="💽 Disco",
+            command=self.start_storage_benchmark,
+            font=FONT_BUTTON,
+            height=42,
+            corner_radius=8,
+            fg_color=COLOR_BG_LIGHT,
+            hover_color=COLOR_BG_MEDIUM,
+            border_width=1,
+            border_color=COLOR_SECONDARY,
+            text_color=COLOR_TEXT_WHITE,
+        )
+        self.storage_button.pack(side="left", fill="x", padx=5)
+
+        self.drives_button = ctk.CTkButton(
+            button_frame,
+            text="🌐 Unidades",
+            command=self.start_drive_probe,
+            font=FONT_BUTTON,
+            height=42,
+            corner_radius=8,
+            fg_color=COLOR_BG_LIGHT,
+            hover_color=COLOR_BG_MEDIUM,
+            border_width=1,
+            border_color=COLOR_SECONDARY,
+            text_color=COLOR_TEXT_WHITE,
+        )
+        self.drives_button.pack(side="left", fill="x", padx=5)
+
+        self.throttle_button = ctk.CTkButton(
+            button_frame,
+            text="🌡 Térmica",
+            command=self.start_throttle_test,
+            font=FONT_BUTTON,
+            height=42,
+            corner_radius=8,
+            fg_color=COLOR_BG_LIGHT,
+            hover_color=COLOR_BG_MEDIUM,
+            border_width=1,
+            border_color=COLOR_SECONDARY,
+            text_color=COLOR_TEXT_WHITE,
+        )
+        self.throttle_button.pack(side="left", fill="x", padx=5)
+
         self.clear_button = ctk.CTkButton(
             button_frame,
             text="🗑️ Limpiar Campos",
@@ -563,36 +2593,44 @@ class DiagnosticApp(ctk.CTk):
         self.output_box.configure(state="disabled")
 
     def load_system_info(self):
-        """Carga información del sistema."""
+        """Inicia la detección del hardware fuera del hilo de la interfaz."""
         self.log("Detectando configuración del hardware...", "PROCESS")
 
+        def worker():
+            try:
+                info, missing = collect_system_info()
+                self.after(0, self.show_system_info, info, missing)
+            except Exception as e:
+                self.after(0, self.show_system_info_error, e)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def show_system_info_error(self, error):
+        """Informa un fallo general en la detección del hardware."""
+        self.log(f"✗ Error al cargar información: {str(error)}", "ERROR")
+        messagebox.showerror(
+            "Error del Sistema",
+            f"No se pudo obtener la información del sistema:\n\n{error}",
+        )
+
+    def show_system_info(self, info, missing):
+        """Muestra la información recolectada (ejecutado en el hilo de Tk)."""
         try:
-            hostname = socket.gethostname()
-            os_info = f"{platform.system()} {platform.release()} {platform.version()}"
-            processor = get_processor_info()
-            manufacturer = get_manufacturer()
-            model = get_model()
-            serial = get_bios_serial()
-            ram = get_ram_info()
-            disks = get_disk_info()
-
-            self.system_info = {
-                "hostname": hostname,
-                "os": os_info,
-                "processor": processor,
-                "manufacturer": manufacturer,
-                "model": model,
-                "serial": serial,
-                "ram": ram,
-                "disks": disks,
-                "user": getpass.getuser(),
-            }
+            self.system_info = info
+            hostname = info["hostname"]
+            os_info = info["os"]
+            processor = info["processor"]
+            manufacturer = info["manufacturer"]
+            model = info["model"]
+            serial = info["serial"]
+            ram = info["ram"]
+            disks = info["disks"]
 
             # Actualizar cuadro de información
             self.info_text.configure(state="normal")
             self.info_text.delete("1.0", "end")
             self.info_text.insert(
-                "end", f"PC: {hostname} | Usuario: {getpass.getuser()}\n"
+                "end", f"PC: {hostname} | Usuario: {info['user']}\n"
             )
             self.info_text.insert("end", f"SO: {os_info}\n")
             self.info_text.insert(
@@ -605,6 +2643,15 @@ class DiagnosticApp(ctk.CTk):
             self.log("✓ Información del sistema cargada correctamente", "SUCCESS")
             self.log(f"✓ Hardware: {manufacturer} {model}", "SUCCESS")
             self.log(f"✓ RAM: {ram['total']}GB | Discos: {len(disks)}", "SUCCESS")
+            for disk in disks:
+                if disk["status"] == "timeout":
+                    self.log(f"⚠ {describe_disk(disk)}", "WARNING")
+            if missing:
+                self.log(
+                    f"⚠ Sin respuesta a tiempo: {', '.join(missing)} "
+                    f"(se reporta como \"{UNAVAILABLE}\")",
+                    "WARNING",
+                )
             self.log("━" * 75, "INFO")
             self.log("✓ Listo para generar informes", "SUCCESS")
 
@@ -615,6 +2662,198 @@ class DiagnosticApp(ctk.CTk):
                 f"No se pudo obtener la información del sistema:\n\n{e}",
             )
 
+    def start_benchmark(self):
+        """Ejecuta el benchmark de CPU y memoria en segundo plano."""
+        self.benchmark_button.configure(state="disabled", text="⏳ Midiendo...")
+        self.log("Ejecutando benchmark de CPU y memoria (~20 s)...", "PROCESS")
+
+        def worker():
+            try:
+                result = run_benchmark(
+                    lambda msg: self.after(0, self.log, f"   {msg}", "INFO")
+                )
+                self.after(0, self.finish_benchmark, result, None)
+            except Exception as e:
+                self.after(0, self.finish_benchmark, None, e)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def finish_benchmark(self, result, error):
+        """Guarda el resultado del benchmark (ejecutado en el hilo de Tk)."""
+        self.benchmark_button.configure(state="normal", text="⏱ Benchmark")
+        if error:
+            self.log(f"✗ Error en el benchmark: {error}", "ERROR")
+            return
+        self.benchmark_result = result
+        self.benchmark_asset = None
+        self.log(f"✓ Benchmark completado: {result['overall']} puntos", "SUCCESS")
+
+    def start_storage_benchmark(self):
+        """Ejecuta el benchmark de almacenamiento en segundo plano."""
+        self.storage_button.configure(state="disabled", text="⏳ Midiendo...")
+        self.log("Ejecutando benchmark de almacenamiento...", "PROCESS")
+
+        def worker():
+            results = run_storage_benchmark(
+                progress=lambda msg: self.after(0, self.log, f"   {msg}", "INFO")
+            )
+            self.after(0, self.finish_storage_benchmark, results)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def finish_storage_benchmark(self, results):
+        """Guarda el resultado del benchmark de disco (hilo de Tk)."""
+        self.storage_button.configure(state="normal", text="💽 Disco")
+        self.storage_result = results
+        for result in results:
+            if "error" in result:
+                self.log(f"⚠ {result['volume']}: {result['error']}", "WARNING")
+            else:
+                self.log(
+                    f"✓ {result['volume']}: {result['seq_read_mbs']} MB/s lectura, "
+                    f"{result['rand_read_iops_qd1']} IOPS 4K",
+                    "SUCCESS",
+                )
+
+    def start_drive_probe(self):
+        """Consulta también las unidades de red y ópticas en segundo plano."""
+        self.drives_button.configure(state="disabled", text="⏳ Consultando...")
+        self.log("Consultando unidades de red y ópticas...", "PROCESS")
+
+        def worker():
+            try:
+                disks = get_disk_info(
+                    include_slow=True, timeout=SLOW_VOLUME_TIMEOUT, refresh=True
+                )
+                self.after(0, self.finish_drive_probe, disks, None)
+            except Exception as e:
+                self.after(0, self.finish_drive_probe, None, e)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def finish_drive_probe(self, disks, error):
+        """Actualiza las unidades del informe (ejecutado en el hilo de Tk)."""
+        self.drives_button.configure(state="normal", text="🌐 Unidades")
+        if error:
+            self.log(f"✗ Error al consultar las unidades: {error}", "ERROR")
+            return
+        if self.system_info is not None:
+            self.system_info["disks"] = disks
+        for disk in disks:
+            if disk["status"] == "ok":
+                self.log(f"✓ {describe_disk(disk)}", "SUCCESS")
+            else:
+                self.log(f"⚠ {describe_disk(disk)}", "WARNING")
+
+    def start_throttle_test(self):
+        """Ejecuta la prueba de throttling térmico en segundo plano."""
+        if self.system_info is None:
+            self.log("⚠ Aún se está detectando el hardware, intenta de nuevo", "WARNING")
+            return
+        self.throttle_button.configure(state="disabled", text="⏳ Midiendo...")
+        self.log("Ejecutando prueba de throttling térmico...", "PROCESS")
+        model = self.system_info["model"]
+
+        def worker():
+            try:
+                result = run_throttle_test(
+                    model,
+                    progress=lambda msg: self.after(0, self.log, f"   {msg}", "INFO"),
+                )
+            except Exception as e:
+                result = {"error": str(e)}
+            self.after(0, self.finish_throttle_test, result)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def finish_throttle_test(self, result):
+        """
+        Registra el resultado (hilo de Tk). Si la placa ya está diligenciada se
+        guarda de inmediato, para comparar la medición previa al mantenimiento.
+        """
+        self.throttle_button.configure(state="normal", text="🌡 Térmica")
+        self.throttle_result = result
+        self.throttle_asset = None
+        if "error" in result:
+            self.log(f"✗ Throttling: {result['error']}", "ERROR")
+            return
+
+        level = "WARNING" if result["throttled"] else "SUCCESS"
+        self.log(f"{describe_throttle_run(result)}", level)
+        fixed_asset = self.fixed_asset_entry.get().strip()
+        if fixed_asset and validate_fixed_asset(fixed_asset)[0]:
+            self.throttle_previous = save_benchmark_result(fixed_asset, result, "throttling")
+            self.throttle_asset = fixed_asset
+            self.log(f"✓ Medición térmica guardada para la placa {fixed_asset}", "SUCCESS")
+
+    def start_event_collection(self):
+        """Consulta el registro de eventos en segundo plano."""
+
+        def worker():
+            summary = collect_event_summary()
+            self.after(0, self.finish_event_collection, summary)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def start_boot_analysis(self):
+        """Analiza el rendimiento de arranque en segundo plano."""
+
+        def worker():
+            result = collect_boot_performance()
+            self.after(0, self.finish_boot_analysis, result)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def finish_boot_analysis(self, result):
+        """Registra el análisis de arranque (hilo de Tk)."""
+        self.boot_result = result
+        if "error" in result:
+            self.log(f"⚠ Rendimiento de arranque: {result['error']}", "WARNING")
+            return
+        if result["truncated"] or result["capped"]:
+            self.log("⚠ Rendimiento de arranque: lectura incompleta del registro", "WARNING")
+        if result["boots"]:
+            trend = result["trend"]
+            self.log(
+                f"🐢 Arranque: promedio {trend['mean_ms'] / 1000:.1f} s en "
+                f"{len(result['boots'])} arranques ({trend['direction']})",
+                "WARNING" if trend["direction"] == "empeorando" else "SUCCESS",
+            )
+
+    def finish_event_collection(self, summary):
+        """Registra el resumen de eventos (hilo de Tk)."""
+        self.event_summary = summary
+        totals = summary["totals"]
+        level = "WARNING" if totals["critical"] or totals["error"] else "SUCCESS"
+        self.log(
+            f"🧾 Eventos ({summary['days']} días): {totals['critical']} críticos, "
+            f"{totals['error']} errores en {len(summary['groups'])} grupos",
+            level,
+        )
+        for failure in summary["failed"]:
+            self.log(f"⚠ No se pudo leer {failure}", "WARNING")
+        for log in summary["truncated"] + summary["capped"]:
+            self.log(f"⚠ {log}: lectura incompleta, los totales son parciales", "WARNING")
+
+    def start_network_diagnostics(self):
+        """Ejecuta el diagnóstico de red en segundo plano."""
+
+        def worker():
+            try:
+                results = run_network_diagnostics()
+            except Exception as e:
+                results = {"endpoints": [], "throughput": {"server": "-", "error": str(e)}}
+            self.after(0, self.finish_network_diagnostics, results)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def finish_network_diagnostics(self, results):
+        """Registra el resultado del diagnóstico de red (hilo de Tk)."""
+        self.network_result = results
+        for line in describe_network(results):
+            level = "SUCCESS" if "p50" in line or "Mbps" in line else "WARNING"
+            self.log(f"🌐 {line}", level)
+
     def validate_form(self):
         """Valida el formulario en tiempo real."""
         tecnico = self.tecnico_entry.get().strip()
@@ -682,6 +2921,10 @@ class DiagnosticApp(ctk.CTk):
             )
             return
 
+        if self.system_info is None:
+            self.log("⚠ Aún se está detectando el hardware, intenta de nuevo", "WARNING")
+            return
+
         self.is_generating = True
         self.generate_button.configure(
             state="disabled", text="⏳ Generando PDF...", fg_color=COLOR_BG_MEDIUM
@@ -714,12 +2957,59 @@ class DiagnosticApp(ctk.CTk):
                 Path("D:/Datos").mkdir(parents=True, exist_ok=True)
                 self.log(f"✓ Directorio D:/Datos creado", "SUCCESS")
 
+            # Cerrar la ventana de muestreo: ambas copias del PDF usan los mismos datos
+            self.sampler.stop()
+            self.log(
+                f"✓ Muestreo de recursos: {self.sampler.count} muestras "
+                f"cada {self.sampler.interval:g} s",
+                "SUCCESS",
+            )
+
+            # Registrar el benchmark en el historial de la placa (una sola vez)
+            if self.benchmark_result and self.benchmark_asset != fixed_asset:
+                self.benchmark_previous = save_benchmark_result(
+                    fixed_asset, self.benchmark_result
+                )
+                self.benchmark_asset = fixed_asset
+                self.log(f"✓ Benchmark guardado para la placa {fixed_asset}", "SUCCESS")
+
+            if (
+                self.throttle_result
+                and "error" not in self.throttle_result
+                and self.throttle_asset != fixed_asset
+            ):
+                self.throttle_previous = save_benchmark_result(
+                    fixed_asset, self.throttle_result, "throttling"
+                )
+                self.throttle_asset = fixed_asset
+
             self.log(f"Generando archivo: {filename}", "PROCESS")
 
             # Generar PDF
             self.crear_pdf(str(ruta_docs), tecnico, ticket, fixed_asset, fecha_actual)
             self.log(f"✓ PDF guardado en: {ruta_docs}", "SUCCESS")
 
+            # Datos del informe en JSON para consulta y comparación
+            ruta_json = ruta_docs.with_suffix(".json")
+            export_report_json(
+                ruta_json,
+                {
+                    "ticket": ticket,
+                    "fixed_asset": fixed_asset,
+                    "technician": tecnico,
+                    "date": fecha_actual,
+                    "system": self.system_info,
+                    "resources": self.sampler.summary(),
+                    "benchmark": self.benchmark_result,
+                    "storage": self.storage_result,
+                    "network": self.network_result,
+                    "throttling": self.throttle_result,
+                    "events": self.event_summary,
+                    "boot": self.boot_result,
+                },
+            )
+            self.log(f"✓ Datos en JSON: {ruta_json}", "SUCCESS")
+
             # Calcular hash
             file_hash = calculate_file_hash(str(ruta_docs))
             self.log(f"✓ SHA-256: {file_hash[:32]}...", "SUCCESS")
@@ -760,11 +3050,42 @@ class DiagnosticApp(ctk.CTk):
                 "• Disco lleno",
             )
         finally:
+            # La ventana de muestreo continúa para un nuevo intento o informe
+            self.sampler.start()
             self.is_generating = False
             self.generate_button.configure(
                 state="normal", text="🚀 Generar Informe PDF", fg_color=COLOR_PRIMARY
             )
 
+    def draw_pdf_section(self, c, y, titulo, lineas, color=(0.043, 0.360, 1.0)):
+        """
+        Dibuja una sección (título + viñetas) con salto de página automático.
+
+        Returns:
+           float: Coordenada Y donde termina la sección
+        """
+        height = letter[1]
+        if y < 150:
+            c.showPage()
+            y = height - 80
+
+        c.setFont("Helvetica-Bold", 13)
+        c.setFillColorRGB(*color)
+        c.drawString(50, y, titulo)
+        y -= 18
+
+        c.setFont("Helvetica", 10)
+        c.setFillColorRGB(0.043, 0.043, 0.043)
+        for linea in lineas:
+            if y < 100:
+                c.showPage()
+                y = height - 80
+                c.setFont("Helvetica", 10)
+                c.setFillColorRGB(0.043, 0.043, 0.043)
+            c.drawString(60, y, f"• {linea}")
+            y -= 15
+        return y
+
     def crear_pdf(self, path, tecnico, ticket, fixed_asset, fecha):
         """
         Crea el archivo PDF del informe con logos corporativos.
@@ -785,6 +3106,7 @@ class DiagnosticApp(ctk.CTk):
         GRIS_OSCURO = (0.290, 0.290, 0.290)  # #4a4a4a
         BLANCO = (1.0, 1.0, 1.0)  # #ffffff
         VERDE = (0.0, 0.902, 0.463)  # #00e676
+        ROJO = (0.827, 0.184, 0.184)  # #d32f2f
 
         # ===================================================================
         # ENCABEZADO CON LOGOS
@@ -913,13 +3235,104 @@ class DiagnosticApp(ctk.CTk):
                 y = height - 80
                 c.setFont("Helvetica", 10)
                 c.setFillColorRGB(*NEGRO_MATE)
-            c.drawString(
-                60,
-                y,
-                f"• {disk['drive']} - Total: {disk['total']} GB | Usado: {disk['used']} GB | Libre: {disk['free']} GB ({disk['percent']}%)",
-            )
+            if disk["status"] == "timeout":
+                c.setFillColorRGB(*ROJO)
+            c.drawString(60, y, f"• {describe_disk(disk)}")
+            c.setFillColorRGB(*NEGRO_MATE)
             y -= 15
 
+        # ===================================================================
+        # ÚLTIMA OPTIMIZACIÓN DEL SISTEMA
+        # ===================================================================
+        optimizer_lines = describe_optimizer_run(sysinfo.get("optimizer_run"))
+        if optimizer_lines:
+            y = self.draw_pdf_section(
+                c, y - 10, "🧹 Última Optimización del Sistema", optimizer_lines
+            )
+
+        # ===================================================================
+        # BENCHMARK DE CPU Y MEMORIA
+        # ===================================================================
+        benchmark_lines = describe_benchmark(
+            self.benchmark_result, self.benchmark_previous
+        )
+        if benchmark_lines:
+            y = self.draw_pdf_section(
+                c, y - 10, "⏱ Benchmark de CPU y Memoria", benchmark_lines
+            )
+
+        # ===================================================================
+        # BENCHMARK DE ALMACENAMIENTO
+        # ===================================================================
+        storage_lines = describe_storage_benchmark(self.storage_result)
+        if storage_lines:
+            y = self.draw_pdf_section(
+                c, y - 10, "💽 Rendimiento de Almacenamiento", storage_lines
+            )
+
+        # ===================================================================
+        # THROTTLING TÉRMICO
+        # ===================================================================
+        throttle_lines = describe_throttling(self.throttle_result, self.throttle_previous)
+        if throttle_lines:
+            y = self.draw_pdf_section(
+                c, y - 10, "🌡 Throttling Térmico (antes / después)", throttle_lines
+            )
+
+        # ===================================================================
+        # RENDIMIENTO DE ARRANQUE
+        # ===================================================================
+        boot_lines = describe_boot_performance(self.boot_result)
+        if boot_lines:
+            y = self.draw_pdf_section(
+                c, y - 10, "🐢 Rendimiento de Arranque y Apagado", boot_lines
+            )
+
+        # ===================================================================
+        # REGISTRO DE EVENTOS
+        # ===================================================================
+        event_lines = describe_events(self.event_summary)
+        if event_lines:
+            y = self.draw_pdf_section(
+                c, y - 10, "🧾 Eventos Críticos y Errores Frecuentes", event_lines
+            )
+
+        # ===================================================================
+        # DIAGNÓSTICO DE RED
+        # ===================================================================
+        network_lines = describe_network(self.network_result)
+        if network_lines:
+            y = self.draw_pdf_section(c, y - 10, "🌐 Diagnóstico de Red", network_lines)
+
+        # ===================================================================
+        # USO DE RECURSOS DURANTE EL DIAGNÓSTICO
+        # ===================================================================
+        stats = self.sampler.summary()
+        if stats:
+            y = self.draw_pdf_section(
+                c,
+                y - 10,
+                "📈 Uso de Recursos Durante el Diagnóstico",
+                [f"Promedio / p95 / máximo en {self.sampler.count} muestras:"],
+            )
+            for name, values in stats.items():
+                if y < 100:
+                    c.showPage()
+                    y = height - 80
+                label, unit = SAMPLER_CHANNELS[name]
+                c.setFont("Helvetica", 9)
+                c.setFillColorRGB(*NEGRO_MATE)
+                c.drawString(70, y, label)
+                c.drawString(
+                    210,
+                    y,
+                    f"{values['mean']:.1f} / {values['p95']:.1f} / {values['max']:.1f} {unit}",
+                )
+                draw_sparkline(
+                    c, 390, y - 2, 160, 10, self.sampler.series(name), AZUL_PROF
+                )
+                y -= 15
+
         # ===================================================================
         # PROCEDIMIENTO REALIZADO
         # ===================================================================
@@ -978,9 +3391,9 @@ class DiagnosticApp(ctk.CTk):
 
         observaciones = [
             "• Estado general del equipo: ÓPTIMO después del mantenimiento.",
-            "• Temperaturas de CPU en rangos normales (35-45°C en reposo).",
-            "• Sistema operativo funcionando correctamente sin errores críticos.",
-            "• Conectividad de red verificada y funcional.",
+            describe_temperature(stats),
+            describe_event_health(self.event_summary),
+            describe_connectivity(self.network_result),
             "• Políticas de seguridad de SpradlingGroup aplicadas correctamente.",
             "• Se recomienda realizar mantenimiento preventivo cada 6-12 meses.",
         ]
@@ -1093,6 +3506,23 @@ class DiagnosticApp(ctk.CTk):
 
 def main():
     """Función principal con verificación de privilegios de administrador."""
+    parser = argparse.ArgumentParser(description=f"{APP_TITLE} {APP_VERSION}")
+    parser.add_argument(
+        "--serve-throughput",
+        metavar="HOST:PUERTO",
+        nargs="?",
+        const=f"0.0.0.0:{THROUGHPUT_PORT}",
+        help="actuar como servidor para la prueba de rendimiento de red",
+    )
+    # Se toleran argumentos desconocidos: un relanzamiento elevado o el
+    # lanzador del ejecutable pueden agregar otros propios
+    args, _ = parser.parse_known_args()
+    if args.serve_throughput:
+        host, port = parse_host_port(args.serve_throughput, THROUGHPUT_PORT)
+        with ThroughputServer((host, port), ThroughputHandler) as server:
+            print(f"Servidor de rendimiento escuchando en {host}:{port}")
+            server.serve_forever()
+        return
 
     # Verificar privilegios de administrador (opcional para este programa)
     if not is_admin():
@@ -1129,4 +3559,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necesario para el pool de procesos del benchmark en el ejecutable
+    multiprocessing.freeze_support()
     main()
@@ -10,14 +10,30 @@ Optimiza el rendimiento del equipo ejecutando varias herramientas clave del sist
 Incluye nuevas optimizaciones para Windows 11 24H2.
 """
 
+import os
 import sys
+import argparse
+import re
+import json
+import stat
+import queue
+import socket
+import shlex
+import shutil
+import fnmatch
+import tempfile
 import ctypes
 import subprocess
 import threading
 import time
+from array import array
+from xml.sax.saxutils import escape
+from concurrent.futures import ThreadPoolExecutor
+import psutil
 import customtkinter as ctk
 from tkinter import messagebox
 from datetime import datetime
+from pathlib import Path
 
 # ============================================================================
 # CONFIGURACIÓN GLOBAL
@@ -29,6 +45,29 @@ APP_TITLE = "Optimizador de Sistema"
 APP_VERSION = "v3.5"
 APP_SIZE = "800x900"
 
+# Historial de ejecuciones (lo consulta también el Generador de Informes)
+LOG_DIR = Path("C:/ProgramData/PQN_Optimizer")
+RUN_HISTORY_DIR = LOG_DIR / "runs"
+STARTUP_CHANGES_FILE = LOG_DIR / "startup_changes.json"
+# Valores de registro previos a cada ejecución (para revertir)
+SNAPSHOT_DIR = LOG_DIR / "snapshots"
+
+# Configuración editable por el equipo de soporte (se combina con los valores
+# por defecto; las claves ausentes en el archivo conservan el default)
+CONFIG_FILE = LOG_DIR / "optimizer_config.json"
+DEFAULT_CONFIG = {
+    # Paquetes que nunca se actualizan (Java 8 fijado por aplicaciones internas)
+    "winget_excluded_ids": ["Oracle.JavaRuntimeEnvironment"],
+    "winget_download_workers": 4,
+    # Destino TCP local (host:puerto) para medir la latencia en la prueba A/B
+    # de red; None = controlador de dominio (LOGONSERVER, puerto 389)
+    "network_probe_endpoint": None,
+    # Modo desatendido programado
+    "headless_preset": "completo",
+    "headless_idle_minutes": 15,
+    "business_hours": "07:00-19:00",
+}
+
 # Colores
 COLOR_PRIMARY = "#42a5f5"
 COLOR_SUCCESS = "#66bb6a"
@@ -60,52 +99,29 @@ OPTIMIZATION_TASKS = [
         "enabled": True,
         "critical": False,
         "category": "basic",
+        # Muestra un diálogo: como SYSTEM (sesión 0) quedaría bloqueado
+        "interactive": True,
     },
     {
-        "id": "defrag_c",
-        "name": "Optimizar Disco C:",
-        "description": "Desfragmenta y optimiza el disco principal",
-        "command": "defrag C: /O /H",
-        "estimated_time": "5-10 min",
+        "id": "optimize_volumes",
+        "name": "Optimizar Unidades (TRIM / Desfragmentar)",
+        "description": "TRIM en SSD, desfragmenta HDD solo si lo necesita",
+        "command": "defrag",
+        "estimated_time": "1-10 min",
         "enabled": True,
         "critical": False,
         "category": "basic",
     },
-    {
-        "id": "defrag_d",
-        "name": "Optimizar Disco D:",
-        "description": "Desfragmenta y optimiza el disco secundario",
-        "command": "defrag D: /O /H",
-        "estimated_time": "5-10 min",
-        "enabled": False,
-        "critical": False,
-        "category": "basic",
-    },
     {
         "id": "temp_files",
         "name": "Limpiar Archivos Temporales",
-        "description": "Elimina temporales de Windows y usuario",
-        "command": [
-            'powershell Remove-Item -Path "$env:TEMP\\*" -Recurse -Force -ErrorAction SilentlyContinue',
-            'powershell Remove-Item -Path "C:\\Windows\\Temp\\*" -Recurse -Force -ErrorAction SilentlyContinue',
-            'powershell Remove-Item "C:\\Windows\\Prefetch\\*" -Force -ErrorAction SilentlyContinue',
-            "powershell Clear-RecycleBin -Force -ErrorAction SilentlyContinue",
-        ],
+        "description": "Elimina temporales de Windows y de todos los perfiles",
+        "command": "native",
         "estimated_time": "1-2 min",
         "enabled": True,
         "critical": False,
         "category": "basic",
     },
-    {
-        "id": "sfc",
-        "name": "Reparar Archivos del Sistema (SFC)",
-        "description": "Verifica y repara archivos corruptos de Windows",
-        "command": "sfc /scannow",
-        "estimated_time": "10-20 min",
-        "enabled": True,
-        "critical": True,
-        "category": "basic",
-    },
     {
         "id": "dism_scan",
         "name": "Escanear Imagen del Sistema (DISM)",
@@ -119,18 +135,28 @@ OPTIMIZATION_TASKS = [
     {
         "id": "dism_restore",
         "name": "Reparar Imagen del Sistema (DISM)",
-        "description": "Repara la imagen de Windows si hay errores",
+        "description": "Repara la imagen de Windows solo si el escaneo detecta daños",
         "command": "DISM /Online /Cleanup-Image /RestoreHealth",
         "estimated_time": "10-30 min",
         "enabled": True,
         "critical": True,
         "category": "basic",
     },
+    {
+        "id": "sfc",
+        "name": "Reparar Archivos del Sistema (SFC)",
+        "description": "Verifica archivos de Windows (solo si DISM lo amerita)",
+        "command": "sfc /scannow",
+        "estimated_time": "10-20 min",
+        "enabled": True,
+        "critical": True,
+        "category": "basic",
+    },
     {
         "id": "winget_update",
         "name": "Actualizar Programas (Winget)",
-        "description": "Actualiza los programas pendientes excepto Java 8-341",
-        "command": "powershell",
+        "description": "Actualiza los programas pendientes según la política de exclusiones",
+        "command": "winget",
         "estimated_time": "5-15 min",
         "enabled": True,
         "critical": False,
@@ -216,10 +242,7 @@ OPTIMIZATION_TASKS = [
         "id": "optimize_power_plan",
         "name": "Configurar Plan de Energía Alto Rendimiento",
         "description": "Activa el plan de máximo rendimiento",
-        "command": [
-            "powercfg -duplicatescheme e9a42b02-d5df-448d-aa00-03f14749eb61",
-            "powercfg -setactive 8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c",
-        ],
+        "command": "ab",
         "estimated_time": "10 seg",
         "enabled": False,
         "critical": False,
@@ -288,7 +311,7 @@ OPTIMIZATION_TASKS = [
     {
         "id": "clean_winsxs",
         "name": "Limpiar WinSxS",
-        "description": "Reduce el tamaño de la carpeta de componentes",
+        "description": "Limpia componentes solo si DISM lo recomienda",
         "command": "DISM /Online /Cleanup-Image /StartComponentCleanup /ResetBase",
         "estimated_time": "5-10 min",
         "enabled": False,
@@ -299,13 +322,7 @@ OPTIMIZATION_TASKS = [
         "id": "optimize_network",
         "name": "Optimizar Configuración de Red",
         "description": "Mejora la latencia y velocidad de red",
-        "command": [
-            "netsh int tcp set global autotuninglevel=normal",
-            "netsh int tcp set global chimney=enabled",
-            "netsh int tcp set global dca=enabled",
-            "netsh int tcp set global netdma=enabled",
-            "netsh int tcp set heuristics disabled",
-        ],
+        "command": "ab",
         "estimated_time": "10 seg",
         "enabled": False,
         "critical": False,
@@ -344,18 +361,44 @@ OPTIMIZATION_TASKS = [
         "critical": False,
         "category": "privacy",
     },
-    {
-        "id": "optimize_ssd",
-        "name": "Optimizar SSD (TRIM)",
-        "description": "Ejecuta comando TRIM en SSDs",
-        "command": "defrag C: /L /O",
-        "estimated_time": "2-5 min",
-        "enabled": False,
-        "critical": False,
-        "category": "maintenance",
-    },
 ]
 
+# Selecciones rápidas (interfaz) y presets del modo desatendido (--preset)
+PRESETS = {
+    "basico": [t["id"] for t in OPTIMIZATION_TASKS if t.get("category") == "basic"],
+    "completo": [
+        "cleanmgr",
+        "temp_files",
+        "optimize_volumes",
+        "disable_visual_effects",
+        "disable_startup_delay",
+        "optimize_power_plan",
+        "disable_superfetch",
+        "disable_transparency",
+        "optimize_network",
+        "clear_dns_cache",
+        "disable_game_bar",
+    ],
+}
+
+
+def get_headless_exclusion(task):
+    """
+    Motivo por el que una tarea no puede ejecutarse en el modo desatendido.
+
+    La tarea programada corre como SYSTEM en la sesión 0: los ajustes de HKCU
+    irían al perfil de SYSTEM y los programas con ventana no los ve nadie.
+
+    Returns:
+       str | None: motivo, o None si la tarea es apta
+    """
+    if task.get("interactive"):
+        return "requiere una sesión interactiva"
+    commands = task["command"] if isinstance(task["command"], list) else [task["command"]]
+    if any(re.search(r"\bHKCU\b|HKEY_CURRENT_USER", command) for command in commands):
+        return "modifica el perfil del usuario (HKCU)"
+    return None
+
 
 # ============================================================================
 # FUNCIONES AUXILIARES
@@ -370,7 +413,37 @@ def is_admin():
         return False
 
 
-def run_command(command, shell=True, timeout=None):
+def load_config():
+    """Carga la configuración del optimizador combinada con los valores por defecto."""
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    try:
+        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+            config.update(json.load(f))
+    except (OSError, ValueError):
+        pass
+    return config
+
+
+def kill_process_tree(pid):
+    """Termina un proceso y todos sus hijos."""
+    try:
+        parent = psutil.Process(pid)
+        processes = parent.children(recursive=True) + [parent]
+    except psutil.Error:
+        return
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.Error:
+            continue
+
+
+# Funciones que reciben el PID de cada proceso lanzado por run_command
+# (medición de recursos, gobernador de prioridad, etc.)
+PROCESS_OBSERVERS = []
+
+
+def run_command(command, shell=True, timeout=None, encoding=None):
     """
     Ejecuta un comando y retorna el resultado.
 
@@ -378,239 +451,4208 @@ def run_command(command, shell=True, timeout=None):
        command: Comando a ejecutar
        shell: Usar shell
        timeout: Timeout en segundos
+       encoding: Codificación de la salida (None = la del sistema)
 
     Returns:
        tuple: (returncode, stdout, stderr)
     """
     try:
-        result = subprocess.run(
-            command, capture_output=True, text=True, shell=shell, timeout=timeout
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            shell=shell,
+            encoding=encoding,
+            errors="replace" if encoding else None,
         )
-        return result.returncode, result.stdout.strip(), result.stderr.strip()
-    except subprocess.TimeoutExpired:
-        return -1, "", "Timeout"
+        for observer in list(PROCESS_OBSERVERS):
+            observer(process.pid)
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # Con shell=True el comando real es hijo del shell
+            kill_process_tree(process.pid)
+            process.communicate()
+            return -1, "", "Timeout"
+        return process.returncode, (stdout or "").strip(), (stderr or "").strip()
     except Exception as e:
         return -1, "", str(e)
 
 
 # ============================================================================
-# CLASE PRINCIPAL
+# INSTANTÁNEAS Y REVERSIÓN DEL REGISTRO
 # ============================================================================
 
+REG_HIVES = {
+    "HKLM": "HKEY_LOCAL_MACHINE",
+    "HKCU": "HKEY_CURRENT_USER",
+    "HKCR": "HKEY_CLASSES_ROOT",
+    "HKU": "HKEY_USERS",
+}
+SERVICES_KEY = r"HKLM\SYSTEM\CurrentControlSet\Services"
+SERVICE_START_VALUES = {
+    "boot": 0,
+    "system": 1,
+    "auto": 2,
+    "delayed-auto": 2,
+    "demand": 3,
+    "disabled": 4,
+}
+SERVICE_START_NAMES = {0: "boot", 1: "system", 2: "auto", 3: "demand", 4: "disabled"}
 
-class OptimizeApp(ctk.CTk):
-    def __init__(self):
-        super().__init__()
 
-        # Configuración
-        self.title(f"{APP_TITLE} {APP_VERSION}")
-        self.geometry(APP_SIZE)
-        self.resizable(True, True)
+def normalize_reg_key(key):
+    """Usa siempre la abreviatura de la colmena (HKLM\\...) y sin barra final."""
+    key = key.strip().strip('"').rstrip("\\")
+    hive, _, path = key.partition("\\")
+    for short, long in REG_HIVES.items():
+        if hive.upper() == long:
+            hive = short
+    return f"{hive.upper()}\\{path}"
 
-        # Variables
-        self.is_processing = False
-        self.should_cancel = False
-        self.task_vars = {}
-        self.current_task = None
 
-        # Construir interfaz
-        self.build_ui()
+def parse_reg_data(value_type, data):
+    """Convierte el /d de reg.exe al valor que se escribe en el registro."""
+    if value_type in ("REG_DWORD", "REG_QWORD"):
+        return int(data, 16) if data.lower().startswith("0x") else int(data)
+    if value_type == "REG_BINARY":
+        return bytes.fromhex(data).hex()
+    if value_type == "REG_MULTI_SZ":
+        return data.split("\\0")
+    return data
 
-        # Verificar prerequisitos
-        self.after(300, self.check_prerequisites)
 
-    def build_ui(self):
-        """Construye la interfaz con scroll."""
+def parse_reg_add(command):
+    """
+    Interpreta un comando "reg add".
 
-        # Marco principal con scroll
-        main_scrollable = ctk.CTkScrollableFrame(
-            self,
-            fg_color=COLOR_BG_DARK,
-            scrollbar_button_color=COLOR_PRIMARY,
-            scrollbar_button_hover_color="#1976d2",
-        )
-        main_scrollable.pack(fill="both", expand=True, padx=15, pady=15)
+    Returns:
+       dict: key, name, type y data; None si no es un "reg add" de un valor
+    """
+    try:
+        tokens = [t.strip('"') for t in shlex.split(command, posix=False)]
+    except ValueError:
+        return None
+    if len(tokens) < 3 or [t.lower() for t in tokens[:2]] != ["reg", "add"]:
+        return None
 
-        # === ENCABEZADO ===
-        header_frame = ctk.CTkFrame(
-            main_scrollable, fg_color=COLOR_PRIMARY, corner_radius=10
-        )
-        header_frame.pack(fill="x", pady=(0, 15))
+    change = {"key": normalize_reg_key(tokens[2]), "name": "", "type": "REG_SZ", "data": ""}
+    options = {"/v": "name", "/t": "type", "/d": "data"}
+    index = 3
+    while index < len(tokens):
+        option = tokens[index].lower()
+        if option == "/ve":
+            change["name"] = ""
+        elif option in options and index + 1 < len(tokens):
+            change[options[option]] = tokens[index + 1]
+            index += 1
+        index += 1
+    change["type"] = change["type"].upper()
+    try:
+        change["data"] = parse_reg_data(change["type"], change["data"])
+    except ValueError:
+        return None
+    return change
 
-        title_label = ctk.CTkLabel(
-            header_frame, text="⚡ " + APP_TITLE, font=FONT_TITLE, text_color="white"
-        )
-        title_label.pack(pady=15)
 
-        subtitle_label = ctk.CTkLabel(
-            header_frame,
-            text=f"Autor: Josué Romero  |  Stefanini / PQN  |  {APP_VERSION}",
-            font=FONT_SUBTITLE,
-            text_color="#e3f2fd",
-        )
-        subtitle_label.pack(pady=(0, 15))
+def parse_sc_config(command):
+    """
+    Interpreta "sc config <servicio> start= <modo>" como cambios de registro.
 
-        # === SELECCIÓN DE TAREAS ===
-        tasks_frame = ctk.CTkFrame(
-            main_scrollable, fg_color=COLOR_BG_LIGHT, corner_radius=8
-        )
-        tasks_frame.pack(fill="x", expand=True, pady=(0, 10))
+    DelayedAutostart se incluye siempre: "sc config start= auto" lo pone en
+    0, así que la instantánea debe conservarlo para poder volver a
+    "delayed-auto" al revertir.
 
-        tasks_title = ctk.CTkLabel(
-            tasks_frame,
-            text="📋 Seleccione las Tareas a Ejecutar",
-            font=FONT_LABEL,
-            text_color=COLOR_TEXT,
-        )
-        tasks_title.pack(pady=(10, 10), anchor="w", padx=15)
+    Returns:
+       list: cambios de Start y DelayedAutostart del servicio; vacía si no aplica
+    """
+    match = re.match(r'\s*sc(?:\.exe)?\s+config\s+"?([^"\s]+)"?\s+start=\s*(\S+)', command, re.I)
+    if not match or match.group(2).lower() not in SERVICE_START_VALUES:
+        return []
+    service, mode = match.group(1), match.group(2).lower()
+    key = f"{SERVICES_KEY}\\{service}"
+    return [
+        {"key": key, "name": "Start", "type": "REG_DWORD", "data": SERVICE_START_VALUES[mode]},
+        {
+            "key": key,
+            "name": "DelayedAutostart",
+            "type": "REG_DWORD",
+            "data": int(mode == "delayed-auto"),
+        },
+    ]
 
-        # Scrollable frame para tareas
-        tasks_scroll = ctk.CTkScrollableFrame(
-            tasks_frame, height=300, fg_color="transparent"
-        )
-        tasks_scroll.pack(padx=15, pady=(0, 10), fill="x")
 
-        # Agrupar tareas por categoría
-        categories = {
-            "basic": "🔧 Tareas Básicas",
-            "performance": "⚡ Optimización de Rendimiento",
-            "privacy": "🔒 Privacidad y Telemetría",
-            "maintenance": "🛠️ Mantenimiento Avanzado",
-        }
+def task_commands(task):
+    """Lista de comandos de una tarea del catálogo."""
+    command = task["command"]
+    return command if isinstance(command, list) else [command]
 
-        current_category = None
-        for task in OPTIMIZATION_TASKS:
-            # Mostrar encabezado de categoría si es nueva
-            if task.get("category") != current_category:
-                current_category = task.get("category")
-                if current_category and current_category in categories:
-                    cat_label = ctk.CTkLabel(
-                        tasks_scroll,
-                        text=categories[current_category],
-                        font=("Segoe UI", 11, "bold"),
-                        text_color=COLOR_PRIMARY,
-                        anchor="w",
-                    )
-                    cat_label.pack(anchor="w", pady=(10, 5), padx=5)
 
-            task_frame = ctk.CTkFrame(tasks_scroll, fg_color="#242424", corner_radius=6)
-            task_frame.pack(fill="x", pady=3, padx=5)
+def plan_registry_changes(tasks):
+    """Cambios de registro (incluido el tipo de inicio de servicios) de un plan de tareas."""
+    changes = []
+    for task in tasks:
+        for command in task_commands(task):
+            change = parse_reg_add(command)
+            if change:
+                changes.append(change)
+            changes.extend(parse_sc_config(command))
+    return changes
 
-            # Variable para el checkbox
-            var = ctk.BooleanVar(value=task["enabled"])
-            self.task_vars[task["id"]] = var
 
-            # Checkbox y nombre
-            checkbox = ctk.CTkCheckBox(task_frame, text="", variable=var, width=20)
-            checkbox.pack(side="left", padx=10, pady=8)
+class MemoryRegistryBackend:
+    """
+    Registro en memoria con la misma interfaz que WinRegistryBackend.
 
-            # Información de la tarea
-            info_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
-            info_frame.pack(side="left", fill="x", expand=True, padx=5)
+    Permite probar instantáneas y reversiones fuera de Windows.
+    """
 
-            name_label = ctk.CTkLabel(
-                info_frame,
-                text=task["name"],
-                font=("Segoe UI", 10, "bold"),
-                text_color=COLOR_SUCCESS if not task["critical"] else COLOR_WARNING,
-                anchor="w",
-            )
-            name_label.pack(anchor="w")
+    def __init__(self, values=None):
+        self.values = {}
+        self.reads = 0
+        self.writes = 0
+        for (key, name), value in (values or {}).items():
+            self.values[(normalize_reg_key(key).lower(), name.lower())] = value
 
-            desc_label = ctk.CTkLabel(
-                info_frame,
-                text=f"{task['description']} • Tiempo estimado: {task['estimated_time']}",
-                font=("Segoe UI", 9),
-                text_color="#9e9e9e",
-                anchor="w",
-            )
-            desc_label.pack(anchor="w")
+    def read_values(self, items):
+        """Lee varios valores; (key, name) → (tipo, dato) o None si no existe."""
+        self.reads += 1
+        return {
+            (key, name): self.values.get((normalize_reg_key(key).lower(), name.lower()))
+            for key, name in items
+        }
 
-        # Botones de selección rápida
-        quick_select_frame = ctk.CTkFrame(tasks_frame, fg_color="transparent")
-        quick_select_frame.pack(pady=(0, 10), padx=15)
+    def write_values(self, changes):
+        """Escribe (o borra, si data es None) varios valores en una pasada."""
+        self.writes += 1
+        for change in changes:
+            entry = (normalize_reg_key(change["key"]).lower(), change["name"].lower())
+            if change["data"] is None:
+                self.values.pop(entry, None)
+            else:
+                self.values[entry] = (change["type"], change["data"])
+        return []
 
-        ctk.CTkButton(
-            quick_select_frame,
-            text="Seleccionar Todas",
-            command=self.select_all_tasks,
-            width=120,
-            height=30,
-            font=("Segoe UI", 10),
-        ).pack(side="left", padx=3)
 
-        ctk.CTkButton(
-            quick_select_frame,
-            text="Deseleccionar Todas",
-            command=self.deselect_all_tasks,
-            width=120,
-            height=30,
-            font=("Segoe UI", 10),
-        ).pack(side="left", padx=3)
+class WinRegistryBackend:
+    """Acceso al registro con winreg, agrupando lecturas y escrituras por clave."""
 
-        ctk.CTkButton(
-            quick_select_frame,
-            text="Solo Básicas",
-            command=self.select_quick_tasks,
-            width=120,
-            height=30,
-            font=("Segoe UI", 10),
-        ).pack(side="left", padx=3)
+    def __init__(self):
+        import winreg
 
-        ctk.CTkButton(
-            quick_select_frame,
-            text="Optimización Completa",
-            command=self.select_performance_tasks,
-            width=140,
-            height=30,
-            font=("Segoe UI", 10),
-        ).pack(side="left", padx=3)
+        self.winreg = winreg
+        self.type_names = {
+            getattr(winreg, name): name
+            for name in (
+                "REG_SZ",
+                "REG_EXPAND_SZ",
+                "REG_BINARY",
+                "REG_DWORD",
+                "REG_QWORD",
+                "REG_MULTI_SZ",
+            )
+        }
 
-        # === PROGRESO ===
-        progress_frame = ctk.CTkFrame(
-            main_scrollable, fg_color=COLOR_BG_LIGHT, corner_radius=8
-        )
-        progress_frame.pack(fill="x", pady=(0, 10))
+    def _open(self, key, access, create=False):
+        hive, _, path = normalize_reg_key(key).partition("\\")
+        root = getattr(self.winreg, REG_HIVES[hive])
+        if create:
+            return self.winreg.CreateKeyEx(root, path, 0, access)
+        return self.winreg.OpenKey(root, path, 0, access)
 
-        self.progress_label = ctk.CTkLabel(
-            progress_frame,
-            text="Listo para iniciar",
-            font=FONT_SUBTITLE,
-            text_color=COLOR_TEXT,
-        )
-        self.progress_label.pack(pady=(10, 5))
+    @staticmethod
+    def _group(items):
+        grouped = {}
+        for item in items:
+            grouped.setdefault(normalize_reg_key(item[0]).lower(), []).append(item)
+        return grouped.values()
 
-        self.progress_bar = ctk.CTkProgressBar(
-            progress_frame, height=10, corner_radius=5, progress_color=COLOR_PRIMARY
-        )
-        self.progress_bar.pack(pady=(0, 10), padx=15, fill="x")
-        self.progress_bar.set(0)
+    def read_values(self, items):
+        """Lee varios valores abriendo cada clave una sola vez."""
+        result = {}
+        for group in self._group(items):
+            try:
+                handle = self._open(group[0][0], self.winreg.KEY_READ)
+            except OSError:
+                result.update({item: None for item in group})
+                continue
+            with handle:
+                for key, name in group:
+                    try:
+                        data, value_type = self.winreg.QueryValueEx(handle, name)
+                    except OSError:
+                        result[(key, name)] = None
+                        continue
+                    type_name = self.type_names.get(value_type, "REG_BINARY")
+                    if isinstance(data, bytes):
+                        data = data.hex()
+                    result[(key, name)] = (type_name, data)
+        return result
 
-        # === LOG ===
-        log_label = ctk.CTkLabel(
-            main_scrollable,
-            text="📝 Registro de Actividad",
-            font=FONT_LABEL,
-            text_color=COLOR_TEXT,
-            anchor="w",
-        )
-        log_label.pack(pady=(5, 5), anchor="w")
+    def write_values(self, changes):
+        """
+        Escribe o borra varios valores creando/abriendo cada clave una sola vez.
 
-        self.text_log = ctk.CTkTextbox(
-            main_scrollable,
-            height=180,
-            font=FONT_CONSOLE,
-            fg_color=COLOR_BG_LIGHT,
-            text_color=COLOR_TEXT,
-            border_width=2,
-            border_color=COLOR_PRIMARY,
-            corner_radius=8,
-        )
-        self.text_log.pack(pady=(0, 10), fill="x")
+        Returns:
+           list: mensajes de error (vacía si todo se aplicó)
+        """
+        errors = []
+        grouped = self._group([(c["key"], c) for c in changes])
+        for group in grouped:
+            try:
+                handle = self._open(group[0][0], self.winreg.KEY_WRITE, create=True)
+            except OSError as e:
+                errors.extend(f"{c['key']}\\{c['name']}: {e}" for _, c in group)
+                continue
+            with handle:
+                for _, change in group:
+                    try:
+                        if change["data"] is None:
+                            self.winreg.DeleteValue(handle, change["name"])
+                            continue
+                        data = change["data"]
+                        if change["type"] == "REG_BINARY":
+                            data = bytes.fromhex(data)
+                        self.winreg.SetValueEx(
+                            handle,
+                            change["name"],
+                            0,
+                            getattr(self.winreg, change["type"]),
+                            data,
+                        )
+                    except FileNotFoundError:
+                        continue
+                    except OSError as e:
+                        errors.append(f"{change['key']}\\{change['name']}: {e}")
+        return errors
 
-        # === BOTONES ===
-        button_frame = ctk.CTkFrame(main_scrollable, fg_color="transparent")
-        button_frame.pack(fill="x")
+
+def get_registry_backend():
+    """Backend de winreg en Windows; en memoria en otros sistemas."""
+    try:
+        return WinRegistryBackend()
+    except ImportError:
+        return MemoryRegistryBackend()
+
+
+def take_registry_snapshot(changes, backend):
+    """
+    Lee en una pasada el valor previo de todo lo que el plan va a modificar.
+
+    Returns:
+       dict: created y entries (key, name, existed, type, data)
+    """
+    items = list(dict.fromkeys((c["key"], c["name"]) for c in changes))
+    current = backend.read_values(items)
+    entries = []
+    for key, name in items:
+        value = current.get((key, name))
+        entries.append(
+            {
+                "key": key,
+                "name": name,
+                "existed": value is not None,
+                "type": value[0] if value else None,
+                "data": value[1] if value else None,
+            }
+        )
+    return {"created": datetime.now().isoformat(timespec="seconds"), "entries": entries}
+
+
+def restore_registry_snapshot(snapshot, backend):
+    """
+    Restaura una instantánea en una sola escritura agrupada.
+
+    Los valores que no existían antes se borran.
+
+    Returns:
+       list: errores de escritura
+    """
+    return backend.write_values(
+        [
+            {
+                "key": entry["key"],
+                "name": entry["name"],
+                "type": entry["type"],
+                "data": entry["data"] if entry["existed"] else None,
+            }
+            for entry in snapshot["entries"]
+        ]
+    )
+
+
+def snapshot_service_modes(snapshot):
+    """Servicios de una instantánea con el tipo de inicio que tenían (para sc config)."""
+    prefix = SERVICES_KEY.lower() + "\\"
+    modes, delayed = {}, set()
+    for entry in snapshot["entries"]:
+        key = normalize_reg_key(entry["key"])
+        if not key.lower().startswith(prefix) or not entry["existed"]:
+            continue
+        service = key[len(prefix):]
+        name = entry["name"].lower()
+        if name == "start" and entry["data"] in SERVICE_START_NAMES:
+            modes[service] = SERVICE_START_NAMES[entry["data"]]
+        elif name == "delayedautostart" and entry["data"]:
+            delayed.add(service)
+    return {
+        service: "delayed-auto" if mode == "auto" and service in delayed else mode
+        for service, mode in modes.items()
+    }
+
+
+def save_registry_snapshot(run_id, snapshot):
+    """Guarda la instantánea de una ejecución."""
+    try:
+        SNAPSHOT_DIR.mkdir(parents=True, exist_ok=True)
+        path = SNAPSHOT_DIR / f"run_{run_id}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        return path
+    except Exception:
+        return None
+
+
+def load_registry_snapshot(run_id=None):
+    """
+    Carga la instantánea de una ejecución (la más reciente si run_id es None).
+
+    Returns:
+       tuple: (run_id, instantánea) o (None, None)
+    """
+    try:
+        paths = sorted(SNAPSHOT_DIR.glob("run_*.json"))
+    except OSError:
+        return None, None
+    if run_id:
+        paths = [p for p in paths if p.stem == f"run_{run_id}"]
+    if not paths:
+        return None, None
+    try:
+        with open(paths[-1], "r", encoding="utf-8") as f:
+            return paths[-1].stem[len("run_"):], json.load(f)
+    except (OSError, ValueError):
+        return None, None
+
+
+def rollback_run(run_id=None, backend=None):
+    """
+    Revierte los cambios de registro y servicios de una ejecución.
+
+    Returns:
+       tuple: (run_id revertido o None, lista de errores)
+    """
+    run_id, snapshot = load_registry_snapshot(run_id)
+    if snapshot is None:
+        return None, ["No hay instantáneas disponibles"]
+    errors = restore_registry_snapshot(snapshot, backend or get_registry_backend())
+    # El SCM solo relee el registro al reiniciar: se le informa con sc config
+    for service, mode in snapshot_service_modes(snapshot).items():
+        code, out, err = run_command(f'sc config "{service}" start= {mode}', timeout=60)
+        if code != 0:
+            errors.append(f"{service}: {err or out}")
+    return run_id, errors
+
+
+# ============================================================================
+# FUSIÓN DE COMANDOS LIGEROS
+# ============================================================================
+
+# Comandos cortos que pueden compartir un solo proceso de shell
+FUSIBLE_COMMANDS = ("sc", "powercfg", "netsh", "ipconfig")
+# Tiempo máximo por subcomando dentro de un lote
+FUSED_COMMAND_TIMEOUT = 60
+FUSION_SENTINEL = "PQN_FUSED_MARK"
+
+
+def is_fusible_command(command):
+    """Indica si un comando es ligero y puede ejecutarse dentro de un lote."""
+    if not isinstance(command, str) or parse_reg_add(command):
+        return False
+    first = command.strip().split(" ", 1)[0].lower()
+    return first.removesuffix(".exe") in FUSIBLE_COMMANDS
+
+
+def build_fused_script(commands, windows=None, gates=()):
+    """
+    Genera un script que ejecuta los comandos en orden con marcas de inicio y fin.
+
+    Cada fin incluye el código de salida del subcomando para atribuirlo. Antes
+    de cada índice de `gates` el script anuncia una espera y lee una línea de
+    la entrada estándar: continúa solo si recibe "go".
+    """
+    windows = sys.platform == "win32" if windows is None else windows
+    lines = ["@echo off"] if windows else []
+    status = "%errorlevel%" if windows else "$?"
+    for index, command in enumerate(commands):
+        if index in gates:
+            lines.append(f"echo {FUSION_SENTINEL} WAIT {index}")
+            if windows:
+                lines.append('set "PQN_GO="')
+                lines.append("set /p PQN_GO=")
+                lines.append('if not "%PQN_GO%"=="go" exit /b 0')
+            else:
+                lines.append("read PQN_GO || exit 0")
+                lines.append('[ "$PQN_GO" = go ] || exit 0')
+        lines.append(f"echo {FUSION_SENTINEL} BEGIN {index}")
+        lines.append(f"{command} 2>&1")
+        lines.append(f"echo {FUSION_SENTINEL} END {index} {status}")
+    return "\r\n".join(lines) + "\r\n" if windows else "\n".join(lines) + "\n"
+
+
+def parse_fused_output(output, count):
+    """
+    Separa la salida de un lote por subcomando.
+
+    Returns:
+       list: por subcomando (código, salida); None si no terminó y
+             (None, salida) si empezó pero no terminó
+    """
+    results = [None] * count
+    current = None
+    buffer = []
+    pattern = re.compile(rf"^{FUSION_SENTINEL} (BEGIN|END) (\d+)(?: (-?\d+))?\s*$")
+    for line in output.splitlines():
+        match = pattern.match(line.strip())
+        if not match:
+            if current is not None:
+                buffer.append(line)
+            continue
+        kind, index = match.group(1), int(match.group(2))
+        if kind == "BEGIN":
+            current, buffer = index, []
+        elif index < count:
+            results[index] = (int(match.group(3) or 0), "\n".join(buffer).strip())
+            current = None
+    if current is not None and current < count:
+        results[current] = (None, "\n".join(buffer).strip())
+    return results
+
+
+def run_fused_commands(commands, timeout_per_command=FUSED_COMMAND_TIMEOUT, gates=None):
+    """
+    Ejecuta varios comandos ligeros en un solo proceso de shell.
+
+    Args:
+       commands: comandos en el orden en que deben ejecutarse
+       timeout_per_command: presupuesto de tiempo por subcomando
+       gates: dict índice -> función sin argumentos; el lote se detiene antes
+              de ese subcomando y solo continúa si la función retorna True.
+              El tiempo de espera en una compuerta no cuenta para el timeout
+
+    Si un subcomando se cuelga se termina el lote y ese subcomando se marca
+    como Timeout.
+
+    Returns:
+       list: (returncode, stdout, stderr) por comando, en el mismo orden;
+             None para los que no llegaron a ejecutarse dentro del lote
+    """
+    gates = gates or {}
+    windows = sys.platform == "win32"
+    fd, script = tempfile.mkstemp(prefix="pqn_fused_", suffix=".cmd" if windows else ".sh")
+    with os.fdopen(fd, "w", encoding="utf-8" if not windows else None) as f:
+        f.write(build_fused_script(commands, windows, gates))
+
+    shell_command = ["cmd", "/d", "/c", script] if windows else ["sh", script]
+    lines = []
+    timed_out = False
+    wait_pattern = re.compile(rf"^{FUSION_SENTINEL} WAIT (\d+)\s*$")
+    # Segundos pasados en compuertas y, si hay una en curso, desde cuándo
+    gate_time = {"total": 0.0, "since": None}
+
+    def answer_gate(process, index):
+        gate_time["since"] = time.monotonic()
+        try:
+            go = bool(gates[index]())
+        except Exception:
+            go = False
+        gate_time["total"] += time.monotonic() - gate_time["since"]
+        gate_time["since"] = None
+        try:
+            process.stdin.write("go\n" if go else "stop\n")
+            process.stdin.flush()
+        except OSError:
+            pass
+
+    def read_output(process):
+        for line in process.stdout:
+            lines.append(line)
+            match = wait_pattern.match(line.strip())
+            if match and int(match.group(1)) in gates:
+                answer_gate(process, int(match.group(1)))
+
+    try:
+        process = subprocess.Popen(
+            shell_command,
+            stdin=subprocess.PIPE if gates else None,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+        for observer in list(PROCESS_OBSERVERS):
+            observer(process.pid)
+        reader = threading.Thread(target=read_output, args=(process,), daemon=True)
+        reader.start()
+
+        budget = timeout_per_command * len(commands)
+        started = time.monotonic()
+        while True:
+            try:
+                process.wait(timeout=0.2)
+                break
+            except subprocess.TimeoutExpired:
+                now = time.monotonic()
+                waiting = now - gate_time["since"] if gate_time["since"] else 0.0
+                if now - started - gate_time["total"] - waiting > budget:
+                    timed_out = True
+                    kill_process_tree(process.pid)
+                    process.wait()
+                    break
+        reader.join(timeout=5)
+        if process.stdin:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+    except Exception:
+        lines = []
+    finally:
+        try:
+            os.remove(script)
+        except OSError:
+            pass
+
+    results = []
+    for parsed in parse_fused_output("".join(lines), len(commands)):
+        if parsed is None:
+            results.append(None)
+        elif parsed[0] is None:
+            results.append((-1, parsed[1], "Timeout" if timed_out else "Lote interrumpido"))
+        else:
+            code, out = parsed
+            results.append((code, out, out if code != 0 else ""))
+    return results
+
+
+def plan_fused_batches(tasks, is_generic):
+    """
+    Agrupa en lotes los comandos ligeros adyacentes, en el orden declarado.
+
+    Un lote puede cruzar tareas consecutivas que ejecuta execute_task; lo
+    cortan cualquier otro comando (también "reg add", que se escribe desde el
+    proceso entre un lote y el siguiente) y las tareas con manejador propio.
+
+    Args:
+       tasks: tareas seleccionadas en orden de ejecución
+       is_generic: función que indica si la tarea la ejecuta execute_task
+
+    Returns:
+       list: lotes de al menos dos comandos; cada uno, lista de
+             (tarea, posición del comando en la tarea, comando)
+    """
+    batches = []
+    current = []
+    for task in tasks + [None]:
+        generic = task is not None and is_generic(task)
+        for position, command in enumerate(task_commands(task) if generic else [None]):
+            if command is not None and is_fusible_command(command):
+                current.append((task, position, command))
+                continue
+            if len(current) >= 2:
+                batches.append(current)
+            current = []
+    return batches
+
+
+# ============================================================================
+# MEDICIÓN DE RECURSOS POR TAREA
+# ============================================================================
+
+# Intervalo fijo de muestreo del árbol de procesos (segundos)
+RESOURCE_SAMPLE_INTERVAL = 1.0
+
+
+class ProcessTreeMonitor:
+    """
+    Mide CPU, E/S y memoria pico de los procesos que lanza una tarea.
+
+    Cada comando se registra con attach(pid); un hilo muestrea el árbol
+    completo (incluidos hijos que quedan huérfanos) a intervalo fijo y
+    conserva la última lectura de cada proceso ya terminado.
+    """
+
+    def __init__(self, interval=RESOURCE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self._roots = []
+        self._tracked = {}
+        self._usage = {}
+        self._peak_rss = 0
+        self._current_rss = 0
+        self._sampler_cpu = 0.0
+        self._started = time.time()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def attach(self, pid):
+        """Agrega un proceso raíz a la medición."""
+        try:
+            process = psutil.Process(pid)
+        except psutil.Error:
+            return
+        with self._lock:
+            self._roots.append(process)
+
+    def start(self):
+        """Inicia el hilo de muestreo."""
+        self._started = time.time()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detiene el muestreo y retorna los totales."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+        self._sample()
+        return self.totals()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        started_cpu = time.thread_time()
+        with self._lock:
+            roots = list(self._roots)
+            candidates = dict(self._tracked)
+
+        for root in roots:
+            try:
+                for process in [root] + root.children(recursive=True):
+                    candidates[(process.pid, process.create_time())] = process
+            except psutil.Error:
+                continue
+
+        alive = {}
+        readings = {}
+        rss = 0
+        for key, process in candidates.items():
+            try:
+                with process.oneshot():
+                    cpu = process.cpu_times()
+                    memory = process.memory_info()
+                    try:
+                        io = process.io_counters()
+                        read_bytes, write_bytes = io.read_bytes, io.write_bytes
+                    except (psutil.AccessDenied, AttributeError):
+                        read_bytes = write_bytes = 0
+            except psutil.Error:
+                continue
+            alive[key] = process
+            readings[key] = (cpu.user + cpu.system, read_bytes, write_bytes)
+            rss += memory.rss
+
+        with self._lock:
+            self._tracked = alive
+            self._roots = [root for root in self._roots if root.is_running()]
+            self._usage.update(readings)
+            self._current_rss = rss
+            self._peak_rss = max(self._peak_rss, rss)
+            self._sampler_cpu += time.thread_time() - started_cpu
+
+    def totals(self):
+        """
+        Retorna los totales acumulados del árbol de procesos.
+
+        Returns:
+           dict: cpu_seconds, read_bytes, write_bytes, peak_rss, current_rss,
+                 processes y sampler_cpu_percent (costo del propio muestreo)
+        """
+        with self._lock:
+            usage = list(self._usage.values())
+            elapsed = max(time.time() - self._started, 0.001)
+            return {
+                "cpu_seconds": round(sum(u[0] for u in usage), 2),
+                "read_bytes": sum(u[1] for u in usage),
+                "write_bytes": sum(u[2] for u in usage),
+                "peak_rss": self._peak_rss,
+                "current_rss": self._current_rss,
+                "processes": len(usage),
+                "sampler_cpu_percent": round(self._sampler_cpu / elapsed * 100, 3),
+            }
+
+
+def describe_resources(usage):
+    """Resume en una línea el consumo de recursos de una tarea."""
+    return (
+        f"CPU {usage['cpu_seconds']:.1f} s | "
+        f"Lectura {format_bytes(usage['read_bytes'])} | "
+        f"Escritura {format_bytes(usage['write_bytes'])} | "
+        f"RAM pico {format_bytes(usage['peak_rss'])}"
+    )
+
+
+# ============================================================================
+# GOBERNADOR DE PRIORIDAD, E/S Y CPU
+# ============================================================================
+
+GOVERNOR_INTERVAL = 2.0
+# Segundos sin teclado/ratón para considerar que el usuario no está
+USER_IDLE_SECONDS = 300
+# Inactividad que publica el monitor de la sesión del usuario (--idle-monitor);
+# se descarta si el archivo no se actualizó en USER_IDLE_MAX_AGE segundos
+USER_IDLE_FILE_PATTERN = "user_idle_{user}.json"
+USER_IDLE_INTERVAL = 5
+USER_IDLE_MAX_AGE = 30
+# Uso de CPU ajeno a la tarea a partir del cual el equipo está saturado
+CPU_PRESSURE_PERCENT = 85
+# Tiempo ocupado del disco, sin la parte atribuible a la tarea, que indica
+# que otro programa está esperando al disco
+DISK_PRESSURE_PERCENT = 80
+# Intervalo mínimo entre dos lecturas de carga (attach() puede llamar seguido)
+PRESSURE_MIN_INTERVAL = 0.5
+
+GOVERNOR_LEVELS = ["background", "balanced", "full"]
+GOVERNOR_LABELS = {
+    "background": "Segundo plano",
+    "balanced": "Equilibrado",
+    "full": "Máxima velocidad",
+}
+
+# Clase de recursos de cada tarea (las no listadas son "light")
+TASK_RESOURCE_CLASS = {
+    "cleanmgr": "heavy",
+    "dism_scan": "heavy",
+    "dism_restore": "heavy",
+    "sfc": "heavy",
+    "clean_winsxs": "heavy",
+    "optimize_volumes": "heavy",
+    "temp_files": "heavy",
+    "winget_update": "heavy",
+}
+
+# (prioridad, prioridad de E/S, tope de CPU en %) por nivel y clase de tarea
+GOVERNOR_POLICIES = {
+    "background": {
+        "heavy": ("idle", "very_low", 25),
+        "light": ("below_normal", "low", None),
+    },
+    "balanced": {
+        "heavy": ("below_normal", "low", 50),
+        "light": ("normal", "normal", None),
+    },
+    "full": {
+        "heavy": ("normal", "normal", None),
+        "light": ("normal", "normal", None),
+    },
+}
+
+if sys.platform == "win32":
+    PRIORITY_VALUES = {
+        "idle": psutil.IDLE_PRIORITY_CLASS,
+        "below_normal": psutil.BELOW_NORMAL_PRIORITY_CLASS,
+        "normal": psutil.NORMAL_PRIORITY_CLASS,
+    }
+    IO_PRIORITY_VALUES = {
+        "very_low": (psutil.IOPRIO_VERYLOW,),
+        "low": (psutil.IOPRIO_LOW,),
+        "normal": (psutil.IOPRIO_NORMAL,),
+    }
+else:
+    # Linux: equivalentes con nice / ionice
+    PRIORITY_VALUES = {"idle": 19, "below_normal": 10, "normal": 0}
+    IO_PRIORITY_VALUES = {
+        "very_low": (getattr(psutil, "IOPRIO_CLASS_IDLE", 3),),
+        "low": (getattr(psutil, "IOPRIO_CLASS_BE", 2), 7),
+        "normal": (getattr(psutil, "IOPRIO_CLASS_BE", 2), 4),
+    }
+
+# Job objects (solo Windows)
+JOB_OBJECT_CPU_RATE_CONTROL_INFORMATION = 15
+JOB_OBJECT_CPU_RATE_CONTROL_ENABLE = 0x1
+JOB_OBJECT_CPU_RATE_CONTROL_HARD_CAP = 0x4
+PROCESS_SET_QUOTA = 0x0100
+PROCESS_TERMINATE = 0x0001
+# Prioridad de CPU y E/S reducidas para el hilo que llama (Windows Vista+)
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+WTS_SESSION_INFO_CLASS = 24
+WTS_SESSION_INFO_EX_CLASS = 25
+WTS_ACTIVE = 0
+WTS_SESSIONSTATE_LOCK = 0
+
+
+def read_user_idle_file(user, max_age=USER_IDLE_MAX_AGE):
+    """
+    Inactividad publicada por el monitor en la sesión de `user`.
+
+    Returns:
+       float | None: segundos de inactividad, o None si no hay dato reciente
+    """
+    path = LOG_DIR / USER_IDLE_FILE_PATTERN.format(user=user.lower())
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        age = time.time() - data["time"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if data.get("idle") is None or not 0 <= age <= max_age:
+        return None
+    return data["idle"] + age
+
+
+def run_idle_monitor(minutes, interval=USER_IDLE_INTERVAL):
+    """
+    Publica la inactividad de la sesión actual durante `minutes` minutos.
+
+    Lo inicia la tarea programada auxiliar en la sesión del usuario, donde
+    GetLastInputInfo sí funciona; el proceso desatendido (sesión 0) lee el
+    archivo con read_user_idle_file.
+    """
+    user = os.environ.get("USERNAME", "").lower()
+    if not user:
+        return
+    path = LOG_DIR / USER_IDLE_FILE_PATTERN.format(user=user)
+    deadline = time.monotonic() + minutes * 60
+    while time.monotonic() < deadline:
+        data = {"idle": get_user_idle_seconds(), "time": time.time()}
+        try:
+            temporary = path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(temporary, path)
+        except OSError:
+            pass
+        time.sleep(interval)
+
+
+def get_console_idle_seconds():
+    """
+    Inactividad de la sesión de consola vista desde la sesión 0.
+
+    GetLastInputInfo solo ve la sesión propia y LastInputTime de WTS suele
+    venir en 0, así que se usa lo que publica el monitor de la sesión del
+    usuario (run_idle_monitor). Sin usuario en la consola, o con la sesión
+    bloqueada o desconectada, el usuario está ausente. None si no hay dato.
+    """
+    try:
+
+        class WTSINFOW(ctypes.Structure):
+            _fields_ = [
+                ("State", ctypes.c_int),
+                ("SessionId", ctypes.c_ulong),
+                ("Counters", ctypes.c_ulong * 6),
+                ("WinStationName", ctypes.c_wchar * 32),
+                ("Domain", ctypes.c_wchar * 17),
+                ("UserName", ctypes.c_wchar * 21),
+                ("ConnectTime", ctypes.c_longlong),
+                ("DisconnectTime", ctypes.c_longlong),
+                ("LastInputTime", ctypes.c_longlong),
+                ("LogonTime", ctypes.c_longlong),
+                ("CurrentTime", ctypes.c_longlong),
+            ]
+
+        wtsapi32 = ctypes.windll.wtsapi32
+        session = ctypes.windll.kernel32.WTSGetActiveConsoleSessionId()
+        buffer = ctypes.c_void_p()
+        size = ctypes.c_ulong()
+        if not wtsapi32.WTSQuerySessionInformationW(
+            None, session, WTS_SESSION_INFO_CLASS, ctypes.byref(buffer), ctypes.byref(size)
+        ):
+            return None
+        try:
+            info = ctypes.cast(buffer, ctypes.POINTER(WTSINFOW)).contents
+            if not info.UserName or info.State != WTS_ACTIVE:
+                # Nadie conectado a la consola o sesión desconectada
+                return float("inf")
+            if is_session_locked(session):
+                return float("inf")
+            published = read_user_idle_file(info.UserName)
+            if published is not None:
+                return published
+            if not info.LastInputTime:
+                return None
+            return max(0, (info.CurrentTime - info.LastInputTime) / 10_000_000)
+        finally:
+            wtsapi32.WTSFreeMemory(buffer)
+    except Exception:
+        return None
+
+
+def is_session_locked(session):
+    """Indica si la sesión tiene la pantalla bloqueada (WTSSessionInfoEx)."""
+    try:
+
+        class WTSINFOEX_LEVEL1_W(ctypes.Structure):
+            _fields_ = [
+                ("SessionId", ctypes.c_ulong),
+                ("SessionState", ctypes.c_int),
+                ("SessionFlags", ctypes.c_long),
+            ]
+
+        class WTSINFOEXW(ctypes.Structure):
+            _fields_ = [("Level", ctypes.c_ulong), ("Data", WTSINFOEX_LEVEL1_W)]
+
+        wtsapi32 = ctypes.windll.wtsapi32
+        buffer = ctypes.c_void_p()
+        size = ctypes.c_ulong()
+        if not wtsapi32.WTSQuerySessionInformationW(
+            None, session, WTS_SESSION_INFO_EX_CLASS, ctypes.byref(buffer), ctypes.byref(size)
+        ):
+            return False
+        try:
+            info = ctypes.cast(buffer, ctypes.POINTER(WTSINFOEXW)).contents
+            return info.Data.SessionFlags == WTS_SESSIONSTATE_LOCK
+        finally:
+            wtsapi32.WTSFreeMemory(buffer)
+    except Exception:
+        return False
+
+
+def get_user_idle_seconds():
+    """Segundos desde la última entrada de teclado/ratón (None si no se puede saber)."""
+    try:
+        session = ctypes.c_ulong()
+        ctypes.windll.kernel32.ProcessIdToSessionId(os.getpid(), ctypes.byref(session))
+        if session.value == 0:
+            return get_console_idle_seconds()
+    except Exception:
+        return None
+
+    try:
+
+        class LASTINPUTINFO(ctypes.Structure):
+            _fields_ = [("cbSize", ctypes.c_uint), ("dwTime", ctypes.c_ulong)]
+
+        info = LASTINPUTINFO()
+        info.cbSize = ctypes.sizeof(info)
+        if not ctypes.windll.user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        ticks = ctypes.windll.kernel32.GetTickCount() & 0xFFFFFFFF
+        return ((ticks - info.dwTime) & 0xFFFFFFFF) / 1000
+    except Exception:
+        return None
+
+
+def set_thread_background():
+    """
+    Baja la prioridad de CPU y E/S del hilo actual.
+
+    Para trabajo que la tarea hace dentro del propio proceso (p. ej. la
+    limpieza de temporales), donde no hay procesos hijos que gobernar.
+    """
+    try:
+        if sys.platform == "win32":
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(
+                kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN
+            )
+        else:
+            # En Linux cada hilo tiene su propio nice
+            os.setpriority(
+                os.PRIO_PROCESS, threading.get_native_id(), PRIORITY_VALUES["below_normal"]
+            )
+    except (AttributeError, OSError):
+        pass
+
+
+def resolve_governor_level(mode, idle_seconds, cpu_percent, disk_busy_percent=0.0):
+    """
+    Calcula el nivel efectivo a partir del modo elegido y la actividad del equipo.
+
+    Con el usuario ausente se sube un nivel; con el usuario presente y la CPU
+    o el disco saturados por otros programas se baja uno. "full" nunca se
+    modifica.
+    """
+    if mode == "full":
+        return mode
+    index = GOVERNOR_LEVELS.index(mode)
+    if idle_seconds is not None and idle_seconds >= USER_IDLE_SECONDS:
+        index += 1
+    elif cpu_percent >= CPU_PRESSURE_PERCENT or disk_busy_percent >= DISK_PRESSURE_PERCENT:
+        index -= 1
+    return GOVERNOR_LEVELS[max(0, min(index, len(GOVERNOR_LEVELS) - 1))]
+
+
+def read_load_sample(monitor=None):
+    """
+    Contadores acumulados para medir la carga entre dos instantes.
+
+    Returns:
+       dict: time, disk_busy_ms y disk_bytes del sistema, own_cpu (s) y
+             own_io (bytes) del árbol que mide `monitor` (0 sin monitor)
+    """
+    sample = {"time": time.monotonic(), "disk_busy_ms": None, "disk_bytes": 0}
+    try:
+        io = psutil.disk_io_counters()
+    except Exception:
+        io = None
+    if io is not None:
+        # Windows no expone busy_time; la suma de tiempos de lectura y
+        # escritura es la aproximación habitual (se acota al 100 %)
+        busy = getattr(io, "busy_time", None)
+        sample["disk_busy_ms"] = busy if busy is not None else io.read_time + io.write_time
+        sample["disk_bytes"] = io.read_bytes + io.write_bytes
+
+    totals = monitor.totals() if monitor else {}
+    sample["own_cpu"] = totals.get("cpu_seconds", 0)
+    sample["own_io"] = totals.get("read_bytes", 0) + totals.get("write_bytes", 0)
+    return sample
+
+
+def compute_foreign_pressure(before, after, system_cpu_percent, cpu_count):
+    """
+    Carga que no proviene del árbol de la tarea entre dos lecturas.
+
+    A la CPU del sistema se le resta la del propio árbol, para que una tarea
+    pesada no se frene a sí misma. El tiempo ocupado del disco no se puede
+    atribuir por proceso, así que se conserva solo la fracción de bytes
+    transferidos que no son de la tarea.
+
+    Returns:
+       tuple: (% de CPU ajeno, % de disco ocupado ajeno)
+    """
+    elapsed = after["time"] - before["time"]
+    if elapsed <= 0:
+        return system_cpu_percent, 0.0
+
+    own_cpu = (after["own_cpu"] - before["own_cpu"]) / (elapsed * max(cpu_count, 1)) * 100
+    cpu = max(0.0, system_cpu_percent - max(own_cpu, 0.0))
+
+    disk = 0.0
+    if before["disk_busy_ms"] is not None and after["disk_busy_ms"] is not None:
+        busy = (after["disk_busy_ms"] - before["disk_busy_ms"]) / (elapsed * 1000) * 100
+        total_bytes = after["disk_bytes"] - before["disk_bytes"]
+        own_bytes = after["own_io"] - before["own_io"]
+        foreign = 1 - own_bytes / total_bytes if total_bytes > 0 else 1.0
+        disk = min(max(busy, 0.0), 100.0) * min(max(foreign, 0.0), 1.0)
+    return round(cpu, 1), round(disk, 1)
+
+
+class CpuRateJob:
+    """Job object de Windows que limita el uso de CPU de los procesos asignados."""
+
+    def __init__(self):
+        self.handle = None
+        try:
+            self.kernel32 = ctypes.windll.kernel32
+            self.handle = self.kernel32.CreateJobObjectW(None, None)
+        except Exception:
+            self.handle = None
+
+    def assign(self, pid):
+        """Asigna un proceso (y sus futuros hijos) al job."""
+        if not self.handle:
+            return False
+        process = self.kernel32.OpenProcess(
+            PROCESS_SET_QUOTA | PROCESS_TERMINATE, False, pid
+        )
+        if not process:
+            return False
+        try:
+            return bool(self.kernel32.AssignProcessToJobObject(self.handle, process))
+        finally:
+            self.kernel32.CloseHandle(process)
+
+    def set_rate(self, percent):
+        """Fija el tope de CPU (None = sin tope)."""
+        if not self.handle:
+            return False
+
+        class JOBOBJECT_CPU_RATE_CONTROL_INFORMATION(ctypes.Structure):
+            _fields_ = [("ControlFlags", ctypes.c_ulong), ("CpuRate", ctypes.c_ulong)]
+
+        info = JOBOBJECT_CPU_RATE_CONTROL_INFORMATION()
+        if percent:
+            info.ControlFlags = (
+                JOB_OBJECT_CPU_RATE_CONTROL_ENABLE | JOB_OBJECT_CPU_RATE_CONTROL_HARD_CAP
+            )
+            info.CpuRate = int(percent * 100)
+        return bool(
+            self.kernel32.SetInformationJobObject(
+                self.handle,
+                JOB_OBJECT_CPU_RATE_CONTROL_INFORMATION,
+                ctypes.byref(info),
+                ctypes.sizeof(info),
+            )
+        )
+
+    def close(self):
+        if self.handle:
+            self.kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+
+class ResourceGovernor:
+    """
+    Ajusta prioridad de CPU, prioridad de E/S y tope de CPU de una tarea.
+
+    Se registra en PROCESS_OBSERVERS con attach(pid). Un hilo revisa la
+    actividad del usuario y la presión de CPU y disco de los demás programas
+    (descontando lo que consume la tarea, según `monitor`) y reaplica la
+    política a todo el árbol de procesos cuando cambia el nivel efectivo o
+    aparecen procesos nuevos. Los servicios que trabajan por cuenta de la
+    tarea (TiWorker, defragsvc) no pertenecen al árbol y no se ven afectados.
+    """
+
+    def __init__(self, task_class, mode="balanced", interval=GOVERNOR_INTERVAL, monitor=None):
+        self.task_class = task_class
+        self.mode = mode
+        self.interval = interval
+        self.monitor = monitor
+        self.level = None
+        self.pressure = (0.0, 0.0)
+        self._load_sample = None
+        self._roots = []
+        self._applied = {}
+        self._job = CpuRateJob() if sys.platform == "win32" else None
+        self._suspended = {}
+        self.paused = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def attach(self, pid):
+        """Agrega un proceso raíz y le aplica la política vigente."""
+        try:
+            process = psutil.Process(pid)
+        except psutil.Error:
+            return
+        if self._job:
+            self._job.assign(pid)
+        with self._lock:
+            self._roots.append(process)
+        self._enforce()
+
+    def set_mode(self, mode):
+        """Cambia el modo elegido por el usuario y lo aplica de inmediato."""
+        self.mode = mode
+        self._enforce()
+
+    def suspend(self):
+        """Suspende el árbol de procesos (los nuevos se suspenden al aparecer)."""
+        self.paused = True
+        self._enforce()
+
+    def resume(self):
+        """Reanuda todos los procesos suspendidos."""
+        self.paused = False
+        with self._lock:
+            suspended, self._suspended = self._suspended, {}
+        for process in suspended.values():
+            try:
+                process.resume()
+            except psutil.Error:
+                continue
+
+    def start(self):
+        psutil.cpu_percent(interval=None)
+        self._load_sample = read_load_sample(self.monitor)
+        self._enforce()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval * 2)
+        self.resume()
+        if self._job:
+            self._job.close()
+
+    def policy(self):
+        """Retorna (prioridad, prioridad de E/S, tope de CPU) del nivel actual."""
+        return GOVERNOR_POLICIES[self.level or self.mode][self.task_class]
+
+    def thread_policy(self, workers):
+        """
+        Política para trabajo en hilos del propio proceso.
+
+        El tope de CPU reduce el número de hilos y, si la política baja la
+        prioridad, cada hilo pasa a segundo plano (set_thread_background).
+
+        Returns:
+           tuple: (número de hilos, función de inicio de hilo o None)
+        """
+        priority, io_priority, cpu_rate = self.policy()
+        if cpu_rate:
+            workers = max(1, workers * cpu_rate // 100)
+        background = priority != "normal" or io_priority != "normal"
+        return workers, (set_thread_background if background else None)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._enforce()
+
+    def _measure_pressure(self):
+        """Actualiza y retorna la carga ajena (CPU %, disco %) desde la última lectura."""
+        with self._lock:
+            before = self._load_sample
+            if before is None or time.monotonic() - before["time"] < PRESSURE_MIN_INTERVAL:
+                return self.pressure
+            after = read_load_sample(self.monitor)
+            self.pressure = compute_foreign_pressure(
+                before, after, psutil.cpu_percent(interval=None), psutil.cpu_count() or 1
+            )
+            self._load_sample = after
+            return self.pressure
+
+    def _enforce(self):
+        cpu_percent, disk_busy_percent = self._measure_pressure()
+        level = resolve_governor_level(
+            self.mode, get_user_idle_seconds(), cpu_percent, disk_busy_percent
+        )
+        with self._lock:
+            changed = level != self.level
+            self.level = level
+            roots = list(self._roots)
+
+        priority, io_priority, cpu_rate = self.policy()
+        if changed and self._job:
+            self._job.set_rate(cpu_rate)
+
+        for root in roots:
+            try:
+                processes = [root] + root.children(recursive=True)
+            except psutil.Error:
+                continue
+            for process in processes:
+                try:
+                    key = (process.pid, process.create_time())
+                    if self.paused and key not in self._suspended:
+                        process.suspend()
+                        with self._lock:
+                            self._suspended[key] = process
+                    if self._applied.get(key) == level:
+                        continue
+                    self._applied[key] = level
+                    process.nice(PRIORITY_VALUES[priority])
+                    if hasattr(process, "ionice"):
+                        process.ionice(*IO_PRIORITY_VALUES[io_priority])
+                except (psutil.Error, OSError, ValueError):
+                    # Sin permisos para subir prioridad (Linux sin root) o proceso terminado
+                    continue
+
+        with self._lock:
+            self._roots = [root for root in self._roots if root.is_running()]
+
+
+# ============================================================================
+# ANÁLISIS DE RESULTADOS DE DISM / SFC
+# ============================================================================
+
+# Estados posibles del almacén de componentes según DISM /ScanHealth
+DISM_HEALTHY = "healthy"
+DISM_REPAIRABLE = "repairable"
+DISM_NOT_REPAIRABLE = "not_repairable"
+DISM_UNKNOWN = "unknown"
+
+# Los patrones evitan letras acentuadas: según la página de códigos de la
+# consola, DISM y SFC pueden devolver "daños" como "da¤os" o "daÃ±os".
+DISM_SCAN_PATTERNS = [
+    (
+        DISM_NOT_REPAIRABLE,
+        r"component store (cannot be repaired|is not repairable)"
+        r"|componentes no se puede reparar",
+    ),
+    (
+        DISM_REPAIRABLE,
+        r"component store is repairable"
+        r"|componentes se puede reparar",
+    ),
+    (
+        DISM_HEALTHY,
+        r"no component store corruption detected"
+        r"|no se (detectaron|ha detectado) da.{1,2}os en el almac.{1,2}n",
+    ),
+]
+
+DISM_RESTORE_OK_PATTERN = (
+    r"restore operation completed successfully"
+    r"|operaci.{1,2}n de restauraci.{1,2}n se complet.{1,2} correctamente"
+    r"|component store corruption was repaired"
+    r"|se repararon los da.{1,2}os"
+)
+
+SFC_CLEAN = "clean"
+SFC_REPAIRED = "repaired"
+SFC_UNREPAIRED = "unrepaired"
+SFC_FAILED = "failed"
+
+SFC_PATTERNS = [
+    (
+        SFC_UNREPAIRED,
+        r"unable to fix some of them"
+        r"|no pudo (corregir|reparar) algunos",
+    ),
+    (
+        SFC_REPAIRED,
+        r"found corrupt files and successfully repaired them"
+        r"|archivos da.{1,2}ados y los repar.{1,2} correctamente",
+    ),
+    (
+        SFC_CLEAN,
+        r"did not find any integrity violations"
+        r"|no encontr.{1,2} ninguna infracci.{1,2}n de integridad",
+    ),
+    (
+        SFC_FAILED,
+        r"could not perform the requested operation"
+        r"|there is a system repair pending"
+        r"|no pudo realizar la operaci.{1,2}n solicitada"
+        r"|reparaci.{1,2}n del sistema pendiente",
+    ),
+]
+
+COMPONENT_CLEANUP_PATTERN = (
+    r"(component store cleanup recommended"
+    r"|limpieza[^:\n]*recomendad[ao][^:\n]*"
+    r"|se recomienda (la )?limpieza[^:\n]*)\s*:\s*(?P<value>\S+)"
+)
+
+
+def normalize_tool_output(text):
+    """
+    Normaliza la salida de DISM/SFC para poder analizarla.
+
+    SFC escribe en UTF-16, por lo que al capturarlo como texto aparecen
+    caracteres nulos entre cada letra; también se unifican saltos de línea.
+    """
+    if not text:
+        return ""
+    text = text.replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n")
+    return re.sub(r"[ \t]+", " ", text).lower()
+
+
+def parse_dism_scan_health(output):
+    """
+    Interpreta la salida de DISM /ScanHealth.
+
+    Returns:
+       str: DISM_HEALTHY, DISM_REPAIRABLE, DISM_NOT_REPAIRABLE o DISM_UNKNOWN
+    """
+    text = normalize_tool_output(output)
+    for state, pattern in DISM_SCAN_PATTERNS:
+        if re.search(pattern, text):
+            return state
+    return DISM_UNKNOWN
+
+
+def parse_dism_restore_health(output, returncode=0):
+    """Indica si DISM /RestoreHealth terminó reparando la imagen."""
+    text = normalize_tool_output(output)
+    if re.search(DISM_RESTORE_OK_PATTERN, text):
+        return True
+    return returncode == 0 and "error" not in text
+
+
+def parse_sfc_result(output):
+    """
+    Interpreta la salida de sfc /scannow.
+
+    Returns:
+       str: SFC_CLEAN, SFC_REPAIRED, SFC_UNREPAIRED, SFC_FAILED o None
+    """
+    text = normalize_tool_output(output)
+    for state, pattern in SFC_PATTERNS:
+        if re.search(pattern, text):
+            return state
+    return None
+
+
+def parse_component_store_analysis(output):
+    """
+    Lee el campo "Component Store Cleanup Recommended" de
+    DISM /AnalyzeComponentStore.
+
+    Returns:
+       bool | None: True/False según la recomendación, None si no aparece
+    """
+    match = re.search(COMPONENT_CLEANUP_PATTERN, normalize_tool_output(output))
+    if not match:
+        return None
+    return match.group("value").startswith(("yes", "s"))
+
+
+# ============================================================================
+# OPTIMIZACIÓN DE VOLÚMENES SEGÚN TIPO DE MEDIO
+# ============================================================================
+
+# Unidades que antes se optimizaban de forma fija; si faltan se informa en el plan
+EXPECTED_VOLUMES = ["C:", "D:"]
+
+# Porcentaje de fragmentación a partir del cual se desfragmenta un HDD
+DEFRAG_THRESHOLD_PERCENT = 10
+
+# Sistemas de archivos que admite defrag.exe para TRIM/desfragmentación
+DEFRAG_FILESYSTEMS = ("NTFS", "REFS")
+
+# Una sola consulta: unidades lógicas + partición + disco físico (MediaType)
+VOLUME_INVENTORY_SCRIPT = r"""
+$ErrorActionPreference = 'SilentlyContinue'
+$physical = @{}
+Get-PhysicalDisk | ForEach-Object { $physical[[string]$_.DeviceId] = $_ }
+$result = foreach ($ld in Get-CimInstance -ClassName Win32_LogicalDisk) {
+   $part = Get-Partition -DriveLetter $ld.DeviceID.TrimEnd(':')
+   $pd = if ($part) { $physical[[string]$part.DiskNumber] }
+   [pscustomobject]@{
+      Drive = $ld.DeviceID
+      DriveType = [int]$ld.DriveType
+      FileSystem = $ld.FileSystem
+      Size = [int64]$ld.Size
+      Free = [int64]$ld.FreeSpace
+      DiskNumber = if ($part) { [int]$part.DiskNumber } else { $null }
+      MediaType = if ($pd) { [string]$pd.MediaType } else { $null }
+      BusType = if ($pd) { [string]$pd.BusType } else { $null }
+   }
+}
+ConvertTo-Json -InputObject @($result) -Compress
+"""
+
+# Win32_LogicalDisk.DriveType
+DRIVE_TYPE_REMOVABLE = 2
+DRIVE_TYPE_FIXED = 3
+DRIVE_TYPE_NETWORK = 4
+DRIVE_TYPE_OPTICAL = 5
+
+
+def parse_volume_inventory(text):
+    """
+    Convierte la salida JSON de VOLUME_INVENTORY_SCRIPT en una lista de volúmenes.
+
+    Returns:
+       list: dicts con drive, drive_type, filesystem, size, free, disk,
+             media_type y bus_type
+
+    Raises:
+       ValueError: si la salida no es JSON válido
+    """
+    data = json.loads(text) if text and text.strip() else []
+    if isinstance(data, dict):
+        data = [data]
+
+    volumes = []
+    for item in data:
+        if not item or not item.get("Drive"):
+            continue
+        volumes.append(
+            {
+                "drive": item["Drive"].upper(),
+                "drive_type": item.get("DriveType"),
+                "filesystem": (item.get("FileSystem") or "").upper(),
+                "size": item.get("Size") or 0,
+                "free": item.get("Free") or 0,
+                "disk": item.get("DiskNumber"),
+                "media_type": (item.get("MediaType") or "").upper(),
+                "bus_type": (item.get("BusType") or "").upper(),
+            }
+        )
+    return volumes
+
+
+def get_volume_inventory():
+    """
+    Enumera volúmenes y discos físicos con una sola llamada a PowerShell.
+
+    Returns:
+       tuple: (lista de volúmenes, None) o (None, mensaje de error)
+    """
+    code, out, err = run_command(
+        ["powershell", "-NoProfile", "-Command", VOLUME_INVENTORY_SCRIPT],
+        shell=False,
+        timeout=60,
+    )
+    if code != 0:
+        return None, (err or out or f"código {code}").strip()[:200]
+    try:
+        volumes = parse_volume_inventory(out)
+    except ValueError as e:
+        return None, f"salida no válida: {e}"
+    if not volumes:
+        return None, "PowerShell no devolvió ningún volumen"
+    return volumes, None
+
+
+def classify_volume(volume):
+    """
+    Clasifica un volumen según el medio que lo respalda.
+
+    Returns:
+       str: "ssd", "hdd", "removable", "network", "optical" o "unknown"
+    """
+    drive_type = volume.get("drive_type")
+    if drive_type == DRIVE_TYPE_NETWORK:
+        return "network"
+    if drive_type == DRIVE_TYPE_OPTICAL:
+        return "optical"
+    if drive_type == DRIVE_TYPE_REMOVABLE or volume.get("bus_type") == "USB":
+        return "removable"
+    if volume.get("media_type") in ("SSD", "SCM"):
+        return "ssd"
+    if volume.get("media_type") == "HDD":
+        return "hdd"
+    return "unknown"
+
+
+def plan_volume_optimization(volumes, expected=EXPECTED_VOLUMES):
+    """
+    Decide la acción para cada volumen: "retrim" (SSD), "defrag" (HDD) o None.
+
+    Returns:
+       list: entradas con drive, disk, media, action y reason
+    """
+    plan = []
+    present = {v["drive"] for v in volumes}
+
+    for drive in expected:
+        if drive.upper() not in present:
+            plan.append(
+                {
+                    "drive": drive.upper(),
+                    "disk": None,
+                    "media": None,
+                    "action": None,
+                    "reason": "la unidad no existe en este equipo",
+                }
+            )
+
+    for volume in sorted(volumes, key=lambda v: v["drive"]):
+        media = classify_volume(volume)
+        entry = {
+            "drive": volume["drive"],
+            "disk": volume.get("disk"),
+            "media": media,
+            "action": None,
+            "reason": "",
+        }
+        if media == "network":
+            entry["reason"] = "unidad de red"
+        elif media == "optical":
+            entry["reason"] = "unidad óptica"
+        elif media == "removable":
+            entry["reason"] = "unidad extraíble/USB"
+        elif volume["filesystem"] not in DEFRAG_FILESYSTEMS:
+            entry["reason"] = f"sistema de archivos {volume['filesystem'] or 'desconocido'}"
+        elif media == "ssd":
+            entry["action"] = "retrim"
+            entry["reason"] = "SSD: TRIM"
+        elif media == "hdd":
+            entry["action"] = "defrag"
+            entry["reason"] = (
+                f"HDD: desfragmentar si supera {DEFRAG_THRESHOLD_PERCENT}% "
+                "de fragmentación"
+            )
+        else:
+            entry["reason"] = "tipo de medio no identificado (p. ej. disco virtual)"
+        plan.append(entry)
+
+    return plan
+
+
+def parse_defrag_analysis(output):
+    """
+    Extrae el porcentaje de espacio fragmentado de "defrag X: /A".
+
+    Returns:
+       int | None: porcentaje o None si no se encontró
+    """
+    match = re.search(
+        r"(fragmented space|espacio fragmentado)[^=\n]*=\s*(\d+)\s*%",
+        normalize_tool_output(output),
+    )
+    return int(match.group(2)) if match else None
+
+
+# ============================================================================
+# LIMPIEZA NATIVA DE ARCHIVOS TEMPORALES
+# ============================================================================
+
+# Hilos para recorrer directorios (la mayor parte del tiempo es E/S)
+SCAN_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Solo se borran archivos con más de estas horas sin modificarse
+TEMP_CLEANUP_MIN_AGE_HOURS = 24
+
+# _MEI*: carpeta donde PyInstaller descomprime este mismo ejecutable
+TEMP_CLEANUP_EXCLUSIONS = ["_MEI*", "*.lock"]
+
+FILE_ATTRIBUTE_READONLY = 0x1
+FILE_ATTRIBUTE_REPARSE_POINT = 0x400
+
+
+def format_bytes(size):
+    """Formatea un tamaño en bytes a una unidad legible."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+        size /= 1024
+    return f"{size:.2f} TB"
+
+
+def parallel_scandir(
+    roots, visit, max_workers=SCAN_WORKERS, cancel_event=None, thread_init=None
+):
+    """
+    Recorre árboles de directorios en paralelo usando os.scandir.
+
+    Args:
+       roots: Directorios iniciales
+       visit: Función visit(path, entries) llamada por cada directorio con su
+              lista de os.DirEntry; retorna los subdirectorios a recorrer
+       max_workers: Número de hilos
+       cancel_event: threading.Event opcional para detener el recorrido
+       thread_init: Función opcional que cada hilo ejecuta al iniciar
+    """
+    pending = queue.Queue()
+    for root in roots:
+        pending.put(root)
+
+    def worker():
+        if thread_init:
+            thread_init()
+        while True:
+            path = pending.get()
+            try:
+                if path is None:
+                    return
+                if cancel_event is not None and cancel_event.is_set():
+                    continue
+                try:
+                    with os.scandir(path) as iterator:
+                        entries = list(iterator)
+                    subdirs = visit(path, entries) or ()
+                except Exception:
+                    continue
+                for subdir in subdirs:
+                    pending.put(subdir)
+            finally:
+                pending.task_done()
+
+    threads = [
+        threading.Thread(target=worker, daemon=True) for _ in range(max_workers)
+    ]
+    for thread in threads:
+        thread.start()
+    pending.join()
+    for _ in threads:
+        pending.put(None)
+    for thread in threads:
+        thread.join()
+
+
+def is_reparse_point(entry):
+    """Indica si la entrada es un enlace simbólico o junction (no se sigue)."""
+    if entry.is_symlink():
+        return True
+    try:
+        attributes = entry.stat(follow_symlinks=False).st_file_attributes
+    except (AttributeError, OSError):
+        return False
+    return bool(attributes & FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def remove_file(entry):
+    """Borra un archivo; si es de solo lectura le quita el atributo y reintenta."""
+    try:
+        os.unlink(entry.path)
+        return True
+    except PermissionError:
+        try:
+            os.chmod(entry.path, stat.S_IWRITE)
+            os.unlink(entry.path)
+            return True
+        except OSError:
+            return False
+    except FileNotFoundError:
+        return False
+    except OSError:
+        return False
+
+
+def clean_directory(
+    root,
+    min_age_hours=TEMP_CLEANUP_MIN_AGE_HOURS,
+    exclusions=TEMP_CLEANUP_EXCLUSIONS,
+    dry_run=False,
+    max_workers=SCAN_WORKERS,
+    cancel_event=None,
+    thread_init=None,
+):
+    """
+    Borra el contenido de un directorio en paralelo sin borrar la raíz.
+
+    Los archivos bloqueados o en uso se omiten al primer intento en lugar de
+    reintentar, y los directorios que quedan vacíos se eliminan al final.
+
+    Returns:
+       dict: files, bytes, skipped (bloqueados/en uso), recent, dirs
+    """
+    stats = {"files": 0, "bytes": 0, "skipped": 0, "recent": 0, "dirs": 0}
+    lock = threading.Lock()
+    directories = []
+    cutoff = time.time() - min_age_hours * 3600
+
+    def visit(path, entries):
+        files = size = skipped = recent = 0
+        subdirs = []
+        for entry in entries:
+            if any(fnmatch.fnmatch(entry.name, pattern) for pattern in exclusions):
+                continue
+            try:
+                if is_reparse_point(entry):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                info = entry.stat(follow_symlinks=False)
+            except OSError:
+                skipped += 1
+                continue
+
+            if info.st_mtime > cutoff:
+                recent += 1
+                continue
+            if dry_run or remove_file(entry):
+                files += 1
+                size += info.st_size
+            else:
+                skipped += 1
+
+        with lock:
+            stats["files"] += files
+            stats["bytes"] += size
+            stats["skipped"] += skipped
+            stats["recent"] += recent
+            directories.extend(subdirs)
+        return subdirs
+
+    parallel_scandir([root], visit, max_workers, cancel_event, thread_init)
+
+    if not dry_run:
+        # Los más profundos primero; rmdir falla rápido si no quedó vacío
+        for directory in sorted(directories, key=len, reverse=True):
+            try:
+                os.rmdir(directory)
+                stats["dirs"] += 1
+            except OSError:
+                pass
+
+    return stats
+
+
+def get_temp_locations():
+    """
+    Lista las ubicaciones de temporales a limpiar.
+
+    Returns:
+       list: tuplas (nombre, ruta) de %TEMP%, el TEMP de cada perfil de
+             usuario y Windows\\Temp (solo las que existen). Prefetch no se
+             toca: vaciarlo vuelve más lento el siguiente inicio de cada programa
+    """
+    locations = []
+    seen = set()
+
+    def add(label, path):
+        if not path or not os.path.isdir(path):
+            return
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            locations.append((label, path))
+
+    add("TEMP del usuario actual", os.environ.get("TEMP"))
+
+    system_drive = os.environ.get("SystemDrive", "C:") + os.sep
+    try:
+        with os.scandir(os.path.join(system_drive, "Users")) as profiles:
+            for profile in profiles:
+                if profile.is_dir(follow_symlinks=False):
+                    add(
+                        f"TEMP de {profile.name}",
+                        os.path.join(profile.path, "AppData", "Local", "Temp"),
+                    )
+    except OSError:
+        pass
+
+    windows_dir = os.environ.get("SystemRoot", "C:\\Windows")
+    add("Windows\\Temp", os.path.join(windows_dir, "Temp"))
+    return locations
+
+
+def empty_recycle_bin():
+    """Vacía la papelera de reciclaje de todas las unidades sin diálogos."""
+    SHERB_NOCONFIRMATION = 0x1
+    SHERB_NOPROGRESSUI = 0x2
+    SHERB_NOSOUND = 0x4
+    try:
+        result = ctypes.windll.shell32.SHEmptyRecycleBinW(
+            None, None, SHERB_NOCONFIRMATION | SHERB_NOPROGRESSUI | SHERB_NOSOUND
+        )
+        return result == 0
+    except Exception:
+        return False
+
+
+def save_run_record(record):
+    """Guarda el resumen de una ejecución en el historial (JSON)."""
+    try:
+        RUN_HISTORY_DIR.mkdir(parents=True, exist_ok=True)
+        path = RUN_HISTORY_DIR / f"run_{record['run_id']}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+        return path
+    except Exception:
+        return None
+
+
+# ============================================================================
+# ANALIZADOR DE USO DE DISCO
+# ============================================================================
+
+# Umbrales para recomendar una tarea de limpieza (bytes recuperables)
+CLEANUP_RECOMMENDATION_RULES = [
+    ("temp_files", ("Temporales", "Papelera de reciclaje"), 500 * 1024**2),
+    ("cleanmgr", ("Caché de Windows Update",), 1024**3),
+    ("clean_winsxs", ("WinSxS",), 8 * 1024**3),
+    ("disable_hibernation", ("Archivo de hibernación",), 4 * 1024**3),
+]
+
+# Perfiles sin uso durante más de estos días se reportan como antiguos
+OLD_PROFILE_DAYS = 180
+
+SYSTEM_PROFILES = ("Default", "Default User", "Public", "All Users")
+
+
+class DirectorySizeIndex:
+    """
+    Árbol compacto de tamaños por directorio.
+
+    Cada directorio es un índice en arreglos paralelos (padre, bytes propios,
+    archivos, mtime) en lugar de un dict por nodo, así escala a millones de
+    entradas. Los hijos siempre tienen un índice mayor que su padre.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.names = []
+        self.parent = array("l")
+        self.own_bytes = array("q")
+        self.own_files = array("q")
+        self.total_bytes = array("q")
+        self.total_files = array("q")
+        self.mtime = array("d")
+        self.path_index = {}
+        self.first_child = array("l")
+        self.next_sibling = array("l")
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.names)
+
+    def _add_node(self, path, name, parent, mtime=0.0):
+        """Reserva un nodo; se llama con el lock tomado."""
+        index = len(self.names)
+        self.names.append(name)
+        self.parent.append(parent)
+        self.own_bytes.append(0)
+        self.own_files.append(0)
+        self.mtime.append(mtime)
+        self.path_index[path] = index
+        return index
+
+    def scan(self, max_workers=SCAN_WORKERS, cancel_event=None):
+        """
+        Recorre el volumen en paralelo.
+
+        Siempre se listan todos los directorios: un archivo que crece en su
+        lugar no cambia el mtime de su carpeta, así que no hay forma segura
+        de reutilizar tamaños de un recorrido anterior.
+        """
+        try:
+            root_mtime = os.stat(self.root).st_mtime
+        except OSError:
+            root_mtime = 0.0
+        self._add_node(self.root, self.root, -1, root_mtime)
+
+        def visit(path, entries):
+            subdirs = []
+            size = files = 0
+            with self._lock:
+                index = self.path_index[path]
+            for entry in entries:
+                try:
+                    if is_reparse_point(entry):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        mtime = entry.stat(follow_symlinks=False).st_mtime
+                        subdirs.append((entry.path, entry.name, mtime))
+                    else:
+                        size += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+                except OSError:
+                    continue
+
+            with self._lock:
+                self.own_bytes[index] = size
+                self.own_files[index] = files
+                for sub_path, name, mtime in subdirs:
+                    self._add_node(sub_path, name, index, mtime)
+            return [sub[0] for sub in subdirs]
+
+        parallel_scandir([self.root], visit, max_workers, cancel_event)
+        self._finalize()
+        return self
+
+    def _finalize(self):
+        """Acumula totales de abajo hacia arriba y enlaza hijos."""
+        count = len(self.names)
+        self.total_bytes = array("q", self.own_bytes)
+        self.total_files = array("q", self.own_files)
+        self.first_child = array("l", [-1]) * count
+        self.next_sibling = array("l", [-1]) * count
+        for index in range(count - 1, 0, -1):
+            parent = self.parent[index]
+            self.total_bytes[parent] += self.total_bytes[index]
+            self.total_files[parent] += self.total_files[index]
+            self.next_sibling[index] = self.first_child[parent]
+            self.first_child[parent] = index
+
+    def size_of(self, path):
+        """Tamaño total de un directorio del índice (0 si no se recorrió)."""
+        index = self.path_index.get(path)
+        return self.total_bytes[index] if index is not None else 0
+
+    def children(self, path):
+        """Lista (nombre, ruta) de los subdirectorios de un directorio."""
+        index = self.path_index.get(path)
+        result = []
+        child = self.first_child[index] if index is not None else -1
+        while child != -1:
+            result.append((self.names[child], os.path.join(path, self.names[child])))
+            child = self.next_sibling[child]
+        return result
+
+
+def find_space_consumers(index, windows_dir=None, now=None):
+    """
+    Identifica los consumidores de espacio conocidos en el índice.
+
+    Returns:
+       list: dicts con category, path y bytes, ordenados de mayor a menor
+    """
+    root = index.root
+    windows_dir = windows_dir or os.path.join(root, "Windows")
+    users_dir = os.path.join(root, "Users")
+    now = now or time.time()
+    consumers = []
+
+    def add(category, path, size=None):
+        size = index.size_of(path) if size is None else size
+        if size:
+            consumers.append({"category": category, "path": path, "bytes": size})
+
+    add("WinSxS", os.path.join(windows_dir, "WinSxS"))
+    add(
+        "Caché de Windows Update",
+        os.path.join(windows_dir, "SoftwareDistribution", "Download"),
+    )
+    add("Temporales", os.path.join(windows_dir, "Temp"))
+    add("Papelera de reciclaje", os.path.join(root, "$Recycle.Bin"))
+
+    try:
+        add(
+            "Archivo de hibernación",
+            os.path.join(root, "hiberfil.sys"),
+            os.path.getsize(os.path.join(root, "hiberfil.sys")),
+        )
+    except OSError:
+        pass
+
+    for name, profile in index.children(users_dir):
+        if name in SYSTEM_PROFILES:
+            continue
+        add("Temporales", os.path.join(profile, "AppData", "Local", "Temp"))
+        add("Descargas de usuarios", os.path.join(profile, "Downloads"))
+        try:
+            last_use = os.stat(os.path.join(profile, "NTUSER.DAT")).st_mtime
+        except OSError:
+            continue
+        if now - last_use > OLD_PROFILE_DAYS * 86400:
+            add("Perfiles antiguos", profile)
+
+    return sorted(consumers, key=lambda c: c["bytes"], reverse=True)
+
+
+def recommend_cleanup_tasks(consumers):
+    """
+    Decide qué tareas de limpieza realmente recuperarían espacio.
+
+    Returns:
+       dict: task_id -> (recomendada: bool, motivo: str)
+    """
+    totals = {}
+    for consumer in consumers:
+        totals[consumer["category"]] = (
+            totals.get(consumer["category"], 0) + consumer["bytes"]
+        )
+
+    recommendations = {}
+    for task_id, categories, threshold in CLEANUP_RECOMMENDATION_RULES:
+        reclaimable = sum(totals.get(category, 0) for category in categories)
+        recommended = reclaimable >= threshold
+        reason = (
+            f"{format_bytes(reclaimable)} en {', '.join(categories)}"
+            if reclaimable
+            else "sin espacio recuperable"
+        )
+        recommendations[task_id] = (recommended, reason)
+    return recommendations
+
+
+# ============================================================================
+# INTEGRACIÓN CON WINGET
+# ============================================================================
+
+WINGET_EXE = "winget"
+WINGET_COMMON_ARGS = [
+    "--accept-source-agreements",
+    "--disable-interactivity",
+]
+WINGET_CACHE_DIR = LOG_DIR / "winget_cache"
+
+# 0x8A15002B: no hay una actualización aplicable; 3010/1641: requiere reinicio
+WINGET_NO_UPGRADE = 0x8A15002B
+INSTALL_SUCCESS_CODES = (0, 3010, 1641)
+
+# Encabezado de la tabla de paquetes anclados o que exigen --id explícito
+# ("require explicit targeting" / "requieren ... explícit..."); no se actualizan
+WINGET_EXPLICIT_HEADER = re.compile(r"explicit targeting|requieren .*expl[ií]cit", re.I)
+
+# Argumentos silenciosos por tecnología cuando se instala la descarga previa
+SILENT_ARGS_BY_TYPE = {
+    "inno": "/VERYSILENT /SUPPRESSMSGBOXES /NORESTART /SP-",
+    "nullsoft": "/S",
+    "burn": "/quiet /norestart",
+    "wix": "/qn /norestart",
+    "msi": "/qn /norestart",
+}
+
+
+def parse_winget_table(text):
+    """
+    Lee la(s) tabla(s) de texto de "winget upgrade" por posición de columnas.
+
+    winget no ofrece salida estructurada para las actualizaciones, así que las
+    columnas se ubican a partir del encabezado que precede a la línea de
+    guiones (funciona con encabezados en inglés o español). La lectura se
+    detiene en la tabla de paquetes que requieren selección explícita
+    (anclados con "winget pin"), que no deben actualizarse.
+
+    Returns:
+       list: dicts con name, id, version, available y source
+    """
+    keys = ["name", "id", "version", "available", "source"]
+    lines = [line.rsplit("\r", 1)[-1].rstrip() for line in text.splitlines()]
+    packages = []
+
+    for position, line in enumerate(lines):
+        if WINGET_EXPLICIT_HEADER.search(line):
+            break
+        if position == 0 or len(line) < 10 or set(line) != {"-"}:
+            continue
+        header = lines[position - 1]
+        starts = [m.start() for m in re.finditer(r"\S+", header)][: len(keys)]
+        if len(starts) < 4:
+            continue
+
+        for row in lines[position + 1 :]:
+            if not row.strip() or len(row) <= starts[3]:
+                break
+            values = []
+            for column, start in enumerate(starts):
+                end = starts[column + 1] if column + 1 < len(starts) else None
+                values.append(row[start:end].strip())
+            item = dict(zip(keys, values))
+            if item.get("id") and " " not in item["id"]:
+                packages.append(item)
+    return packages
+
+
+def is_winget_excluded(package_id, excluded_ids):
+    """Indica si un paquete está excluido por la política (admite comodines)."""
+    package_id = package_id.lower()
+    return any(fnmatch.fnmatch(package_id, pattern.lower()) for pattern in excluded_ids)
+
+
+def get_winget_upgrades():
+    """
+    Obtiene la lista de paquetes con actualización disponible.
+
+    Returns:
+       tuple: (paquetes: list, error: str)
+    """
+    code, out, err = run_command(
+        [WINGET_EXE, "upgrade", "--include-unknown", *WINGET_COMMON_ARGS],
+        shell=False,
+        timeout=300,
+        encoding="utf-8",
+    )
+    packages = parse_winget_table(out)
+    if not packages and code != 0 and code & 0xFFFFFFFF != WINGET_NO_UPGRADE:
+        return [], err or out[-200:] or f"código {code}"
+    return packages, ""
+
+
+def read_downloaded_manifest(directory):
+    """
+    Busca el instalador y el manifiesto que deja "winget download".
+
+    Returns:
+       tuple: (ruta_instalador | None, tipo_instalador, argumentos_silenciosos)
+    """
+    installer = None
+    installer_type = ""
+    silent = ""
+    for entry in os.scandir(directory):
+        name = entry.name.lower()
+        if name.endswith((".exe", ".msi")):
+            installer = entry.path
+        elif name.endswith(".yaml"):
+            with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                manifest = f.read()
+            match = re.search(r"^[\s-]*InstallerType:\s*(\w+)", manifest, re.M)
+            installer_type = match.group(1).lower() if match else ""
+            match = re.search(r"^[\s-]*Silent:\s*(.+)$", manifest, re.M)
+            silent = match.group(1).strip().strip("'\"") if match else ""
+    return installer, installer_type, silent
+
+
+def download_winget_package(package, cache_dir):
+    """Descarga el instalador de un paquete a su carpeta de caché."""
+    target = Path(cache_dir) / re.sub(r"[^\w.\-]", "_", package["id"])
+    target.mkdir(parents=True, exist_ok=True)
+    code, out, err = run_command(
+        [
+            WINGET_EXE,
+            "download",
+            "--id",
+            package["id"],
+            "--exact",
+            "--download-directory",
+            str(target),
+            "--accept-package-agreements",
+            *WINGET_COMMON_ARGS,
+        ],
+        shell=False,
+        timeout=1800,
+        encoding="utf-8",
+    )
+    return target if code == 0 else None
+
+
+def install_downloaded_package(directory):
+    """
+    Instala un paquete desde su descarga previa si la tecnología es conocida.
+
+    Returns:
+       int | None: código de salida, o None si no se pudo instalar así
+    """
+    installer, installer_type, silent = read_downloaded_manifest(directory)
+    if not installer:
+        return None
+
+    if installer.lower().endswith(".msi") or installer_type in ("msi", "wix"):
+        command = ["msiexec.exe", "/i", installer, "/qn", "/norestart"]
+    elif silent:
+        command = [installer, *silent.split()]
+    elif installer_type in SILENT_ARGS_BY_TYPE:
+        command = [installer, *SILENT_ARGS_BY_TYPE[installer_type].split()]
+    else:
+        return None
+
+    code, out, err = run_command(command, shell=False, timeout=1800)
+    return code
+
+
+def install_winget_package(package, download_dir):
+    """
+    Instala la actualización desde la descarga previa o, si esa vía no es
+    posible (sin descarga o tecnología desconocida), con "winget upgrade".
+
+    Un instalador descargado que se ejecutó y falló no se reintenta con
+    winget: repetir la instalación sobre un intento fallido deja el equipo
+    en un estado peor.
+
+    Returns:
+       tuple: (código de salida, método usado)
+    """
+    code = install_downloaded_package(download_dir) if download_dir else None
+    if code is not None:
+        return code, "descarga previa"
+    return upgrade_winget_package(package), "winget"
+
+
+def upgrade_winget_package(package):
+    """Actualiza un paquete directamente con winget (descarga incluida)."""
+    code, out, err = run_command(
+        [
+            WINGET_EXE,
+            "upgrade",
+            "--id",
+            package["id"],
+            "--exact",
+            "--silent",
+            "--accept-package-agreements",
+            *WINGET_COMMON_ARGS,
+        ],
+        shell=False,
+        timeout=1800,
+        encoding="utf-8",
+    )
+    return code
+
+
+# ============================================================================
+# LÍNEA BASE DE RENDIMIENTO (ANTES / DESPUÉS)
+# ============================================================================
+
+BOOT_EVENT_SCRIPT = (
+    "$e = Get-WinEvent -FilterHashtable @{LogName="
+    "'Microsoft-Windows-Diagnostics-Performance/Operational'; Id=100} "
+    "-MaxEvents 1 -ErrorAction SilentlyContinue; if ($e) { $e.ToXml() }"
+)
+
+STARTUP_RUN_KEYS = [
+    ("HKEY_LOCAL_MACHINE", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Run"),
+    ("HKEY_LOCAL_MACHINE", r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Run"),
+    ("HKEY_CURRENT_USER", r"Software\Microsoft\Windows\CurrentVersion\Run"),
+]
+
+# Duración de las micro-pruebas (se mantienen cortas para no alterar el equipo)
+CPU_PROBE_ITERATIONS = 2_000_000
+DISK_PROBE_BYTES = 32 * 1024**2
+
+# True = un valor mayor es mejor; False = un valor menor es mejor
+BASELINE_METRICS = [
+    ("free_bytes", "Espacio libre total", True),
+    ("committed_bytes", "Memoria comprometida", False),
+    ("services", "Servicios en ejecución", False),
+    ("processes", "Procesos en ejecución", False),
+    ("startup_items", "Elementos de inicio", False),
+    ("cpu_ops_per_sec", "Micro-prueba CPU (op/s)", True),
+    ("disk_write_mbps", "Micro-prueba escritura (MB/s)", True),
+    ("disk_read_mbps", "Micro-prueba lectura (MB/s)", True),
+]
+
+# Se guardan en cada línea base pero no se comparan: la duración del arranque
+# solo cambia tras reiniciar, y antes y después se miden en la misma sesión
+BASELINE_ABSOLUTE_METRICS = [
+    ("boot_ms", "Duración del último arranque (ms)"),
+]
+
+
+def get_volume_free_space():
+    """Espacio libre por volumen fijo (bytes)."""
+    volumes = {}
+    for partition in psutil.disk_partitions(all=False):
+        if "cdrom" in partition.opts or "remote" in partition.opts:
+            continue
+        if not partition.fstype:
+            continue
+        try:
+            volumes[partition.mountpoint] = psutil.disk_usage(partition.mountpoint).free
+        except OSError:
+            continue
+    return volumes
+
+
+def get_committed_memory():
+    """Memoria comprometida del sistema (bytes)."""
+    try:
+
+        class PERFORMANCE_INFORMATION(ctypes.Structure):
+            _fields_ = [
+                ("cb", ctypes.c_ulong),
+                ("CommitTotal", ctypes.c_size_t),
+                ("CommitLimit", ctypes.c_size_t),
+                ("CommitPeak", ctypes.c_size_t),
+                ("PhysicalTotal", ctypes.c_size_t),
+                ("PhysicalAvailable", ctypes.c_size_t),
+                ("SystemCache", ctypes.c_size_t),
+                ("KernelTotal", ctypes.c_size_t),
+                ("KernelPaged", ctypes.c_size_t),
+                ("KernelNonpaged", ctypes.c_size_t),
+                ("PageSize", ctypes.c_size_t),
+                ("HandleCount", ctypes.c_ulong),
+                ("ProcessCount", ctypes.c_ulong),
+                ("ThreadCount", ctypes.c_ulong),
+            ]
+
+        info = PERFORMANCE_INFORMATION()
+        info.cb = ctypes.sizeof(info)
+        if ctypes.windll.psapi.GetPerformanceInfo(ctypes.byref(info), info.cb):
+            return info.CommitTotal * info.PageSize
+    except Exception:
+        pass
+    return psutil.virtual_memory().used + psutil.swap_memory().used
+
+
+def count_running_services():
+    """Número de servicios en ejecución (None fuera de Windows)."""
+    if not hasattr(psutil, "win_service_iter"):
+        return None
+    code, out, err = run_command("sc query type= service state= running", timeout=30)
+    return len(re.findall(r"^SERVICE_NAME:", out, re.M)) if code == 0 else None
+
+
+def count_startup_items():
+    """Elementos de inicio en claves Run y carpetas de Inicio (None fuera de Windows)."""
+    try:
+        import winreg
+    except ImportError:
+        return None
+
+    count = 0
+    for hive_name, key_path in STARTUP_RUN_KEYS:
+        try:
+            with winreg.OpenKey(getattr(winreg, hive_name), key_path) as key:
+                count += winreg.QueryInfoKey(key)[1]
+        except OSError:
+            continue
+
+    folders = [
+        os.path.join(
+            os.environ.get("APPDATA", ""),
+            r"Microsoft\Windows\Start Menu\Programs\Startup",
+        ),
+        os.path.join(
+            os.environ.get("ProgramData", r"C:\ProgramData"),
+            r"Microsoft\Windows\Start Menu\Programs\Startup",
+        ),
+    ]
+    for folder in folders:
+        try:
+            count += sum(
+                1 for entry in os.scandir(folder) if entry.name.lower() != "desktop.ini"
+            )
+        except OSError:
+            continue
+    return count
+
+
+def get_last_boot_duration():
+    """Duración del último arranque en ms según el evento 100 de Diagnostics-Performance."""
+    code, out, err = run_command(
+        ["powershell", "-NoProfile", "-Command", BOOT_EVENT_SCRIPT],
+        shell=False,
+        timeout=30,
+    )
+    match = re.search(r"<Data Name='BootTime'>(\d+)</Data>", out)
+    return int(match.group(1)) if match else None
+
+
+def probe_cpu(iterations=CPU_PROBE_ITERATIONS):
+    """Micro-prueba de CPU: operaciones enteras por segundo en un hilo."""
+    start = time.perf_counter()
+    total = 0
+    for i in range(iterations):
+        total += i * i % 7
+    return round(iterations / (time.perf_counter() - start))
+
+
+def probe_disk(size=DISK_PROBE_BYTES, directory=None):
+    """
+    Micro-prueba de disco: escribe y relee un archivo temporal.
+
+    Returns:
+       tuple: (MB/s escritura, MB/s lectura)
+    """
+    block = os.urandom(1024 * 1024)
+    fd, path = tempfile.mkstemp(prefix="pqn_probe_", dir=directory)
+    try:
+        start = time.perf_counter()
+        with os.fdopen(fd, "wb") as f:
+            for _ in range(size // len(block)):
+                f.write(block)
+            f.flush()
+            os.fsync(f.fileno())
+        write_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            while f.read(len(block)):
+                pass
+        read_seconds = time.perf_counter() - start
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    megabytes = size / 1024**2
+    return round(megabytes / write_seconds, 1), round(megabytes / read_seconds, 1)
+
+
+def capture_baseline():
+    """
+    Toma una foto del estado del sistema.
+
+    Los colectores corren en paralelo; las micro-pruebas se ejecutan después,
+    en serie, para que no compitan con ellos ni entre sí.
+
+    Returns:
+       dict: métricas de BASELINE_METRICS y BASELINE_ABSOLUTE_METRICS más
+             volumes, timestamp y elapsed
+    """
+    start = time.time()
+    collectors = {
+        "volumes": get_volume_free_space,
+        "committed_bytes": get_committed_memory,
+        "services": count_running_services,
+        "processes": lambda: len(psutil.pids()),
+        "startup_items": count_startup_items,
+        "boot_ms": get_last_boot_duration,
+    }
+
+    snapshot = {"timestamp": datetime.now().isoformat(timespec="seconds")}
+    with ThreadPoolExecutor(max_workers=len(collectors)) as pool:
+        futures = {key: pool.submit(func) for key, func in collectors.items()}
+        for key, future in futures.items():
+            try:
+                snapshot[key] = future.result(timeout=30)
+            except Exception:
+                snapshot[key] = None
+
+    snapshot["free_bytes"] = sum((snapshot["volumes"] or {}).values())
+    try:
+        snapshot["cpu_ops_per_sec"] = probe_cpu()
+        snapshot["disk_write_mbps"], snapshot["disk_read_mbps"] = probe_disk()
+    except Exception:
+        snapshot.setdefault("cpu_ops_per_sec", None)
+        snapshot["disk_write_mbps"] = snapshot["disk_read_mbps"] = None
+
+    snapshot["elapsed"] = round(time.time() - start, 2)
+    return snapshot
+
+
+def compare_baselines(before, after):
+    """
+    Calcula la diferencia entre dos líneas base.
+
+    Returns:
+       list: dicts con metric, label, before, after, delta e improved
+             (None si no se pudo comparar)
+    """
+    report = []
+    for key, label, higher_is_better in BASELINE_METRICS:
+        old, new = before.get(key), after.get(key)
+        delta = round(new - old, 1) if old is not None and new is not None else None
+        improved = None
+        if delta:
+            improved = delta > 0 if higher_is_better else delta < 0
+        report.append(
+            {
+                "metric": key,
+                "label": label,
+                "before": old,
+                "after": new,
+                "delta": delta,
+                "improved": improved,
+            }
+        )
+    return report
+
+
+# ============================================================================
+# ANALIZADOR DE IMPACTO DE INICIO
+# ============================================================================
+
+# Una sola llamada a PowerShell: Run/RunOnce, carpetas de Inicio, tareas de
+# inicio de sesión, servicios automáticos y eventos 101/103 de arranque
+STARTUP_INVENTORY_SCRIPT = r"""
+$ErrorActionPreference = 'SilentlyContinue'
+$approvedBase = 'Software\Microsoft\Windows\CurrentVersion\Explorer\StartupApproved'
+function Get-Approved($hive, $sub, $name) {
+   $v = (Get-ItemProperty -Path "$($hive):\$approvedBase\$sub" -Name $name).$name
+   if ($v) { [int]$v[0] } else { $null }
+}
+$runKeys = @(
+   @{Hive='HKLM'; Path='SOFTWARE\Microsoft\Windows\CurrentVersion\Run'; Approved='Run'},
+   @{Hive='HKLM'; Path='SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Run'; Approved='Run32'},
+   @{Hive='HKCU'; Path='Software\Microsoft\Windows\CurrentVersion\Run'; Approved='Run'},
+   @{Hive='HKLM'; Path='SOFTWARE\Microsoft\Windows\CurrentVersion\RunOnce'; Approved=$null},
+   @{Hive='HKCU'; Path='Software\Microsoft\Windows\CurrentVersion\RunOnce'; Approved=$null}
+)
+$registry = foreach ($k in $runKeys) {
+   $item = Get-Item -Path "$($k.Hive):\$($k.Path)"
+   if (-not $item) { continue }
+   foreach ($name in $item.GetValueNames()) {
+      if (-not $name) { continue }
+      [pscustomobject]@{
+         Hive = $k.Hive; Key = $k.Path; Name = $name; Approved = $k.Approved
+         Command = [string]$item.GetValue($name)
+         State = if ($k.Approved) { Get-Approved $k.Hive $k.Approved $name } else { $null }
+      }
+   }
+}
+$shell = New-Object -ComObject WScript.Shell
+$startupFolders = @(
+   @{Hive='HKCU'; Path=[Environment]::GetFolderPath('Startup')},
+   @{Hive='HKLM'; Path=[Environment]::GetFolderPath('CommonStartup')}
+)
+$folders = foreach ($f in $startupFolders) {
+   Get-ChildItem -Path $f.Path -File | Where-Object { $_.Name -ne 'desktop.ini' } | ForEach-Object {
+      $target = $_.FullName
+      if ($_.Extension -eq '.lnk') { $target = $shell.CreateShortcut($_.FullName).TargetPath }
+      [pscustomobject]@{
+         Hive = $f.Hive; Name = $_.Name; Path = $_.FullName; Command = $target
+         State = Get-Approved $f.Hive 'StartupFolder' $_.Name
+      }
+   }
+}
+$logonTriggers = 'MSFT_TaskLogonTrigger', 'MSFT_TaskBootTrigger'
+$tasks = Get-ScheduledTask | Where-Object {
+   $_.State -ne 'Disabled' -and ($_.Triggers | Where-Object { $_.CimClass.CimClassName -in $logonTriggers })
+} | ForEach-Object {
+   [pscustomobject]@{ Path = $_.TaskPath; Name = $_.TaskName; Command = [string]($_.Actions | Select-Object -First 1).Execute }
+}
+$services = Get-CimInstance -ClassName Win32_Service -Filter "StartMode='Auto'" | ForEach-Object {
+   [pscustomobject]@{ Name = $_.Name; DisplayName = $_.DisplayName; Command = $_.PathName; Delayed = [bool]$_.DelayedAutoStart }
+}
+$events = Get-WinEvent -FilterHashtable @{LogName='Microsoft-Windows-Diagnostics-Performance/Operational'; Id=101,103} -MaxEvents 300 | ForEach-Object { $_.ToXml() }
+ConvertTo-Json -Depth 4 -Compress -InputObject ([pscustomobject]@{
+   Registry = @($registry); Folders = @($folders); Tasks = @($tasks)
+   Services = @($services); Events = @($events)
+})
+"""
+
+# Ventana tras el arranque en la que un proceso se considera "de inicio"
+STARTUP_WINDOW_SECONDS = 600
+# Muestreo de CPU/E/S durante esa ventana; el resultado se guarda por arranque
+STARTUP_SAMPLE_INTERVAL = 5
+STARTUP_USAGE_FILE = LOG_DIR / "startup_usage.json"
+# Conversión de E/S a tiempo equivalente (~100 MB/s de disco)
+STARTUP_IO_BYTES_PER_MS = 100 * 1024
+# Primer byte de StartupApproved: 02/06 habilitado, 03/07 deshabilitado
+STARTUP_APPROVED_DISABLED = (0x03, 0x07)
+STARTUP_APPROVED_ROOT = r"Software\Microsoft\Windows\CurrentVersion\Explorer\StartupApproved"
+STARTUP_APPROVED_VALUES = {
+    True: "020000000000000000000000",
+    False: "030000000000000000000000",
+}
+
+
+def extract_image_name(command):
+    """
+    Obtiene el nombre del ejecutable de una línea de comandos.
+
+    '"C:\\Program Files\\App\\app.exe" /min' → 'app.exe'
+    """
+    command = os.path.expandvars((command or "").strip())
+    if not command:
+        return ""
+    if command.startswith('"'):
+        path = command[1:].split('"', 1)[0]
+    else:
+        match = re.match(r"(.+?\.(?:exe|com|bat|cmd|lnk|vbs|ps1))(?:\s|$)", command, re.I)
+        path = match.group(1) if match else command.split()[0]
+    return re.split(r"[\\/]", path)[-1].lower()
+
+
+def is_windows_binary(command):
+    """Indica si el comando apunta a un binario del sistema operativo."""
+    path = os.path.expandvars(command or "").lower().lstrip('"')
+    return path.startswith(("c:\\windows\\", "%systemroot%", "\\systemroot\\")) or (
+        "\\" not in path and extract_image_name(path) in ("svchost.exe", "lsass.exe")
+    )
+
+
+def parse_startup_inventory(text):
+    """
+    Convierte la salida JSON de STARTUP_INVENTORY_SCRIPT en entradas de inicio.
+
+    Los servicios y tareas del propio Windows se descartan: no son candidatos
+    a deshabilitar desde el optimizador.
+
+    Returns:
+       tuple: (lista de entradas, lista de XML de eventos 101/103)
+    """
+    try:
+        data = json.loads(text) if text and text.strip() else {}
+    except ValueError:
+        return [], []
+    if not isinstance(data, dict):
+        return [], []
+
+    def items(key):
+        value = data.get(key) or []
+        return [value] if isinstance(value, (dict, str)) else [v for v in value if v]
+
+    entries = []
+    for item in items("Registry"):
+        entries.append(
+            {
+                "id": f"registry:{item['Hive']}\\{item['Key']}\\{item['Name']}",
+                "kind": "registry",
+                "name": item["Name"],
+                "command": item.get("Command") or "",
+                "hive": item["Hive"],
+                "key": item["Key"],
+                "approved": item.get("Approved"),
+                "enabled": item.get("State") not in STARTUP_APPROVED_DISABLED,
+            }
+        )
+    for item in items("Folders"):
+        entries.append(
+            {
+                "id": f"folder:{item['Path']}",
+                "kind": "folder",
+                "name": item["Name"],
+                "command": item.get("Command") or item["Path"],
+                "hive": item["Hive"],
+                "approved": "StartupFolder",
+                "enabled": item.get("State") not in STARTUP_APPROVED_DISABLED,
+            }
+        )
+    for item in items("Tasks"):
+        path = item.get("Path") or "\\"
+        if path.lower().startswith("\\microsoft\\"):
+            continue
+        entries.append(
+            {
+                "id": f"task:{path}{item['Name']}",
+                "kind": "task",
+                "name": f"{path}{item['Name']}",
+                "command": item.get("Command") or "",
+                "enabled": True,
+            }
+        )
+    for item in items("Services"):
+        if is_windows_binary(item.get("Command")):
+            continue
+        entries.append(
+            {
+                "id": f"service:{item['Name']}",
+                "kind": "service",
+                "name": item["Name"],
+                "display_name": item.get("DisplayName") or item["Name"],
+                "command": item.get("Command") or "",
+                "delayed": bool(item.get("Delayed")),
+                "enabled": True,
+            }
+        )
+
+    for entry in entries:
+        entry["image"] = extract_image_name(entry["command"])
+    return entries, items("Events")
+
+
+def parse_degradation_events(events):
+    """
+    Agrega los eventos 101 (aplicación) y 103 (servicio) de Diagnostics-Performance.
+
+    Returns:
+       dict: clave (nombre de imagen o "service:<nombre>") →
+             {"count", "degradation_ms", "total_ms"}
+    """
+    summary = {}
+    for xml in events:
+        event_id = re.search(r"<EventID[^>]*>(\d+)</EventID>", xml)
+        data = dict(re.findall(r"<Data Name=['\"](\w+)['\"]>([^<]*)</Data>", xml))
+        name = (data.get("Name") or "").strip().lower()
+        if not event_id or not name:
+            continue
+        key = f"service:{name}" if event_id.group(1) == "103" else extract_image_name(name)
+        item = summary.setdefault(key, {"count": 0, "degradation_ms": 0, "total_ms": 0})
+        item["count"] += 1
+        item["degradation_ms"] += int(data.get("DegradationTime") or 0)
+        item["total_ms"] += int(data.get("TotalTime") or 0)
+    return summary
+
+
+def read_process_counters(window, boot):
+    """
+    Contadores acumulados de los procesos creados dentro de la ventana.
+
+    Returns:
+       dict: (pid, create_time) → (nombre, segundos de CPU, bytes de E/S)
+    """
+    counters = {}
+    for process in psutil.process_iter(["name", "create_time"]):
+        try:
+            if process.info["create_time"] - boot > window:
+                continue
+            with process.oneshot():
+                cpu = process.cpu_times()
+                try:
+                    io = process.io_counters()
+                    io_bytes = io.read_bytes + io.write_bytes
+                except (psutil.AccessDenied, AttributeError):
+                    io_bytes = 0
+        except psutil.Error:
+            continue
+        key = (process.pid, process.info["create_time"])
+        name = (process.info["name"] or "").lower()
+        counters[key] = (name, cpu.user + cpu.system, io_bytes)
+    return counters
+
+
+def sample_early_process_usage(
+    window=STARTUP_WINDOW_SECONDS, interval=STARTUP_SAMPLE_INTERVAL, boot=None
+):
+    """
+    Muestrea la CPU y E/S de los procesos de inicio hasta que cierra la ventana.
+
+    El último valor leído de cada proceso es su consumo dentro de la ventana
+    (también para los que terminan antes). Fuera de la ventana retorna None:
+    los contadores acumulados incluirían todo lo consumido después.
+
+    Returns:
+       dict | None: nombre de imagen → {"cpu_seconds", "io_bytes", "processes"}
+    """
+    boot = boot if boot is not None else psutil.boot_time()
+    if time.time() >= boot + window:
+        return None
+    last = {}
+    while True:
+        last.update(read_process_counters(window, boot))
+        remaining = boot + window - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(interval, remaining))
+
+    usage = {}
+    for name, cpu_seconds, io_bytes in last.values():
+        item = usage.setdefault(name, {"cpu_seconds": 0.0, "io_bytes": 0, "processes": 0})
+        item["cpu_seconds"] += cpu_seconds
+        item["io_bytes"] += io_bytes
+        item["processes"] += 1
+    return usage
+
+
+def collect_early_process_usage(window=STARTUP_WINDOW_SECONDS, path=STARTUP_USAGE_FILE):
+    """
+    CPU y E/S de los procesos creados en los primeros minutos tras el arranque.
+
+    Usa la muestra guardada de este arranque; si todavía no cerró la ventana
+    muestrea hasta su fin (bloquea, llamar desde un hilo) y la guarda.
+
+    Returns:
+       dict: nombre de imagen → {"cpu_seconds", "io_bytes", "processes"};
+             vacío si el análisis se hace después de la ventana sin muestra
+    """
+    boot = psutil.boot_time()
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if abs(saved["boot_time"] - boot) < 2 and saved["window"] == window:
+            return saved["usage"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    usage = sample_early_process_usage(window, boot=boot)
+    if usage is None:
+        return {}
+    try:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"boot_time": boot, "window": window, "usage": usage}, f)
+    except OSError:
+        pass
+    return usage
+
+
+def rank_startup_entries(entries, degradation, usage):
+    """
+    Ordena las entradas de inicio por impacto medido.
+
+    El impacto (ms equivalentes) suma la degradación promedio registrada por
+    Windows, el tiempo de CPU y la E/S convertida a tiempo de disco.
+
+    Returns:
+       list: copias de las entradas con impact_ms y evidence, de mayor a menor
+    """
+    ranked = []
+    for entry in entries:
+        keys = [entry["image"]]
+        if entry["kind"] == "service":
+            keys.insert(0, f"service:{entry['name'].lower()}")
+
+        events = next((degradation[k] for k in keys if k in degradation), None)
+        process = usage.get(entry["image"]) if entry["image"] else None
+
+        impact = 0.0
+        evidence = []
+        if events:
+            average = events["degradation_ms"] / events["count"]
+            impact += average
+            evidence.append(f"{events['count']} eventos de arranque, {average:.0f} ms de retraso")
+        if process:
+            impact += process["cpu_seconds"] * 1000
+            impact += process["io_bytes"] / STARTUP_IO_BYTES_PER_MS
+            evidence.append(
+                f"CPU {process['cpu_seconds']:.1f} s, E/S {format_bytes(process['io_bytes'])}"
+            )
+        if entry["kind"] == "service" and entry.get("delayed"):
+            # El inicio retrasado ya no compite con el inicio de sesión
+            impact /= 2
+
+        ranked.append({**entry, "impact_ms": round(impact), "evidence": evidence})
+
+    ranked.sort(key=lambda e: e["impact_ms"], reverse=True)
+    return ranked
+
+
+def build_startup_toggle_command(entry, enable):
+    """
+    Comando que habilita o deshabilita una entrada de inicio sin borrarla.
+
+    Run y carpetas de Inicio usan StartupApproved (lo mismo que el Administrador
+    de tareas); las tareas se deshabilitan con schtasks; los servicios pasan a
+    inicio manual (al rehabilitarlos se respeta el inicio retrasado). RunOnce
+    no admite deshabilitarse (retorna None).
+    """
+    if entry["kind"] in ("registry", "folder"):
+        if not entry.get("approved"):
+            return None
+        return (
+            f'reg add "{entry["hive"]}\\{STARTUP_APPROVED_ROOT}\\{entry["approved"]}" '
+            f'/v "{entry["name"]}" /t REG_BINARY '
+            f"/d {STARTUP_APPROVED_VALUES[enable]} /f"
+        )
+    if entry["kind"] == "task":
+        return f'schtasks /Change /TN "{entry["name"]}" /{"Enable" if enable else "Disable"}'
+    if entry["kind"] == "service":
+        mode = ("delayed-auto" if entry.get("delayed") else "auto") if enable else "demand"
+        return f'sc config "{entry["name"]}" start= {mode}'
+    return None
+
+
+def get_startup_inventory():
+    """Enumera las entradas de inicio y los eventos de arranque en una pasada."""
+    code, out, err = run_command(
+        ["powershell", "-NoProfile", "-Command", STARTUP_INVENTORY_SCRIPT],
+        shell=False,
+        timeout=180,
+    )
+    return parse_startup_inventory(out) if code == 0 else ([], [])
+
+
+def load_startup_changes():
+    """Lee el historial de cambios de inicio (para deshacer)."""
+    try:
+        with open(STARTUP_CHANGES_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def set_startup_entry(entry, enable):
+    """
+    Habilita o deshabilita una entrada y lo anota en el historial.
+
+    Returns:
+       tuple: (éxito, mensaje)
+    """
+    command = build_startup_toggle_command(entry, enable)
+    if not command:
+        return False, "Esta entrada no se puede deshabilitar"
+    code, out, err = run_command(command, timeout=60)
+    if code != 0:
+        return False, err or out
+
+    changes = load_startup_changes()
+    changes.append(
+        {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "enabled": enable,
+            "entry": {k: v for k, v in entry.items() if k != "evidence"},
+        }
+    )
+    try:
+        STARTUP_CHANGES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(STARTUP_CHANGES_FILE, "w", encoding="utf-8") as f:
+            json.dump(changes, f, indent=2, ensure_ascii=False)
+    except OSError:
+        pass
+    return True, command
+
+
+def undo_last_startup_change():
+    """
+    Revierte el último cambio de inicio registrado.
+
+    Returns:
+       tuple: (éxito, mensaje)
+    """
+    changes = load_startup_changes()
+    if not changes:
+        return False, "No hay cambios para deshacer"
+    last = changes[-1]
+    command = build_startup_toggle_command(last["entry"], not last["enabled"])
+    code, out, err = run_command(command, timeout=60)
+    if code != 0:
+        return False, err or out
+    try:
+        with open(STARTUP_CHANGES_FILE, "w", encoding="utf-8") as f:
+            json.dump(changes[:-1], f, indent=2, ensure_ascii=False)
+    except OSError:
+        pass
+    return True, last["entry"]["name"]
+
+
+# ============================================================================
+# PRUEBAS A/B DE AJUSTES MEDIBLES (RED Y PLAN DE ENERGÍA)
+# ============================================================================
+
+# Margen de ruido: solo se revierte si la métrica empeora más que esto
+AB_TOLERANCE = 0.05
+NETWORK_PROBE_SAMPLES = 10
+CPU_PROBE_RUNS = 3
+
+ULTIMATE_PERFORMANCE_SCHEME = "e9a42b02-d5df-448d-aa00-03f14749eb61"
+HIGH_PERFORMANCE_SCHEME = "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c"
+# GUID fijo de la copia de "Máximo rendimiento": se reutiliza entre ejecuciones
+OPTIMIZER_SCHEME = "5a1f0e3c-7b2d-4c9e-9f61-2d8e4b7a0c15"
+GUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.I
+)
+
+# Ajustes TCP vigentes (chimney y netdma ya no existen en Windows 10/11).
+# "pattern" localiza la línea en la salida de "show" (inglés / español).
+NETWORK_TWEAKS = [
+    {
+        "setting": "autotuninglevel",
+        "show": "netsh int tcp show global",
+        "pattern": r"auto-?tuning|ajuste autom",
+        "value": "normal",
+        "set": "netsh int tcp set global autotuninglevel={value}",
+    },
+    {
+        "setting": "dca",
+        "show": "netsh int tcp show global",
+        "pattern": r"\(DCA\)|direct cache",
+        "value": "enabled",
+        "set": "netsh int tcp set global dca={value}",
+    },
+    {
+        "setting": "heuristics",
+        "show": "netsh int tcp show heuristics",
+        "pattern": r"heur",
+        "value": "disabled",
+        "set": "netsh int tcp set heuristics {value}",
+    },
+]
+
+# Valores localizados → valores aceptados por netsh
+NETSH_VALUES = {
+    "enabled": "enabled",
+    "habilitado": "enabled",
+    "disabled": "disabled",
+    "deshabilitado": "disabled",
+    "normal": "normal",
+    "restricted": "restricted",
+    "restringido": "restricted",
+    "highlyrestricted": "highlyrestricted",
+    "muy restringido": "highlyrestricted",
+    "experimental": "experimental",
+}
+
+UNSUPPORTED_PATTERNS = [
+    r"not supported",
+    r"no es compatible",
+    r"no se admite",
+    r"the parameter is incorrect",
+    r"el par.metro no es correcto",
+    r"invalid",
+]
+
+
+def parse_netsh_setting(output, pattern):
+    """
+    Lee el valor de un ajuste en la salida de "netsh int tcp show ...".
+
+    Returns:
+       str: valor normalizado para netsh, o None si no se encontró o no se reconoce
+    """
+    for line in output.splitlines():
+        if ":" not in line or not re.search(pattern, line, re.I):
+            continue
+        value = line.rsplit(":", 1)[1].strip().lower()
+        return NETSH_VALUES.get(value)
+    return None
+
+
+def is_unsupported(code, output):
+    """Indica si un comando de ajuste falló o el sistema no lo admite."""
+    text = normalize_tool_output(output)
+    return code != 0 or any(re.search(p, text) for p in UNSUPPORTED_PATTERNS)
+
+
+def parse_scheme_guid(output):
+    """Extrae el GUID de la salida de powercfg (/getactivescheme, /duplicatescheme)."""
+    match = GUID_PATTERN.search(output or "")
+    return match.group(0).lower() if match else None
+
+
+def parse_scheme_list(output):
+    """GUIDs de los planes listados por "powercfg /list"."""
+    return [guid.lower() for guid in GUID_PATTERN.findall(output or "")]
+
+
+def parse_endpoint(endpoint):
+    """Convierte "host:puerto" en (host, puerto)."""
+    host, _, port = endpoint.rpartition(":")
+    return (host or endpoint), int(port or 443)
+
+
+def get_network_probe_endpoint(config):
+    """
+    Destino de la prueba A/B de red: el configurado o el controlador de dominio.
+
+    Returns:
+       tuple: (host, puerto), o None si no hay un destino local disponible
+    """
+    if config.get("network_probe_endpoint"):
+        return parse_endpoint(config["network_probe_endpoint"])
+    logon_server = os.environ.get("LOGONSERVER", "").lstrip("\\")
+    if logon_server and logon_server.upper() != socket.gethostname().upper():
+        return logon_server, 389
+    return None
+
+
+def measure_tcp_connect(host, port, samples=NETWORK_PROBE_SAMPLES, timeout=2):
+    """
+    Mide el tiempo de conexión TCP a un destino.
+
+    Returns:
+       float: mediana en ms, o None si ninguna conexión tuvo éxito
+    """
+    times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                times.append((time.perf_counter() - start) * 1000)
+        except OSError:
+            continue
+    if not times:
+        return None
+    times.sort()
+    return round(times[len(times) // 2], 2)
+
+
+def measure_cpu_throughput(runs=CPU_PROBE_RUNS):
+    """Mejor resultado de varias micro-pruebas de CPU (op/s)."""
+    return max(probe_cpu() for _ in range(runs))
+
+
+def run_ab_trial(measure, apply, revert, higher_is_better, tolerance=AB_TOLERANCE):
+    """
+    Aplica un ajuste entre dos mediciones y lo revierte si no conviene.
+
+    Args:
+       measure: función sin argumentos que devuelve la métrica (o None)
+       apply: función que aplica el ajuste; devuelve False si no es compatible
+       revert: función que restaura la configuración previa
+       higher_is_better: sentido de la métrica
+       tolerance: empeoramiento relativo tolerado antes de revertir
+
+    Returns:
+       dict: before, after, kept y reason
+    """
+    result = {"before": measure(), "after": None, "kept": False, "reason": ""}
+
+    if not apply():
+        revert()
+        result["reason"] = "no compatible"
+        return result
+
+    result["after"] = measure()
+    before, after = result["before"], result["after"]
+    if before is None or after is None:
+        result["kept"] = True
+        result["reason"] = "sin medición, se mantiene"
+        return result
+
+    if higher_is_better:
+        worse = after < before * (1 - tolerance)
+    else:
+        worse = after > before * (1 + tolerance)
+
+    if worse:
+        revert()
+        result["reason"] = "empeoró, revertido"
+    else:
+        improved = after > before if higher_is_better else after < before
+        result["kept"] = True
+        result["reason"] = "mejoró" if improved else "sin cambios significativos"
+    return result
+
+
+# ============================================================================
+# MOTOR DE OPTIMIZACIÓN
+# ============================================================================
+
+
+class OptimizationEngine:
+    """
+    Ejecución de tareas compartida por la interfaz y el modo desatendido.
+
+    Las subclases implementan log(), set_progress(), update_progress_label()
+    y los ganchos before_task(), on_run_completed() y on_run_finished().
+    """
+
+    def init_engine(self):
+        """Inicializa el estado de ejecución."""
+        self.is_processing = False
+        self.should_cancel = False
+        self.current_task = None
+        self.run_context = {}
+        self.run_record = None
+        self.task_monitor = None
+        self.task_governor = None
+        self.governor_mode = "balanced"
+        self.sfc_verify = False
+        self.cleanup_dry_run = False
+        self.registry_backend = get_registry_backend()
+        self.cancel_event = threading.Event()
+        self.reset_fusion_state()
+
+    def reset_fusion_state(self):
+        """Olvida los lotes planificados y los resultados de una ejecución anterior."""
+        # (id de tarea, posición del comando) -> lote que empieza en ese comando
+        self.fused_batches = {}
+        # (id de tarea, posición del comando) -> resultado obtenido en un lote
+        self.fused_results = {}
+        # Tareas que ya pasaron before_task() en la compuerta de un lote
+        self.gated_tasks = set()
+        # id de tarea -> id de la tarea en cuyo lote corrieron sus comandos
+        self.batched_in = {}
+
+    def before_task(self, task):
+        """Se llama antes de cada tarea; retornar False detiene la ejecución."""
+        return True
+
+    def on_run_completed(self):
+        """Se llama cuando todas las tareas terminaron sin cancelación."""
+
+    def on_run_finished(self):
+        """Se llama siempre al terminar la ejecución."""
+
+    def optimize_system(self, selected_tasks, trigger="manual", preset=None):
+        """
+        Ejecuta las tareas de optimización.
+
+        Args:
+           selected_tasks: tareas de OPTIMIZATION_TASKS a ejecutar, en orden
+           trigger: "manual" (interfaz) o "headless" (tarea programada)
+           preset: nombre del preset usado, si aplica
+        """
+        try:
+            self.log("━" * 75, "INFO")
+            self.log("🚀 Iniciando proceso de optimización del sistema", "INFO")
+            self.log("━" * 75, "INFO")
+
+            total_tasks = len(selected_tasks)
+            completed = 0
+            self.run_context = {}
+            self.run_record = {
+                "run_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
+                "hostname": socket.gethostname(),
+                "started": datetime.now().isoformat(timespec="seconds"),
+                "trigger": trigger,
+                "preset": preset,
+                "governor_mode": self.governor_mode,
+                "tasks": [],
+            }
+
+            self.run_record["selected_tasks"] = [task["id"] for task in selected_tasks]
+
+            changes = plan_registry_changes(selected_tasks)
+            if changes:
+                snapshot = take_registry_snapshot(changes, self.registry_backend)
+                path = save_registry_snapshot(self.run_record["run_id"], snapshot)
+                self.run_record["registry_snapshot"] = {
+                    "path": str(path) if path else None,
+                    "values": len(snapshot["entries"]),
+                }
+                self.log(
+                    f"✓ Instantánea de {len(snapshot['entries'])} valores de registro "
+                    "guardada para revertir",
+                    "SUCCESS",
+                )
+
+            self.log("Capturando línea base del sistema...", "PROGRESS")
+            baseline_before = capture_baseline()
+            self.log(f"✓ Línea base capturada en {baseline_before['elapsed']} s", "SUCCESS")
+            self.log("")
+
+            # Tareas cuya ejecución depende del resultado de otras
+            handlers = {
+                "winget_update": self.update_programs,
+                "dism_scan": self.run_dism_scan,
+                "dism_restore": self.run_dism_restore,
+                "sfc": self.run_sfc,
+                "clean_winsxs": self.run_clean_winsxs,
+                "optimize_volumes": self.run_volume_optimizer,
+                "temp_files": self.run_temp_cleanup,
+                "optimize_network": self.run_network_ab,
+                "optimize_power_plan": self.run_power_plan_ab,
+            }
+
+            # Comandos ligeros adyacentes (también de tareas consecutivas) en
+            # un solo proceso; cada cambio de tarea dentro del lote es una
+            # compuerta donde se revisan la cancelación y before_task()
+            self.reset_fusion_state()
+            for batch in plan_fused_batches(
+                selected_tasks, lambda task: task["id"] not in handlers
+            ):
+                task, position, _ = batch[0]
+                self.fused_batches[(task["id"], position)] = batch
+
+            for task in selected_tasks:
+                # Una tarea que ya pasó la compuerta de un lote ejecutó sus
+                # comandos ligeros: se completa aunque luego se cancele
+                gated = task["id"] in self.gated_tasks
+                if not gated and (self.should_cancel or not self.before_task(task)):
+                    self.log("✗ Proceso cancelado", "WARNING")
+                    self.should_cancel = True
+                    break
+
+                self.current_task = task
+                self.update_progress_label(f"Ejecutando: {task['name']}")
+
+                self.log(f"─── {task['name']} ───", "PROGRESS")
+                self.log(f"Descripción: {task['description']}")
+                self.log(f"Tiempo estimado: {task['estimated_time']}")
+
+                # Ejecutar tarea midiendo los procesos que lance
+                monitor = ProcessTreeMonitor().start()
+                self.task_monitor = monitor
+                PROCESS_OBSERVERS.append(monitor.attach)
+                governor = ResourceGovernor(
+                    TASK_RESOURCE_CLASS.get(task["id"], "light"),
+                    self.governor_mode,
+                    monitor=monitor,
+                ).start()
+                self.task_governor = governor
+                PROCESS_OBSERVERS.append(governor.attach)
+                task_start = time.time()
+                try:
+                    handler = handlers.get(task["id"])
+                    if handler:
+                        success = handler()
+                    else:
+                        success = self.execute_task(task)
+                finally:
+                    PROCESS_OBSERVERS.remove(monitor.attach)
+                    PROCESS_OBSERVERS.remove(governor.attach)
+                    usage = monitor.stop()
+                    governor.stop()
+                    self.task_monitor = None
+                    self.task_governor = None
+
+                completed += 1
+                progress = completed / total_tasks
+                self.set_progress(progress)
+                record = {
+                    "id": task["id"],
+                    "name": task["name"],
+                    "success": success,
+                    "duration": round(time.time() - task_start, 1),
+                    "resources": usage,
+                }
+                if task["id"] in self.batched_in:
+                    # Su tiempo y recursos se midieron en la tarea del lote
+                    record["batched_in"] = self.batched_in[task["id"]]
+                self.run_record["tasks"].append(record)
+                self.log(f"Recursos: {describe_resources(usage)}")
+
+                if success:
+                    self.log(f"✓ {task['name']} completado", "SUCCESS")
+                else:
+                    self.log(f"⚠ {task['name']} completado con advertencias", "WARNING")
+
+                self.log("")  # Línea en blanco
+                time.sleep(0.5)
+
+            self.log("Capturando línea base posterior...", "PROGRESS")
+            baseline_after = capture_baseline()
+            delta = compare_baselines(baseline_before, baseline_after)
+            self.run_record["baseline"] = {
+                "before": baseline_before,
+                "after": baseline_after,
+                "delta": delta,
+            }
+            self.log_baseline_delta(delta, baseline_after)
+
+            # Proceso completado
+            if not self.should_cancel:
+                self.log("━" * 75, "INFO")
+                self.log("✓ Optimización completada exitosamente", "SUCCESS")
+                self.log("━" * 75, "INFO")
+
+                self.on_run_completed()
+
+        except Exception as e:
+            self.log(f"✗ Error crítico: {str(e)}", "ERROR")
+        finally:
+            if self.run_record is not None:
+                self.run_record["finished"] = datetime.now().isoformat(
+                    timespec="seconds"
+                )
+                tasks = self.run_record["tasks"]
+                self.run_record["resources"] = {
+                    key: sum(t["resources"][key] for t in tasks)
+                    for key in ("cpu_seconds", "read_bytes", "write_bytes")
+                }
+                self.run_record["resources"]["peak_rss"] = max(
+                    [t["resources"]["peak_rss"] for t in tasks] or [0]
+                )
+                self.run_record["cancelled"] = self.should_cancel
+                save_run_record(self.run_record)
+            self.is_processing = False
+            self.current_task = None
+            self.on_run_finished()
+            self.update_progress_label("Proceso finalizado")
+
+    def log_baseline_delta(self, delta, baseline=None):
+        """Muestra en el log la comparación antes/después y los valores absolutos."""
+        self.log("Comparación antes / después:")
+        for item in delta:
+            if item["before"] is None or item["after"] is None:
+                self.log(f"  {item['label']}: no disponible")
+                continue
+            if item["metric"] in ("free_bytes", "committed_bytes"):
+                before = format_bytes(item["before"])
+                after = format_bytes(item["after"])
+                change = format_bytes(item["delta"])
+            else:
+                before, after, change = item["before"], item["after"], item["delta"]
+            mark = {True: "▲ mejora", False: "▼ empeora", None: "="}[item["improved"]]
+            self.log(f"  {item['label']}: {before} → {after} ({change}) {mark}")
+        for key, label in BASELINE_ABSOLUTE_METRICS:
+            value = (baseline or {}).get(key)
+            self.log(f"  {label}: {value if value is not None else 'no disponible'}")
+        self.log("")
+
+    def run_fused_batch(self, batch):
+        """
+        Ejecuta un lote de comandos ligeros y guarda el resultado de cada uno.
+
+        Antes del primer comando de cada tarea siguiente el lote espera: si la
+        ejecución se canceló o before_task() lo impide, se detiene ahí y los
+        comandos de esa tarea no llegan a ejecutarse.
+        """
+        first = batch[0][0]
+        gates = {}
+        for index in range(1, len(batch)):
+            task = batch[index][0]
+            if task is not batch[index - 1][0]:
+                gates[index] = lambda task=task: self.gate_batched_task(task, first)
+
+        tasks = len(gates) + 1
+        self.log(
+            f"  → Lote de {len(batch)} comandos ligeros"
+            + (f" de {tasks} tareas" if tasks > 1 else "")
+            + " en un solo proceso"
+        )
+        results = run_fused_commands([command for _, _, command in batch], gates=gates)
+        for (task, position, _), result in zip(batch, results):
+            self.fused_results[(task["id"], position)] = result
+
+    def gate_batched_task(self, task, first):
+        """Compuerta de un lote: decide si los comandos de `task` pueden correr."""
+        if self.should_cancel or not self.before_task(task):
+            self.should_cancel = True
+            return False
+        self.gated_tasks.add(task["id"])
+        self.batched_in[task["id"]] = first["id"]
+        return True
+
+    def execute_task(self, task):
+        """Ejecuta una tarea específica."""
+        command = task["command"]
+        batched = (task["id"], 0) in self.fused_batches or (task["id"], 0) in self.fused_results
+
+        if isinstance(command, list) or parse_reg_add(command) or batched:
+            # Múltiples comandos en el orden declarado: los "reg add"
+            # consecutivos se escriben en el proceso en una sola pasada en
+            # lugar de lanzar reg.exe, y los comandos ligeros adyacentes
+            # corren en el lote planificado por optimize_system
+            all_success = True
+            pending = []
+            for position, cmd in enumerate(task_commands(task) + [None]):
+                change = parse_reg_add(cmd) if cmd else None
+                if change:
+                    self.log(f"  → {cmd[:60]}...")
+                    pending.append(change)
+                    continue
+                if pending:
+                    for error in self.registry_backend.write_values(pending):
+                        all_success = False
+                        self.log(f"    Error: {error[:100]}", "ERROR")
+                    pending = []
+                if cmd is None:
+                    break
+                key = (task["id"], position)
+                if key in self.fused_batches:
+                    self.run_fused_batch(self.fused_batches.pop(key))
+                self.log(f"  → {cmd[:60]}...")
+                result = self.fused_results.pop(key, None)
+                if result is None:
+                    # Fuera de lote o no alcanzó a ejecutarse dentro de él
+                    result = run_command(cmd, timeout=300)
+                code, out, err = result
+                if code != 0:
+                    all_success = False
+                    if err:
+                        self.log(f"    Error: {err[:100]}", "ERROR")
+            return all_success
+        else:
+            # Comando único
+            self.log(f"  → {command[:60]}...")
+            code, out, err = run_command(command, timeout=1800)  # 30 min timeout
+
+            if code == 0:
+                if out:
+                    lines = out.split("\n")[:5]  # Primeras 5 líneas
+                    for line in lines:
+                        if line.strip():
+                            self.log(f"    {line[:70]}")
+                return True
+            else:
+                if err:
+                    self.log(f"    Error: {err[:100]}", "ERROR")
+                return False
+
+    def run_dism_scan(self):
+        """Escanea la imagen con DISM y guarda el estado para las demás tareas."""
+        command = "DISM /Online /Cleanup-Image /ScanHealth"
+        self.log(f"  → {command}")
+        code, out, err = run_command(command, timeout=1800)
+        state = parse_dism_scan_health(out)
+        self.run_context["dism_state"] = state
+
+        messages = {
+            DISM_HEALTHY: ("No se detectaron daños en la imagen", "SUCCESS"),
+            DISM_REPAIRABLE: ("La imagen tiene daños reparables", "WARNING"),
+            DISM_NOT_REPAIRABLE: ("La imagen tiene daños NO reparables", "ERROR"),
+            DISM_UNKNOWN: ("No se pudo interpretar el resultado de DISM", "WARNING"),
+        }
+        msg, level = messages[state]
+        self.log(f"    {msg}", level)
+        if state == DISM_UNKNOWN and err:
+            self.log(f"    Error: {err[:100]}", "ERROR")
+
+        return state in (DISM_HEALTHY, DISM_REPAIRABLE)
+
+    def run_dism_restore(self):
+        """Ejecuta DISM /RestoreHealth solo si el escaneo detectó daños reparables."""
+        if "dism_state" not in self.run_context:
+            self.log("  → Sin escaneo previo, ejecutando DISM /ScanHealth primero...")
+            self.run_dism_scan()
+
+        state = self.run_context["dism_state"]
+        if state == DISM_HEALTHY:
+            self.log("  ⏭ Omitido: la imagen no tiene daños", "INFO")
+            return True
+        if state == DISM_NOT_REPAIRABLE:
+            self.log(
+                "  ⏭ Omitido: DISM indica que la imagen no se puede reparar "
+                "(se recomienda reparación in-place de Windows)",
+                "WARNING",
+            )
+            return False
+
+        command = "DISM /Online /Cleanup-Image /RestoreHealth"
+        self.log(f"  → {command}")
+        code, out, err = run_command(command, timeout=3600)
+        repaired = parse_dism_restore_health(out, code)
+        self.run_context["dism_repaired"] = repaired
+
+        if repaired:
+            self.log("    Imagen reparada correctamente", "SUCCESS")
+        elif err:
+            self.log(f"    Error: {err[:100]}", "ERROR")
+        return repaired
+
+    def run_sfc(self):
+        """Ejecuta SFC solo cuando DISM reparó la imagen o se pidió verificar."""
+        state = self.run_context.get("dism_state")
+        verify = self.sfc_verify
+
+        # Sin información de DISM se respeta la selección del usuario
+        if state is not None and not self.run_context.get("dism_repaired"):
+            if state == DISM_HEALTHY and not verify:
+                self.log("  ⏭ Omitido: la imagen está sana y no se pidió verificación")
+                return True
+            if state != DISM_HEALTHY:
+                self.log(
+                    "  ⏭ Omitido: la imagen no fue reparada, SFC no podría "
+                    "restaurar los archivos",
+                    "WARNING",
+                )
+                return False
+
+        command = "sfc /scannow"
+        self.log(f"  → {command}")
+        code, out, err = run_command(command, timeout=1800)
+        result = parse_sfc_result(out)
+
+        messages = {
+            SFC_CLEAN: ("No se encontraron infracciones de integridad", "SUCCESS"),
+            SFC_REPAIRED: ("Se repararon archivos dañados", "SUCCESS"),
+            SFC_UNREPAIRED: ("Hay archivos dañados que no se pudieron reparar", "ERROR"),
+            SFC_FAILED: ("SFC no pudo completar la verificación", "ERROR"),
+        }
+        if result in messages:
+            msg, level = messages[result]
+            self.log(f"    {msg}", level)
+            return result in (SFC_CLEAN, SFC_REPAIRED)
+
+        if err:
+            self.log(f"    Error: {err[:100]}", "ERROR")
+        return code == 0
+
+    def run_clean_winsxs(self):
+        """Limpia WinSxS solo si /AnalyzeComponentStore lo recomienda."""
+        command = "DISM /Online /Cleanup-Image /AnalyzeComponentStore"
+        self.log(f"  → {command}")
+        code, out, err = run_command(command, timeout=900)
+        recommended = parse_component_store_analysis(out)
+
+        if recommended is False:
+            self.log("  ⏭ Omitido: DISM no recomienda limpiar el almacén de componentes")
+            return True
+        if recommended is None:
+            self.log("    No se pudo leer la recomendación, se ejecuta la limpieza", "WARNING")
+
+        command = "DISM /Online /Cleanup-Image /StartComponentCleanup /ResetBase"
+        self.log(f"  → {command}")
+        code, out, err = run_command(command, timeout=1800)
+        if code != 0 and err:
+            self.log(f"    Error: {err[:100]}", "ERROR")
+        return code == 0
+
+    def log_ab_result(self, task_id, unit, result):
+        """Registra y muestra el resultado de una prueba A/B."""
+        self.run_record.setdefault("ab_tests", {})[task_id] = result
+
+        def fmt(value):
+            return "n/d" if value is None else f"{value} {unit}"
+
+        level = "SUCCESS" if result["kept"] else "WARNING"
+        self.log(
+            f"  Antes: {fmt(result['before'])} | Después: {fmt(result['after'])}"
+            f" → {result['reason']}",
+            level,
+        )
+
+    def run_network_ab(self):
+        """Aplica los ajustes TCP y los revierte si la latencia empeora."""
+        endpoint = get_network_probe_endpoint(load_config())
+        if endpoint is None:
+            self.log(
+                "  ⏭ Sin destino local para medir (configure network_probe_endpoint); "
+                "no se aplican ajustes de red",
+                "WARNING",
+            )
+            return True
+        host, port = endpoint
+        self.log(f"  → Midiendo conexión TCP a {host}:{port}")
+
+        outputs = {}
+        pending = []
+        for tweak in NETWORK_TWEAKS:
+            if tweak["show"] not in outputs:
+                outputs[tweak["show"]] = run_command(tweak["show"], timeout=30)[1]
+            previous = parse_netsh_setting(outputs[tweak["show"]], tweak["pattern"])
+            if previous is None:
+                self.log(f"    ⏭ {tweak['setting']}: valor actual desconocido, no se toca")
+            elif previous == tweak["value"]:
+                self.log(f"    ⏭ {tweak['setting']}: ya está en {previous}")
+            else:
+                pending.append((tweak, previous))
+
+        if not pending:
+            self.log("  No hay ajustes de red que aplicar")
+            return True
+
+        def apply():
+            for tweak, previous in pending:
+                command = tweak["set"].format(value=tweak["value"])
+                self.log(f"  → {command}")
+                code, out, err = run_command(command, timeout=60)
+                if is_unsupported(code, out + err):
+                    return False
+            return True
+
+        def revert():
+            for tweak, previous in pending:
+                command = tweak["set"].format(value=previous)
+                self.log(f"  ↩ {command}")
+                run_command(command, timeout=60)
+
+        result = run_ab_trial(
+            lambda: measure_tcp_connect(host, port),
+            apply,
+            revert,
+            higher_is_better=False,
+        )
+        result["settings"] = {tweak["setting"]: previous for tweak, previous in pending}
+        self.log_ab_result("optimize_network", "ms", result)
+        return result["reason"] != "no compatible"
+
+    def run_power_plan_ab(self):
+        """Activa el plan de máximo rendimiento y lo revierte si la CPU no mejora."""
+        code, out, err = run_command("powercfg /getactivescheme", timeout=30)
+        previous = parse_scheme_guid(out)
+        if not previous:
+            self.log("    No se pudo leer el plan de energía activo", "ERROR")
+            return False
+        if previous in (
+            ULTIMATE_PERFORMANCE_SCHEME,
+            HIGH_PERFORMANCE_SCHEME,
+            OPTIMIZER_SCHEME,
+        ):
+            self.log("  ⏭ Ya está activo un plan de alto rendimiento")
+            return True
+
+        created = {}
+
+        def apply():
+            code, out, err = run_command("powercfg /list", timeout=30)
+            if OPTIMIZER_SCHEME in parse_scheme_list(out):
+                target = OPTIMIZER_SCHEME
+            else:
+                command = (
+                    f"powercfg -duplicatescheme {ULTIMATE_PERFORMANCE_SCHEME} "
+                    f"{OPTIMIZER_SCHEME}"
+                )
+                self.log(f"  → {command}")
+                code, out, err = run_command(command, timeout=60)
+                if code == 0 and parse_scheme_guid(out) == OPTIMIZER_SCHEME:
+                    target = created["guid"] = OPTIMIZER_SCHEME
+                else:
+                    # Ediciones sin "Máximo rendimiento": usar "Alto rendimiento"
+                    target = HIGH_PERFORMANCE_SCHEME
+            self.log(f"  → powercfg -setactive {target}")
+            code, out, err = run_command(f"powercfg -setactive {target}", timeout=60)
+            return not is_unsupported(code, out + err)
+
+        def revert():
+            self.log(f"  ↩ powercfg -setactive {previous}")
+            run_command(f"powercfg -setactive {previous}", timeout=60)
+            if created.get("guid"):
+                run_command(f"powercfg -delete {created['guid']}", timeout=60)
+
+        self.log("  → Midiendo rendimiento de CPU con el plan actual")
+        result = run_ab_trial(
+            measure_cpu_throughput, apply, revert, higher_is_better=True
+        )
+        result["previous_scheme"] = previous
+        result["new_scheme"] = created.get("guid")
+        self.log_ab_result("optimize_power_plan", "op/s", result)
+        return result["reason"] != "no compatible"
+
+    def run_volume_optimizer(self):
+        """Optimiza cada volumen según su medio, en paralelo por disco físico."""
+        self.log("  → Enumerando volúmenes y discos físicos...")
+        volumes, error = get_volume_inventory()
+        if error:
+            self.log(f"  No se pudo obtener el inventario de volúmenes: {error}", "ERROR")
+            return False
+        plan = plan_volume_optimization(volumes)
+
+        self.log("  Plan de optimización de unidades:")
+        for entry in plan:
+            if entry["action"]:
+                self.log(f"    {entry['drive']} → {entry['reason']}")
+            else:
+                self.log(f"    {entry['drive']} ⏭ Omitido: {entry['reason']}")
+
+        # Volúmenes del mismo disco físico se procesan en serie
+        groups = {}
+        for entry in plan:
+            if entry["action"]:
+                groups.setdefault(entry["disk"], []).append(entry)
+
+        if not groups:
+            self.log("  No hay volúmenes que requieran optimización", "INFO")
+            return True
+
+        with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+            results = list(pool.map(self.optimize_disk_volumes, groups.values()))
+
+        return all(results)
+
+    def optimize_disk_volumes(self, entries):
+        """Ejecuta en serie el plan de los volúmenes de un mismo disco físico."""
+        all_success = True
+        for entry in entries:
+            if self.should_cancel:
+                break
+            drive = entry["drive"]
+
+            if entry["action"] == "retrim":
+                command = f"defrag {drive} /L"
+            else:
+                code, out, err = run_command(f"defrag {drive} /A", timeout=600)
+                fragmented = parse_defrag_analysis(out)
+                if fragmented is not None and fragmented < DEFRAG_THRESHOLD_PERCENT:
+                    self.log(f"    {drive} ⏭ Omitido: fragmentación {fragmented}%")
+                    continue
+                command = f"defrag {drive} /O /H"
+
+            self.log(f"  → {command}")
+            code, out, err = run_command(command, timeout=3600)
+            if code == 0:
+                self.log(f"    {drive} optimizada", "SUCCESS")
+            else:
+                all_success = False
+                self.log(f"    {drive} Error: {(err or out)[:100]}", "ERROR")
+        return all_success
+
+    def run_temp_cleanup(self):
+        """Limpia temporales de todas las ubicaciones con el motor nativo."""
+        dry_run = self.cleanup_dry_run
+        if dry_run:
+            self.log("  Modo simulación: no se borrará ningún archivo", "WARNING")
+
+        # La limpieza corre en hilos de este proceso: el gobernador no tiene
+        # procesos hijos que ajustar, así que su política fija hilos y prioridad
+        workers, thread_init = SCAN_WORKERS, None
+        if self.task_governor:
+            workers, thread_init = self.task_governor.thread_policy(SCAN_WORKERS)
+
+        summary = {"dry_run": dry_run, "locations": [], "files": 0, "bytes": 0}
+        for label, path in get_temp_locations():
+            if self.should_cancel:
+                break
+            self.log(f"  → {label}: {path}")
+            stats = clean_directory(
+                path,
+                dry_run=dry_run,
+                max_workers=workers,
+                cancel_event=self.cancel_event,
+                thread_init=thread_init,
+            )
+            self.log(
+                f"    {stats['files']} archivos, {format_bytes(stats['bytes'])} "
+                f"liberados | {stats['skipped']} en uso | {stats['recent']} recientes"
+            )
+            summary["locations"].append({"name": label, "path": path, **stats})
+            summary["files"] += stats["files"]
+            summary["bytes"] += stats["bytes"]
+
+        if not dry_run:
+            if empty_recycle_bin():
+                self.log("  → Papelera de reciclaje vaciada")
+
+        verb = "se liberarían" if dry_run else "liberados"
+        self.log(
+            f"  Total: {summary['files']} archivos, "
+            f"{format_bytes(summary['bytes'])} {verb}",
+            "SUCCESS",
+        )
+        self.run_record["cleanup"] = summary
+        return True
+
+    def update_programs(self):
+        """
+        Actualiza programas con winget.
+
+        La lista de actualizaciones se obtiene una sola vez, se aplica la
+        política de exclusiones, los instaladores se descargan en paralelo y
+        las instalaciones se ejecutan en serie (winget/msiexec no admiten
+        instalaciones simultáneas).
+        """
+        config = load_config()
+        self.log("  → Buscando actualizaciones disponibles...")
+        packages, error = get_winget_upgrades()
+        if error:
+            self.log(f"    Error consultando winget: {error[:100]}", "ERROR")
+            return False
+
+        results = []
+        pending = []
+        for package in packages:
+            if is_winget_excluded(package["id"], config["winget_excluded_ids"]):
+                self.log(f"    ⏭ Omitido por política: {package['id']}")
+                results.append(
+                    {
+                        "id": package["id"],
+                        "name": package["name"],
+                        "old_version": package["version"],
+                        "new_version": package["available"],
+                        "status": "excluded",
+                        "exit_code": None,
+                        "duration": 0.0,
+                    }
+                )
+            else:
+                pending.append(package)
+
+        self.log(f"    {len(pending)} paquetes por actualizar")
+        if not pending:
+            self.run_record["winget"] = results
+            return True
+
+        # Descargas en paralelo
+        cache_dir = WINGET_CACHE_DIR / self.run_record["run_id"]
+        workers = max(1, int(config["winget_download_workers"]))
+        self.log(f"  → Descargando instaladores ({workers} en paralelo)...")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            downloads = list(
+                pool.map(lambda p: download_winget_package(p, cache_dir), pending)
+            )
+
+        # Instalaciones en serie
+        all_success = True
+        for package, download_dir in zip(pending, downloads):
+            if self.should_cancel:
+                break
+            self.log(
+                f"  → {package['id']}: {package['version']} → {package['available']}"
+            )
+            start = time.time()
+            code, method = install_winget_package(package, download_dir)
+
+            duration = round(time.time() - start, 1)
+            success = code in INSTALL_SUCCESS_CODES
+            all_success = all_success and success
+            results.append(
+                {
+                    "id": package["id"],
+                    "name": package["name"],
+                    "old_version": package["version"],
+                    "new_version": package["available"],
+                    "status": "updated" if success else "failed",
+                    "exit_code": code,
+                    "duration": duration,
+                    "method": method,
+                }
+            )
+            if success:
+                self.log(f"    ✓ Actualizado en {duration} s ({method})", "SUCCESS")
+            else:
+                self.log(f"    ✗ Falló (código {code}, {duration} s)", "ERROR")
+
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        self.run_record["winget"] = results
+        return all_success
+
+
+# ============================================================================
+# CLASE PRINCIPAL
+# ============================================================================
+
+
+class OptimizeApp(OptimizationEngine, ctk.CTk):
+    def __init__(self):
+        super().__init__()
+
+        # Configuración
+        self.title(f"{APP_TITLE} {APP_VERSION}")
+        self.geometry(APP_SIZE)
+        self.resizable(True, True)
+
+        # Variables
+        self.init_engine()
+        self.task_vars = {}
+
+        # Construir interfaz
+        self.build_ui()
+
+        # Verificar prerequisitos
+        self.after(300, self.check_prerequisites)
+
+    def build_ui(self):
+        """Construye la interfaz con scroll."""
+
+        # Marco principal con scroll
+        main_scrollable = ctk.CTkScrollableFrame(
+            self,
+            fg_color=COLOR_BG_DARK,
+            scrollbar_button_color=COLOR_PRIMARY,
+            scrollbar_button_hover_color="#1976d2",
+        )
+        main_scrollable.pack(fill="both", expand=True, padx=15, pady=15)
+
+        # === ENCABEZADO ===
+        header_frame = ctk.CTkFrame(
+            main_scrollable, fg_color=COLOR_PRIMARY, corner_radius=10
+        )
+        header_frame.pack(fill="x", pady=(0, 15))
+
+        title_label = ctk.CTkLabel(
+            header_frame, text="⚡ " + APP_TITLE, font=FONT_TITLE, text_color="white"
+        )
+        title_label.pack(pady=15)
+
+        subtitle_label = ctk.CTkLabel(
+            header_frame,
+            text=f"Autor: Josué Romero  |  Stefanini / PQN  |  {APP_VERSION}",
+            font=FONT_SUBTITLE,
+            text_color="#e3f2fd",
+        )
+        subtitle_label.pack(pady=(0, 15))
+
+        # === SELECCIÓN DE TAREAS ===
+        tasks_frame = ctk.CTkFrame(
+            main_scrollable, fg_color=COLOR_BG_LIGHT, corner_radius=8
+        )
+        tasks_frame.pack(fill="x", expand=True, pady=(0, 10))
+
+        tasks_title = ctk.CTkLabel(
+            tasks_frame,
+            text="📋 Seleccione las Tareas a Ejecutar",
+            font=FONT_LABEL,
+            text_color=COLOR_TEXT,
+        )
+        tasks_title.pack(pady=(10, 10), anchor="w", padx=15)
+
+        # Scrollable frame para tareas
+        tasks_scroll = ctk.CTkScrollableFrame(
+            tasks_frame, height=300, fg_color="transparent"
+        )
+        tasks_scroll.pack(padx=15, pady=(0, 10), fill="x")
+
+        # Agrupar tareas por categoría
+        categories = {
+            "basic": "🔧 Tareas Básicas",
+            "performance": "⚡ Optimización de Rendimiento",
+            "privacy": "🔒 Privacidad y Telemetría",
+            "maintenance": "🛠️ Mantenimiento Avanzado",
+        }
+
+        current_category = None
+        for task in OPTIMIZATION_TASKS:
+            # Mostrar encabezado de categoría si es nueva
+            if task.get("category") != current_category:
+                current_category = task.get("category")
+                if current_category and current_category in categories:
+                    cat_label = ctk.CTkLabel(
+                        tasks_scroll,
+                        text=categories[current_category],
+                        font=("Segoe UI", 11, "bold"),
+                        text_color=COLOR_PRIMARY,
+                        anchor="w",
+                    )
+                    cat_label.pack(anchor="w", pady=(10, 5), padx=5)
+
+            task_frame = ctk.CTkFrame(tasks_scroll, fg_color="#242424", corner_radius=6)
+            task_frame.pack(fill="x", pady=3, padx=5)
+
+            # Variable para el checkbox
+            var = ctk.BooleanVar(value=task["enabled"])
+            self.task_vars[task["id"]] = var
+
+            # Checkbox y nombre
+            checkbox = ctk.CTkCheckBox(task_frame, text="", variable=var, width=20)
+            checkbox.pack(side="left", padx=10, pady=8)
+
+            # Información de la tarea
+            info_frame = ctk.CTkFrame(task_frame, fg_color="transparent")
+            info_frame.pack(side="left", fill="x", expand=True, padx=5)
+
+            name_label = ctk.CTkLabel(
+                info_frame,
+                text=task["name"],
+                font=("Segoe UI", 10, "bold"),
+                text_color=COLOR_SUCCESS if not task["critical"] else COLOR_WARNING,
+                anchor="w",
+            )
+            name_label.pack(anchor="w")
+
+            desc_label = ctk.CTkLabel(
+                info_frame,
+                text=f"{task['description']} • Tiempo estimado: {task['estimated_time']}",
+                font=("Segoe UI", 9),
+                text_color="#9e9e9e",
+                anchor="w",
+            )
+            desc_label.pack(anchor="w")
+
+        # Botones de selección rápida
+        quick_select_frame = ctk.CTkFrame(tasks_frame, fg_color="transparent")
+        quick_select_frame.pack(pady=(0, 10), padx=15)
+
+        ctk.CTkButton(
+            quick_select_frame,
+            text="Seleccionar Todas",
+            command=self.select_all_tasks,
+            width=120,
+            height=30,
+            font=("Segoe UI", 10),
+        ).pack(side="left", padx=3)
+
+        ctk.CTkButton(
+            quick_select_frame,
+            text="Deseleccionar Todas",
+            command=self.deselect_all_tasks,
+            width=120,
+            height=30,
+            font=("Segoe UI", 10),
+        ).pack(side="left", padx=3)
+
+        ctk.CTkButton(
+            quick_select_frame,
+            text="Solo Básicas",
+            command=self.select_quick_tasks,
+            width=120,
+            height=30,
+            font=("Segoe UI", 10),
+        ).pack(side="left", padx=3)
+
+        ctk.CTkButton(
+            quick_select_frame,
+            text="Optimización Completa",
+            command=self.select_performance_tasks,
+            width=140,
+            height=30,
+            font=("Segoe UI", 10),
+        ).pack(side="left", padx=3)
+
+        self.btn_analyze = ctk.CTkButton(
+            quick_select_frame,
+            text="🔍 Analizar Espacio",
+            command=self.on_analyze_disk,
+            width=130,
+            height=30,
+            font=("Segoe UI", 10),
+            fg_color=COLOR_SUCCESS,
+            hover_color="#43a047",
+        )
+        self.btn_analyze.pack(side="left", padx=3)
+
+        self.btn_startup = ctk.CTkButton(
+            quick_select_frame,
+            text="🚀 Analizar Inicio",
+            command=self.on_analyze_startup,
+            width=120,
+            height=30,
+            font=("Segoe UI", 10),
+        )
+        self.btn_startup.pack(side="left", padx=3)
+
+        ctk.CTkButton(
+            quick_select_frame,
+            text="↩ Revertir",
+            command=self.on_rollback,
+            width=90,
+            height=30,
+            font=("Segoe UI", 10),
+            fg_color=COLOR_WARNING,
+            hover_color="#fb8c00",
+        ).pack(side="left", padx=3)
+
+        ctk.CTkButton(
+            quick_select_frame,
+            text="⏰ Programar",
+            command=self.on_schedule,
+            width=110,
+            height=30,
+            font=("Segoe UI", 10),
+        ).pack(side="left", padx=3)
+
+        # Opción de verificación SFC cuando DISM no encuentra daños
+        self.sfc_verify_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            tasks_frame,
+            text="Ejecutar SFC aunque DISM reporte la imagen sana",
+            variable=self.sfc_verify_var,
+            font=("Segoe UI", 10),
+            text_color=COLOR_TEXT,
+        ).pack(pady=(0, 5), padx=15, anchor="w")
+
+        self.cleanup_dry_run_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(
+            tasks_frame,
+            text="Simular limpieza de temporales (no borra, solo calcula)",
+            variable=self.cleanup_dry_run_var,
+            font=("Segoe UI", 10),
+            text_color=COLOR_TEXT,
+        ).pack(pady=(0, 5), padx=15, anchor="w")
+
+        # Modo del gobernador de recursos
+        governor_frame = ctk.CTkFrame(tasks_frame, fg_color="transparent")
+        governor_frame.pack(pady=(0, 10), padx=15, anchor="w")
+
+        ctk.CTkLabel(
+            governor_frame,
+            text="Uso de recursos:",
+            font=("Segoe UI", 10),
+            text_color=COLOR_TEXT,
+        ).pack(side="left", padx=(0, 8))
+
+        self.governor_selector = ctk.CTkSegmentedButton(
+            governor_frame,
+            values=[GOVERNOR_LABELS[level] for level in GOVERNOR_LEVELS],
+            command=self.on_governor_mode_change,
+            font=("Segoe UI", 10),
+        )
+        self.governor_selector.set(GOVERNOR_LABELS[self.governor_mode])
+        self.governor_selector.pack(side="left")
+
+        # === PROGRESO ===
+        progress_frame = ctk.CTkFrame(
+            main_scrollable, fg_color=COLOR_BG_LIGHT, corner_radius=8
+        )
+        progress_frame.pack(fill="x", pady=(0, 10))
+
+        self.progress_label = ctk.CTkLabel(
+            progress_frame,
+            text="Listo para iniciar",
+            font=FONT_SUBTITLE,
+            text_color=COLOR_TEXT,
+        )
+        self.progress_label.pack(pady=(10, 5))
+
+        self.progress_bar = ctk.CTkProgressBar(
+            progress_frame, height=10, corner_radius=5, progress_color=COLOR_PRIMARY
+        )
+        self.progress_bar.pack(pady=(0, 5), padx=15, fill="x")
+        self.progress_bar.set(0)
+
+        self.impact_label = ctk.CTkLabel(
+            progress_frame,
+            text="Impacto de la tarea actual: -",
+            font=("Segoe UI", 10),
+            text_color="#9e9e9e",
+        )
+        self.impact_label.pack(pady=(0, 8))
+
+        # === LOG ===
+        log_label = ctk.CTkLabel(
+            main_scrollable,
+            text="📝 Registro de Actividad",
+            font=FONT_LABEL,
+            text_color=COLOR_TEXT,
+            anchor="w",
+        )
+        log_label.pack(pady=(5, 5), anchor="w")
+
+        self.text_log = ctk.CTkTextbox(
+            main_scrollable,
+            height=180,
+            font=FONT_CONSOLE,
+            fg_color=COLOR_BG_LIGHT,
+            text_color=COLOR_TEXT,
+            border_width=2,
+            border_color=COLOR_PRIMARY,
+            corner_radius=8,
+        )
+        self.text_log.pack(pady=(0, 10), fill="x")
+
+        # === BOTONES ===
+        button_frame = ctk.CTkFrame(main_scrollable, fg_color="transparent")
+        button_frame.pack(fill="x")
 
         self.btn_run = ctk.CTkButton(
             button_frame,
@@ -665,32 +4707,259 @@ class OptimizeApp(ctk.CTk):
             var.set(False)
         self.log("Todas las tareas deseleccionadas")
 
+    def select_preset(self, name):
+        """Marca solo las tareas de un preset."""
+        for task_id, var in self.task_vars.items():
+            var.set(task_id in PRESETS[name])
+
     def select_quick_tasks(self):
         """Selecciona solo tareas básicas/rápidas."""
-        for task in OPTIMIZATION_TASKS:
-            is_basic = task.get("category") == "basic"
-            self.task_vars[task["id"]].set(is_basic)
+        self.select_preset("basico")
         self.log("Tareas básicas seleccionadas")
 
     def select_performance_tasks(self):
         """Selecciona tareas de optimización completa."""
-        performance_ids = [
-            "cleanmgr",
-            "temp_files",
-            "defrag_c",
-            "disable_visual_effects",
-            "disable_startup_delay",
-            "optimize_power_plan",
-            "disable_superfetch",
-            "disable_transparency",
-            "optimize_network",
-            "clear_dns_cache",
-            "disable_game_bar",
-        ]
-        for task_id, var in self.task_vars.items():
-            var.set(task_id in performance_ids)
+        self.select_preset("completo")
         self.log("Optimización completa seleccionada")
 
+    def on_analyze_disk(self):
+        """Analiza el uso del disco del sistema en segundo plano."""
+        if self.is_processing:
+            return
+        self.btn_analyze.configure(state="disabled")
+        thread = threading.Thread(target=self.analyze_disk_usage, daemon=True)
+        thread.start()
+
+    def analyze_disk_usage(self, top_n=8):
+        """Recorre el volumen del sistema y recomienda solo la limpieza útil."""
+        try:
+            root = os.environ.get("SystemDrive", "C:") + os.sep
+            self.log(f"Analizando uso de disco en {root}...")
+
+            start = time.time()
+            index = DirectorySizeIndex(root).scan()
+            self.log(
+                f"✓ {len(index)} carpetas, {index.total_files[0]} archivos, "
+                f"{format_bytes(index.total_bytes[0])} en "
+                f"{time.time() - start:.1f} s",
+                "SUCCESS",
+            )
+
+            consumers = find_space_consumers(index)
+            self.log("Mayores consumidores de espacio:")
+            for consumer in consumers[:top_n]:
+                self.log(
+                    f"  {format_bytes(consumer['bytes']):>10}  "
+                    f"{consumer['category']}: {consumer['path']}"
+                )
+
+            self.log("Tareas de limpieza recomendadas:")
+            for task_id, (recommended, reason) in recommend_cleanup_tasks(
+                consumers
+            ).items():
+                self.task_vars[task_id].set(recommended)
+                mark = "✓" if recommended else "⏭"
+                self.log(f"  {mark} {task_id}: {reason}")
+
+        except Exception as e:
+            self.log(f"✗ Error analizando el disco: {e}", "ERROR")
+        finally:
+            self.after(100, lambda: self.btn_analyze.configure(state="normal"))
+
+    def on_analyze_startup(self):
+        """Analiza el impacto de los programas de inicio en segundo plano."""
+        self.btn_startup.configure(state="disabled")
+        thread = threading.Thread(target=self.analyze_startup, daemon=True)
+        thread.start()
+
+    def analyze_startup(self, top_n=10):
+        """Enumera, mide y ordena las entradas de inicio."""
+        try:
+            self.log("Analizando programas de inicio...")
+            remaining = psutil.boot_time() + STARTUP_WINDOW_SECONDS - time.time()
+            if remaining > 0:
+                self.log(
+                    f"  Muestreando CPU y E/S hasta el fin de la ventana de inicio "
+                    f"({remaining / 60:.0f} min)..."
+                )
+            start = time.time()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                inventory = pool.submit(get_startup_inventory)
+                early_usage = pool.submit(collect_early_process_usage)
+                entries, events = inventory.result()
+                usage = early_usage.result()
+            if not usage:
+                self.log(
+                    "  Sin muestra de CPU/E/S de este arranque (se toma en los "
+                    f"primeros {STARTUP_WINDOW_SECONDS // 60} min): solo se usan "
+                    "los eventos de arranque",
+                    "WARNING",
+                )
+
+            ranked = rank_startup_entries(
+                entries, parse_degradation_events(events), usage
+            )
+            self.log(
+                f"✓ {len(ranked)} entradas de inicio, {len(events)} eventos de "
+                f"arranque en {time.time() - start:.1f} s",
+                "SUCCESS",
+            )
+            for entry in ranked[:top_n]:
+                state = "" if entry["enabled"] else " (deshabilitada)"
+                self.log(f"  {entry['impact_ms']:>7} ms  {entry['name']}{state}")
+
+            self.after(0, lambda: self.show_startup_window(ranked))
+        except Exception as e:
+            self.log(f"✗ Error analizando el inicio: {e}", "ERROR")
+        finally:
+            self.after(100, lambda: self.btn_startup.configure(state="normal"))
+
+    def show_startup_window(self, ranked):
+        """Ventana para deshabilitar entradas de inicio seleccionadas o deshacer."""
+        window = ctk.CTkToplevel(self)
+        window.title("Impacto de Programas de Inicio")
+        window.geometry("700x520")
+        window.configure(fg_color=COLOR_BG_DARK)
+        window.transient(self)
+
+        entries_scroll = ctk.CTkScrollableFrame(
+            window, height=380, fg_color=COLOR_BG_LIGHT
+        )
+        entries_scroll.pack(padx=10, pady=10, fill="both", expand=True)
+
+        selection = []
+        for entry in ranked:
+            command = build_startup_toggle_command(entry, False)
+            var = ctk.BooleanVar(value=False)
+            details = "; ".join(entry["evidence"]) or "sin datos de impacto"
+            ctk.CTkCheckBox(
+                entries_scroll,
+                text=f"{entry['impact_ms']:>7} ms | {entry['kind']} | "
+                f"{entry['name']}\n{details}",
+                variable=var,
+                font=("Segoe UI", 10),
+                text_color=COLOR_TEXT if entry["enabled"] else "#9e9e9e",
+                state="normal" if command and entry["enabled"] else "disabled",
+            ).pack(anchor="w", pady=3, padx=5)
+            selection.append((entry, var))
+
+        # set_startup_entry y undo_last_startup_change lanzan reg/schtasks/sc
+        # y esperan hasta 60 s: corren en un hilo y el log vuelve con after()
+        def log_later(message, level):
+            self.after(0, lambda: self.log(message, level))
+
+        def close_window():
+            if window.winfo_exists():
+                window.destroy()
+
+        def set_buttons_state(state):
+            if window.winfo_exists():
+                btn_disable.configure(state=state)
+                btn_undo.configure(state=state)
+
+        def disable_worker(chosen):
+            for entry in chosen:
+                ok, message = set_startup_entry(entry, False)
+                if ok:
+                    log_later(f"✓ Inicio deshabilitado: {entry['name']}", "SUCCESS")
+                else:
+                    log_later(f"✗ {entry['name']}: {message[:100]}", "ERROR")
+            self.after(0, close_window)
+
+        def undo_worker():
+            ok, message = undo_last_startup_change()
+            if ok:
+                log_later(f"↩ Cambio de inicio revertido: {message}", "SUCCESS")
+            else:
+                log_later(f"⚠ {message[:100]}", "WARNING")
+            self.after(0, lambda: set_buttons_state("normal"))
+
+        def disable_selected():
+            chosen = [entry for entry, var in selection if var.get()]
+            set_buttons_state("disabled")
+            threading.Thread(target=disable_worker, args=(chosen,), daemon=True).start()
+
+        def undo_last():
+            set_buttons_state("disabled")
+            threading.Thread(target=undo_worker, daemon=True).start()
+
+        buttons = ctk.CTkFrame(window, fg_color="transparent")
+        buttons.pack(pady=(0, 10))
+        btn_disable = ctk.CTkButton(
+            buttons,
+            text="Deshabilitar seleccionados",
+            command=disable_selected,
+            fg_color=COLOR_WARNING,
+            hover_color="#fb8c00",
+            font=("Segoe UI", 10),
+        )
+        btn_disable.pack(side="left", padx=5)
+        btn_undo = ctk.CTkButton(
+            buttons,
+            text="↩ Deshacer último cambio",
+            command=undo_last,
+            font=("Segoe UI", 10),
+        )
+        btn_undo.pack(side="left", padx=5)
+
+    def on_rollback(self):
+        """Revierte los cambios de registro y servicios de la última ejecución."""
+        if self.is_processing:
+            return
+        run_id, snapshot = load_registry_snapshot()
+        if snapshot is None:
+            messagebox.showinfo("Revertir", "No hay ejecuciones para revertir.")
+            return
+        response = messagebox.askyesno(
+            "Revertir Ejecución",
+            f"Se restaurarán {len(snapshot['entries'])} valores de registro y "
+            f"servicios a su estado previo a la ejecución {run_id}.\n\n"
+            "¿Desea continuar?",
+        )
+        if not response:
+            return
+
+        run_id, errors = rollback_run(run_id, self.registry_backend)
+        for error in errors:
+            self.log(f"    Error: {error[:100]}", "ERROR")
+        if errors:
+            self.log(f"⚠ Ejecución {run_id} revertida con errores", "WARNING")
+        else:
+            self.log(f"✓ Ejecución {run_id} revertida", "SUCCESS")
+
+    def on_schedule(self):
+        """Registra la ejecución desatendida con el preset configurado."""
+        config = load_config()
+        preset = config["headless_preset"]
+        skipped = [
+            task["name"]
+            for task in OPTIMIZATION_TASKS
+            if task["id"] in PRESETS.get(preset, []) and get_headless_exclusion(task)
+        ]
+        note = f"• Se omitirán: {', '.join(skipped)}\n" if skipped else ""
+        response = messagebox.askyesno(
+            "Programar Optimización",
+            f"Se programará el preset '{preset}' para ejecutarse sin supervisión:\n\n"
+            f"• Fuera del horario laboral ({config['business_hours']})\n"
+            f"• Con {config['headless_idle_minutes']} min de inactividad\n"
+            "• Solo conectado a la corriente\n"
+            f"{note}\n"
+            "¿Desea continuar?",
+        )
+        if not response:
+            return
+
+        ok, message = register_scheduled_task(
+            preset,
+            config["headless_idle_minutes"],
+            config["business_hours"],
+            self.governor_mode,
+        )
+        if ok:
+            self.log(f"✓ Tarea programada registrada: {SCHEDULED_TASK_NAME}", "SUCCESS")
+        else:
+            self.log(f"✗ No se pudo registrar la tarea: {message[:100]}", "ERROR")
+
     def check_prerequisites(self):
         """Verifica prerequisitos."""
         self.log("Verificando prerequisitos del sistema...")
@@ -732,9 +5001,14 @@ class OptimizeApp(ctk.CTk):
             self.log("✗ Operación cancelada por el usuario", "WARNING")
             return
 
+        selected_tasks = [task for task in OPTIMIZATION_TASKS if task["id"] in selected]
+        self.sfc_verify = self.sfc_verify_var.get()
+        self.cleanup_dry_run = self.cleanup_dry_run_var.get()
+
         # Iniciar en hilo separado
         self.is_processing = True
         self.should_cancel = False
+        self.cancel_event.clear()
         self.btn_run.configure(state="disabled")
         self.btn_cancel.configure(state="normal")
 
@@ -742,8 +5016,36 @@ class OptimizeApp(ctk.CTk):
         self.text_log.delete("1.0", "end")
         self.text_log.configure(state="disabled")
 
-        thread = threading.Thread(target=self.optimize_system, daemon=True)
+        thread = threading.Thread(
+            target=self.optimize_system, args=(selected_tasks,), daemon=True
+        )
         thread.start()
+        self.after(1000, self.refresh_impact_label)
+
+    def on_governor_mode_change(self, label):
+        """Aplica el modo de uso de recursos elegido, también a la tarea en curso."""
+        for level, text in GOVERNOR_LABELS.items():
+            if text == label:
+                self.governor_mode = level
+        governor = self.task_governor
+        if governor is not None:
+            governor.set_mode(self.governor_mode)
+
+    def refresh_impact_label(self):
+        """Muestra en vivo el consumo de la tarea en curso."""
+        monitor = self.task_monitor
+        if monitor is not None:
+            usage = monitor.totals()
+            text = (
+                "Impacto de la tarea actual: "
+                f"{describe_resources(usage)} | {usage['processes']} procesos"
+            )
+            governor = self.task_governor
+            if governor is not None and governor.level:
+                text += f" | Modo: {GOVERNOR_LABELS[governor.level]}"
+            self.impact_label.configure(text=text)
+        if self.is_processing:
+            self.after(1000, self.refresh_impact_label)
 
     def cancel_operation(self):
         """Cancela la operación en curso."""
@@ -755,160 +5057,380 @@ class OptimizeApp(ctk.CTk):
             )
             if response:
                 self.should_cancel = True
+                self.cancel_event.set()
                 self.log("Cancelación solicitada...", "WARNING")
                 self.btn_cancel.configure(state="disabled")
 
-    def optimize_system(self):
-        """Ejecuta las tareas de optimización."""
-        try:
-            self.log("━" * 75, "INFO")
-            self.log("🚀 Iniciando proceso de optimización del sistema", "INFO")
-            self.log("━" * 75, "INFO")
+    def update_progress_label(self, text):
+        """Actualiza el label de progreso."""
+        self.progress_label.configure(text=text)
 
-            # Obtener tareas seleccionadas
-            selected_tasks = [
-                task for task in OPTIMIZATION_TASKS if self.task_vars[task["id"]].get()
-            ]
+    def set_progress(self, value):
+        """Actualiza la barra de progreso."""
+        self.progress_bar.set(value)
 
-            total_tasks = len(selected_tasks)
-            completed = 0
+    def on_run_completed(self):
+        """Pregunta por el reinicio al terminar."""
+        self.after(100, self.ask_restart)
 
-            for task in selected_tasks:
-                if self.should_cancel:
-                    self.log("✗ Proceso cancelado por el usuario", "WARNING")
-                    break
+    def on_run_finished(self):
+        """Restablece los botones."""
+        self.after(100, lambda: self.btn_run.configure(state="normal"))
+        self.after(100, lambda: self.btn_cancel.configure(state="disabled"))
 
-                self.current_task = task
-                self.update_progress_label(f"Ejecutando: {task['name']}")
+    def ask_restart(self):
+        """Pregunta si desea reiniciar."""
+        response = messagebox.askyesno(
+            "Optimización Completada",
+            "✓ La optimización ha finalizado exitosamente.\n\n"
+            "Se recomienda reiniciar el equipo para aplicar\n"
+            "todos los cambios correctamente.\n\n"
+            "¿Desea reiniciar ahora?",
+        )
 
-                self.log(f"─── {task['name']} ───", "PROGRESS")
-                self.log(f"Descripción: {task['description']}")
-                self.log(f"Tiempo estimado: {task['estimated_time']}")
+        if response:
+            self.log("Reiniciando el sistema...", "INFO")
+            run_command('shutdown /r /t 10 /c "Reinicio programado en 10 seg, guarde!"')
+            messagebox.showinfo(
+                "Reiniciando",
+                "El sistema se reiniciará en 10 segundos.\n\n"
+                "Guarde todo su trabajo ahora.",
+            )
+            self.after(2000, self.quit)
 
-                # Ejecutar tarea
-                if task["id"] == "winget_update":
-                    success = self.update_programs()
-                else:
-                    success = self.execute_task(task)
 
-                completed += 1
-                progress = completed / total_tasks
-                self.progress_bar.set(progress)
+# ============================================================================
+# MODO DESATENDIDO PROGRAMADO
+# ============================================================================
 
-                if success:
-                    self.log(f"✓ {task['name']} completado", "SUCCESS")
-                else:
-                    self.log(f"⚠ {task['name']} completado con advertencias", "WARNING")
+SCHEDULED_TASK_NAME = r"PQN\Optimizador desatendido"
+SCHEDULED_TASK_XML = LOG_DIR / "scheduled_task.xml"
+# Tarea auxiliar que mide la inactividad dentro de la sesión del usuario
+IDLE_MONITOR_TASK_NAME = r"PQN\Optimizador desatendido - actividad"
+IDLE_MONITOR_TASK_XML = LOG_DIR / "idle_monitor_task.xml"
+HEADLESS_LOG_DIR = LOG_DIR / "headless"
+# Inactividad por debajo de la cual se considera que el usuario volvió
+USER_RETURN_SECONDS = 60
+HEADLESS_CHECK_INTERVAL = 5
 
-                self.log("")  # Línea en blanco
-                time.sleep(0.5)
+TASK_XML_TEMPLATE = """<?xml version="1.0" encoding="UTF-16"?>
+<Task version="1.4" xmlns="http://schemas.microsoft.com/windows/2004/02/mit/task">
+  <RegistrationInfo>
+    <Description>Optimización desatendida (preset {preset}) fuera del horario laboral</Description>
+  </RegistrationInfo>
+  <Triggers>
+    <CalendarTrigger>
+      <StartBoundary>{start_boundary}</StartBoundary>
+      <ScheduleByDay><DaysInterval>1</DaysInterval></ScheduleByDay>
+    </CalendarTrigger>
+  </Triggers>
+  <Principals>
+    <Principal id="Author">
+      <UserId>S-1-5-18</UserId>
+      <RunLevel>HighestAvailable</RunLevel>
+    </Principal>
+  </Principals>
+  <Settings>
+    <MultipleInstancesPolicy>IgnoreNew</MultipleInstancesPolicy>
+    <DisallowStartIfOnBatteries>true</DisallowStartIfOnBatteries>
+    <StopIfGoingOnBatteries>true</StopIfGoingOnBatteries>
+    <RunOnlyIfIdle>true</RunOnlyIfIdle>
+    <IdleSettings>
+      <Duration>PT{idle_minutes}M</Duration>
+      <WaitTimeout>PT{window_minutes}M</WaitTimeout>
+      <StopOnIdleEnd>false</StopOnIdleEnd>
+      <RestartOnIdle>false</RestartOnIdle>
+    </IdleSettings>
+    <StartWhenAvailable>false</StartWhenAvailable>
+    <ExecutionTimeLimit>PT{window_minutes}M</ExecutionTimeLimit>
+    <Priority>7</Priority>
+  </Settings>
+  <Actions Context="Author">
+    <Exec>
+      <Command>{command}</Command>
+      <Arguments>{arguments}</Arguments>
+    </Exec>
+  </Actions>
+</Task>
+"""
 
-            # Proceso completado
-            if not self.should_cancel:
-                self.log("━" * 75, "INFO")
-                self.log("✓ Optimización completada exitosamente", "SUCCESS")
-                self.log("━" * 75, "INFO")
 
-                # Preguntar por reinicio
-                self.after(100, self.ask_restart)
+# Sin desencadenadores: la inicia el modo desatendido con "schtasks /Run".
+# S-1-5-4 (INTERACTIVE) la ejecuta en la sesión del usuario conectado.
+IDLE_MONITOR_TASK_XML_TEMPLATE = """<?xml version="1.0" encoding="UTF-16"?>
+<Task version="1.4" xmlns="http://schemas.microsoft.com/windows/2004/02/mit/task">
+  <RegistrationInfo>
+    <Description>Mide la inactividad del usuario para el optimizador desatendido</Description>
+  </RegistrationInfo>
+  <Principals>
+    <Principal id="Author">
+      <GroupId>S-1-5-4</GroupId>
+      <RunLevel>LeastPrivilege</RunLevel>
+    </Principal>
+  </Principals>
+  <Settings>
+    <MultipleInstancesPolicy>IgnoreNew</MultipleInstancesPolicy>
+    <DisallowStartIfOnBatteries>false</DisallowStartIfOnBatteries>
+    <StopIfGoingOnBatteries>false</StopIfGoingOnBatteries>
+    <ExecutionTimeLimit>PT{window_minutes}M</ExecutionTimeLimit>
+    <Hidden>true</Hidden>
+  </Settings>
+  <Actions Context="Author">
+    <Exec>
+      <Command>{command}</Command>
+      <Arguments>{arguments}</Arguments>
+    </Exec>
+  </Actions>
+</Task>
+"""
 
-        except Exception as e:
-            self.log(f"✗ Error crítico: {str(e)}", "ERROR")
-        finally:
-            self.is_processing = False
-            self.current_task = None
-            self.after(100, lambda: self.btn_run.configure(state="normal"))
-            self.after(100, lambda: self.btn_cancel.configure(state="disabled"))
-            self.update_progress_label("Proceso finalizado")
 
-    def execute_task(self, task):
-        """Ejecuta una tarea específica."""
-        command = task["command"]
+def parse_business_hours(text):
+    """Convierte "07:00-19:00" en (inicio, fin) como minutos del día."""
+    minutes = []
+    for value in text.split("-"):
+        hours, mins = value.strip().split(":")
+        minutes.append(int(hours) * 60 + int(mins))
+    return minutes[0], minutes[1]
 
-        if isinstance(command, list):
-            # Múltiples comandos
-            all_success = True
-            for cmd in command:
-                self.log(f"  → {cmd[:60]}...")
-                code, out, err = run_command(cmd, timeout=300)
-                if code != 0:
-                    all_success = False
-                    if err:
-                        self.log(f"    Error: {err[:100]}", "ERROR")
-            return all_success
-        else:
-            # Comando único
-            self.log(f"  → {command[:60]}...")
-            code, out, err = run_command(command, timeout=1800)  # 30 min timeout
 
-            if code == 0:
-                if out:
-                    lines = out.split("\n")[:5]  # Primeras 5 líneas
-                    for line in lines:
-                        if line.strip():
-                            self.log(f"    {line[:70]}")
-                return True
-            else:
-                if err:
-                    self.log(f"    Error: {err[:100]}", "ERROR")
-                return False
+def is_business_hours(now, business_hours):
+    """Indica si la fecha dada cae en horario laboral (lunes a viernes)."""
+    if now.weekday() >= 5:
+        return False
+    start, end = parse_business_hours(business_hours)
+    minute = now.hour * 60 + now.minute
+    return start <= minute < end
 
-    def update_programs(self):
-        """Actualiza programas con winget."""
-        self.log("  → Buscando actualizaciones disponibles...")
 
-        ps_script = """
-Set-ExecutionPolicy Bypass -Scope Process -Force
-$raw = winget upgrade --accept-source-agreements --accept-package-agreements
-$apps = $raw | Select-Object -Skip 2 | ForEach-Object {
-   ($_ -split '\s{2,}')[1]
-}
-foreach ($app in $apps) {
-   if ($app -and $app -ne "Id") {
-      if ($app -ne "Oracle.JavaRuntimeEnvironment") {
-         Write-Host "Buscando nueva version de [$app]"
-         winget upgrade --id $app --accept-source-agreements --accept-package-agreements -h
-      }
-      else {
-         Write-Host "Omitiendo actualización de [$app]"
-      }
-   }
-}
-"""
+def is_on_ac_power():
+    """True si el equipo está conectado a la corriente (o no tiene batería)."""
+    try:
+        battery = psutil.sensors_battery()
+    except Exception:
+        return True
+    return battery is None or bool(battery.power_plugged)
 
-        code, out, err = run_command(f'powershell -Command "{ps_script}"', timeout=1800)
 
-        if out:
-            lines = out.split("\n")
-            for line in lines[:10]:  # Primeras 10 líneas
-                if line.strip():
-                    self.log(f"    {line[:70]}")
+def get_window_minutes(business_hours):
+    """Minutos desde el fin de la jornada hasta el inicio de la siguiente."""
+    start, end = parse_business_hours(business_hours)
+    return (start - end) % (24 * 60) or 24 * 60
 
-        return code == 0
 
-    def update_progress_label(self, text):
-        """Actualiza el label de progreso."""
-        self.progress_label.configure(text=text)
+def build_scheduled_task_xml(preset, idle_minutes, business_hours, command, arguments):
+    """Genera el XML de la tarea programada que inicia el modo desatendido."""
+    start, end = parse_business_hours(business_hours)
+    window_minutes = get_window_minutes(business_hours)
+    start_boundary = f"2024-01-01T{end // 60:02d}:{end % 60:02d}:00"
+    return TASK_XML_TEMPLATE.format(
+        preset=escape(preset),
+        start_boundary=start_boundary,
+        idle_minutes=int(idle_minutes),
+        window_minutes=window_minutes,
+        command=escape(command),
+        arguments=escape(arguments),
+    )
 
-    def ask_restart(self):
-        """Pregunta si desea reiniciar."""
-        response = messagebox.askyesno(
-            "Optimización Completada",
-            "✓ La optimización ha finalizado exitosamente.\n\n"
-            "Se recomienda reiniciar el equipo para aplicar\n"
-            "todos los cambios correctamente.\n\n"
-            "¿Desea reiniciar ahora?",
+
+def build_idle_monitor_xml(business_hours, command, arguments):
+    """Genera el XML de la tarea auxiliar que mide la inactividad del usuario."""
+    return IDLE_MONITOR_TASK_XML_TEMPLATE.format(
+        window_minutes=get_window_minutes(business_hours),
+        command=escape(command),
+        arguments=escape(arguments),
+    )
+
+
+def get_self_command():
+    """Ruta del ejecutable (o del intérprete y el script) para la tarea programada."""
+    if getattr(sys, "frozen", False):
+        return sys.executable, ""
+    return sys.executable, f'"{os.path.abspath(__file__)}" '
+
+
+def register_scheduled_task(preset, idle_minutes, business_hours, mode):
+    """
+    Registra la tarea programada del modo desatendido.
+
+    Returns:
+       tuple: (éxito, mensaje)
+    """
+    command, prefix = get_self_command()
+    arguments = f"{prefix}--headless --preset {preset} --mode {mode}"
+    tasks = [
+        (
+            SCHEDULED_TASK_NAME,
+            SCHEDULED_TASK_XML,
+            build_scheduled_task_xml(
+                preset, idle_minutes, business_hours, command, arguments
+            ),
+        ),
+        (
+            IDLE_MONITOR_TASK_NAME,
+            IDLE_MONITOR_TASK_XML,
+            build_idle_monitor_xml(
+                business_hours,
+                command,
+                f"{prefix}--idle-monitor {get_window_minutes(business_hours)}",
+            ),
+        ),
+    ]
+    messages = []
+    for name, path, xml in tasks:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(xml, encoding="utf-16")
+        except OSError as e:
+            return False, str(e)
+
+        code, out, err = run_command(
+            f'schtasks /Create /TN "{name}" /XML "{path}" /F', timeout=60
         )
+        if code != 0:
+            return False, (out or err)
+        messages.append(out)
+    return True, "".join(messages)
 
-        if response:
-            self.log("Reiniciando el sistema...", "INFO")
-            run_command('shutdown /r /t 10 /c "Reinicio programado en 10 seg, guarde!"')
-            messagebox.showinfo(
-                "Reiniciando",
-                "El sistema se reiniciará en 10 segundos.\n\n"
-                "Guarde todo su trabajo ahora.",
-            )
-            self.after(2000, self.quit)
+
+def unregister_scheduled_task():
+    """Elimina la tarea programada del modo desatendido y su tarea auxiliar."""
+    run_command(f'schtasks /Delete /TN "{IDLE_MONITOR_TASK_NAME}" /F', timeout=60)
+    code, out, err = run_command(
+        f'schtasks /Delete /TN "{SCHEDULED_TASK_NAME}" /F', timeout=60
+    )
+    return code == 0, (out or err)
+
+
+class HeadlessOptimizer(OptimizationEngine):
+    """
+    Ejecuta un preset sin interfaz.
+
+    Entre tareas espera a que el usuario esté ausente; durante una tarea
+    pesada suspende su árbol de procesos si el usuario vuelve y lo reanuda
+    cuando vuelve a estar inactivo. Se detiene al empezar el horario laboral
+    o al pasar a batería.
+    """
+
+    def __init__(self, preset, mode="balanced", config=None):
+        self.init_engine()
+        self.config = config or load_config()
+        self.preset = preset
+        self.governor_mode = mode
+        self.idle_required = self.config["headless_idle_minutes"] * 60
+        HEADLESS_LOG_DIR.mkdir(parents=True, exist_ok=True)
+        self.log_path = HEADLESS_LOG_DIR / f"{datetime.now():%Y%m%d_%H%M%S}.log"
+        self._watcher = None
+
+    def log(self, msg, level="INFO"):
+        line = f"[{datetime.now():%H:%M:%S}] {level:<8} {msg}\n"
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def set_progress(self, value):
+        pass
+
+    def update_progress_label(self, text):
+        pass
+
+    def window_open(self):
+        """Indica si se puede seguir trabajando (fuera de horario y con corriente)."""
+        if is_business_hours(datetime.now(), self.config["business_hours"]):
+            self.log("Inicio del horario laboral: se detiene la ejecución", "WARNING")
+            return False
+        if not is_on_ac_power():
+            self.log("El equipo pasó a batería: se detiene la ejecución", "WARNING")
+            return False
+        return True
+
+    def before_task(self, task):
+        """Espera a que el usuario esté ausente antes de cada tarea."""
+        while True:
+            if not self.window_open():
+                return False
+            idle = get_user_idle_seconds()
+            if idle is None or idle >= USER_RETURN_SECONDS:
+                return True
+            self.log("Usuario activo: esperando inactividad para continuar")
+            time.sleep(HEADLESS_CHECK_INTERVAL * 6)
+
+    def watch_user(self):
+        """Suspende o reanuda la tarea pesada en curso según la actividad del usuario."""
+        while self.is_processing:
+            governor = self.task_governor
+            idle = get_user_idle_seconds()
+            if governor is not None and governor.task_class == "heavy" and idle is not None:
+                if not governor.paused and idle < USER_RETURN_SECONDS:
+                    self.log("Usuario activo: tarea pesada en pausa", "WARNING")
+                    governor.suspend()
+                elif governor.paused and idle >= self.idle_required:
+                    self.log("Usuario inactivo: se reanuda la tarea")
+                    governor.resume()
+            if governor is not None and governor.paused and not self.window_open():
+                self.should_cancel = True
+                self.cancel_event.set()
+                governor.resume()
+            time.sleep(HEADLESS_CHECK_INTERVAL)
+
+    def run(self):
+        """Ejecuta el preset y retorna el código de salida del proceso."""
+        if self.preset not in PRESETS:
+            self.log(f"Preset desconocido: {self.preset}", "ERROR")
+            return 2
+        if not is_admin():
+            self.log("Se requieren privilegios de administrador", "ERROR")
+            return 1
+        if not self.window_open():
+            return 0
+
+        tasks = []
+        for task in OPTIMIZATION_TASKS:
+            if task["id"] not in PRESETS[self.preset]:
+                continue
+            reason = get_headless_exclusion(task)
+            if reason:
+                self.log(f"⏭ {task['name']}: omitida en modo desatendido ({reason})")
+            else:
+                tasks.append(task)
+
+        # El monitor de la sesión del usuario alimenta get_user_idle_seconds
+        run_command(f'schtasks /Run /TN "{IDLE_MONITOR_TASK_NAME}"', timeout=30)
+        self.is_processing = True
+        self._watcher = threading.Thread(target=self.watch_user, daemon=True)
+        self._watcher.start()
+        try:
+            self.optimize_system(tasks, trigger="headless", preset=self.preset)
+        finally:
+            run_command(f'schtasks /End /TN "{IDLE_MONITOR_TASK_NAME}"', timeout=30)
+        record = self.run_record or {}
+        return 0 if all(t["success"] for t in record.get("tasks", [])) else 3
+
+
+def parse_arguments(argv=None):
+    parser = argparse.ArgumentParser(description=f"{APP_TITLE} {APP_VERSION}")
+    parser.add_argument("--headless", action="store_true", help="ejecutar sin interfaz")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="preset de tareas")
+    parser.add_argument("--mode", choices=GOVERNOR_LEVELS, default="background")
+    parser.add_argument(
+        "--register", action="store_true", help="registrar la tarea programada"
+    )
+    parser.add_argument(
+        "--unregister", action="store_true", help="eliminar la tarea programada"
+    )
+    parser.add_argument(
+        "--idle-monitor",
+        type=int,
+        metavar="MINUTOS",
+        help="publicar la inactividad de esta sesión (lo usa la tarea auxiliar)",
+    )
+    parser.add_argument(
+        "--rollback",
+        nargs="?",
+        const="last",
+        metavar="RUN_ID",
+        help="revertir el registro de una ejecución (por defecto la última)",
+    )
+    return parser.parse_args(argv)
 
 
 # ============================================================================
@@ -916,5 +5438,29 @@ foreach ($app in $apps) {
 # ============================================================================
 
 if __name__ == "__main__":
-    app = OptimizeApp()
-    app.mainloop()
+    args = parse_arguments()
+    config = load_config()
+    preset = args.preset or config["headless_preset"]
+
+    if args.idle_monitor:
+        run_idle_monitor(args.idle_monitor)
+        sys.exit(0)
+    elif args.register:
+        ok, message = register_scheduled_task(
+            preset, config["headless_idle_minutes"], config["business_hours"], args.mode
+        )
+        print(message)
+        sys.exit(0 if ok else 1)
+    elif args.rollback:
+        run_id, errors = rollback_run(None if args.rollback == "last" else args.rollback)
+        print("\n".join(errors) or f"Ejecución {run_id} revertida")
+        sys.exit(0 if run_id and not errors else 1)
+    elif args.unregister:
+        ok, message = unregister_scheduled_task()
+        print(message)
+        sys.exit(0 if ok else 1)
+    elif args.headless:
+        sys.exit(HeadlessOptimizer(preset, args.mode, config).run())
+    else:
+        app = OptimizeApp()
+        app.mainloop()
@@ -24,6 +24,14 @@ import threading
 import hashlib
 import sys
 import ctypes
+import json
+import shutil
+import argparse
+import mmap
+import re
+import struct
+import psutil
+from concurrent.futures import ThreadPoolExecutor, wait
 
 # ============================================================================
 # INFORMACIÓN DE COPYRIGHT Y LICENCIA
@@ -70,7 +78,29 @@ FONT_INFO = ("Segoe UI", 13)                   # Era 11
 INSTALLERS_PATH = Path("D:/Utilidades/Programas")
 LOG_FILENAME = "install_log.txt"
 
+# Catálogo generado a partir de la carpeta de instaladores (viaja con ella)
+CATALOG_FILENAME = "catalog.json"
+CATALOG_EXTENSIONS = (".exe", ".msi")
+
+# Intervalo fijo de muestreo de recursos de cada instalador (segundos)
+RESOURCE_SAMPLE_INTERVAL = 1.0
+
+# Verificación previa: tiempo máximo y caché de hashes (ruta, tamaño, mtime)
+PREFLIGHT_DEADLINE = 2.0
+PREFLIGHT_SPACE_MARGIN_MB = 1024
+HASH_CACHE_FILE = Path("C:/ProgramData/PQN_Installer/hash_cache.json")
+
+# Almacén de instaladores direccionado por contenido (SHA-256). Se consulta
+# por capas: disco local, almacenes compartidos configurados y el de la USB.
+LOCAL_STORE_DIR = Path("C:/ProgramData/PQN_Installer/store")
+STORE_CONFIG_FILE = Path("C:/ProgramData/PQN_Installer/store_config.json")
+STORE_MANIFEST = "manifest.json"
+STORE_CHUNK_SIZE = 8 * 1024**2
+STORE_FETCH_WORKERS = 4
+
 # Definición de instaladores con banderas correctas
+# required_mb: espacio libre necesario en la unidad del sistema
+# sha256 (opcional): hash esperado del instalador
 INSTALLERS = [
    {
       "id": "teamviewer_host",
@@ -78,6 +108,7 @@ INSTALLERS = [
       "file": "1.1_TeamViewer_Host.exe",
       "args": "/S",  # Silencioso
       "timeout": 300,
+      "required_mb": 150,
       "category": "Soporte Remoto",
       "enabled": True,
       "description": "Cliente de soporte remoto (solo host)"
@@ -88,6 +119,7 @@ INSTALLERS = [
       "file": "1.2_TeamViewer_Full_Client.exe",
       "args": "/S",  # Silencioso
       "timeout": 300,
+      "required_mb": 250,
       "category": "Soporte Remoto",
       "enabled": False,
       "description": "Cliente completo de soporte remoto"
@@ -98,6 +130,7 @@ INSTALLERS = [
       "file": "2_FortiClient.exe",
       "args": "/quiet /norestart",  # Silencioso sin reinicio
       "timeout": 600,
+      "required_mb": 700,
       "category": "Conectividad",
       "enabled": True,
       "description": "Cliente VPN corporativo"
@@ -108,6 +141,7 @@ INSTALLERS = [
       "file": "3_Citrix.exe",
       "args": "/silent /noreboot /AutoUpdateCheck=disabled",  # Silencioso
       "timeout": 600,
+      "required_mb": 600,
       "category": "Conectividad",
       "enabled": True,
       "description": "Acceso a aplicaciones virtualizadas"
@@ -118,6 +152,7 @@ INSTALLERS = [
       "file": "4_Java8_341.exe",
       "args": "/s INSTALL_SILENT=1 AUTO_UPDATE=0 WEB_JAVA=1",  # Silencioso
       "timeout": 600,
+      "required_mb": 250,
       "category": "Runtime & Frameworks",
       "enabled": True,
       "description": "Java Runtime Environment 8"
@@ -128,6 +163,7 @@ INSTALLERS = [
       "file": "5_NET_3.5.exe",
       "args": "/q /norestart",  # Silencioso sin reinicio
       "timeout": 900,
+      "required_mb": 400,
       "category": "Runtime & Frameworks",
       "enabled": True,
       "description": "Framework para aplicaciones .NET"
@@ -138,6 +174,7 @@ INSTALLERS = [
       "file": "6_Reader.exe",
       "args": "/sAll /rs /msi EULA_ACCEPT=YES",  # Silencioso
       "timeout": 600,
+      "required_mb": 1200,
       "category": "Esenciales",
       "enabled": True,
       "description": "Lector de documentos PDF"
@@ -148,6 +185,7 @@ INSTALLERS = [
       "file": "7_SupportAssist_Dell.exe",
       "args": "/S /v/qn",  # Silencioso
       "timeout": 600,
+      "required_mb": 800,
       "category": "Soporte Hardware",
       "enabled": False,
       "description": "Soporte automático para equipos Dell"
@@ -158,6 +196,7 @@ INSTALLERS = [
       "file": "7_SupportAssist_Lenovo.exe",
       "args": "/VERYSILENT /SUPPRESSMSGBOXES /NORESTART",  # Silencioso
       "timeout": 600,
+      "required_mb": 500,
       "category": "Soporte Hardware",
       "enabled": False,
       "description": "Soporte automático para equipos Lenovo"
@@ -168,6 +207,7 @@ INSTALLERS = [
       "file": "8_Teams.exe",
       "args": "/S",  # Silencioso
       "timeout": 900,
+      "required_mb": 900,
       "category": "Comunicaciones",
       "enabled": True,
       "description": "Plataforma de colaboración empresarial"
@@ -178,6 +218,7 @@ INSTALLERS = [
       "file": "9_ChromeEnterprise.msi",
       "args": "/qn /norestart",  # MSI silencioso
       "timeout": 600,
+      "required_mb": 500,
       "category": "Navegadores",
       "enabled": True,
       "description": "Navegador web corporativo"
@@ -189,6 +230,7 @@ INSTALLERS = [
       "config": "10_config.xml",
       "args": "/configure",  # Requiere XML
       "timeout": 1800,
+      "required_mb": 4000,
       "category": "Productividad",
       "enabled": True,
       "description": "Suite ofimática completa"
@@ -211,13 +253,16 @@ def is_admin():
 def run_as_admin():
    """Reinicia el script con privilegios de administrador."""
    try:
+      # En el ejecutable congelado sys.executable ya es el programa: solo se
+      # pasan los argumentos, sin sys.argv[0]
+      arguments = subprocess.list2cmdline(sys.argv[1:])
       if sys.argv[0].endswith('.py'):
          ctypes.windll.shell32.ShellExecuteW(
-               None, "runas", sys.executable, f'"{sys.argv[0]}"', None, 1
+               None, "runas", sys.executable, f'"{sys.argv[0]}" {arguments}'.strip(), None, 1
          )
       else:
          ctypes.windll.shell32.ShellExecuteW(
-               None, "runas", sys.executable, " ".join(sys.argv), None, 1
+               None, "runas", sys.executable, arguments, None, 1
          )
       sys.exit(0)
    except Exception as e:
@@ -242,13 +287,151 @@ def calculate_hash(data):
       return "N/A"
 
 
+# Archivos presentes en la carpeta según el último escaneo del catálogo
+# (nombre en minúsculas → nombre real); None si no hay catálogo cargado
+CATALOG_INDEX = None
+
+
 def find_installer(filename):
-   """Busca un instalador en la ruta fija."""
+   """Busca un instalador en la ruta fija (sin stat si el catálogo está cargado)."""
    installer_path = INSTALLERS_PATH / filename
+   if CATALOG_INDEX is not None and filename.lower() in CATALOG_INDEX:
+      return str(INSTALLERS_PATH / CATALOG_INDEX[filename.lower()])
    return str(installer_path) if installer_path.exists() else None
 
 
-def run_installer(installer_path, arguments, timeout=600):
+def format_bytes(size):
+   """Formatea un tamaño en bytes a una unidad legible."""
+   for unit in ("B", "KB", "MB", "GB"):
+      if abs(size) < 1024:
+         return f"{size:.1f} {unit}" if unit != "B" else f"{size} B"
+      size /= 1024
+   return f"{size:.2f} TB"
+
+
+class ProcessTreeMonitor:
+   """
+   Mide CPU, E/S y memoria pico de un instalador y todos sus subprocesos.
+
+   Un hilo muestrea el árbol completo (incluidos hijos que quedan huérfanos,
+   p. ej. msiexec lanzado por un bootstrapper) a intervalo fijo y conserva
+   la última lectura de cada proceso ya terminado.
+   """
+
+   def __init__(self, interval=RESOURCE_SAMPLE_INTERVAL):
+      self.interval = interval
+      self._roots = []
+      self._tracked = {}
+      self._usage = {}
+      self._peak_rss = 0
+      self._current_rss = 0
+      self._sampler_cpu = 0.0
+      self._started = time.time()
+      self._lock = threading.Lock()
+      self._stop = threading.Event()
+      self._thread = None
+
+   def attach(self, pid):
+      """Agrega un proceso raíz a la medición."""
+      try:
+         process = psutil.Process(pid)
+      except psutil.Error:
+         return
+      with self._lock:
+         self._roots.append(process)
+
+   def start(self):
+      """Inicia el hilo de muestreo."""
+      self._started = time.time()
+      self._thread = threading.Thread(target=self._run, daemon=True)
+      self._thread.start()
+      return self
+
+   def stop(self):
+      """Detiene el muestreo y retorna los totales."""
+      self._stop.set()
+      if self._thread:
+         self._thread.join(timeout=self.interval * 2)
+      self._sample()
+      return self.totals()
+
+   def _run(self):
+      while not self._stop.wait(self.interval):
+         self._sample()
+
+   def _sample(self):
+      started_cpu = time.thread_time()
+      with self._lock:
+         roots = list(self._roots)
+         candidates = dict(self._tracked)
+
+      for root in roots:
+         try:
+            for process in [root] + root.children(recursive=True):
+               candidates[(process.pid, process.create_time())] = process
+         except psutil.Error:
+            continue
+
+      alive = {}
+      readings = {}
+      rss = 0
+      for key, process in candidates.items():
+         try:
+            with process.oneshot():
+               cpu = process.cpu_times()
+               memory = process.memory_info()
+               try:
+                  io = process.io_counters()
+                  read_bytes, write_bytes = io.read_bytes, io.write_bytes
+               except (psutil.AccessDenied, AttributeError):
+                  read_bytes = write_bytes = 0
+         except psutil.Error:
+            continue
+         alive[key] = process
+         readings[key] = (cpu.user + cpu.system, read_bytes, write_bytes)
+         rss += memory.rss
+
+      with self._lock:
+         self._tracked = alive
+         self._roots = [root for root in self._roots if root.is_running()]
+         self._usage.update(readings)
+         self._current_rss = rss
+         self._peak_rss = max(self._peak_rss, rss)
+         self._sampler_cpu += time.thread_time() - started_cpu
+
+   def totals(self):
+      """
+      Retorna los totales acumulados del árbol de procesos.
+
+      Returns:
+         dict: cpu_seconds, read_bytes, write_bytes, peak_rss, current_rss,
+               processes y sampler_cpu_percent (costo del propio muestreo)
+      """
+      with self._lock:
+         usage = list(self._usage.values())
+         elapsed = max(time.time() - self._started, 0.001)
+         return {
+            "cpu_seconds": round(sum(u[0] for u in usage), 2),
+            "read_bytes": sum(u[1] for u in usage),
+            "write_bytes": sum(u[2] for u in usage),
+            "peak_rss": self._peak_rss,
+            "current_rss": self._current_rss,
+            "processes": len(usage),
+            "sampler_cpu_percent": round(self._sampler_cpu / elapsed * 100, 3),
+         }
+
+
+def describe_resources(usage):
+   """Resume en una línea el consumo de recursos de un instalador."""
+   return (
+      f"CPU {usage['cpu_seconds']:.1f} s | "
+      f"Lectura {format_bytes(usage['read_bytes'])} | "
+      f"Escritura {format_bytes(usage['write_bytes'])} | "
+      f"RAM pico {format_bytes(usage['peak_rss'])}"
+   )
+
+
+def run_installer(installer_path, arguments, timeout=600, monitor=None):
    """
    Ejecuta un instalador de forma desatendida.
    
@@ -256,6 +439,7 @@ def run_installer(installer_path, arguments, timeout=600):
       installer_path: Ruta completa del instalador
       arguments: Argumentos de línea de comandos
       timeout: Timeout en segundos
+      monitor: ProcessTreeMonitor opcional que medirá el proceso
    
    Returns:
       tuple: (success: bool, error_msg: str)
@@ -270,25 +454,31 @@ def run_installer(installer_path, arguments, timeout=600):
          cmd = f'"{installer_path}" {arguments}'
       
       # Ejecutar
-      result = subprocess.run(
+      process = subprocess.Popen(
          cmd,
          shell=True,
-         capture_output=True,
+         stdout=subprocess.PIPE,
+         stderr=subprocess.PIPE,
          text=True,
-         timeout=timeout,
          creationflags=subprocess.CREATE_NO_WINDOW
       )
+      if monitor is not None:
+         monitor.attach(process.pid)
+      try:
+         process.communicate(timeout=timeout)
+      except subprocess.TimeoutExpired:
+         process.kill()
+         process.communicate()
+         return False, f"Timeout - La instalación excedió {timeout} segundos"
       
       # Códigos de retorno comunes de éxito
       success_codes = [0, 3010]  # 0=éxito, 3010=éxito pero requiere reinicio
       
-      if result.returncode in success_codes:
+      if process.returncode in success_codes:
          return True, ""
       else:
-         return False, f"Código de salida: {result.returncode}"
-         
-   except subprocess.TimeoutExpired:
-      return False, f"Timeout - La instalación excedió {timeout} segundos"
+         return False, f"Código de salida: {process.returncode}"
+
    except Exception as e:
       return False, str(e)
 
@@ -303,6 +493,734 @@ def write_log(path, content):
       pass
 
 
+# ============================================================================
+# CATÁLOGO DE INSTALADORES
+# ============================================================================
+
+OLE_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+# Firmas en el binario, en orden de prioridad (un Burn puede contener un MSI, etc.)
+INSTALLER_SIGNATURES = [
+   ("wix_burn", (b".wixburn",)),
+   ("nsis", (b"Nullsoft.NSIS", b"NullsoftInst")),
+   ("inno", (b"Inno Setup Setup Data", b"Inno Setup Messages")),
+   ("installshield", (b"InstallShield",)),
+   ("squirrel", (b"SquirrelSetup", b"Squirrel.Windows", b"SquirrelTemp")),
+]
+
+SILENT_ARGS = {
+   "msi": "/qn /norestart",
+   "nsis": "/S",
+   "inno": "/VERYSILENT /SUPPRESSMSGBOXES /NORESTART",
+   "installshield": '/s /v"/qn /norestart"',
+   "wix_burn": "/quiet /norestart",
+   "squirrel": "--silent",
+}
+
+VS_FIXEDFILEINFO_SIGNATURE = struct.pack("<I", 0xFEEF04BD)
+VERSION_STRINGS = ("ProductName", "CompanyName", "FileDescription", "ProductVersion")
+
+
+def read_version_string(mm, start, end, key):
+   """Lee un valor de StringFileInfo (UTF-16) dentro del recurso de versión."""
+   needle = key.encode("utf-16-le") + b"\x00\x00"
+   position = mm.find(needle, start, end)
+   if position < 0:
+      return None
+   position += len(needle)
+   # El valor está alineado a 4 bytes respecto del inicio del recurso
+   while position < end and (position - start) % 4:
+      position += 1
+   value_end = position
+   while value_end + 1 < end and mm[value_end:value_end + 2] != b"\x00\x00":
+      value_end += 2
+   value = mm[position:value_end].decode("utf-16-le", errors="ignore").strip()
+   return value or None
+
+
+def read_version_info(mm):
+   """
+   Extrae VS_VERSION_INFO de un ejecutable mapeado en memoria.
+
+   Returns:
+      dict: file_version y las cadenas de VERSION_STRINGS encontradas
+   """
+   info = {}
+   marker = "VS_VERSION_INFO".encode("utf-16-le")
+   start = mm.rfind(marker)
+   if start < 0:
+      return info
+   # El encabezado (wLength, wValueLength, wType) ocupa los 6 bytes previos
+   base = max(0, start - 6)
+   length = struct.unpack_from("<H", mm, base)[0] if start >= 6 else 0
+   end = min(len(mm), base + length) if length else min(len(mm), start + 4096)
+
+   fixed = mm.find(VS_FIXEDFILEINFO_SIGNATURE, start, end)
+   if fixed >= 0 and fixed + 16 <= len(mm):
+      ms, ls = struct.unpack_from("<II", mm, fixed + 8)
+      info["file_version"] = f"{ms >> 16}.{ms & 0xFFFF}.{ls >> 16}.{ls & 0xFFFF}"
+   for key in VERSION_STRINGS:
+      value = read_version_string(mm, base, end, key)
+      if value:
+         info[key] = value
+   return info
+
+
+def sniff_installer(path):
+   """
+   Identifica la tecnología de un instalador leyendo sus firmas con mmap.
+
+   Returns:
+      dict: technology, version, product_name y company
+   """
+   result = {"technology": "unknown", "version": None, "product_name": None, "company": None}
+   with open(path, "rb") as f:
+      if os.fstat(f.fileno()).st_size == 0:
+         return result
+      with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+         if mm[:8] == OLE_SIGNATURE:
+            result["technology"] = "msi"
+            return result
+         if mm[:2] != b"MZ":
+            return result
+         for technology, signatures in INSTALLER_SIGNATURES:
+            if any(mm.find(signature) >= 0 for signature in signatures):
+               result["technology"] = technology
+               break
+         info = read_version_info(mm)
+   result["version"] = info.get("ProductVersion") or info.get("file_version")
+   result["product_name"] = info.get("ProductName") or info.get("FileDescription")
+   result["company"] = info.get("CompanyName")
+   return result
+
+
+def suggest_detection_rule(fingerprint):
+   """Regla para saber si el programa ya está instalado (DisplayName en Uninstall)."""
+   name = fingerprint.get("product_name")
+   if not name:
+      return None
+   return {
+      "type": "uninstall_display_name",
+      "pattern": re.sub(r"[\d.]+$", "", name).strip(),
+      "min_version": fingerprint.get("version"),
+   }
+
+
+def catalog_entry_for(filename, stat, fingerprint, known=None):
+   """
+   Arma la entrada de catálogo de un archivo.
+
+   Los datos ya definidos en INSTALLERS (nombre, argumentos, categoría) se
+   conservan; para archivos nuevos se sugieren a partir de la huella.
+   """
+   entry = dict(known) if known else {
+      "id": re.sub(r"[^a-z0-9]+", "_", Path(filename).stem.lower()).strip("_"),
+      "name": fingerprint.get("product_name") or Path(filename).stem,
+      "file": filename,
+      "args": SILENT_ARGS.get(fingerprint["technology"], ""),
+      "timeout": 900,
+      "required_mb": max(200, stat.st_size * 3 // 1024**2),
+      "category": "Sin categoría",
+      "enabled": False,
+      "description": fingerprint.get("company") or "Agregado por el escáner de catálogo",
+   }
+   entry.update({
+      "technology": fingerprint["technology"],
+      "version": fingerprint.get("version"),
+      "suggested_args": SILENT_ARGS.get(fingerprint["technology"]),
+      "detection": suggest_detection_rule(fingerprint),
+      "size": stat.st_size,
+      "mtime": int(stat.st_mtime),
+   })
+   return entry
+
+
+# Campos de la entrada que salen del análisis del archivo (reutilizables
+# mientras el archivo no cambie); el resto lo define INSTALLERS
+FINGERPRINT_FIELDS = ("technology", "version", "suggested_args", "detection", "size", "mtime")
+
+
+def build_catalog(directory, previous=None, known_installers=None):
+   """
+   Escanea la carpeta de instaladores y genera el catálogo.
+
+   Solo se vuelven a analizar los archivos cuyo tamaño o mtime cambió
+   respecto del catálogo anterior. De las entradas reutilizadas solo se toma
+   la huella: los datos curados en INSTALLERS siempre se aplican encima.
+
+   Returns:
+      tuple: (catálogo, cantidad de archivos analizados)
+   """
+   known = {inst["file"].lower(): inst for inst in (known_installers or [])}
+   old = {e["file"].lower(): e for e in (previous or {}).get("entries", [])}
+   entries = []
+   sniffed = 0
+   with os.scandir(directory) as it:
+      files = sorted(
+         (e for e in it if e.is_file() and e.name.lower().endswith(CATALOG_EXTENSIONS)),
+         key=lambda e: e.name.lower(),
+      )
+   for item in files:
+      stat = item.stat()
+      cached = old.get(item.name.lower())
+      if cached and cached.get("size") == stat.st_size and cached.get("mtime") == int(stat.st_mtime):
+         curated = known.get(item.name.lower())
+         if curated:
+            cached = dict(curated, **{key: cached.get(key) for key in FINGERPRINT_FIELDS})
+         entries.append(cached)
+         continue
+      try:
+         fingerprint = sniff_installer(item.path)
+      except (OSError, ValueError):
+         fingerprint = {"technology": "unknown"}
+      sniffed += 1
+      entries.append(catalog_entry_for(item.name, stat, fingerprint, known.get(item.name.lower())))
+
+   # Las entradas conocidas sin archivo se conservan: la verificación previa
+   # las informará como faltantes
+   scanned = {item.name.lower() for item in files}
+   entries.extend(dict(inst) for name, inst in known.items() if name not in scanned)
+   # Se respeta el orden de instalación de INSTALLERS; los nuevos van al final
+   order = {name: position for position, name in enumerate(known)}
+   entries.sort(key=lambda e: (order.get(e["file"].lower(), len(order)), e["file"].lower()))
+
+   # Archivos auxiliares (p. ej. el XML de Office) de entradas conocidas
+   present = {e.name.lower(): e.name for e in os.scandir(directory) if e.is_file()}
+   catalog = {
+      "version": 1,
+      "generated": datetime.datetime.now().isoformat(timespec="seconds"),
+      "entries": entries,
+      "index": present,
+   }
+   return catalog, sniffed
+
+
+def load_installer_catalog(directory=None):
+   """
+   Carga (y actualiza de forma incremental) el catálogo de la carpeta.
+
+   Returns:
+      tuple: (lista de instaladores, índice de archivos) o (None, None) si no
+             se pudo usar el catálogo y debe usarse INSTALLERS
+   """
+   directory = Path(directory or INSTALLERS_PATH)
+   path = directory / CATALOG_FILENAME
+   try:
+      with open(path, "r", encoding="utf-8") as f:
+         previous = json.load(f)
+   except (OSError, ValueError):
+      previous = None
+
+   try:
+      catalog, sniffed = build_catalog(directory, previous, INSTALLERS)
+   except OSError:
+      return None, None
+
+   if (sniffed or previous is None or previous.get("index") != catalog["index"]
+         or previous.get("entries") != catalog["entries"]):
+      try:
+         with open(path, "w", encoding="utf-8") as f:
+            json.dump(catalog, f, indent=2, ensure_ascii=False)
+      except OSError:
+         pass
+   if not catalog["entries"]:
+      return None, None
+   return catalog["entries"], catalog["index"]
+
+
+# ============================================================================
+# ALMACÉN DIRECCIONADO POR CONTENIDO
+# ============================================================================
+
+def get_store_layers():
+   """
+   Capas del almacén en orden de consulta: local, compartidas y la de la USB.
+
+   Las compartidas (rutas o recursos \\servidor\carpeta) se leen de
+   STORE_CONFIG_FILE: {"shared_stores": ["..."]}.
+   """
+   shared = []
+   try:
+      with open(STORE_CONFIG_FILE, "r", encoding="utf-8") as f:
+         shared = [Path(p) for p in json.load(f).get("shared_stores", [])]
+   except (OSError, ValueError):
+      pass
+   return [LOCAL_STORE_DIR] + shared + [INSTALLERS_PATH / "store"]
+
+
+def object_path(store, digest):
+   """Ruta de un objeto dentro de un almacén (objects/ab/abcdef...)."""
+   return Path(store) / "objects" / digest[:2] / digest
+
+
+def object_matches(path, item):
+   """Indica si un archivo tiene el tamaño y el SHA-256 del objeto (usa la caché de hashes)."""
+   try:
+      return Path(path).stat().st_size == item["size"] and file_sha256(path).lower() == item["sha256"].lower()
+   except OSError:
+      return False
+
+
+def discard_object(store, digest):
+   """Elimina un objeto dañado del almacén y su copia ejecutable en run/."""
+   object_path(store, digest).unlink(missing_ok=True)
+   shutil.rmtree(Path(store) / "run" / digest, ignore_errors=True)
+
+
+def materialize_object(store, item):
+   """
+   Expone un objeto verificado con su nombre original para poder ejecutarlo.
+
+   Los objetos no tienen extensión y msiexec o cmd no los reconocen; se
+   crea un enlace duro (o una copia si el volumen no los admite) en
+   run/<digest>/<archivo> del mismo almacén.
+
+   Returns:
+      Path: ruta ejecutable del objeto
+   """
+   source = object_path(store, item["sha256"])
+   target = Path(store) / "run" / item["sha256"] / Path(item["file"]).name
+   if object_matches(target, item):
+      return target
+   target.parent.mkdir(parents=True, exist_ok=True)
+   temporary = target.with_name(f"{target.name}.tmp")
+   temporary.unlink(missing_ok=True)
+   try:
+      os.link(source, temporary)
+   except OSError:
+      shutil.copyfile(source, temporary)
+   os.replace(temporary, target)
+   return target
+
+
+def store_put(store, path):
+   """
+   Agrega un archivo al almacén; si ya existe el mismo contenido no se copia.
+
+   Returns:
+      dict: sha256, size y file
+   """
+   digest = file_sha256(path)
+   target = object_path(store, digest)
+   if not target.exists():
+      target.parent.mkdir(parents=True, exist_ok=True)
+      temporary = target.with_suffix(".tmp")
+      shutil.copyfile(path, temporary)
+      os.replace(temporary, target)
+   return {"sha256": digest, "size": os.path.getsize(path), "file": Path(path).name}
+
+
+def publish_to_store(directory, store, installers):
+   """
+   Publica los instaladores de una carpeta en un almacén y escribe su manifiesto.
+
+   Returns:
+      dict: manifiesto (id → sha256, size, file y config opcional)
+   """
+   manifest = {"generated": datetime.datetime.now().isoformat(timespec="seconds"), "installers": {}}
+   for installer in installers:
+      path = Path(directory) / installer["file"]
+      if not path.is_file():
+         continue
+      item = store_put(store, path)
+      config = installer.get("config")
+      if config and (Path(directory) / config).is_file():
+         item["config"] = store_put(store, Path(directory) / config)
+      manifest["installers"][installer["id"]] = item
+
+   Path(store).mkdir(parents=True, exist_ok=True)
+   with open(Path(store) / STORE_MANIFEST, "w", encoding="utf-8") as f:
+      json.dump(manifest, f, indent=2, ensure_ascii=False)
+   return manifest
+
+
+def load_store_manifest(layers=None):
+   """
+   Carga el manifiesto más reciente entre las capas y guarda copia local.
+
+   Returns:
+      dict: id → {sha256, size, file, config}; vacío si no hay manifiesto
+   """
+   best = None
+   for store in layers or get_store_layers():
+      try:
+         with open(Path(store) / STORE_MANIFEST, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+      except (OSError, ValueError):
+         continue
+      if best is None or manifest.get("generated", "") > best.get("generated", ""):
+         best = manifest
+   if best is None:
+      return {}
+   try:
+      LOCAL_STORE_DIR.mkdir(parents=True, exist_ok=True)
+      with open(LOCAL_STORE_DIR / STORE_MANIFEST, "w", encoding="utf-8") as f:
+         json.dump(best, f, indent=2, ensure_ascii=False)
+   except OSError:
+      pass
+   return best.get("installers", {})
+
+
+def locate_object(item, layers=None):
+   """Primera capa que contiene el objeto con el tamaño esperado (sin copiar)."""
+   for store in layers or get_store_layers():
+      path = object_path(store, item["sha256"])
+      try:
+         if path.stat().st_size == item["size"]:
+            return path
+      except OSError:
+         continue
+   return None
+
+
+def copy_chunks(source, target, size, chunk_size=STORE_CHUNK_SIZE, workers=STORE_FETCH_WORKERS):
+   """
+   Copia un archivo por bloques en paralelo, reanudable.
+
+   El progreso se guarda en <target>.json con los bloques completados; si la
+   copia se interrumpe, el siguiente intento solo copia los que faltan.
+   """
+   progress_path = Path(f"{target}.json")
+   try:
+      with open(progress_path, "r", encoding="utf-8") as f:
+         done = set(json.load(f))
+   except (OSError, ValueError):
+      done = set()
+   if not Path(target).exists():
+      done = set()
+      with open(target, "wb") as f:
+         f.truncate(size)
+
+   lock = threading.Lock()
+
+   def copy_chunk(index):
+      offset = index * chunk_size
+      with open(source, "rb") as src, open(target, "r+b") as dst:
+         src.seek(offset)
+         dst.seek(offset)
+         dst.write(src.read(chunk_size))
+      with lock:
+         done.add(index)
+         with open(progress_path, "w", encoding="utf-8") as f:
+            json.dump(sorted(done), f)
+
+   chunks = [i for i in range((size + chunk_size - 1) // chunk_size) if i not in done]
+   with ThreadPoolExecutor(max_workers=workers) as pool:
+      list(pool.map(copy_chunk, chunks))
+
+
+def fetch_object(item, layers=None):
+   """
+   Garantiza que un objeto esté en el almacén local y retorna su ruta.
+
+   Un objeto local solo se reutiliza si su SHA-256 coincide; si está dañado
+   se descarta. Se copia desde la primera capa remota que lo tenga y se
+   verifica antes de publicarlo en el almacén local; si la copia no
+   coincide se intenta con la capa siguiente.
+
+   Returns:
+      tuple: (ruta ejecutable en run/<digest>/<archivo> o None, mensaje de error)
+   """
+   layers = layers or get_store_layers()
+   local = object_path(layers[0], item["sha256"])
+   if locate_object(item, layers[:1]):
+      if object_matches(local, item):
+         try:
+            return materialize_object(layers[0], item), ""
+         except OSError as e:
+            return None, f"{item['file']}: {e}"
+      discard_object(layers[0], item["sha256"])
+
+   partial = local.with_suffix(".partial")
+   progress = Path(f"{partial}.json")
+   errors = []
+   for store in layers[1:]:
+      source = locate_object(item, [store])
+      if source is None:
+         continue
+      try:
+         local.parent.mkdir(parents=True, exist_ok=True)
+         # Una copia interrumpida se reanuda aunque venga de otra capa: el
+         # contenido de un mismo digest es idéntico en todas
+         copy_chunks(source, partial, item["size"])
+         if file_sha256(partial, use_cache=False) != item["sha256"]:
+            partial.unlink()
+            progress.unlink(missing_ok=True)
+            errors.append(f"el hash no coincide tras la copia desde {store}")
+            continue
+         os.replace(partial, local)
+         progress.unlink(missing_ok=True)
+         return materialize_object(layers[0], item), ""
+      except OSError as e:
+         errors.append(str(e))
+
+   if not errors:
+      return None, f"{item['file']} no está en ningún almacén"
+   return None, f"{item['file']}: {'; '.join(errors)}"
+
+
+def resolve_installers(installers, manifest, workers=3):
+   """
+   Resuelve en paralelo los instaladores del manifiesto al almacén local.
+
+   Returns:
+      dict: id → {"file": ruta, "config": ruta o None, "error": mensaje}
+   """
+   def resolve(installer):
+      item = manifest[installer["id"]]
+      path, error = fetch_object(item)
+      config = None
+      if path and item.get("config"):
+         config, error = fetch_object(item["config"])
+      return installer["id"], {"file": path and str(path), "config": config and str(config), "error": error}
+
+   targets = [inst for inst in installers if inst["id"] in manifest]
+   if not targets:
+      return {}
+   with ThreadPoolExecutor(max_workers=workers) as pool:
+      return dict(pool.map(resolve, targets))
+
+
+# ============================================================================
+# VERIFICACIÓN PREVIA (PRE-FLIGHT)
+# ============================================================================
+
+PREFLIGHT_OK = "ok"
+PREFLIGHT_WARNING = "warning"
+PREFLIGHT_ERROR = "error"
+
+PENDING_REBOOT_KEYS = [
+   r"SOFTWARE\Microsoft\Windows\CurrentVersion\Component Based Servicing\RebootPending",
+   r"SOFTWARE\Microsoft\Windows\CurrentVersion\WindowsUpdate\Auto Update\RebootRequired",
+]
+PENDING_RENAME_KEY = r"SYSTEM\CurrentControlSet\Control\Session Manager"
+
+# Procesos de Windows Update / servicing que compiten con los instaladores
+SERVICING_PROCESSES = ("tiworker.exe", "trustedinstaller.exe", "mousocoreworker.exe", "wuauclt.exe")
+
+_hash_cache_lock = threading.Lock()
+
+
+def preflight_result(check, target, status, detail=""):
+   """Crea una entrada del informe de verificación previa."""
+   return {"check": check, "target": target, "status": status, "detail": detail}
+
+
+def check_disk_space(installers, drive=None):
+   """Compara el espacio requerido por los instaladores con el libre en la unidad del sistema."""
+   drive = drive or os.environ.get("SystemDrive", "C:") + os.sep
+   required = sum(inst.get("required_mb", 0) for inst in installers) + PREFLIGHT_SPACE_MARGIN_MB
+   try:
+      free = psutil.disk_usage(drive).free // 1024**2
+   except OSError as e:
+      return preflight_result("Espacio en disco", drive, PREFLIGHT_WARNING, str(e))
+   detail = f"{free} MB libres, {required} MB requeridos"
+   status = PREFLIGHT_OK if free >= required else PREFLIGHT_ERROR
+   return preflight_result("Espacio en disco", drive, status, detail)
+
+
+def check_pending_reboot():
+   """Detecta un reinicio pendiente (servicing, Windows Update o renombrados)."""
+   try:
+      import winreg
+   except ImportError:
+      return preflight_result("Reinicio pendiente", "Sistema", PREFLIGHT_OK, "No aplica")
+
+   reasons = []
+   for key in PENDING_REBOOT_KEYS:
+      try:
+         winreg.CloseKey(winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key))
+         reasons.append(key.rsplit("\\", 1)[-1])
+      except OSError:
+         continue
+   try:
+      with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, PENDING_RENAME_KEY) as key:
+         if winreg.QueryValueEx(key, "PendingFileRenameOperations")[0]:
+            reasons.append("PendingFileRenameOperations")
+   except OSError:
+      pass
+
+   if reasons:
+      return preflight_result("Reinicio pendiente", "Sistema", PREFLIGHT_WARNING, ", ".join(reasons))
+   return preflight_result("Reinicio pendiente", "Sistema", PREFLIGHT_OK)
+
+
+def is_msi_installation_running():
+   """Indica si Windows Installer está ocupado (mutex global _MSIExecute)."""
+   try:
+      SYNCHRONIZE = 0x00100000
+      handle = ctypes.windll.kernel32.OpenMutexW(SYNCHRONIZE, False, "Global\\_MSIExecute")
+   except Exception:
+      return False
+   if handle:
+      ctypes.windll.kernel32.CloseHandle(handle)
+      return True
+   return False
+
+
+def check_busy_installers():
+   """Detecta una instalación MSI o Windows Update en curso."""
+   if is_msi_installation_running():
+      return preflight_result(
+         "Instalaciones en curso", "msiexec", PREFLIGHT_ERROR,
+         "Windows Installer está ejecutando otra instalación"
+      )
+   running = sorted({
+      (p.info["name"] or "").lower() for p in psutil.process_iter(["name"])
+   } & set(SERVICING_PROCESSES))
+   if running:
+      return preflight_result(
+         "Instalaciones en curso", "Windows Update", PREFLIGHT_WARNING,
+         f"En ejecución: {', '.join(running)}"
+      )
+   return preflight_result("Instalaciones en curso", "Sistema", PREFLIGHT_OK)
+
+
+def check_file_readable(installer, key="file", manifest=None):
+   """Verifica que el archivo del instalador (o su configuración) existe y se puede leer."""
+   path = INSTALLERS_PATH / installer[key]
+   label = "Configuración" if key == "config" else "Archivo"
+   item = (manifest or {}).get(installer["id"])
+   if item and key == "config":
+      item = item.get("config")
+   if item:
+      stored = locate_object(item)
+      if stored is None:
+         return preflight_result(label, installer["name"], PREFLIGHT_ERROR, f"{item['file']} no está en ningún almacén")
+      return preflight_result(label, installer["name"], PREFLIGHT_OK, f"almacén: {stored.parent.parent.parent}")
+   try:
+      with open(path, "rb") as f:
+         f.read(1)
+   except FileNotFoundError:
+      return preflight_result(label, installer["name"], PREFLIGHT_ERROR, f"No encontrado: {path.name}")
+   except OSError as e:
+      return preflight_result(label, installer["name"], PREFLIGHT_ERROR, f"No se puede leer: {e}")
+   return preflight_result(label, installer["name"], PREFLIGHT_OK, path.name)
+
+
+def load_hash_cache():
+   try:
+      with open(HASH_CACHE_FILE, "r", encoding="utf-8") as f:
+         return json.load(f)
+   except (OSError, ValueError):
+      return {}
+
+
+def file_sha256(path, chunk_size=4 * 1024**2, use_cache=True):
+   """
+   SHA-256 de un archivo usando la caché por (ruta, tamaño, mtime).
+
+   Solo se lee el archivo completo si cambió desde la última vez. Con
+   use_cache=False siempre se lee (verificación de copias recién escritas).
+   """
+   stat = os.stat(path)
+   cache_key = f"{os.path.abspath(path).lower()}|{stat.st_size}|{int(stat.st_mtime)}"
+   if use_cache:
+      with _hash_cache_lock:
+         cached = load_hash_cache().get(cache_key)
+      if cached:
+         return cached
+
+   digest = hashlib.sha256()
+   with open(path, "rb") as f:
+      for chunk in iter(lambda: f.read(chunk_size), b""):
+         digest.update(chunk)
+   value = digest.hexdigest()
+   if not use_cache:
+      return value
+
+   with _hash_cache_lock:
+      cache = load_hash_cache()
+      cache[cache_key] = value
+      try:
+         HASH_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+         with open(HASH_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=1)
+      except OSError:
+         pass
+   return value
+
+
+def check_file_hash(installer):
+   """Compara el SHA-256 del instalador con el declarado en el catálogo."""
+   path = INSTALLERS_PATH / installer["file"]
+   try:
+      actual = file_sha256(path)
+   except OSError as e:
+      return preflight_result("Integridad", installer["name"], PREFLIGHT_ERROR, str(e))
+   if actual.lower() != installer["sha256"].lower():
+      return preflight_result("Integridad", installer["name"], PREFLIGHT_ERROR, "El hash no coincide")
+   return preflight_result("Integridad", installer["name"], PREFLIGHT_OK, actual[:16])
+
+
+def run_preflight(installers, deadline=PREFLIGHT_DEADLINE, manifest=None):
+   """
+   Ejecuta en paralelo todas las verificaciones previas de un lote.
+
+   Las verificaciones que no terminan dentro del plazo se informan como
+   advertencia y siguen en segundo plano llenando la caché. La integridad
+   no se puede dar por buena sin terminar: si el hash queda pendiente se
+   vuelve a verificar justo antes de ejecutar el instalador
+   (verify_before_install).
+
+   Returns:
+      tuple: (go: bool, lista de resultados)
+   """
+   checks = [
+      (("Espacio en disco", "Sistema"), check_disk_space, (installers,)),
+      (("Reinicio pendiente", "Sistema"), check_pending_reboot, ()),
+      (("Instalaciones en curso", "Sistema"), check_busy_installers, ()),
+   ]
+   for installer in installers:
+      checks.append((("Archivo", installer["name"]), check_file_readable, (installer, "file", manifest)))
+      if installer.get("config"):
+         checks.append((("Configuración", installer["name"]), check_file_readable, (installer, "config", manifest)))
+      if installer.get("sha256") and installer["id"] not in (manifest or {}):
+         checks.append((("Integridad", installer["name"]), check_file_hash, (installer,)))
+
+   pool = ThreadPoolExecutor(max_workers=min(16, len(checks)))
+   futures = {pool.submit(func, *args): label for label, func, args in checks}
+   done, pending = wait(futures, timeout=deadline)
+   pool.shutdown(wait=False)
+
+   results = []
+   for future, (check, target) in futures.items():
+      if future in pending:
+         detail = "Sin respuesta dentro del plazo"
+         if check == "Integridad":
+            detail = "Hash pendiente: se verificará antes de instalar"
+         results.append(preflight_result(check, target, PREFLIGHT_WARNING, detail))
+         continue
+      try:
+         results.append(future.result())
+      except Exception as e:
+         results.append(preflight_result(check, target, PREFLIGHT_WARNING, str(e)))
+
+   go = all(r["status"] != PREFLIGHT_ERROR for r in results)
+   return go, results
+
+
+def verify_before_install(installer, installer_path):
+   """
+   Verifica el hash declarado justo antes de ejecutar el instalador.
+
+   Usa la caché que llenó la verificación previa, así que solo relee el
+   archivo si el hash no terminó dentro del plazo o el archivo cambió.
+
+   Returns:
+      str | None: motivo del rechazo, o None si se puede instalar
+   """
+   if not installer.get("sha256"):
+      return None
+   try:
+      actual = file_sha256(installer_path)
+   except OSError as e:
+      return f"No se pudo verificar la integridad: {e}"
+   if actual.lower() != installer["sha256"].lower():
+      return "El hash no coincide"
+   return None
+
+
 # ============================================================================
 # CLASE PRINCIPAL DE LA APLICACIÓN
 # ============================================================================
@@ -321,6 +1239,11 @@ class InstallerApp(ctk.CTk):
       self.should_cancel = False
       self.installer_vars = {}
       self.log_path = None
+      self.current_monitor = None
+      
+      # Catálogo de la carpeta de instaladores (si no existe, se usa INSTALLERS)
+      self.catalog_loaded = self.load_catalog()
+      self.store_manifest = {}
       
       # Estadísticas
       self.stats = {
@@ -520,9 +1443,17 @@ class InstallerApp(ctk.CTk):
          progress_color=COLOR_ACCENT,
          fg_color=COLOR_BG_LIGHT
       )
-      self.progress_bar.pack(pady=(0, 10), padx=15)  # Reducido padding
+      self.progress_bar.pack(pady=(0, 5), padx=15)  # Reducido padding
       self.progress_bar.set(0)
       
+      self.impact_label = ctk.CTkLabel(
+         progress_frame,
+         text="Impacto del instalador actual: -",
+         font=("Segoe UI", 11),
+         text_color=COLOR_TEXT_GRAY
+      )
+      self.impact_label.pack(pady=(0, 8))
+      
       # === ÁREA DE LOGS ===
       log_label = ctk.CTkLabel(
          main_frame,
@@ -587,6 +1518,18 @@ class InstallerApp(ctk.CTk):
       self.bind("<Escape>", lambda e: self.quit())
 
    
+   def load_catalog(self):
+      """Reemplaza la lista fija por el catálogo escaneado de la carpeta."""
+      global CATALOG_INDEX
+      if not INSTALLERS_PATH.exists():
+         return False
+      entries, index = load_installer_catalog()
+      if entries is None:
+         return False
+      INSTALLERS[:] = entries
+      CATALOG_INDEX = index
+      return True
+   
    def log(self, message, level="INFO"):
       """Registra mensajes en el log con formato."""
       timestamp = datetime.datetime.now().strftime("%H:%M:%S")
@@ -649,13 +1592,20 @@ class InstallerApp(ctk.CTk):
       self.log(f"✓ Carpeta de instaladores encontrada: {INSTALLERS_PATH}", "SUCCESS")
       self.log_path = INSTALLERS_PATH / LOG_FILENAME
       
-      # Verificar cuántos instaladores están disponibles
-      available_count = 0
-      for installer in INSTALLERS:
-         if find_installer(installer["file"]):
-               available_count += 1
+      # Verificar cuántos instaladores están disponibles (en paralelo)
+      with ThreadPoolExecutor(max_workers=8) as pool:
+         available = list(pool.map(lambda inst: find_installer(inst["file"]), INSTALLERS))
+      available_count = sum(1 for path in available if path)
       
       self.log(f"✓ Instaladores disponibles: {available_count}/{len(INSTALLERS)}", "SUCCESS")
+      if self.catalog_loaded:
+         self.log(f"✓ Catálogo cargado desde {INSTALLERS_PATH / CATALOG_FILENAME}", "SUCCESS")
+         for installer in INSTALLERS:
+            if installer.get("category") == "Sin categoría":
+               self.log(
+                  f"   Nuevo: {installer['file']} ({installer['technology']}) → "
+                  f"argumentos sugeridos: {installer['args'] or 'ninguno'}", "WARNING"
+               )
       self.log("━" * 85, "INFO")
       self.log("✓ Sistema listo para instalar programas", "SUCCESS")
    
@@ -715,23 +1665,95 @@ class InstallerApp(ctk.CTk):
          self.log("✗ Instalación cancelada por el usuario", "WARNING")
          return
       
-      # Iniciar proceso
-      self.is_processing = True
-      self.should_cancel = False
-      self.button_start.configure(state="disabled")
-      self.button_cancel.configure(state="normal")
-      
       # Limpiar log
       self.textbox.configure(state="normal")
       self.textbox.delete("1.0", "end")
       self.textbox.configure(state="disabled")
       
+      # Verificación previa en segundo plano: el lote falla antes de
+      # instalar nada sin bloquear la interfaz mientras se calculan hashes
+      self.button_start.configure(state="disabled")
+      self.progress_label.configure(text="Verificación previa en curso...")
+      thread = threading.Thread(target=self.run_preflight_check, args=(selected,), daemon=True)
+      thread.start()
+   
+   def launch_installation(self):
+      """Inicia el hilo de instalación una vez superada la verificación previa."""
+      self.is_processing = True
+      self.should_cancel = False
+      self.button_start.configure(state="disabled")
+      self.button_cancel.configure(state="normal")
+      
       # Resetear estadísticas
-      self.stats = {"total": 0, "installed": 0, "skipped": 0, "failed": 0}
+      self.stats = {
+         "total": 0, "installed": 0, "skipped": 0, "failed": 0,
+         "resources": {"cpu_seconds": 0, "read_bytes": 0, "write_bytes": 0, "peak_rss": 0},
+      }
       
       # Iniciar hilo de instalación
       thread = threading.Thread(target=self.install_programs, daemon=True)
       thread.start()
+      self.after(1000, self.refresh_impact_label)
+   
+   def run_preflight_check(self, selected):
+      """Ejecuta (en un hilo) la verificación previa del lote."""
+      installers = [inst for inst in INSTALLERS if inst["id"] in selected]
+      start = time.time()
+      self.store_manifest = load_store_manifest()
+      go, results = run_preflight(installers, manifest=self.store_manifest)
+      elapsed = time.time() - start
+      self.after(0, lambda: self.show_preflight_report(go, results, elapsed))
+   
+   def show_preflight_report(self, go, results, elapsed):
+      """Muestra el informe go/no-go y, si se aprueba, inicia la instalación."""
+      if self.confirm_preflight(go, results, elapsed):
+         self.launch_installation()
+      else:
+         self.button_start.configure(state="normal")
+         self.progress_label.configure(text="Listo para iniciar instalación")
+   
+   def confirm_preflight(self, go, results, elapsed):
+      """Registra los resultados de la verificación previa y pide confirmación."""
+      self.log(f"Verificación previa ({elapsed:.1f} s):", "PROCESS")
+      levels = {PREFLIGHT_OK: "SUCCESS", PREFLIGHT_WARNING: "WARNING", PREFLIGHT_ERROR: "ERROR"}
+      for result in results:
+         if result["status"] == PREFLIGHT_OK and result["check"] in ("Archivo", "Configuración"):
+            continue
+         detail = f" → {result['detail']}" if result["detail"] else ""
+         self.log(f"   {result['check']} | {result['target']}{detail}", levels[result["status"]])
+      
+      errors = [r for r in results if r["status"] == PREFLIGHT_ERROR]
+      if not go:
+         self.log(f"✗ Lote detenido: {len(errors)} problemas bloqueantes", "ERROR")
+         messagebox.showerror(
+            "Verificación Previa",
+            "No se puede iniciar la instalación:\n\n" +
+            "\n".join(f"• {r['check']} ({r['target']}): {r['detail']}" for r in errors[:8])
+         )
+         return False
+      
+      warnings = [r for r in results if r["status"] == PREFLIGHT_WARNING]
+      if warnings:
+         return messagebox.askyesno(
+            "Verificación Previa",
+            "Se encontraron advertencias:\n\n" +
+            "\n".join(f"• {r['check']} ({r['target']}): {r['detail']}" for r in warnings[:8]) +
+            "\n\n¿Desea continuar de todas formas?"
+         )
+      self.log("✓ Verificación previa superada", "SUCCESS")
+      return True
+   
+   def refresh_impact_label(self):
+      """Muestra en vivo el consumo del instalador en curso."""
+      monitor = self.current_monitor
+      if monitor is not None:
+         usage = monitor.totals()
+         self.impact_label.configure(
+            text=f"Impacto del instalador actual: {describe_resources(usage)} "
+                 f"| {usage['processes']} procesos"
+         )
+      if self.is_processing:
+         self.after(1000, self.refresh_impact_label)
    
    def install_programs(self):
       """Ejecuta el proceso de instalación de los programas seleccionados."""
@@ -751,6 +1773,19 @@ class InstallerApp(ctk.CTk):
          completed = 0
          
          self.log(f"Total de programas a instalar: {total}", "INFO")
+         
+         # Copiar al almacén local (en paralelo y verificados) los del manifiesto
+         resolved = {}
+         if self.store_manifest:
+            self.progress_label.configure(text="Obteniendo instaladores del almacén...")
+            self.log("Obteniendo instaladores del almacén de contenido...", "PROCESS")
+            start = time.time()
+            resolved = resolve_installers(selected_installers, self.store_manifest)
+            for inst_id, item in resolved.items():
+               if item["error"]:
+                  self.log(f"   ✗ {item['error']}", "ERROR")
+            self.log(f"✓ {sum(1 for r in resolved.values() if r['file'])} instaladores verificados "
+                     f"en {time.time() - start:.1f} s", "SUCCESS")
          self.log("", "INFO")
          
          # Instalar cada programa
@@ -768,8 +1803,11 @@ class InstallerApp(ctk.CTk):
                self.log(f"[{completed + 1}/{total}] {installer['name']}", "PROCESS")
                self.log(f"Categoría: {installer['category']}", "INFO")
                
-               # Buscar instalador
-               installer_path = find_installer(installer["file"])
+               # Buscar instalador (almacén de contenido o carpeta fija)
+               stored = resolved.get(installer["id"]) or {}
+               if stored.get("error"):
+                  self.log(f"      ⚠ Almacén: {stored['error']}; se busca en la carpeta de instaladores", "WARNING")
+               installer_path = stored.get("file") or find_installer(installer["file"])
                
                if not installer_path:
                   self.log(f"      ✗ Archivo no encontrado: {installer['file']}", "ERROR")
@@ -780,7 +1818,7 @@ class InstallerApp(ctk.CTk):
                   
                   # Para Office 365, agregar ruta del config.xml
                   if installer["id"] == "office365" and "config" in installer:
-                     config_path = find_installer(installer["config"])
+                     config_path = stored.get("config") or find_installer(installer["config"])
                      if config_path:
                            args = f'{args} "{config_path}"'
                      else:
@@ -789,9 +1827,33 @@ class InstallerApp(ctk.CTk):
                         completed += 1
                         continue
 
+               # El hash pudo quedar pendiente en la verificación previa (los
+               # objetos del almacén ya se verificaron al traerlos)
+               if installer_path and installer_path != stored.get("file"):
+                  rejected = verify_before_install(installer, installer_path)
+                  if rejected:
+                     self.log(f"      ✗ {rejected}: {installer['file']}", "ERROR")
+                     self.stats["failed"] += 1
+                     completed += 1
+                     continue
+
                # Ejecutar instalador
                self.log("      ⚙ Ejecutando instalador en modo silencioso...", "PROCESS")
-               success, error_msg = run_installer(installer_path, args, installer["timeout"])
+               monitor = ProcessTreeMonitor().start()
+               self.current_monitor = monitor
+               try:
+                  success, error_msg = run_installer(
+                     installer_path, args, installer["timeout"], monitor=monitor
+                  )
+               finally:
+                  usage = monitor.stop()
+                  self.current_monitor = None
+               self.log(f"      Recursos: {describe_resources(usage)}", "INFO")
+               for key in ("cpu_seconds", "read_bytes", "write_bytes"):
+                  self.stats["resources"][key] += usage[key]
+               self.stats["resources"]["peak_rss"] = max(
+                  self.stats["resources"]["peak_rss"], usage["peak_rss"]
+               )
 
                if success:
                   self.log("      ✓ Instalación completada con éxito", "SUCCESS")
@@ -833,6 +1895,8 @@ def finish_installation(self, force_error=False):
    self.log(f"📦 Instalados correctamente : {t['installed']}", "SUCCESS")
    self.log(f"⏭ Saltados / No encontrados : {t['skipped']}", "WARNING")
    self.log(f"❌ Fallidos : {t['failed']}", "ERROR")
+   if "resources" in t:
+      self.log(f"📊 Recursos totales : {describe_resources(t['resources'])}", "INFO")
 
    if force_error:
       self.log("⚠ El proceso terminó con errores inesperados.", "ERROR")
@@ -852,6 +1916,18 @@ def finish_installation(self, force_error=False):
 # PUNTO DE ENTRADA (MAIN)
 # ============================================================================
 if __name__ == "__main__":
+   parser = argparse.ArgumentParser(description=f"{APP_TITLE} {APP_VERSION}")
+   parser.add_argument(
+      "--publish", metavar="ALMACEN",
+      help="publicar los instaladores de la carpeta en un almacén compartido"
+   )
+   args = parser.parse_args()
+   if args.publish:
+      entries, _ = load_installer_catalog()
+      manifest = publish_to_store(INSTALLERS_PATH, args.publish, entries or INSTALLERS)
+      print(f"{len(manifest['installers'])} instaladores publicados en {args.publish}")
+      sys.exit(0)
+
    # Verificar si tiene permisos administrativos
    if not is_admin():
       messagebox.showwarning(
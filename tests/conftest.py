@@ -0,0 +1,53 @@
+"""Configuración común de las pruebas: los scripts viven en src/main."""
+
+import io
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "main"))
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+class FakeWevtutil:
+    """Proceso simulado: entrega la salida indicada y, si hang, se queda esperando."""
+
+    def __init__(self, output, hang=False):
+        self.output = io.BytesIO(output)
+        self.hang = hang
+        self.killed = threading.Event()
+        self.stdout = self
+
+    def read(self, size):
+        data = self.output.read(size)
+        if not data and self.hang:
+            self.killed.wait(5)
+        return data
+
+    def close(self):
+        pass
+
+    def kill(self):
+        self.killed.set()
+
+    def poll(self):
+        return 0 if self.killed.is_set() or not self.hang else None
+
+    def wait(self):
+        return 0
+
+
+@pytest.fixture
+def wevtutil(monkeypatch):
+    """Salidas simuladas de wevtutil por registro: outputs[log] = (xml, hang=False)."""
+    outputs = {}
+    monkeypatch.setattr(subprocess, "CREATE_NO_WINDOW", 0, raising=False)
+    monkeypatch.setattr(
+        subprocess, "Popen", lambda command, **kwargs: FakeWevtutil(*outputs[command[2]])
+    )
+    return outputs
@@ -0,0 +1,255 @@
+"""Pruebas A/B de red y plan de energía con sondas locales y powercfg simulado."""
+
+import socket
+
+import pytest
+
+import Optimize_System_Performance as osp
+from conftest import FIXTURES
+
+AB = FIXTURES / "ab"
+
+
+def read_capture(name):
+    return (AB / name).read_text(encoding="utf-8")
+
+
+def tweak(setting):
+    return next(t for t in osp.NETWORK_TWEAKS if t["setting"] == setting)
+
+
+@pytest.mark.parametrize(
+    "name, setting, expected",
+    [
+        ("netsh_global_en.txt", "autotuninglevel", "disabled"),
+        ("netsh_global_en.txt", "dca", None),
+        ("netsh_global_es.txt", "autotuninglevel", "restricted"),
+        ("netsh_global_es.txt", "dca", "disabled"),
+        ("netsh_heuristics_en.txt", "heuristics", "enabled"),
+    ],
+)
+def test_parse_netsh_setting(name, setting, expected):
+    assert osp.parse_netsh_setting(read_capture(name), tweak(setting)["pattern"]) == expected
+
+
+def test_parse_scheme_list():
+    assert osp.parse_scheme_list(read_capture("powercfg_list_en.txt")) == [
+        "381b4222-f694-41f0-9685-ff5bb260df2e",
+        osp.HIGH_PERFORMANCE_SCHEME,
+        "a1841308-3541-4fab-bc81-f71556f20b4a",
+    ]
+    assert osp.OPTIMIZER_SCHEME in osp.parse_scheme_list(read_capture("powercfg_list_es.txt"))
+
+
+class Probe:
+    """Métrica simulada: devuelve los valores indicados en orden."""
+
+    def __init__(self, *values):
+        self.values = list(values)
+
+    def __call__(self):
+        return self.values.pop(0)
+
+
+class Setting:
+    def __init__(self, supported=True):
+        self.supported = supported
+        self.applied = self.reverted = 0
+
+    def apply(self):
+        self.applied += 1
+        return self.supported
+
+    def revert(self):
+        self.reverted += 1
+
+
+@pytest.mark.parametrize(
+    "before, after, higher_is_better, kept, reason",
+    [
+        (10.0, 8.0, False, True, "mejoró"),
+        (10.0, 10.4, False, True, "sin cambios significativos"),
+        (10.0, 12.0, False, False, "empeoró, revertido"),
+        (1000, 900, True, False, "empeoró, revertido"),
+        (1000, 1100, True, True, "mejoró"),
+        (None, 5.0, False, True, "sin medición, se mantiene"),
+    ],
+)
+def test_run_ab_trial(before, after, higher_is_better, kept, reason):
+    setting = Setting()
+    result = osp.run_ab_trial(
+        Probe(before, after), setting.apply, setting.revert, higher_is_better
+    )
+    assert (result["kept"], result["reason"]) == (kept, reason)
+    assert setting.reverted == (0 if kept else 1)
+
+
+def test_run_ab_trial_unsupported_is_reverted_without_second_measure():
+    setting = Setting(supported=False)
+    result = osp.run_ab_trial(Probe(10.0), setting.apply, setting.revert, False)
+    assert result["reason"] == "no compatible"
+    assert result["after"] is None
+    assert setting.reverted == 1
+
+
+def test_measure_tcp_connect_localhost():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        latency = osp.measure_tcp_connect("127.0.0.1", port, samples=5)
+    assert latency is not None and latency >= 0
+
+
+def test_measure_tcp_connect_refused():
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+    assert osp.measure_tcp_connect("127.0.0.1", port, samples=2, timeout=0.5) is None
+
+
+def test_probe_endpoint_defaults_to_domain_controller(monkeypatch):
+    monkeypatch.setenv("LOGONSERVER", r"\\DC01")
+    assert osp.get_network_probe_endpoint(osp.DEFAULT_CONFIG) == ("DC01", 389)
+    assert osp.get_network_probe_endpoint(
+        {"network_probe_endpoint": "fs01.corp.local:445"}
+    ) == ("fs01.corp.local", 445)
+
+
+def test_probe_endpoint_none_without_domain(monkeypatch):
+    monkeypatch.setenv("LOGONSERVER", "\\\\" + socket.gethostname())
+    assert osp.get_network_probe_endpoint(osp.DEFAULT_CONFIG) is None
+
+
+class Engine(osp.OptimizationEngine):
+    def __init__(self):
+        self.init_engine()
+        self.run_record = {"run_id": "test"}
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append(message)
+
+
+class FakePowercfg:
+    """Simula powercfg con un conjunto de planes instalados."""
+
+    def __init__(self, active, schemes=(), duplicate=True):
+        self.active = active
+        self.schemes = set(schemes) | {active}
+        self.duplicate = duplicate
+        self.calls = []
+
+    def __call__(self, command, shell=True, timeout=None, **kwargs):
+        self.calls.append(command)
+        args = command.split()
+        if args[1] == "/getactivescheme":
+            return 0, f"Power Scheme GUID: {self.active}  (Balanced)", ""
+        if args[1] == "/list":
+            return 0, "\n".join(f"Power Scheme GUID: {g}  (x)" for g in self.schemes), ""
+        if args[1] == "-duplicatescheme":
+            if not self.duplicate:
+                return 1, "", "Invalid Parameters"
+            self.schemes.add(args[3])
+            return 0, f"Power Scheme GUID: {args[3]}  (Ultimate Performance)", ""
+        if args[1] == "-setactive" and args[2] in self.schemes:
+            self.active = args[2]
+            return 0, "", ""
+        if args[1] == "-delete":
+            self.schemes.discard(args[2])
+            return 0, "", ""
+        return 1, "", "Invalid Parameters"
+
+    def duplicates(self):
+        return [c for c in self.calls if "-duplicatescheme" in c]
+
+
+BALANCED = "381b4222-f694-41f0-9685-ff5bb260df2e"
+
+
+@pytest.fixture
+def powercfg(monkeypatch):
+    def install(cpu, **kwargs):
+        fake = FakePowercfg(**kwargs)
+        monkeypatch.setattr(osp, "run_command", fake)
+        monkeypatch.setattr(osp, "measure_cpu_throughput", Probe(*cpu))
+        return fake
+
+    return install
+
+
+def test_power_plan_duplicates_once_with_fixed_guid(powercfg):
+    fake = powercfg([1000, 1100], active=BALANCED)
+    assert Engine().run_power_plan_ab()
+    assert fake.active == osp.OPTIMIZER_SCHEME
+    assert fake.duplicates() == [
+        f"powercfg -duplicatescheme {osp.ULTIMATE_PERFORMANCE_SCHEME} {osp.OPTIMIZER_SCHEME}"
+    ]
+
+
+def test_power_plan_reuses_existing_copy(powercfg):
+    fake = powercfg([1000, 1100], active=BALANCED, schemes=[osp.OPTIMIZER_SCHEME])
+    assert Engine().run_power_plan_ab()
+    assert fake.active == osp.OPTIMIZER_SCHEME
+    assert fake.duplicates() == []
+
+
+def test_power_plan_skips_when_copy_is_active(powercfg):
+    fake = powercfg([], active=osp.OPTIMIZER_SCHEME)
+    assert Engine().run_power_plan_ab()
+    assert fake.calls == ["powercfg /getactivescheme"]
+
+
+def test_power_plan_revert_deletes_plan_created_in_this_run(powercfg):
+    fake = powercfg([1000, 800], active=BALANCED)
+    engine = Engine()
+    assert engine.run_power_plan_ab()
+    assert fake.active == BALANCED
+    assert osp.OPTIMIZER_SCHEME not in fake.schemes
+    assert engine.run_record["ab_tests"]["optimize_power_plan"]["kept"] is False
+
+
+def test_power_plan_revert_keeps_preexisting_copy(powercfg):
+    fake = powercfg([1000, 800], active=BALANCED, schemes=[osp.OPTIMIZER_SCHEME])
+    assert Engine().run_power_plan_ab()
+    assert fake.active == BALANCED
+    assert osp.OPTIMIZER_SCHEME in fake.schemes
+
+
+def test_power_plan_falls_back_to_high_performance(powercfg):
+    fake = powercfg(
+        [1000, 1100], active=BALANCED, schemes=[osp.HIGH_PERFORMANCE_SCHEME], duplicate=False
+    )
+    assert Engine().run_power_plan_ab()
+    assert fake.active == osp.HIGH_PERFORMANCE_SCHEME
+
+
+def test_network_ab_skipped_without_local_endpoint(monkeypatch):
+    monkeypatch.setattr(osp, "load_config", lambda: dict(osp.DEFAULT_CONFIG))
+    monkeypatch.setattr(osp, "get_network_probe_endpoint", lambda config: None)
+    monkeypatch.setattr(osp, "run_command", pytest.fail)
+    engine = Engine()
+    assert engine.run_network_ab()
+    assert "ab_tests" not in engine.run_record
+
+
+def test_network_ab_measures_local_endpoint(monkeypatch):
+    calls = []
+
+    def fake_netsh(command, shell=True, timeout=None, **kwargs):
+        calls.append(command)
+        if command.endswith("show global"):
+            return 0, read_capture("netsh_global_en.txt"), ""
+        if command.endswith("show heuristics"):
+            return 0, read_capture("netsh_heuristics_en.txt"), ""
+        return 0, "Ok.", ""
+
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        endpoint = f"127.0.0.1:{server.getsockname()[1]}"
+        monkeypatch.setattr(osp, "load_config", lambda: {"network_probe_endpoint": endpoint})
+        monkeypatch.setattr(osp, "run_command", fake_netsh)
+        engine = Engine()
+        assert engine.run_network_ab()
+
+    result = engine.run_record["ab_tests"]["optimize_network"]
+    assert result["before"] is not None and result["after"] is not None
+    assert result["settings"] == {"autotuninglevel": "disabled", "heuristics": "enabled"}
+    assert "netsh int tcp set global autotuninglevel=normal" in calls
+    assert "netsh int tcp set heuristics disabled" in calls
@@ -0,0 +1,60 @@
+"""Línea base antes/después: métricas comparadas y valores absolutos."""
+
+import json
+
+import Optimize_System_Performance as osp
+
+BOOT_EVENT = (
+    "<Event xmlns='http://schemas.microsoft.com/win/2004/08/events/event'>"
+    "<System><EventID>100</EventID></System><EventData>"
+    "<Data Name='BootTsVersion'>2</Data><Data Name='BootTime'>41250</Data>"
+    "<Data Name='MainPathBootTime'>18000</Data></EventData></Event>"
+)
+
+
+def test_last_boot_duration_reads_boot_time(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        osp, "run_command", lambda command, **kwargs: calls.append(command) or (0, BOOT_EVENT, "")
+    )
+    assert osp.get_last_boot_duration() == 41250
+    assert calls[0][-1] == osp.BOOT_EVENT_SCRIPT
+
+    monkeypatch.setattr(osp, "run_command", lambda command, **kwargs: (0, "", ""))
+    assert osp.get_last_boot_duration() is None
+
+
+def test_boot_duration_is_captured_but_not_compared(monkeypatch):
+    boots = iter([41250, 41250])
+    monkeypatch.setattr(osp, "get_last_boot_duration", lambda: next(boots))
+    monkeypatch.setattr(osp, "probe_cpu", lambda: 1000)
+    monkeypatch.setattr(osp, "probe_disk", lambda: (100.0, 200.0))
+
+    before, after = osp.capture_baseline(), osp.capture_baseline()
+    assert before["boot_ms"] == after["boot_ms"] == 41250
+    json.dumps(after)
+
+    delta = osp.compare_baselines(before, after)
+    assert "boot_ms" not in [item["metric"] for item in delta]
+    assert [item["metric"] for item in delta] == [key for key, _, _ in osp.BASELINE_METRICS]
+
+
+class Engine(osp.OptimizationEngine):
+    def __init__(self):
+        self.init_engine()
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append(message)
+
+
+def test_log_shows_boot_duration_as_absolute_value():
+    engine = Engine()
+    delta = osp.compare_baselines({"processes": 120}, {"processes": 110})
+    engine.log_baseline_delta(delta, {"processes": 110, "boot_ms": 41250})
+    assert "  Procesos en ejecución: 120 → 110 (-10) ▲ mejora" in engine.messages
+    assert "  Duración del último arranque (ms): 41250" in engine.messages
+
+    engine.messages.clear()
+    engine.log_baseline_delta(delta, {"boot_ms": None})
+    assert "  Duración del último arranque (ms): no disponible" in engine.messages
@@ -0,0 +1,87 @@
+"""Rendimiento de arranque con XML grabado de Diagnostics-Performance."""
+
+import functools
+
+import Generate_Diagnostic_Report as gdr
+from conftest import FIXTURES
+
+BOOT_XML = (FIXTURES / "boot" / "diagnostics_performance.xml").read_bytes()
+
+
+def recorded_events(data=BOOT_XML):
+    return gdr.parse_event_stream([data], gdr.BOOT_LOG)
+
+
+def test_analyze_recorded_boots():
+    result = gdr.analyze_boot_events(recorded_events(), last_boots=4)
+    assert [b["boot_ms"] for b in result["boots"]] == [40000, 45000, 52000, 61000]
+    assert result["boots"][-1] == {
+        "time": "2026-10-18T13:05:10.0000000Z",
+        "boot_ms": 61000,
+        "main_path_ms": 38000,
+        "post_boot_ms": 23000,
+        "degraded": True,
+    }
+    assert result["shutdowns"] == [{"time": "2026-10-17T23:10:00.0000000Z", "shutdown_ms": 14000}]
+    assert result["trend"]["direction"] == "empeorando"
+    offenders = [(o["kind"], o["name"], o["count"], o["total_ms"]) for o in result["offenders"]]
+    assert offenders == [
+        ("aplicación", "Microsoft Teams", 2, 9300),
+        ("aplicación", "Microsoft OneDrive", 1, 3000),
+        ("servicio", "Adobe Acrobat Update Service", 1, 1800),
+    ]
+
+
+def test_last_boots_limits_the_window():
+    result = gdr.analyze_boot_events(recorded_events(), last_boots=2)
+    assert [b["boot_ms"] for b in result["boots"]] == [52000, 61000]
+    assert "Microsoft OneDrive" not in [o["name"] for o in result["offenders"]]
+
+
+def test_collect_complete(wevtutil):
+    wevtutil[gdr.BOOT_LOG] = (BOOT_XML,)
+    result = gdr.collect_boot_performance(last_boots=4)
+    assert (result["truncated"], result["capped"]) == (False, False)
+    assert len(result["boots"]) == 4
+    lines = gdr.describe_boot_performance(result)
+    assert lines[0].startswith("Últimos 4 arranques: promedio 49.5 s")
+    assert not any("solo se analizaron" in line for line in lines)
+
+
+def test_collect_timeout_keeps_recent_boots(wevtutil, monkeypatch):
+    # Corte dentro del arranque del 15/10 (wevtutil terminado por plazo)
+    wevtutil[gdr.BOOT_LOG] = (BOOT_XML[: BOOT_XML.index(b"2026-10-15T07:02:30") + 10], True)
+    monkeypatch.setattr(
+        gdr, "query_events",
+        functools.partial(gdr.query_events, timeout=0.2),
+    )
+    result = gdr.collect_boot_performance()
+    assert result["truncated"] is True
+    assert [b["boot_ms"] for b in result["boots"]] == [61000]
+    assert [o["name"] for o in result["offenders"]] == ["Microsoft Teams"]
+    assert gdr.describe_boot_performance(result)[-1] == (
+        "Lectura interrumpida por tiempo: solo se analizaron los eventos más recientes"
+    )
+
+
+def test_collect_capped(wevtutil, monkeypatch):
+    wevtutil[gdr.BOOT_LOG] = (BOOT_XML,)
+    monkeypatch.setattr(gdr, "BOOT_MAX_EVENTS", 10)
+    result = gdr.collect_boot_performance()
+    assert result["capped"] is True
+    assert gdr.describe_boot_performance(result)[-1].startswith(
+        "Se alcanzó el límite de 10 eventos"
+    )
+
+
+def test_collect_timeout_without_boots(wevtutil, monkeypatch):
+    wevtutil[gdr.BOOT_LOG] = (BOOT_XML[:200], True)
+    monkeypatch.setattr(
+        gdr, "query_events",
+        functools.partial(gdr.query_events, timeout=0.2),
+    )
+    result = gdr.collect_boot_performance()
+    assert result["boots"] == []
+    assert gdr.describe_boot_performance(result) == [
+        "La lectura del registro de rendimiento no terminó a tiempo."
+    ]
@@ -0,0 +1,155 @@
+"""Catálogo de instaladores: huellas MZ/NSIS y MSI, caché por tamaño y mtime."""
+
+import json
+import os
+import struct
+
+import pytest
+
+import Unattended_Installation_of_Programs as u
+
+
+def pad4(data):
+    return data + b"\0" * (-len(data) % 4)
+
+
+def version_blob(version, strings):
+    """Recurso VS_VERSION_INFO mínimo: VS_FIXEDFILEINFO y pares clave/valor."""
+    body = pad4(b"\0" * 6 + "VS_VERSION_INFO\0".encode("utf-16-le"))[6:]
+    ms = (version[0] << 16) | version[1]
+    ls = (version[2] << 16) | version[3]
+    fixed = struct.pack("<IIII", 0xFEEF04BD, 0x10000, ms, ls) + b"\0" * 36
+    body += fixed
+    for key, value in strings.items():
+        body = pad4(b"\0" * 6 + body + f"{key}\0".encode("utf-16-le"))[6:]
+        body = pad4(b"\0" * 6 + body + f"{value}\0".encode("utf-16-le"))[6:]
+    return struct.pack("<HHH", 6 + len(body), len(fixed), 0) + body
+
+
+def nsis_exe(version="23.01"):
+    strings = {
+        "CompanyName": "Igor Pavlov",
+        "ProductName": "7-Zip 23.01",
+        "ProductVersion": version,
+    }
+    head = b"MZ" + b"\0" * 510 + b"Nullsoft.NSIS.exehead" + b"\0" * 100
+    return pad4(head) + version_blob((23, 1, 0, 0), strings) + b"\0" * 64
+
+
+def msi():
+    return u.OLE_SIGNATURE + b"\0" * 2048
+
+
+@pytest.fixture
+def folder(tmp_path):
+    directory = tmp_path / "Programas"
+    directory.mkdir()
+    (directory / "7z2301-x64.exe").write_bytes(nsis_exe())
+    (directory / "Agent.msi").write_bytes(msi())
+    (directory / "office.xml").write_text("<Configuration/>", encoding="utf-8")
+    return directory
+
+
+def entries_by_file(catalog):
+    return {e["file"]: e for e in catalog["entries"]}
+
+
+def test_sniff_nsis_with_version_info(folder):
+    assert u.sniff_installer(folder / "7z2301-x64.exe") == {
+        "technology": "nsis",
+        "version": "23.01",
+        "product_name": "7-Zip 23.01",
+        "company": "Igor Pavlov",
+    }
+
+
+def test_sniff_msi_and_unknown(folder, tmp_path):
+    assert u.sniff_installer(folder / "Agent.msi")["technology"] == "msi"
+    other = tmp_path / "plain.exe"
+    other.write_bytes(b"MZ" + b"\0" * 64)
+    assert u.sniff_installer(other) == {
+        "technology": "unknown", "version": None, "product_name": None, "company": None,
+    }
+
+
+def test_new_files_get_suggested_entries(folder):
+    catalog, sniffed = u.build_catalog(folder)
+    assert sniffed == 2
+    entries = entries_by_file(catalog)
+    nsis = entries["7z2301-x64.exe"]
+    assert (nsis["id"], nsis["name"], nsis["technology"]) == ("7z2301_x64", "7-Zip 23.01", "nsis")
+    assert nsis["args"] == nsis["suggested_args"] == "/S"
+    assert nsis["enabled"] is False
+    assert nsis["detection"] == {
+        "type": "uninstall_display_name", "pattern": "7-Zip", "min_version": "23.01",
+    }
+    assert entries["Agent.msi"]["suggested_args"] == "/qn /norestart"
+    assert catalog["index"]["office.xml"] == "office.xml"
+
+
+def test_unchanged_rescan_sniffs_nothing(folder, monkeypatch):
+    catalog, _ = u.build_catalog(folder)
+    calls = []
+    real_sniff = u.sniff_installer
+    monkeypatch.setattr(u, "sniff_installer", lambda path: calls.append(path) or real_sniff(path))
+    again, sniffed = u.build_catalog(folder, json.loads(json.dumps(catalog)))
+    assert (sniffed, calls) == (0, [])
+    assert again["entries"] == catalog["entries"]
+
+
+@pytest.mark.parametrize("change", ["mtime", "size"])
+def test_changed_file_is_sniffed_again(folder, change):
+    catalog, _ = u.build_catalog(folder)
+    path = folder / "7z2301-x64.exe"
+    if change == "mtime":
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 60))
+    else:
+        path.write_bytes(nsis_exe(version="24.08") + b"\0" * 4)
+    again, sniffed = u.build_catalog(folder, catalog)
+    assert sniffed == 1
+    entry = entries_by_file(again)["7z2301-x64.exe"]
+    assert entry["mtime"] == int(path.stat().st_mtime)
+    assert entry["version"] == ("23.01" if change == "mtime" else "24.08")
+
+
+def test_curated_fields_win_over_cache(folder):
+    curated = {
+        "id": "7zip",
+        "name": "7-Zip",
+        "file": "7z2301-x64.exe",
+        "args": "/S /D=C:\\7-Zip",
+        "timeout": 300,
+        "required_mb": 10,
+        "category": "Utilidades",
+        "enabled": True,
+        "description": "Compresor",
+    }
+    catalog, _ = u.build_catalog(folder)
+    # Un catálogo viejo con datos editados a mano no pisa a INSTALLERS
+    for entry in catalog["entries"]:
+        entry["name"] = "nombre viejo"
+        entry["args"] = "/viejo"
+    again, sniffed = u.build_catalog(folder, catalog, [curated])
+    assert sniffed == 0
+    entry = again["entries"][0]
+    assert {k: entry[k] for k in curated} == curated
+    assert (entry["technology"], entry["version"]) == ("nsis", "23.01")
+    assert entries_by_file(again)["Agent.msi"]["name"] == "nombre viejo"
+
+
+def test_known_installer_without_file_is_kept(folder):
+    missing = {"id": "office", "name": "Office", "file": "setup.exe", "args": ""}
+    catalog, _ = u.build_catalog(folder, known_installers=[missing])
+    assert catalog["entries"][0] == missing
+
+
+def test_load_catalog_persists_and_reuses(folder, monkeypatch):
+    monkeypatch.setattr(u, "INSTALLERS", [])
+    entries, _ = u.load_installer_catalog(folder)
+    assert {e["file"] for e in entries} == {"7z2301-x64.exe", "Agent.msi"}
+    saved = json.loads((folder / u.CATALOG_FILENAME).read_text(encoding="utf-8"))
+    assert saved["entries"] == entries
+
+    monkeypatch.setattr(u, "sniff_installer", lambda path: pytest.fail("no debía analizar"))
+    assert u.load_installer_catalog(folder)[0] == entries
@@ -0,0 +1,79 @@
+"""Analizador de disco: índice de tamaños, consumidores y recomendaciones."""
+
+import os
+import time
+
+import Optimize_System_Performance as osp
+
+MB = 1024**2
+GB = 1024**3
+
+
+def sparse(path, size):
+    """Crea un archivo disperso: st_size es real pero no ocupa disco."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.truncate(size)
+    return path
+
+
+def build_volume(root):
+    windows = root / "Windows"
+    sparse(windows / "WinSxS" / "amd64_a" / "a.dll", 6 * GB)
+    sparse(windows / "WinSxS" / "amd64_b" / "b.dll", 3 * GB)
+    sparse(windows / "SoftwareDistribution" / "Download" / "kb.cab", 200 * MB)
+    sparse(windows / "Temp" / "t.tmp", 300 * MB)
+    sparse(root / "$Recycle.Bin" / "S-1-5-21" / "$R1.iso", 250 * MB)
+    sparse(root / "Users" / "ana" / "Downloads" / "setup.exe", 2 * GB)
+    sparse(root / "Users" / "ana" / "NTUSER.DAT", 1)
+    sparse(root / "Users" / "viejo" / "Documents" / "doc.pst", 700 * MB)
+    old = time.time() - (osp.OLD_PROFILE_DAYS + 10) * 86400
+    ntuser = sparse(root / "Users" / "viejo" / "NTUSER.DAT", 1)
+    os.utime(ntuser, (old, old))
+    sparse(root / "Users" / "Public" / "Downloads" / "p.bin", 5 * GB)
+    sparse(root / "hiberfil.sys", 3 * GB)
+
+
+def test_index_sizes_and_children(tmp_path):
+    build_volume(tmp_path)
+    index = osp.DirectorySizeIndex(str(tmp_path)).scan(max_workers=4)
+
+    winsxs = str(tmp_path / "Windows" / "WinSxS")
+    assert index.size_of(winsxs) == 9 * GB
+    assert index.size_of(str(tmp_path / "Windows")) == 9 * GB + 500 * MB
+    assert index.total_files[0] == 11
+    assert index.total_bytes[0] == sum(
+        entry.stat().st_size for entry in tmp_path.rglob("*") if entry.is_file()
+    )
+    assert sorted(name for name, _ in index.children(winsxs)) == ["amd64_a", "amd64_b"]
+    assert index.size_of(str(tmp_path / "no_existe")) == 0
+
+
+def test_top_consumers_and_recommendations(tmp_path):
+    build_volume(tmp_path)
+    index = osp.DirectorySizeIndex(str(tmp_path)).scan(max_workers=4)
+    consumers = osp.find_space_consumers(index)
+
+    top = [(c["category"], os.path.relpath(c["path"], tmp_path), c["bytes"]) for c in consumers[:4]]
+    assert top == [
+        ("WinSxS", os.path.join("Windows", "WinSxS"), 9 * GB),
+        ("Archivo de hibernación", "hiberfil.sys", 3 * GB),
+        ("Descargas de usuarios", os.path.join("Users", "ana", "Downloads"), 2 * GB),
+        ("Perfiles antiguos", os.path.join("Users", "viejo"), 700 * MB + 1),
+    ]
+    # Los perfiles del sistema no cuentan y la lista está ordenada
+    assert not any("Public" in c["path"] for c in consumers)
+    assert [c["bytes"] for c in consumers] == sorted((c["bytes"] for c in consumers), reverse=True)
+
+    recommendations = osp.recommend_cleanup_tasks(consumers)
+    assert {task_id: flag for task_id, (flag, _) in recommendations.items()} == {
+        "temp_files": True,
+        "cleanmgr": False,
+        "clean_winsxs": True,
+        "disable_hibernation": False,
+    }
+    assert recommendations["temp_files"][1].startswith("550.0 MB")
+
+
+def test_recommendations_without_consumers():
+    assert osp.recommend_cleanup_tasks([])["clean_winsxs"] == (False, "sin espacio recuperable")
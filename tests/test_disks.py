@@ -0,0 +1,67 @@
+"""Inventario de unidades del informe de diagnóstico sin bloquearse en unidades lentas."""
+
+import threading
+from collections import namedtuple
+
+import pytest
+
+import Generate_Diagnostic_Report as gdr
+
+Partition = namedtuple("Partition", "device mountpoint fstype opts")
+
+FIXED = Partition("C:\\", "C:\\", "NTFS", "rw,fixed")
+SLOW = Partition("E:\\", "E:\\", "NTFS", "rw,fixed")
+NETWORK = Partition("Z:\\", "Z:\\", "", "rw,remote")
+
+
+@pytest.fixture
+def volumes(monkeypatch):
+    gdr._volume_cache.clear()
+    release = threading.Event()
+    types = {"C:\\": "fixed", "E:\\": "fixed", "Z:\\": "network"}
+
+    def probe(partition, kind):
+        if partition is SLOW and not release.is_set():
+            release.wait(1)
+            raise OSError("sin respuesta")
+        return {"drive": partition.device, "type": kind, "status": "ok", "total": 1,
+                "used": 0, "free": 1, "percent": 0}
+
+    monkeypatch.setattr(gdr, "list_partitions", lambda: [FIXED, SLOW, NETWORK])
+    monkeypatch.setattr(gdr, "get_drive_type", lambda partition: types[partition.mountpoint])
+    monkeypatch.setattr(gdr, "probe_volume_usage", probe)
+    yield release
+    release.set()
+    gdr._volume_cache.clear()
+
+
+def test_network_drives_are_listed_but_not_probed(volumes):
+    volumes.set()
+    disks = {d["drive"]: d for d in gdr.get_disk_info()}
+    assert disks["Z:\\"] == {"drive": "Z:\\", "type": "network", "status": "skipped"}
+    assert gdr.get_disk_info(include_slow=True)[2]["status"] == "ok"
+
+
+def test_only_successful_reads_are_cached(volumes):
+    disks = {d["drive"]: d["status"] for d in gdr.get_disk_info(timeout=0.1)}
+    assert disks == {"C:\\": "ok", "E:\\": "timeout", "Z:\\": "skipped"}
+    assert set(gdr._volume_cache) == {"C:\\"}
+
+    # El volumen lento responde en el siguiente informe
+    volumes.set()
+    assert [d["status"] for d in gdr.get_disk_info(timeout=0.5)] == ["ok", "ok", "skipped"]
+
+
+def test_refresh_reprobes_cached_and_slow_drives(volumes, monkeypatch):
+    volumes.set()
+    gdr.get_disk_info()
+    probed = []
+    monkeypatch.setattr(
+        gdr, "probe_volume_usage",
+        lambda partition, kind: probed.append(partition.device) or {
+            "drive": partition.device, "type": kind, "status": "ok"},
+    )
+
+    disks = gdr.get_disk_info(include_slow=True, refresh=True)
+    assert sorted(probed) == ["C:\\", "E:\\", "Z:\\"]
+    assert [d["status"] for d in disks] == ["ok", "ok", "ok"]
@@ -0,0 +1,66 @@
+"""Análisis de salidas capturadas de DISM y SFC (inglés y español)."""
+
+import pytest
+
+import Optimize_System_Performance as osp
+from conftest import FIXTURES
+
+DISM = FIXTURES / "dism"
+
+
+def read_capture(name):
+    """Lee una captura tal como llega de la consola (página de códigos OEM)."""
+    return (DISM / name).read_bytes().decode("latin-1")
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("scanhealth_healthy_en.txt", osp.DISM_HEALTHY),
+        ("scanhealth_healthy_es_cp850.txt", osp.DISM_HEALTHY),
+        ("scanhealth_repairable_en.txt", osp.DISM_REPAIRABLE),
+        ("scanhealth_not_repairable_es.txt", osp.DISM_NOT_REPAIRABLE),
+        ("restorehealth_source_error_en.txt", osp.DISM_UNKNOWN),
+    ],
+)
+def test_parse_dism_scan_health(name, expected):
+    assert osp.parse_dism_scan_health(read_capture(name)) == expected
+
+
+def test_parse_dism_restore_health():
+    assert osp.parse_dism_restore_health(read_capture("restorehealth_ok_es.txt"))
+    assert not osp.parse_dism_restore_health(
+        read_capture("restorehealth_source_error_en.txt"), returncode=0x800F081F
+    )
+    assert not osp.parse_dism_restore_health(
+        read_capture("restorehealth_source_error_en.txt"), returncode=0
+    )
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("sfc_clean_en_utf16.txt", osp.SFC_CLEAN),
+        ("sfc_repaired_en_utf16.txt", osp.SFC_REPAIRED),
+        ("sfc_unrepaired_es_utf16.txt", osp.SFC_UNREPAIRED),
+        ("sfc_pending_en_utf16.txt", osp.SFC_FAILED),
+    ],
+)
+def test_parse_sfc_result_utf16(name, expected):
+    assert osp.parse_sfc_result(read_capture(name)) == expected
+
+
+def test_parse_sfc_result_unknown():
+    assert osp.parse_sfc_result("Beginning system scan.") is None
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("analyze_store_yes_en.txt", True),
+        ("analyze_store_no_es.txt", False),
+        ("scanhealth_healthy_en.txt", None),
+    ],
+)
+def test_parse_component_store_analysis(name, expected):
+    assert osp.parse_component_store_analysis(read_capture(name)) is expected
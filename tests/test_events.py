@@ -0,0 +1,132 @@
+"""Registro de eventos: XML grabado de wevtutil/Visor de eventos y lecturas cortadas."""
+
+import functools
+import tracemalloc
+
+import pytest
+
+import Generate_Diagnostic_Report as gdr
+from conftest import FIXTURES
+
+EVENTS = FIXTURES / "events"
+SYSTEM = (EVENTS / "system_wevtutil.xml").read_bytes()
+APPLICATION = (EVENTS / "application_export.xml").read_bytes()
+
+
+def chunked(data, size):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [37, 4096, 1 << 20])
+def test_parse_wevtutil_stream_in_chunks(size):
+    events = list(gdr.parse_event_stream(chunked(SYSTEM, size), "System"))
+    assert [e["event_id"] for e in events] == [41, 6008, 7, 7, 98, 7000]
+    power = events[0]
+    assert power["provider"] == "Microsoft-Windows-Kernel-Power"
+    assert power["level"] == 1
+    assert power["time"] == "2026-10-18T13:02:11.5102361Z"
+    assert power["data"]["BugcheckCode"] == "0"
+    assert power["message"].startswith("El sistema se reinició sin apagarse")
+    # Datos sin nombre: se indexan por posición
+    assert events[1]["data"]["0"] == "13:58:02"
+
+
+def test_parse_event_viewer_export():
+    events = list(gdr.parse_event_stream(chunked(APPLICATION, 512)))
+    assert [(e["log"], e["provider"], e["event_id"]) for e in events] == [
+        ("Application", "Application Error", 1000),
+        ("Application", "Application Error", 1000),
+        ("Application", "Application Hang", 1002),
+    ]
+
+
+def test_truncated_stream_keeps_parsed_events():
+    cut = SYSTEM.index(b"Service Control Manager")
+    state = {}
+    events = list(gdr.parse_event_stream(chunked(SYSTEM[:cut], 1000), "System", state))
+    assert [e["event_id"] for e in events] == [41, 6008, 7, 7, 98]
+    assert state == {"truncated": True}
+
+
+SMALL_EVENT = (
+    b'<Event xmlns="http://schemas.microsoft.com/win/2004/08/events/event"><System>'
+    b'<Provider Name="disk"/><EventID>7</EventID><Level>2</Level>'
+    b'<TimeCreated SystemTime="2026-10-12T19:20:55.0012000Z"/></System>'
+    b"<EventData><Data>\\Device\\Harddisk0\\DR0</Data></EventData></Event>"
+)
+
+
+def test_large_stream_memory_stays_flat():
+    count, per_chunk, warmup = 100_000, 200, 5_000
+    peaks = {}
+
+    def chunks():
+        # Salida de wevtutil generada por bloques, sin guardarla entera
+        for done in range(0, count, per_chunk):
+            if done == warmup:
+                peaks["warmup"] = tracemalloc.get_traced_memory()[1]
+            yield SMALL_EVENT * per_chunk
+
+    tracemalloc.start()
+    try:
+        parsed = sum(1 for _ in gdr.parse_event_stream(chunks(), "System"))
+        peaks["total"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert parsed == count
+    # Veinte veces más eventos sin que crezca el pico de memoria
+    assert peaks["total"] < peaks["warmup"] * 1.5
+
+
+def test_aggregate_recorded_events():
+    groups = gdr.aggregate_events(gdr.parse_event_stream([SYSTEM], "System"))
+    disk = groups[0]
+    assert (disk["provider"], disk["event_id"], disk["count"]) == ("disk", 7, 2)
+    assert disk["first"] == "2026-10-12T19:20:55.0012000Z"
+    assert disk["last"] == "2026-10-15T08:44:03.2241900Z"
+    assert len(groups) == 5
+
+
+def test_query_complete(wevtutil):
+    wevtutil["System"] = (SYSTEM,)
+    state = {}
+    events = list(gdr.query_events("System", "*", state=state))
+    assert len(events) == 6
+    assert state == {"events": 6, "truncated": False, "capped": False}
+
+
+def test_query_capped_by_max_events(wevtutil):
+    wevtutil["System"] = (SYSTEM,)
+    state = {}
+    list(gdr.query_events("System", "*", max_events=6, state=state))
+    assert state["capped"] is True
+
+
+def test_query_timeout_keeps_partial_events(wevtutil):
+    cut = SYSTEM.index(b"Service Control Manager")
+    wevtutil["System"] = (SYSTEM[:cut], True)
+    state = {}
+    events = list(gdr.query_events("System", "*", timeout=0.2, state=state))
+    assert len(events) == 5
+    assert state == {"events": 5, "truncated": True, "capped": False}
+
+
+def test_summary_marks_partial_totals(wevtutil, monkeypatch):
+    wevtutil["System"] = (SYSTEM[: SYSTEM.index(b"<Event xmlns", 10) + 40], True)
+    wevtutil["Application"] = (APPLICATION,)
+    monkeypatch.setattr(
+        gdr, "query_events",
+        functools.partial(gdr.query_events, max_events=3, timeout=0.2),
+    )
+    summary = gdr.collect_event_summary()
+    assert summary["truncated"] == ["System"]
+    assert summary["capped"] == ["Application"]
+    assert summary["failed"] == []
+    assert summary["totals"] == {"critical": 1, "error": 3, "warning": 0}
+
+    lines = gdr.describe_events(summary)
+    assert lines[0].startswith("Últimos 30 días: al menos 1 críticos, 3 errores")
+    assert "System: lectura interrumpida por tiempo, totales parciales" in lines
+    assert f"Application: se alcanzó el límite de {gdr.EVENT_MAX_EVENTS} eventos, hay más" in lines
+    assert "al menos 1 críticos" in gdr.describe_event_health(summary)
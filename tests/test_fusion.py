@@ -0,0 +1,220 @@
+"""Lotes de comandos ligeros: orden declarado, tareas consecutivas y compuertas."""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import Optimize_System_Performance as osp
+
+FAKE_TOOLS = ("sc", "powercfg", "netsh", "ipconfig", "cleanmgr")
+
+
+def task(task_id):
+    return next(t for t in osp.OPTIMIZATION_TASKS if t["id"] == task_id)
+
+
+def tasks(*task_ids):
+    return [task(task_id) for task_id in task_ids]
+
+
+class LoggingRegistry(osp.MemoryRegistryBackend):
+    def __init__(self, log_path):
+        super().__init__()
+        self.log_path = log_path
+
+    def write_values(self, changes):
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(f"reg {len(changes)}\n")
+        return super().write_values(changes)
+
+
+class Engine(osp.OptimizationEngine):
+    def __init__(self, log_path, stop_before=None):
+        self.init_engine()
+        self.registry_backend = LoggingRegistry(log_path)
+        self.stop_before = stop_before
+        self.started = []
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append(message)
+
+    def set_progress(self, value):
+        pass
+
+    def update_progress_label(self, text):
+        pass
+
+    def before_task(self, task):
+        if task["id"] == self.stop_before:
+            return False
+        self.started.append(task["id"])
+        return True
+
+    # Tareas con manejador propio: no forman parte de la fusión
+    def run_temp_cleanup(self):
+        return True
+
+    def run_volume_optimizer(self):
+        return True
+
+    def run_network_ab(self):
+        return True
+
+    def run_power_plan_ab(self):
+        return True
+
+
+@pytest.fixture
+def system(tmp_path, monkeypatch):
+    """Herramientas de Windows falsas en el PATH que anotan cada ejecución."""
+    if sys.platform == "win32":
+        pytest.skip("las herramientas falsas son scripts de sh")
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log_path = tmp_path / "calls.log"
+    for name in FAKE_TOOLS:
+        tool = bin_dir / name
+        tool.write_text(f'#!/bin/sh\necho "{name} $*" >> "{log_path}"\n', encoding="utf-8")
+        tool.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    popens = []
+    real_popen = subprocess.Popen
+
+    def counting_popen(*args, **kwargs):
+        popens.append(args[0])
+        return real_popen(*args, **kwargs)
+
+    monkeypatch.setattr(osp.subprocess, "Popen", counting_popen)
+    monkeypatch.setattr(osp, "capture_baseline", lambda: {"elapsed": 0})
+    monkeypatch.setattr(osp, "compare_baselines", lambda before, after: [])
+    monkeypatch.setattr(osp, "save_run_record", lambda record: None)
+    monkeypatch.setattr(osp, "SNAPSHOT_DIR", tmp_path)
+    monkeypatch.setattr(osp.time, "sleep", lambda seconds: None)
+
+    class System:
+        def engine(self, **kwargs):
+            return Engine(log_path, **kwargs)
+
+        def calls(self):
+            if not log_path.exists():
+                return []
+            return log_path.read_text(encoding="utf-8").splitlines()
+
+    system = System()
+    system.popens = popens
+    system.log_path = log_path
+    return system
+
+
+def commands_of(*task_ids):
+    return [c for t in tasks(*task_ids) for c in osp.task_commands(t)]
+
+
+def test_plan_crosses_tasks_and_stops_at_other_commands():
+    batches = osp.plan_fused_batches(
+        tasks(
+            "disable_telemetry",
+            "disable_hibernation",
+            "disable_windows_search",
+            "disable_cortana",
+            "disable_superfetch",
+            "optimize_network",
+            "clear_dns_cache",
+        ),
+        lambda t: t["id"] != "optimize_network",
+    )
+    assert [[(t["id"], position) for t, position, _ in batch] for batch in batches] == [
+        [
+            ("disable_telemetry", 2),
+            ("disable_telemetry", 3),
+            ("disable_telemetry", 4),
+            ("disable_telemetry", 5),
+            ("disable_hibernation", 0),
+            ("disable_windows_search", 0),
+            ("disable_windows_search", 1),
+        ],
+        [("disable_superfetch", 0), ("disable_superfetch", 1)],
+    ]
+
+
+def test_batch_runs_in_declared_order_across_tasks(system):
+    selected = ("disable_telemetry", "disable_hibernation", "disable_windows_search",
+                "disable_superfetch")
+    engine = system.engine()
+    engine.optimize_system(tasks(*selected))
+
+    # Los dos "reg add" de telemetría se escriben antes que el lote
+    shell = [c for c in commands_of(*selected) if osp.is_fusible_command(c)]
+    assert system.calls() == ["reg 2"] + shell
+    assert len(system.popens) == 1
+    assert engine.started == list(selected)
+    records = engine.run_record["tasks"]
+    assert [r["id"] for r in records] == list(selected)
+    assert all(r["success"] for r in records)
+    assert [r.get("batched_in") for r in records] == [None] + ["disable_telemetry"] * 3
+
+
+def test_gate_stops_batch_before_next_task(system):
+    engine = system.engine(stop_before="disable_windows_search")
+    engine.optimize_system(
+        tasks("disable_telemetry", "disable_hibernation", "disable_windows_search")
+    )
+
+    assert system.calls() == ["reg 2"] + [
+        c for c in commands_of("disable_telemetry", "disable_hibernation")
+        if osp.is_fusible_command(c)
+    ]
+    assert engine.should_cancel
+    assert [r["id"] for r in engine.run_record["tasks"]] == [
+        "disable_telemetry",
+        "disable_hibernation",
+    ]
+
+
+def test_full_preset_process_count(system, monkeypatch):
+    selected = [task(task_id) for task_id in osp.PRESETS["completo"]]
+    system.engine().optimize_system(selected)
+    fused = len(system.popens)
+    fused_calls = system.calls()
+
+    del system.popens[:]
+    os.remove(system.log_path)
+    monkeypatch.setattr(osp, "plan_fused_batches", lambda tasks, is_generic: [])
+    system.engine().optimize_system(selected)
+    separate = len(system.popens)
+
+    # cleanmgr, el lote de SysMain e ipconfig frente a un proceso por comando
+    assert (separate, fused) == (4, 3)
+    assert system.calls() == fused_calls
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="comandos de sh")
+def test_hung_command_times_out_and_rest_is_left_to_caller():
+    results = osp.run_fused_commands(["echo uno", "sleep 30", "echo tres"], timeout_per_command=0.5)
+    assert results[0] == (0, "uno", "")
+    assert results[1][0] == -1 and results[1][2] == "Timeout"
+    assert results[2] is None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="comandos de sh")
+def test_gate_wait_does_not_count_against_timeout():
+    answers = []
+
+    def slow_gate():
+        time.sleep(0.8)
+        answers.append("go")
+        return True
+
+    results = osp.run_fused_commands(
+        ["echo uno", "echo dos"], timeout_per_command=0.25, gates={1: slow_gate}
+    )
+    assert answers == ["go"]
+    assert results == [(0, "uno", ""), (0, "dos", "")]
+    assert osp.run_fused_commands(
+        ["echo uno", "echo dos"], gates={1: lambda: False}
+    ) == [(0, "uno", ""), None]
@@ -0,0 +1,105 @@
+"""Gobernador de recursos: presión ajena a la tarea y prioridades reales."""
+
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+import Optimize_System_Performance as osp
+
+
+def sample(time_, own_cpu=0.0, own_io=0, disk_busy_ms=0, disk_bytes=0):
+    return {
+        "time": time_,
+        "own_cpu": own_cpu,
+        "own_io": own_io,
+        "disk_busy_ms": disk_busy_ms,
+        "disk_bytes": disk_bytes,
+    }
+
+
+def test_own_cpu_is_not_pressure():
+    # 4 CPU al 90 % durante 2 s; la tarea consumió 6.8 s de CPU (85 %)
+    before, after = sample(10.0), sample(12.0, own_cpu=6.8)
+    assert osp.compute_foreign_pressure(before, after, 90.0, 4) == (5.0, 0.0)
+
+
+def test_foreign_cpu_is_pressure():
+    before, after = sample(10.0), sample(12.0, own_cpu=0.4)
+    cpu, _ = osp.compute_foreign_pressure(before, after, 95.0, 4)
+    assert cpu == 90.0
+    assert osp.resolve_governor_level("balanced", 0, cpu) == "background"
+
+
+def test_disk_busy_discounts_task_bytes():
+    before = sample(0.0)
+    # Disco ocupado el 100 % de 1 s; la mitad de los bytes fue de la tarea
+    after = sample(1.0, own_io=50, disk_busy_ms=1000, disk_bytes=100)
+    assert osp.compute_foreign_pressure(before, after, 0.0, 1) == (0.0, 50.0)
+    # Todo lo transferido fue de la tarea: no hay presión
+    after = sample(1.0, own_io=100, disk_busy_ms=1000, disk_bytes=100)
+    assert osp.compute_foreign_pressure(before, after, 0.0, 1)[1] == 0.0
+    # La suma de tiempos de E/S de Windows puede pasar del 100 %
+    after = sample(1.0, disk_busy_ms=3500, disk_bytes=100)
+    assert osp.compute_foreign_pressure(before, after, 0.0, 1)[1] == 100.0
+
+
+def test_disk_pressure_lowers_level():
+    assert osp.resolve_governor_level("balanced", 0, 10, osp.DISK_PRESSURE_PERCENT) == "background"
+    assert osp.resolve_governor_level("balanced", 0, 10, 5) == "balanced"
+    assert osp.resolve_governor_level("balanced", osp.USER_IDLE_SECONDS, 10, 100) == "full"
+
+
+class FakeMonitor:
+    def __init__(self):
+        self.cpu_seconds = 0.0
+
+    def totals(self):
+        return {"cpu_seconds": self.cpu_seconds, "read_bytes": 0, "write_bytes": 0}
+
+
+def test_governor_reads_pressure_from_monitor(monkeypatch):
+    monkeypatch.setattr(osp.psutil, "cpu_percent", lambda interval=None: 90.0)
+    monkeypatch.setattr(osp.psutil, "cpu_count", lambda: 2)
+    monkeypatch.setattr(osp.psutil, "disk_io_counters", lambda: None)
+    monkeypatch.setattr(osp, "get_user_idle_seconds", lambda: 0)
+    monitor = FakeMonitor()
+    governor = osp.ResourceGovernor("heavy", "balanced", interval=60, monitor=monitor)
+    governor._load_sample = osp.read_load_sample(monitor)
+    governor._load_sample["time"] -= 1.0
+    # La tarea usó 1.7 s de CPU en 1 s sobre 2 CPU: el 85 % es suyo
+    monitor.cpu_seconds = 1.7
+    governor._enforce()
+    assert governor.pressure[0] < osp.CPU_PRESSURE_PERCENT
+    assert governor.level == "balanced"
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="nice/ionice de Linux")
+def test_child_tree_gets_nice_and_ionice():
+    child = subprocess.Popen(
+        [sys.executable, "-c", "import subprocess; subprocess.run(['sleep', '30'])"]
+    )
+    try:
+        parent = psutil.Process(child.pid)
+        deadline = time.monotonic() + 10
+        while not parent.children() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        monitor = osp.ProcessTreeMonitor(interval=0.1).start()
+        monitor.attach(child.pid)
+        governor = osp.ResourceGovernor("heavy", "background", interval=0.1, monitor=monitor)
+        governor.start()
+        governor.attach(child.pid)
+        try:
+            tree = [parent] + parent.children(recursive=True)
+            assert len(tree) == 2
+            for process in tree:
+                assert process.nice() == osp.PRIORITY_VALUES["idle"]
+                assert process.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+        finally:
+            governor.stop()
+            monitor.stop()
+    finally:
+        osp.kill_process_tree(child.pid)
+        child.wait(timeout=10)
@@ -0,0 +1,55 @@
+"""Modo desatendido: tareas aptas para la sesión 0 y monitor de inactividad."""
+
+import json
+import time
+
+import Optimize_System_Performance as osp
+
+
+def task(task_id):
+    return next(t for t in osp.OPTIMIZATION_TASKS if t["id"] == task_id)
+
+
+def test_headless_excludes_per_user_and_interactive_tasks():
+    excluded = {
+        t["id"] for t in osp.OPTIMIZATION_TASKS if t["id"] in osp.PRESETS["completo"]
+        and osp.get_headless_exclusion(t)
+    }
+    assert excluded == {
+        "cleanmgr",
+        "disable_visual_effects",
+        "disable_startup_delay",
+        "disable_transparency",
+        "disable_game_bar",
+    }
+
+
+def test_headless_keeps_machine_wide_tasks():
+    for task_id in ("temp_files", "disable_telemetry", "disable_superfetch", "optimize_network"):
+        assert osp.get_headless_exclusion(task(task_id)) is None
+
+
+def test_idle_file_round_trip(monkeypatch, tmp_path):
+    monkeypatch.setattr(osp, "LOG_DIR", tmp_path)
+    monkeypatch.setenv("USERNAME", "Tecnico")
+    monkeypatch.setattr(osp, "get_user_idle_seconds", lambda: 42.0)
+    osp.run_idle_monitor(minutes=0.0001, interval=0)
+    idle = osp.read_user_idle_file("TECNICO")
+    assert idle is not None and 42.0 <= idle < 45.0
+
+
+def test_idle_file_stale_or_unknown_is_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(osp, "LOG_DIR", tmp_path)
+    path = tmp_path / osp.USER_IDLE_FILE_PATTERN.format(user="ana")
+    path.write_text(json.dumps({"idle": 5, "time": time.time() - 600}), encoding="utf-8")
+    assert osp.read_user_idle_file("ana") is None
+    path.write_text(json.dumps({"idle": None, "time": time.time()}), encoding="utf-8")
+    assert osp.read_user_idle_file("ana") is None
+    assert osp.read_user_idle_file("nadie") is None
+
+
+def test_idle_monitor_task_runs_in_user_session():
+    xml = osp.build_idle_monitor_xml("07:00-19:00", r"C:\PQN\Optimizer.exe", "--idle-monitor 720")
+    assert "<GroupId>S-1-5-4</GroupId>" in xml
+    assert "<ExecutionTimeLimit>PT720M</ExecutionTimeLimit>" in xml
+    assert "<Arguments>--idle-monitor 720</Arguments>" in xml
@@ -0,0 +1,83 @@
+"""Prueba de rendimiento de red contra el servidor incluido, en localhost."""
+
+import socket
+import sys
+import threading
+
+import pytest
+
+import Generate_Diagnostic_Report as gdr
+
+
+@pytest.fixture
+def throughput_server():
+    server = gdr.ThroughputServer(("127.0.0.1", 0), gdr.ThroughputHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("direction", ["download", "upload"])
+def test_measure_throughput_localhost(throughput_server, direction):
+    host, port = throughput_server
+    result = gdr.measure_throughput(host, port, direction, size=4 * 1024**2, duration=5)
+    assert result["bytes"] == 4 * 1024**2
+    assert result["mbps"] > 0
+
+
+def test_download_stops_at_duration(throughput_server):
+    host, port = throughput_server
+    result = gdr.measure_throughput(host, port, "download", size=gdr.THROUGHPUT_MAX_BYTES,
+                                    duration=0.2)
+    assert 0 < result["bytes"] < gdr.THROUGHPUT_MAX_BYTES
+    assert result["seconds"] < 2
+
+
+def test_server_ignores_foreign_clients(throughput_server):
+    with socket.create_connection(throughput_server, timeout=2) as sock:
+        sock.sendall(b"GET / HTTP/1.1\r\n\r\n")
+        assert sock.recv(16) == b""
+
+
+def test_network_diagnostics_with_throughput_server(throughput_server):
+    address = "{}:{}".format(*throughput_server)
+    results = gdr.run_network_diagnostics(endpoints=[], throughput_server=address)
+    throughput = results["throughput"]
+    assert throughput["server"] == address
+    assert throughput["download"]["bytes"] > 0 and throughput["upload"]["bytes"] > 0
+    assert gdr.describe_network(results)[0].startswith(f"Rendimiento contra {address}: descarga")
+
+
+def test_throughput_server_unreachable():
+    with socket.create_server(("127.0.0.1", 0)) as probe:
+        address = "127.0.0.1:{}".format(probe.getsockname()[1])
+    results = gdr.run_network_diagnostics(endpoints=[], throughput_server=address)
+    assert "error" in results["throughput"]
+
+
+def test_main_serves_with_relaunch_arguments(monkeypatch):
+    served = []
+
+    class Server:
+        def __init__(self, address, handler):
+            served.append(address)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def serve_forever(self):
+            pass
+
+    monkeypatch.setattr(gdr, "ThroughputServer", Server)
+    # Relanzamiento del ejecutable con argv[0] repetido como posicional
+    monkeypatch.setattr(
+        sys, "argv",
+        ["Diagnostico.exe", "C:\\PQN\\Diagnostico.exe", "--serve-throughput", "127.0.0.1:5300"],
+    )
+    gdr.main()
+    assert served == [("127.0.0.1", 5300)]
@@ -0,0 +1,114 @@
+"""Verificación previa del instalador: plazo, errores e integridad pendiente."""
+
+import hashlib
+import time
+from collections import namedtuple
+
+import pytest
+
+import Unattended_Installation_of_Programs as u
+
+Usage = namedtuple("Usage", "total used free percent")
+PAYLOAD = b"MZ" + b"\0" * 4096
+
+
+@pytest.fixture
+def installers_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "Programas"
+    directory.mkdir()
+    monkeypatch.setattr(u, "INSTALLERS_PATH", directory)
+    monkeypatch.setattr(u, "HASH_CACHE_FILE", tmp_path / "hash_cache.json")
+    monkeypatch.setattr(u, "check_pending_reboot", lambda: u.preflight_result(
+        "Reinicio pendiente", "Sistema", u.PREFLIGHT_OK))
+    monkeypatch.setattr(u, "check_busy_installers", lambda: u.preflight_result(
+        "Instalaciones en curso", "Sistema", u.PREFLIGHT_OK))
+    monkeypatch.setattr(u.psutil, "disk_usage", lambda drive: Usage(0, 0, 500 * 1024**3, 0))
+    return directory
+
+
+def installer(directory, sha256=None, config=None, required_mb=100):
+    (directory / "app.exe").write_bytes(PAYLOAD)
+    item = {
+        "id": "app",
+        "name": "App",
+        "file": "app.exe",
+        "sha256": sha256 or hashlib.sha256(PAYLOAD).hexdigest(),
+        "required_mb": required_mb,
+    }
+    if config:
+        item["config"] = config
+    return item
+
+
+def by_check(results):
+    return {r["check"]: r for r in results}
+
+
+def test_all_checks_pass(installers_dir):
+    go, results = u.run_preflight([installer(installers_dir)])
+    assert go
+    assert {r["check"]: r["status"] for r in results} == {
+        "Espacio en disco": u.PREFLIGHT_OK,
+        "Reinicio pendiente": u.PREFLIGHT_OK,
+        "Instalaciones en curso": u.PREFLIGHT_OK,
+        "Archivo": u.PREFLIGHT_OK,
+        "Integridad": u.PREFLIGHT_OK,
+    }
+
+
+def test_slow_check_is_a_warning_within_deadline(installers_dir, monkeypatch):
+    def slow_reboot_check():
+        time.sleep(2)
+        return u.preflight_result("Reinicio pendiente", "Sistema", u.PREFLIGHT_OK)
+
+    monkeypatch.setattr(u, "check_pending_reboot", slow_reboot_check)
+    start = time.monotonic()
+    go, results = u.run_preflight([installer(installers_dir)], deadline=0.2)
+    assert time.monotonic() - start < 1.5
+    assert go
+    reboot = by_check(results)["Reinicio pendiente"]
+    assert reboot["status"] == u.PREFLIGHT_WARNING
+    assert reboot["detail"] == "Sin respuesta dentro del plazo"
+
+
+def test_missing_config_blocks(installers_dir):
+    go, results = u.run_preflight([installer(installers_dir, config="app.ini")])
+    assert not go
+    config = by_check(results)["Configuración"]
+    assert (config["status"], config["detail"]) == (u.PREFLIGHT_ERROR, "No encontrado: app.ini")
+
+
+def test_insufficient_space_blocks(installers_dir, monkeypatch):
+    monkeypatch.setattr(u.psutil, "disk_usage", lambda drive: Usage(0, 0, 600 * 1024**2, 0))
+    go, results = u.run_preflight([installer(installers_dir, required_mb=200)])
+    assert not go
+    space = by_check(results)["Espacio en disco"]
+    assert space["status"] == u.PREFLIGHT_ERROR
+    assert space["detail"] == f"600 MB libres, {200 + u.PREFLIGHT_SPACE_MARGIN_MB} MB requeridos"
+
+
+@pytest.mark.parametrize("matches", [True, False])
+def test_pending_hash_is_enforced_before_install(installers_dir, monkeypatch, matches):
+    item = installer(installers_dir, sha256=None if matches else "0" * 64)
+    real_sha256 = u.file_sha256
+
+    def slow_sha256(path, *args, **kwargs):
+        time.sleep(1)
+        return real_sha256(path, *args, **kwargs)
+
+    monkeypatch.setattr(u, "file_sha256", slow_sha256)
+    go, results = u.run_preflight([item], deadline=0.2)
+    integrity = by_check(results)["Integridad"]
+    assert go
+    assert integrity["status"] == u.PREFLIGHT_WARNING
+    assert integrity["detail"] == "Hash pendiente: se verificará antes de instalar"
+
+    monkeypatch.setattr(u, "file_sha256", real_sha256)
+    reason = u.verify_before_install(item, installers_dir / "app.exe")
+    assert reason == (None if matches else "El hash no coincide")
+
+
+def test_wrong_hash_blocks_when_checked_in_time(installers_dir):
+    go, results = u.run_preflight([installer(installers_dir, sha256="0" * 64)])
+    assert not go
+    assert by_check(results)["Integridad"]["detail"] == "El hash no coincide"
@@ -0,0 +1,143 @@
+"""Instantáneas de registro: lectura del plan, ida y vuelta y reversión."""
+
+import pytest
+
+import Optimize_System_Performance as osp
+
+
+def task(task_id):
+    return next(t for t in osp.OPTIMIZATION_TASKS if t["id"] == task_id)
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        (
+            'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\DataCollection" '
+            "/v AllowTelemetry /t REG_DWORD /d 0 /f",
+            {
+                "key": "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\DataCollection",
+                "name": "AllowTelemetry",
+                "type": "REG_DWORD",
+                "data": 0,
+            },
+        ),
+        (
+            'reg add "HKEY_CURRENT_USER\\Control Panel\\Desktop\\" /v UserPreferencesMask '
+            "/t REG_BINARY /d 9012038010000000 /f",
+            {
+                "key": "HKCU\\Control Panel\\Desktop",
+                "name": "UserPreferencesMask",
+                "type": "REG_BINARY",
+                "data": "9012038010000000",
+            },
+        ),
+        (
+            'reg add "HKCU\\Software\\Test" /v Mask /t REG_DWORD /d 0x10 /f',
+            {"key": "HKCU\\Software\\Test", "name": "Mask", "type": "REG_DWORD", "data": 16},
+        ),
+        (
+            'reg add "HKCU\\Control Panel\\Desktop\\WindowMetrics" /v MinAnimate /d 0 /f',
+            {
+                "key": "HKCU\\Control Panel\\Desktop\\WindowMetrics",
+                "name": "MinAnimate",
+                "type": "REG_SZ",
+                "data": "0",
+            },
+        ),
+    ],
+)
+def test_parse_reg_add(command, expected):
+    assert osp.parse_reg_add(command) == expected
+
+
+@pytest.mark.parametrize(
+    "command",
+    ["sc stop DiagTrack", "reg delete HKCU\\Software\\Test /f", 'reg add "HKCU\\X" /t REG_DWORD /d zz /f'],
+)
+def test_parse_reg_add_ignores_other_commands(command):
+    assert osp.parse_reg_add(command) is None
+
+
+def test_plan_registry_changes_includes_services():
+    changes = osp.plan_registry_changes([task("disable_telemetry")])
+    keys = [(c["key"], c["name"]) for c in changes]
+    assert ("HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\DataCollection", "AllowTelemetry") in keys
+    assert (f"{osp.SERVICES_KEY}\\DiagTrack", "Start") in keys
+    assert (f"{osp.SERVICES_KEY}\\DiagTrack", "DelayedAutostart") in keys
+    assert len(changes) == 6
+
+
+def test_snapshot_round_trip():
+    tasks = [task("disable_telemetry"), task("disable_visual_effects")]
+    changes = osp.plan_registry_changes(tasks)
+    original = {
+        ("HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\DataCollection", "AllowTelemetry"): ("REG_DWORD", 3),
+        ("HKCU\\Control Panel\\Desktop", "UserPreferencesMask"): ("REG_BINARY", "9e3e078012000000"),
+        (f"{osp.SERVICES_KEY}\\DiagTrack", "Start"): ("REG_DWORD", 2),
+        (f"{osp.SERVICES_KEY}\\DiagTrack", "DelayedAutostart"): ("REG_DWORD", 1),
+    }
+    backend = osp.MemoryRegistryBackend(original)
+    before = dict(backend.values)
+
+    snapshot = osp.take_registry_snapshot(changes, backend)
+    assert backend.reads == 1
+    existed = {(e["key"], e["name"]): e["existed"] for e in snapshot["entries"]}
+    assert existed[("HKCU\\Software\\Microsoft\\Windows\\DWM", "EnableAeroPeek")] is False
+
+    # La ejecución aplica el plan...
+    backend.write_values(changes)
+    assert backend.values != before
+
+    # ...y la reversión deja el registro como estaba, en una sola escritura
+    backend.writes = 0
+    assert osp.restore_registry_snapshot(snapshot, backend) == []
+    assert backend.writes == 1
+    assert backend.values == before
+
+
+def test_snapshot_service_modes():
+    backend = osp.MemoryRegistryBackend(
+        {
+            (f"{osp.SERVICES_KEY}\\DiagTrack", "Start"): ("REG_DWORD", 2),
+            (f"{osp.SERVICES_KEY}\\dmwappushservice", "Start"): ("REG_DWORD", 3),
+        }
+    )
+    snapshot = osp.take_registry_snapshot(
+        osp.plan_registry_changes([task("disable_telemetry")]), backend
+    )
+    assert osp.snapshot_service_modes(snapshot) == {
+        "DiagTrack": "auto",
+        "dmwappushservice": "demand",
+    }
+
+
+def test_save_load_and_rollback(tmp_path, monkeypatch):
+    monkeypatch.setattr(osp, "SNAPSHOT_DIR", tmp_path)
+    commands = []
+    monkeypatch.setattr(
+        osp, "run_command", lambda command, **kwargs: commands.append(command) or (0, "", "")
+    )
+    backend = osp.MemoryRegistryBackend(
+        {(f"{osp.SERVICES_KEY}\\SysMain", "Start"): ("REG_DWORD", 2)}
+    )
+    changes = osp.plan_registry_changes([task("disable_superfetch")])
+    snapshot = osp.take_registry_snapshot(changes, backend)
+    assert osp.save_registry_snapshot("20261019_020000", snapshot)
+    osp.save_registry_snapshot("20261019_030000", {"created": "", "entries": []})
+
+    assert osp.load_registry_snapshot()[0] == "20261019_030000"
+    assert osp.load_registry_snapshot("20261019_020000") == ("20261019_020000", snapshot)
+
+    backend.write_values(changes)
+    run_id, errors = osp.rollback_run("20261019_020000", backend)
+    assert (run_id, errors) == ("20261019_020000", [])
+    assert backend.read_values([(f"{osp.SERVICES_KEY}\\SysMain", "Start")]) == {
+        (f"{osp.SERVICES_KEY}\\SysMain", "Start"): ("REG_DWORD", 2)
+    }
+    assert commands == ['sc config "SysMain" start= auto']
+
+
+def test_rollback_without_snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(osp, "SNAPSHOT_DIR", tmp_path / "missing")
+    assert osp.rollback_run() == (None, ["No hay instantáneas disponibles"])
@@ -0,0 +1,92 @@
+"""Muestreador de recursos: búfer circular, estadísticas con huecos y reducción de series."""
+
+import math
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import Generate_Diagnostic_Report as gdr
+
+NAN = math.nan
+
+
+@pytest.fixture
+def feed(monkeypatch):
+    """Alimenta el muestreador con lecturas fijas: (cpu, temperatura) por muestra."""
+    readings = []
+
+    def cpu_percent(percpu=False):
+        return [readings[0][0]] * 2
+
+    def temperature():
+        return readings.pop(0)[1]
+
+    monkeypatch.setattr(gdr.psutil, "cpu_count", lambda: 2)
+    monkeypatch.setattr(gdr.psutil, "cpu_percent", cpu_percent)
+    monkeypatch.setattr(gdr.psutil, "cpu_freq", lambda: None)
+    monkeypatch.setattr(gdr.psutil, "disk_io_counters", lambda: None)
+    monkeypatch.setattr(gdr.psutil, "net_io_counters", lambda: None)
+    monkeypatch.setattr(gdr.psutil, "virtual_memory", lambda: SimpleNamespace(percent=50.0))
+    monkeypatch.setattr(gdr, "read_cpu_temperature", temperature)
+
+    def run(sampler, *samples):
+        sampler._last = (time.monotonic(), (0, 0), (0, 0))
+        for cpu, temp in samples:
+            readings.append((cpu, temp))
+            sampler.sample()
+        return sampler
+
+    return run
+
+
+def test_series_before_the_buffer_fills(feed):
+    sampler = feed(gdr.ResourceSampler(interval=1, window=5), (10, 40), (20, 41), (30, 42))
+    assert sampler.series("cpu").tolist() == [10, 20, 30]
+    assert sampler.per_core[:3, 1].tolist() == [10, 20, 30]
+
+
+def test_series_keeps_chronological_order_after_wraparound(feed):
+    sampler = feed(
+        gdr.ResourceSampler(interval=1, window=5),
+        *[(value, 40) for value in range(0, 80, 10)],
+    )
+    assert sampler.count == 5 and sampler.index == 3
+    assert sampler.series("cpu").tolist() == [30, 40, 50, 60, 70]
+
+    # La serie es una copia: modificarla no altera el búfer
+    sampler.series("cpu")[0] = -1
+    assert sampler.series("cpu")[0] == 30
+
+
+def test_summary_ignores_nan_gaps(feed):
+    # Siete muestras en un búfer de cinco: sobreviven 60, NaN, 70, NaN, 80
+    sampler = feed(
+        gdr.ResourceSampler(interval=1, window=5),
+        (1, 99), (2, 99), (3, 60), (4, NAN), (5, 70), (6, NAN), (7, 80),
+    )
+    stats = sampler.summary()
+
+    assert stats["temperature"] == {"mean": 70.0, "p95": 79.0, "max": 80.0, "samples": 3}
+    assert stats["cpu"]["max"] == 7.0 and stats["cpu"]["samples"] == 5
+    # Un canal sin ninguna lectura válida no aparece
+    assert "freq" not in stats
+
+
+def test_downsample_averages_uneven_blocks():
+    values = np.arange(10, dtype=np.float32)
+    assert gdr.downsample(values, points=4).tolist() == [0.5, 3.0, 5.5, 8.0]
+
+
+def test_downsample_drops_nan_and_keeps_short_series():
+    values = np.array([1.0, NAN, 2.0, NAN, 3.0], dtype=np.float32)
+    assert gdr.downsample(values, points=4).tolist() == [1.0, 2.0, 3.0]
+    assert gdr.downsample(np.full(6, NAN), points=4).size == 0
+
+
+def test_downsample_caps_long_series_at_the_point_count():
+    values = np.linspace(0, 100, 1000, dtype=np.float32)
+    reduced = gdr.downsample(values)
+    assert reduced.size == gdr.SPARKLINE_POINTS
+    assert np.all(np.diff(reduced) > 0)
@@ -0,0 +1,126 @@
+"""Analizador de inicio: inventario capturado, eventos 101/103 y muestreo."""
+
+import json
+import time
+
+import pytest
+
+import Optimize_System_Performance as osp
+from conftest import FIXTURES
+
+STARTUP = FIXTURES / "startup"
+
+
+def load_inventory(name="inventory.json"):
+    return osp.parse_startup_inventory((STARTUP / name).read_text(encoding="utf-8"))
+
+
+def by_id(entries):
+    return {entry["id"]: entry for entry in entries}
+
+
+def test_parse_inventory_entries():
+    entries, events = load_inventory()
+    entries = by_id(entries)
+    assert len(events) == 3
+
+    teams = entries[r"registry:HKCU\Software\Microsoft\Windows\CurrentVersion\Run\com.squirrel.Teams.Teams"]
+    assert teams["image"] == "update.exe"
+    assert teams["approved"] == "Run"
+    assert teams["enabled"]
+
+    acrobat = entries[
+        r"registry:HKLM\SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Run\Acrobat Assistant 8.0"
+    ]
+    assert acrobat["image"] == "reader_sl.exe"
+    assert not acrobat["enabled"]
+
+    onenote = next(e for e in entries.values() if e["kind"] == "folder")
+    assert onenote["image"] == "onenotem.exe"
+
+
+def test_parse_inventory_skips_windows_items():
+    entries = by_id(load_inventory()[0])
+    assert "task:\\GoogleUpdateTaskMachineCore" in entries
+    assert not any("ScheduledDefrag" in key for key in entries)
+    assert "service:AdobeARMservice" in entries
+    assert "service:Dnscache" not in entries
+    assert entries["service:gupdate"]["delayed"] is True
+
+
+def test_parse_inventory_single_objects_and_bad_json():
+    entries, events = load_inventory("inventory_single.json")
+    assert [e["kind"] for e in entries] == ["registry", "service"]
+    assert len(events) == 1
+    assert osp.parse_startup_inventory("no es json") == ([], [])
+    assert osp.parse_startup_inventory("") == ([], [])
+
+
+def test_parse_degradation_events():
+    summary = osp.parse_degradation_events(load_inventory()[1])
+    assert summary["teams.exe"] == {"count": 2, "degradation_ms": 5200, "total_ms": 9300}
+    assert summary["service:adobearmservice"] == {
+        "count": 1,
+        "degradation_ms": 1800,
+        "total_ms": 2100,
+    }
+
+
+def test_rank_startup_entries():
+    entries, events = load_inventory()
+    usage = {"reader_sl.exe": {"cpu_seconds": 1.5, "io_bytes": 100 * 1024 * 500, "processes": 1}}
+    ranked = osp.rank_startup_entries(entries, osp.parse_degradation_events(events), usage)
+    assert ranked[0]["id"] == "registry:HKLM\\SOFTWARE\\WOW6432Node\\Microsoft\\Windows\\CurrentVersion\\Run\\Acrobat Assistant 8.0"
+    assert ranked[0]["impact_ms"] == 2000
+    assert ranked[1]["id"] == "service:AdobeARMservice"
+    assert ranked[1]["impact_ms"] == 1800
+
+
+@pytest.mark.parametrize(
+    "delayed, expected",
+    [(False, 'sc config "svc" start= auto'), (True, 'sc config "svc" start= delayed-auto')],
+)
+def test_service_reenable_keeps_delayed_start(delayed, expected):
+    entry = {"kind": "service", "name": "svc", "delayed": delayed}
+    assert osp.build_startup_toggle_command(entry, True) == expected
+    assert osp.build_startup_toggle_command(entry, False) == 'sc config "svc" start= demand'
+
+
+def test_snapshot_restores_delayed_auto():
+    backend = osp.MemoryRegistryBackend()
+    key = f"{osp.SERVICES_KEY}\\gupdate"
+    backend.write_values(
+        [
+            {"key": key, "name": "Start", "type": "REG_DWORD", "data": 2},
+            {"key": key, "name": "DelayedAutostart", "type": "REG_DWORD", "data": 1},
+        ]
+    )
+    changes = osp.parse_sc_config('sc config "gupdate" start= demand')
+    snapshot = osp.take_registry_snapshot(changes, backend)
+    assert osp.snapshot_service_modes(snapshot) == {"gupdate": "delayed-auto"}
+
+
+def test_sample_early_usage_stops_at_window_end():
+    window = 600
+    boot = time.time() - window + 0.3
+    start = time.monotonic()
+    usage = osp.sample_early_process_usage(window, interval=0.1, boot=boot)
+    assert time.monotonic() - start < 2
+    assert isinstance(usage, dict)
+
+
+def test_sample_early_usage_outside_window():
+    assert osp.sample_early_process_usage(600, boot=time.time() - 601) is None
+
+
+def test_collect_early_usage_reuses_sample_of_this_boot(tmp_path, monkeypatch):
+    boot = time.time() - 3600
+    monkeypatch.setattr(osp.psutil, "boot_time", lambda: boot)
+    path = tmp_path / "startup_usage.json"
+    usage = {"app.exe": {"cpu_seconds": 2.0, "io_bytes": 10, "processes": 1}}
+    path.write_text(json.dumps({"boot_time": boot, "window": 600, "usage": usage}))
+    assert osp.collect_early_process_usage(600, path) == usage
+
+    # Muestra de otro arranque y ventana cerrada: no hay datos fiables
+    path.write_text(json.dumps({"boot_time": boot - 86400, "window": 600, "usage": usage}))
+    assert osp.collect_early_process_usage(600, path) == {}
@@ -0,0 +1,49 @@
+"""Benchmark de almacenamiento en un directorio temporal (E/S real, tamaños reducidos)."""
+
+import os
+
+import pytest
+
+import Generate_Diagnostic_Report as gdr
+
+
+@pytest.fixture
+def small_benchmark(monkeypatch):
+    monkeypatch.setattr(gdr, "STORAGE_BENCH_MAX_MB", 8)
+    monkeypatch.setattr(gdr, "STORAGE_BENCH_MIN_MB", 4)
+    monkeypatch.setattr(gdr, "STORAGE_RANDOM_SECONDS", 0.1)
+    monkeypatch.setattr(gdr, "STORAGE_QUEUE_DEPTH", 2)
+
+
+def test_storage_run_measures_and_cleans_up(small_benchmark, tmp_path):
+    stale = tmp_path / f"{gdr.STORAGE_BENCH_PREFIX}1.tmp"
+    stale.write_bytes(b"resto de una prueba interrumpida")
+    messages = []
+
+    results = gdr.run_storage_benchmark([("tmp", tmp_path)], progress=messages.append)
+
+    assert messages == ["Midiendo tmp..."]
+    [result] = results
+    assert "error" not in result, result
+    assert result["volume"] == "tmp"
+    assert result["file_mb"] == 8
+    assert result["queue_depth"] == 2
+    assert result["seq_write_mbs"] > 0 and result["seq_read_mbs"] > 0
+    for kind in ("read", "write"):
+        for suffix in ("qd1", "qdn"):
+            assert result[f"rand_{kind}_iops_{suffix}"] > 0
+            assert set(result["latency_ms"][f"{kind}_{suffix}"]) == {"p50", "p95", "p99"}
+    assert os.listdir(tmp_path) == []
+
+    lines = gdr.describe_storage_benchmark(results)
+    assert lines[0].startswith("tmp: secuencial lectura")
+    assert "QD2" in lines[2]
+
+
+def test_storage_run_reports_errors_per_volume(small_benchmark, tmp_path, monkeypatch):
+    monkeypatch.setattr(gdr, "STORAGE_BENCH_MIN_MB", 10**9)
+    results = gdr.run_storage_benchmark([("lleno", tmp_path), ("falta", tmp_path / "no")])
+    assert [r["volume"] for r in results] == ["lleno", "falta"]
+    assert results[0]["error"].startswith("espacio libre insuficiente")
+    assert "error" in results[1]
+    assert gdr.describe_storage_benchmark(results)[0].startswith("lleno: no se pudo medir")
@@ -0,0 +1,130 @@
+"""Almacén direccionado por contenido: publicación, copia reanudable y verificación."""
+
+import hashlib
+import json
+import os
+
+import pytest
+
+import Unattended_Installation_of_Programs as u
+
+SETUP = b"MZ" + bytes(range(256)) * 40
+CONFIG = b"<Configuration><Add/></Configuration>"
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    """Capas local, compartida y USB en tmp_path, con la caché de hashes aislada."""
+    monkeypatch.setattr(u, "HASH_CACHE_FILE", tmp_path / "hash_cache.json")
+    monkeypatch.setattr(u, "STORE_CHUNK_SIZE", 1024)
+    source = tmp_path / "Programas"
+    source.mkdir()
+    (source / "setup.exe").write_bytes(SETUP)
+    (source / "copia.exe").write_bytes(SETUP)
+    (source / "config.xml").write_bytes(CONFIG)
+    layers = [tmp_path / "local", tmp_path / "shared", tmp_path / "usb"]
+    return source, layers
+
+
+INSTALLERS = [
+    {"id": "office", "file": "setup.exe", "config": "config.xml"},
+    {"id": "duplicado", "file": "copia.exe"},
+    {"id": "ausente", "file": "no_existe.exe"},
+]
+
+
+def corrupt(path):
+    """Cambia el contenido sin cambiar el tamaño (y mueve el mtime)."""
+    data = bytearray(path.read_bytes())
+    data[10] ^= 0xFF
+    path.write_bytes(bytes(data))
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+
+def test_publish_and_fetch(stores):
+    source, (local, shared, usb) = stores
+    manifest = u.publish_to_store(source, usb, INSTALLERS)
+
+    item = manifest["installers"]["office"]
+    assert item["sha256"] == hashlib.sha256(SETUP).hexdigest()
+    assert item["config"]["file"] == "config.xml"
+    assert "ausente" not in manifest["installers"]
+    assert json.loads((usb / u.STORE_MANIFEST).read_text(encoding="utf-8")) == manifest
+
+    path, error = u.fetch_object(item, [local, shared, usb])
+    assert error == ""
+    assert path == local / "run" / item["sha256"] / "setup.exe"
+    assert path.read_bytes() == SETUP
+    assert u.object_path(local, item["sha256"]).read_bytes() == SETUP
+    assert not list((local / "objects").rglob("*.partial*"))
+
+    # Segunda vez: se reutiliza el objeto local verificado
+    assert u.fetch_object(item, [local, shared, usb]) == (path, "")
+
+
+def test_identical_payloads_are_stored_once(stores):
+    source, (_, _, usb) = stores
+    manifest = u.publish_to_store(source, usb, INSTALLERS)
+    installers = manifest["installers"]
+    assert installers["office"]["sha256"] == installers["duplicado"]["sha256"]
+    objects = [p for p in (usb / "objects").rglob("*") if p.is_file()]
+    assert len(objects) == 2  # instalador y config.xml
+
+
+def test_copy_chunks_resumes_from_progress(tmp_path):
+    source = tmp_path / "source.bin"
+    source.write_bytes(SETUP)
+    target = tmp_path / "target.partial"
+    # Copia interrumpida: los bloques 0 y 2 ya constan como copiados
+    target.write_bytes(b"\xaa" * len(SETUP))
+    (tmp_path / "target.partial.json").write_text("[0, 2]", encoding="utf-8")
+
+    u.copy_chunks(source, target, len(SETUP), chunk_size=1024, workers=2)
+    data = target.read_bytes()
+    assert data[:1024] == b"\xaa" * 1024
+    assert data[2048:3072] == b"\xaa" * 1024
+    assert data[1024:2048] == SETUP[1024:2048]
+    assert data[3072:] == SETUP[3072:]
+    chunks = (len(SETUP) + 1023) // 1024
+    assert json.loads((tmp_path / "target.partial.json").read_text()) == list(range(chunks))
+
+
+def test_hash_mismatch_after_copy_tries_next_layer(stores):
+    source, (local, shared, usb) = stores
+    item = u.publish_to_store(source, usb, INSTALLERS)["installers"]["office"]
+    u.publish_to_store(source, shared, INSTALLERS)
+    corrupt(u.object_path(shared, item["sha256"]))
+
+    path, error = u.fetch_object(item, [local, shared, usb])
+    assert error == ""
+    assert path.read_bytes() == SETUP
+
+    # Sin una capa sana no se publica nada en el almacén local
+    u.discard_object(local, item["sha256"])
+    path, error = u.fetch_object(item, [local, shared])
+    assert path is None
+    assert error.startswith("setup.exe: el hash no coincide tras la copia")
+    assert not u.object_path(local, item["sha256"]).exists()
+    assert not list((local / "objects").rglob("*.partial*"))
+
+
+def test_corrupted_local_object_is_fetched_again(stores):
+    source, (local, shared, usb) = stores
+    item = u.publish_to_store(source, usb, INSTALLERS)["installers"]["office"]
+    path, _ = u.fetch_object(item, [local, shared, usb])
+
+    # El objeto y su enlace en run/ se dañan con el mismo tamaño
+    corrupt(u.object_path(local, item["sha256"]))
+    assert not u.object_matches(u.object_path(local, item["sha256"]), item)
+
+    again, error = u.fetch_object(item, [local, shared, usb])
+    assert (again, error) == (path, "")
+    assert again.read_bytes() == SETUP
+    assert u.object_path(local, item["sha256"]).read_bytes() == SETUP
+
+
+def test_missing_object(stores):
+    _, layers = stores
+    item = {"sha256": "ab" * 32, "size": 10, "file": "x.exe"}
+    assert u.fetch_object(item, layers) == (None, "x.exe no está en ningún almacén")
@@ -0,0 +1,169 @@
+"""Motor nativo de limpieza de temporales sobre árboles generados."""
+
+import os
+import threading
+import time
+
+import pytest
+
+import Optimize_System_Performance as osp
+
+OLD = time.time() - 48 * 3600
+
+
+def write(path, size=100, mtime=OLD):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def temp_tree(tmp_path):
+    root = tmp_path / "Temp"
+    write(root / "a.tmp", 100)
+    write(root / "b.log", 200)
+    write(root / "reciente.tmp", 50, mtime=time.time())
+    write(root / "sub" / "deep" / "c.tmp", 300)
+    write(root / "_MEI12345" / "python311.dll", 1000)
+    write(root / "setup.lock", 10)
+    write(root / "vacia" / "d.tmp", 400)
+    return root
+
+
+def remaining(root):
+    found = []
+    for path, dirs, files in os.walk(root):
+        prefix = os.path.relpath(path, root).replace(os.sep, "/")
+        prefix = "" if prefix == "." else prefix + "/"
+        found += [prefix + name for name in files] + [prefix + name + "/" for name in dirs]
+    return sorted(found)
+
+
+def test_dry_run_counts_without_deleting(temp_tree):
+    before = remaining(temp_tree)
+    stats = osp.clean_directory(str(temp_tree), dry_run=True, max_workers=4)
+    assert stats == {"files": 4, "bytes": 1000, "skipped": 0, "recent": 1, "dirs": 0}
+    assert remaining(temp_tree) == before
+
+
+def test_cleanup_respects_age_and_exclusions(temp_tree):
+    stats = osp.clean_directory(str(temp_tree), max_workers=4)
+    assert stats == {"files": 4, "bytes": 1000, "skipped": 0, "recent": 1, "dirs": 3}
+    assert remaining(temp_tree) == [
+        "_MEI12345/",
+        "_MEI12345/python311.dll",
+        "reciente.tmp",
+        "setup.lock",
+    ]
+
+
+def test_min_age_zero_deletes_recent_files(temp_tree):
+    stats = osp.clean_directory(str(temp_tree), min_age_hours=0, exclusions=[], max_workers=2)
+    assert stats["files"] == 7
+    assert remaining(temp_tree) == []
+
+
+def test_locked_files_are_skipped_once(temp_tree, monkeypatch):
+    attempts = []
+    real_remove = osp.remove_file
+
+    def remove(entry):
+        attempts.append(entry.name)
+        return False if entry.name == "b.log" else real_remove(entry)
+
+    monkeypatch.setattr(osp, "remove_file", remove)
+    stats = osp.clean_directory(str(temp_tree), max_workers=4)
+    assert (stats["files"], stats["bytes"], stats["skipped"]) == (3, 800, 1)
+    assert attempts.count("b.log") == 1
+    assert "b.log" in remaining(temp_tree)
+
+
+def test_parallel_scandir_visits_every_directory(temp_tree):
+    seen = []
+    lock = threading.Lock()
+
+    def visit(path, entries):
+        with lock:
+            seen.append(os.path.relpath(path, temp_tree))
+        return [e.path for e in entries if e.is_dir()]
+
+    osp.parallel_scandir([str(temp_tree)], visit, max_workers=3)
+    assert sorted(seen) == sorted([".", "sub", os.path.join("sub", "deep"), "_MEI12345", "vacia"])
+
+
+def test_parallel_scandir_stops_when_cancelled(temp_tree):
+    cancel = threading.Event()
+    cancel.set()
+    seen = []
+    osp.parallel_scandir([str(temp_tree)], lambda path, entries: seen.append(path), 2, cancel)
+    assert seen == []
+
+
+def test_temp_locations_skip_prefetch(tmp_path, monkeypatch):
+    windows = tmp_path / "Windows"
+    (windows / "Temp").mkdir(parents=True)
+    (windows / "Prefetch").mkdir()
+    (tmp_path / "Users" / "ana" / "AppData" / "Local" / "Temp").mkdir(parents=True)
+    monkeypatch.setenv("SystemRoot", str(windows))
+    monkeypatch.setenv("SystemDrive", str(tmp_path))
+    monkeypatch.delenv("TEMP", raising=False)
+    assert [label for label, _ in osp.get_temp_locations()] == [
+        "TEMP de ana",
+        "Windows\\Temp",
+    ]
+
+
+class Engine(osp.OptimizationEngine):
+    def __init__(self):
+        self.init_engine()
+        self.run_record = {"run_id": "test"}
+        self.messages = []
+
+    def log(self, message, level="INFO"):
+        self.messages.append(message)
+
+
+def test_run_temp_cleanup_reports_each_location(tmp_path, monkeypatch):
+    first, second = tmp_path / "uno", tmp_path / "dos"
+    write(first / "a.tmp", 100)
+    write(second / "b.tmp", 200)
+    write(second / "c.tmp", 300)
+    monkeypatch.setattr(osp, "get_temp_locations", lambda: [("Uno", str(first)), ("Dos", str(second))])
+    monkeypatch.setattr(osp, "empty_recycle_bin", lambda: False)
+
+    engine = Engine()
+    assert engine.run_temp_cleanup()
+    cleanup = engine.run_record["cleanup"]
+    assert [(l["name"], l["files"], l["bytes"]) for l in cleanup["locations"]] == [
+        ("Uno", 1, 100),
+        ("Dos", 2, 500),
+    ]
+    assert (cleanup["files"], cleanup["bytes"], cleanup["dry_run"]) == (3, 600, False)
+
+
+# Benchmark opcional: PQN_BENCH_FILES=1000000 python -m pytest tests/test_temp_cleanup.py -s
+BENCH_FILES = int(os.environ.get("PQN_BENCH_FILES", "0"))
+
+
+@pytest.mark.skipif(not BENCH_FILES, reason="definir PQN_BENCH_FILES para medir")
+def test_benchmark_generated_tree(tmp_path):
+    per_dir = 1000
+    root = tmp_path / "bench"
+    for index in range(BENCH_FILES):
+        directory = root / f"d{index // per_dir // 100}" / f"d{index // per_dir}"
+        if index % per_dir == 0:
+            directory.mkdir(parents=True)
+        path = directory / f"f{index}.tmp"
+        path.write_bytes(b"x")
+        os.utime(path, (OLD, OLD))
+
+    start = time.perf_counter()
+    dry = osp.clean_directory(str(root), dry_run=True)
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    stats = osp.clean_directory(str(root))
+    clean = time.perf_counter() - start
+    print(f"\n{BENCH_FILES} archivos: recorrido {scan:.1f} s, limpieza {clean:.1f} s "
+          f"({BENCH_FILES / clean:.0f} archivos/s)")
+    assert dry["files"] == stats["files"] == BENCH_FILES
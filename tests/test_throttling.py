@@ -0,0 +1,86 @@
+"""Prueba de throttling: referencia tras el arranque de la carga y contador de Windows."""
+
+import math
+
+import pytest
+
+import Generate_Diagnostic_Report as gdr
+
+THRESHOLDS = dict(gdr.DEFAULT_THROTTLE_THRESHOLDS)
+NAN = math.nan
+
+
+def series(*mhz, interval=0.5, temp=60.0):
+    return [(f, f, temp) for f in mhz], interval
+
+
+def test_ramp_up_is_not_the_reference():
+    # Primer segundo con la carga aún arrancando; luego estable
+    samples, interval = series(1200, 1800, *([3000] * 20))
+    result = gdr.analyze_throttling(samples, interval, THRESHOLDS)
+    assert result["reference_mhz"] == 3000
+    assert result["throttled"] is False
+    assert result["max_drop_percent"] == 0
+
+
+def test_sustained_drop_after_reference():
+    samples, interval = series(*([3000] * 8), *([2300] * 12))
+    result = gdr.analyze_throttling(samples, interval, THRESHOLDS)
+    assert result["reference_mhz"] == 3000
+    assert result["sustained_seconds"] == 6.0
+    assert result["throttled"] is True
+
+
+def test_temperature_limit():
+    samples, interval = series(*([3000] * 10), temp=96.0)
+    assert gdr.analyze_throttling(samples, interval, THRESHOLDS)["throttled"] is True
+
+
+def test_without_frequency():
+    samples, interval = series(*([NAN] * 10))
+    assert "error" in gdr.analyze_throttling(samples, interval, THRESHOLDS)
+
+
+def test_parse_performance_counter():
+    output = (
+        '"(PDH-CSV 4.0)","\\\\PC\\Processor Information(_Total)\\% Processor Performance"\n'
+        '"10/19/2026 10:00:00.000","112.5"\n'
+        '"10/19/2026 10:00:01.000"," "\n'
+        '"10/19/2026 10:00:02.000","87.5"\n'
+    )
+    assert gdr.parse_performance_counter(output, 2000) == [2250.0, 1750.0]
+
+
+def constant_sample():
+    return 3000.0, 2900.0, NAN
+
+
+def test_run_throttle_test_samples_under_load(monkeypatch):
+    monkeypatch.setattr(gdr, "get_throttle_thresholds", lambda model: THRESHOLDS)
+    result = gdr.run_throttle_test(
+        "Latitude 5420", duration=1.5, interval=0.05, sample=constant_sample
+    )
+    assert result["model"] == "Latitude 5420"
+    assert result["reference_mhz"] == 3000
+    assert result["throttled"] is False
+
+
+class Counter:
+    def __init__(self, output):
+        self.output = output
+
+    def communicate(self, timeout=None):
+        return self.output, None
+
+
+@pytest.mark.parametrize("counter", [None, Counter("")])
+def test_windows_without_typeperf_is_an_error(monkeypatch, counter):
+    monkeypatch.setattr(gdr.sys, "platform", "win32")
+    monkeypatch.setattr(gdr, "start_performance_counter", lambda seconds: counter)
+    monkeypatch.setattr(gdr, "get_throttle_thresholds", lambda model: THRESHOLDS)
+    result = gdr.run_throttle_test("OptiPlex", duration=0.3, interval=0.05, sample=constant_sample)
+    assert result == {
+        "error": "typeperf no entregó el rendimiento real del procesador",
+        "model": "OptiPlex",
+    }
+    assert gdr.describe_throttling(result) == [f"No se pudo evaluar: {result['error']}"]
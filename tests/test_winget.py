@@ -0,0 +1,197 @@
+"""Integración con winget usando salidas capturadas y un winget simulado."""
+
+import json
+import sys
+
+import pytest
+
+import Optimize_System_Performance as osp
+from conftest import FIXTURES
+
+WINGET = FIXTURES / "winget"
+
+# Ejecutable falso: registra su argv y responde según winget.json, que está
+# junto a él. Lo lanza run_command con el mismo subprocess que en producción.
+FAKE_WINGET = """#!{python}
+import json, os, shutil, sys
+
+here = {here!r}
+with open(os.path.join(here, "winget.json"), encoding="utf-8") as f:
+    config = json.load(f)
+with open(os.path.join(here, "calls.jsonl"), "a", encoding="utf-8") as f:
+    f.write(json.dumps(sys.argv) + "\\n")
+
+args = sys.argv[1:]
+if {installer}:
+    sys.exit(config["install_code"])
+if args[0] == "upgrade" and "--id" not in args:
+    sys.stdout.buffer.write(config["listing"].encode("utf-8"))
+    sys.exit(config["listing_code"])
+if args[0] == "upgrade":
+    sys.exit(config["upgrade_code"])
+if args[0] == "download" and config["manifest"] is not None:
+    target = args[args.index("--download-directory") + 1]
+    shutil.copy(os.path.join(here, "setup.exe"), os.path.join(target, "setup.exe"))
+    with open(os.path.join(target, "manifest.yaml"), "w", encoding="utf-8") as f:
+        f.write(config["manifest"])
+    sys.exit(0)
+sys.stderr.write("download failed")
+sys.exit(1)
+"""
+
+
+def read_capture(name):
+    return (WINGET / name).read_text(encoding="utf-8")
+
+
+class FakeWinget:
+    """
+    Instala en un directorio un winget falso (y el instalador que "descarga")
+    y expone las llamadas reales que recibieron ambos ejecutables.
+
+    Los códigos de salida se mantienen por debajo de 256: en POSIX un
+    proceso no puede devolver los códigos de 32 bits de Windows.
+    """
+
+    def __init__(self, directory, listing="", listing_code=0, upgrade_code=0,
+                 install_code=0, manifest=None):
+        self.directory = directory
+        config = {
+            "listing": listing,
+            "listing_code": listing_code,
+            "upgrade_code": upgrade_code,
+            "install_code": install_code,
+            "manifest": manifest,
+        }
+        (directory / "winget.json").write_text(json.dumps(config), encoding="utf-8")
+        self.exe = self._script("winget", installer=False)
+        self._script("setup.exe", installer=True)
+
+    def _script(self, name, installer):
+        path = self.directory / name
+        path.write_text(
+            FAKE_WINGET.format(python=sys.executable, here=str(self.directory),
+                               installer=installer),
+            encoding="utf-8",
+        )
+        path.chmod(0o755)
+        return str(path)
+
+    @property
+    def calls(self):
+        log = self.directory / "calls.jsonl"
+        if not log.exists():
+            return []
+        return [json.loads(line) for line in log.read_text(encoding="utf-8").splitlines()]
+
+    def winget_upgrades(self):
+        return [c for c in self.calls if c[0] == self.exe and "--id" in c
+                and c[1] == "upgrade"]
+
+
+@pytest.fixture
+def fake_winget(tmp_path, monkeypatch):
+    if sys.platform == "win32":
+        pytest.skip("el winget falso es un script con shebang")
+    directory = tmp_path / "bin"
+    directory.mkdir()
+
+    def install(**kwargs):
+        fake = FakeWinget(directory, **kwargs)
+        monkeypatch.setattr(osp, "WINGET_EXE", fake.exe)
+        return fake
+
+    return install
+
+
+def test_parse_table_skips_explicit_targeting_en():
+    packages = osp.parse_winget_table(read_capture("upgrade_en.txt"))
+    assert [p["id"] for p in packages] == [
+        "Mozilla.Firefox",
+        "7zip.7zip",
+        "Microsoft.EdgeWebView2Ru…",
+    ]
+    assert packages[0] == {
+        "name": "Mozilla Firefox (x64 en-US)",
+        "id": "Mozilla.Firefox",
+        "version": "118.0.1",
+        "available": "119.0",
+        "source": "winget",
+    }
+
+
+def test_parse_table_skips_explicit_targeting_es():
+    packages = osp.parse_winget_table(read_capture("upgrade_es.txt"))
+    assert [p["id"] for p in packages] == ["Google.Chrome", "Adobe.Acrobat.Reader.64-…"]
+    assert packages[0]["version"] == "118.0.5993.118"
+    assert packages[0]["available"] == "119.0.6045.106"
+
+
+def test_get_upgrades_lists_only_unpinned(fake_winget):
+    fake_winget(listing=read_capture("upgrade_en.txt"))
+    packages, error = osp.get_winget_upgrades()
+    assert error == ""
+    assert "Notepad++.Notepad++" not in [p["id"] for p in packages]
+
+
+def test_get_upgrades_no_upgrade_code_is_not_an_error(monkeypatch):
+    # 0x8A15002B no cabe en un código de salida POSIX: aquí se simula el
+    # resultado de run_command tal como lo devuelve Windows (con signo)
+    monkeypatch.setattr(
+        osp,
+        "run_command",
+        lambda *args, **kwargs: (
+            osp.WINGET_NO_UPGRADE - 2**32, read_capture("upgrade_none_es.txt"), ""
+        ),
+    )
+    assert osp.get_winget_upgrades() == ([], "")
+
+
+def test_get_upgrades_passes_common_args(fake_winget):
+    fake = fake_winget(listing=read_capture("upgrade_es.txt"))
+    packages, error = osp.get_winget_upgrades()
+    assert (len(packages), error) == (2, "")
+    assert fake.calls == [[fake.exe, "upgrade", "--include-unknown", *osp.WINGET_COMMON_ARGS]]
+
+
+def test_get_upgrades_reports_failure(fake_winget):
+    fake_winget(listing="", listing_code=1)
+    packages, error = osp.get_winget_upgrades()
+    assert packages == []
+    assert error
+
+
+PACKAGE = {"id": "7zip.7zip", "name": "7-Zip", "version": "22.01", "available": "23.01"}
+NSIS_MANIFEST = "Installers:\n- InstallerType: nullsoft\n"
+
+
+def test_install_uses_download_without_winget(fake_winget, tmp_path):
+    fake = fake_winget(manifest=NSIS_MANIFEST)
+    directory = osp.download_winget_package(PACKAGE, tmp_path)
+    assert osp.install_winget_package(PACKAGE, directory) == (0, "descarga previa")
+    assert fake.calls[0][1:5] == ["download", "--id", "7zip.7zip", "--exact"]
+    assert fake.calls[-1] == [str(directory / "setup.exe"), "/S"]
+    assert (directory / "manifest.yaml").read_text(encoding="utf-8") == NSIS_MANIFEST
+    assert fake.winget_upgrades() == []
+
+
+def test_failed_download_install_is_not_retried(fake_winget, tmp_path):
+    fake = fake_winget(manifest=NSIS_MANIFEST, install_code=67)
+    directory = osp.download_winget_package(PACKAGE, tmp_path)
+    assert osp.install_winget_package(PACKAGE, directory) == (67, "descarga previa")
+    assert fake.winget_upgrades() == []
+
+
+def test_falls_back_to_winget_without_download(fake_winget, tmp_path):
+    fake = fake_winget(manifest=None, upgrade_code=194)
+    directory = osp.download_winget_package(PACKAGE, tmp_path)
+    assert directory is None
+    assert osp.install_winget_package(PACKAGE, directory) == (194, "winget")
+    assert len(fake.winget_upgrades()) == 1
+
+
+def test_falls_back_to_winget_for_unknown_technology(fake_winget, tmp_path):
+    fake = fake_winget(manifest="InstallerType: portable\n")
+    directory = osp.download_winget_package(PACKAGE, tmp_path)
+    assert osp.install_winget_package(PACKAGE, directory) == (0, "winget")
+    assert len(fake.winget_upgrades()) == 1